@@ -0,0 +1,122 @@
+"""Compact graph benchmark for the :mod:`cookbase.graph.compact` module.
+
+Builds the synthetic recipes of ``benchmarks/graph.py`` and prints, for each recipe,
+the memory held by its CBRGraph and by its CompactCBRGraph, and the median time taken
+to build each of them and to apply the Graph validation rules to it. No database is
+needed. Run from the repository root::
+
+    python benchmarks/compact.py [-n RUNS] [-l LINES] [-o OUTPUT_PATH] [SIZE ...]
+"""
+import argparse
+import gc
+import json
+import logging
+import os
+import sys
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from cookbase.graph.cbrgraph import CBRGraph  # noqa: E402
+from cookbase.graph.cbrindex import CBRIndex  # noqa: E402
+from cookbase.graph.compact import CompactCBRGraph  # noqa: E402
+from cookbase.validation.rules import Graph  # noqa: E402
+from graph import synthetic_cbr, timed  # noqa: E402
+
+DEFAULT_SIZES = [100, 1000, 5000]
+
+
+def retained_bytes(build: Callable[[], Any]) -> int:
+    """Returns the memory allocated by a function and still held by its result, in
+    bytes, after a first call warming up any cache."""
+    build()
+    gc.collect()
+    tracemalloc.start()
+
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+    del result
+    return retained
+
+
+def build_cbrgraph(cbr: Dict[str, Any], index: CBRIndex) -> CBRGraph:
+    """Builds the CBRGraph of a recipe."""
+    graph = CBRGraph()
+    graph.build_graph(cbr, index)
+    return graph
+
+
+def apply_rules(graph: Any) -> None:
+    """Applies the Graph validation rules to a graph of either representation."""
+    Graph.ingredients_used_exactly_once(graph)
+    Graph.single_final_process(graph)
+    Graph.appliances_not_in_conflict(graph)
+
+
+def run(sizes: List[int], runs: int, lines: int = 8) -> Dict[int, Dict[str, float]]:
+    """Measures the memory and times of both graph representations of synthetic
+    recipes.
+
+    :param sizes: The approximate numbers of processes of the recipes
+    :type sizes: list[int]
+    :param int runs: The number of measurements taken per operation
+    :param int lines: The number of parallel production lines of the recipes,
+      defaults to :const:`8`
+    :return: A dictionary mapping each size into the memory of each representation,
+      in KiB, and the median time of each operation, in milliseconds
+    :rtype: dict[int, dict[str, float]]
+    """
+    results = {}
+
+    for size in sizes:
+        cbr = synthetic_cbr(size, lines)
+        index = CBRIndex.from_cbr(cbr)
+        results[size] = r = {}
+
+        for name, build in (
+            ("cbrgraph", lambda: build_cbrgraph(cbr, index)),
+            ("compact", lambda: CompactCBRGraph.from_cbr(cbr, index)),
+        ):
+            r[f"{name}_memory_kib"] = retained_bytes(build) / 1024
+            r[f"{name}_build_ms"] = timed(build, runs)
+
+            def build_and_apply():
+                apply_rules(build())
+
+            r[f"{name}_build_and_rules_ms"] = timed(build_and_apply, runs)
+
+        compact = CompactCBRGraph.from_cbr(cbr, index)
+        r["to_networkx_ms"] = timed(compact.to_networkx, runs)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("sizes", nargs="*", type=int, default=DEFAULT_SIZES)
+    parser.add_argument("-n", "--runs", type=int, default=5)
+    parser.add_argument("-l", "--lines", type=int, default=8)
+    parser.add_argument("-o", "--output", dest="output_path")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    results = run(args.sizes, args.runs, args.lines)
+
+    for size, r in results.items():
+        for measure, value in r.items():
+            print(f"{size:>8} {measure:<40} {value:>10.2f}")
+
+    if args.output_path:
+        with open(args.output_path, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
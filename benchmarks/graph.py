@@ -0,0 +1,163 @@
+"""Graph analysis benchmark for the :mod:`cookbase.graph.cbrgraph` module.
+
+Builds synthetic recipes of increasing size, where several production lines run in
+parallel, share appliances and are merged every few steps, and prints the median time
+taken to build their CBRGraph and to analyze it. No database is needed. Run from the
+repository root::
+
+    python benchmarks/graph.py [-n RUNS] [-l LINES] [-o OUTPUT_PATH] [SIZE ...]
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from cookbase.graph.cbrgraph import CBRGraph  # noqa: E402
+from cookbase.validation.rules import Graph  # noqa: E402
+
+DEFAULT_SIZES = [100, 1000, 5000]
+
+
+def synthetic_cbr(
+    processes: int, lines: int = 8, merge_every: int = 25, seed: int = 0
+) -> Dict[str, Any]:
+    """Generates a recipe whose preparation runs `lines` production lines in parallel,
+    merging all of them into one every `merge_every` steps.
+
+    :param int processes: The approximate number of processes
+    :param int lines: The number of parallel production lines, defaults to :const:`8`
+    :param int merge_every: The number of steps of a line between merges, defaults to
+      :const:`25`
+    :param int seed: The seed of the appliance assignment, defaults to :const:`0`
+    :return: The recipe
+    :rtype: dict[str, Any]
+    """
+    rnd = random.Random(seed)
+    name = {"text": "x", "language": "en"}
+    appliances = {f"app{i}": {"cbaId": i, "name": name} for i in range(4 * lines)}
+    ingredients = {}
+    preparation = {}
+    heads = [None] * lines
+    merged = None
+
+    def add_process(foodstuffs):
+        ref = f"proc{len(preparation)}"
+        preparation[ref] = {
+            "cbpId": 1,
+            "name": name,
+            "foodstuffsList": foodstuffs,
+            "appliances": [
+                {"appliance": a, "usedAfter": False}
+                for a in rnd.sample(list(appliances), 2)
+            ],
+        }
+        return ref
+
+    while len(preparation) < processes:
+        for line in range(lines):
+            ingredient = f"ing{len(ingredients)}"
+            ingredients[ingredient] = {"cbiId": len(ingredients), "name": name}
+            foodstuffs = [ingredient]
+
+            if merged is not None:
+                foodstuffs.append(merged)
+
+            heads[line] = add_process(foodstuffs)
+
+            for _ in range(merge_every - 1):
+                heads[line] = add_process([heads[line]])
+
+        merged = add_process(list(heads))
+
+    return {
+        "info": {"name": f"synthetic recipe of {len(preparation)} processes"},
+        "ingredients": ingredients,
+        "appliances": appliances,
+        "preparation": preparation,
+    }
+
+
+def timed(function: Callable[[], Any], runs: int) -> float:
+    """Returns the median time taken by several calls to a function, in
+    milliseconds."""
+    samples = []
+
+    for _ in range(runs):
+        start = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - start)
+
+    return statistics.median(samples) * 1000
+
+
+def run(sizes: List[int], runs: int, lines: int = 8) -> Dict[int, Dict[str, float]]:
+    """Measures the graph construction and analysis times of synthetic recipes.
+
+    :param sizes: The approximate numbers of processes of the recipes
+    :type sizes: list[int]
+    :param int runs: The number of measurements taken per operation
+    :param int lines: The number of parallel production lines of the recipes,
+      defaults to :const:`8`
+    :return: A dictionary mapping each size into the median time of each operation,
+      in milliseconds
+    :rtype: dict[int, dict[str, float]]
+    """
+    results = {}
+
+    for size in sizes:
+        cbr = synthetic_cbr(size, lines)
+        graph = CBRGraph()
+
+        def summary():
+            graph.mark_changed()
+            graph.processes_summary()
+
+        results[size] = {
+            "build_graph": timed(lambda: graph.build_graph(cbr), runs),
+            "processes_summary": timed(summary, runs),
+            "aggregated_appliances_graph": timed(
+                graph.aggregated_appliances_graph, runs
+            ),
+            "ingredients_used_exactly_once": timed(
+                lambda: Graph.ingredients_used_exactly_once(graph), runs
+            ),
+            "single_final_process": timed(
+                lambda: Graph.single_final_process(graph), runs
+            ),
+            "appliances_not_in_conflict": timed(
+                lambda: Graph.appliances_not_in_conflict(graph), runs
+            ),
+        }
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("sizes", nargs="*", type=int, default=DEFAULT_SIZES)
+    parser.add_argument("-n", "--runs", type=int, default=5)
+    parser.add_argument("-l", "--lines", type=int, default=8)
+    parser.add_argument("-o", "--output", dest="output_path")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    results = run(args.sizes, args.runs, args.lines)
+
+    for size, r in results.items():
+        for operation, ms in r.items():
+            print(f"{size:>8} {operation:<40} {ms:>10.2f} ms")
+
+    if args.output_path:
+        with open(args.output_path, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Serialization benchmark for the binary encoding of :mod:`cookbase.graph.compact`.
+
+Builds the CBRGraphs of the synthetic recipes of ``benchmarks/graph.py`` and prints,
+for each recipe, the size of its node-link JSON, of its stored document in both forms
+and of its binary encoding with and without compression, along with the median time
+taken to encode and decode it in each format, the binary one being also decoded into a
+CompactCBRGraph. No database is needed. Run from the repository root::
+
+    python benchmarks/serialization.py [-n RUNS] [-l LINES] [-o OUTPUT_PATH] [SIZE ...]
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+from typing import Dict, List
+
+import bson
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from cookbase.db.handler import (  # noqa: E402
+    cbrgraph_document,
+    cbrgraph_from_document,
+)
+from cookbase.graph.cbrgraph import CBRGraph  # noqa: E402
+from cookbase.graph.compact import CompactCBRGraph  # noqa: E402
+from graph import synthetic_cbr, timed  # noqa: E402
+
+DEFAULT_SIZES = [100, 1000, 5000]
+
+
+def run(sizes: List[int], runs: int, lines: int = 8) -> Dict[int, Dict[str, float]]:
+    """Measures the sizes and the encoding and decoding times of the CBRGraphs of
+    synthetic recipes in each format.
+
+    :param sizes: The approximate numbers of processes of the recipes
+    :type sizes: list[int]
+    :param int runs: The number of measurements taken per operation
+    :param int lines: The number of parallel production lines of the recipes,
+      defaults to :const:`8`
+    :return: A dictionary mapping each size into the size of each format, in KiB, and
+      the median time of each operation, in milliseconds
+    :rtype: dict[int, dict[str, float]]
+    """
+    results = {}
+
+    for size in sizes:
+        graph = CBRGraph()
+        graph.build_graph(synthetic_cbr(size, lines))
+        cbr_id = bson.ObjectId()
+        node_link = json.dumps(graph.get_serializable_graph()).encode()
+        raw = graph.to_bytes(compress=False)
+        compressed = graph.to_bytes()
+        node_link_doc = bson.BSON.encode(cbrgraph_document(graph, cbr_id))
+        binary_doc = bson.BSON.encode(cbrgraph_document(graph, cbr_id, binary=True))
+
+        results[size] = {
+            "node_link_json_kib": len(node_link) / 1024,
+            "node_link_bson_kib": len(node_link_doc) / 1024,
+            "binary_kib": len(raw) / 1024,
+            "binary_zlib_kib": len(compressed) / 1024,
+            "binary_bson_kib": len(binary_doc) / 1024,
+            "node_link_json_encode_ms": timed(
+                lambda: json.dumps(graph.get_serializable_graph()), runs
+            ),
+            "node_link_json_decode_ms": timed(
+                lambda: CBRGraph.from_serializable_graph(json.loads(node_link)), runs
+            ),
+            "node_link_bson_decode_ms": timed(
+                lambda: cbrgraph_from_document(bson.BSON(node_link_doc).decode()),
+                runs,
+            ),
+            "binary_encode_ms": timed(lambda: graph.to_bytes(compress=False), runs),
+            "binary_decode_ms": timed(lambda: CBRGraph.from_bytes(raw), runs),
+            "binary_decode_compact_ms": timed(
+                lambda: CompactCBRGraph.from_bytes(raw), runs
+            ),
+            "binary_zlib_encode_ms": timed(graph.to_bytes, runs),
+            "binary_zlib_decode_ms": timed(
+                lambda: CBRGraph.from_bytes(compressed), runs
+            ),
+            "binary_bson_decode_ms": timed(
+                lambda: cbrgraph_from_document(bson.BSON(binary_doc).decode()), runs
+            ),
+            "binary_bson_decode_compact_ms": timed(
+                lambda: cbrgraph_from_document(
+                    bson.BSON(binary_doc).decode(), compact=True
+                ),
+                runs,
+            ),
+        }
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("sizes", nargs="*", type=int, default=DEFAULT_SIZES)
+    parser.add_argument("-n", "--runs", type=int, default=5)
+    parser.add_argument("-l", "--lines", type=int, default=8)
+    parser.add_argument("-o", "--output", dest="output_path")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    results = run(args.sizes, args.runs, args.lines)
+
+    for size, r in results.items():
+        for measure, value in r.items():
+            print(f"{size:>8} {measure:<40} {value:>10.2f}")
+
+    if args.output_path:
+        with open(args.output_path, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
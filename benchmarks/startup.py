@@ -0,0 +1,90 @@
+"""Startup benchmark for the :mod:`cookbase` package.
+
+Records the cumulative import time reported by :code:`python -X importtime` for a set of
+:mod:`cookbase` modules, each one imported in a fresh interpreter, and prints the median
+over several runs. Run from the repository root::
+
+    python benchmarks/startup.py [-n RUNS] [-o OUTPUT_PATH] [MODULE ...]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+DEFAULT_MODULES = ["cookbase", "cookbase.validation.cbr", "cookbase.graph.cbrgraph"]
+
+
+def import_time(module: str) -> Dict[str, int]:
+    """Imports a module in a fresh interpreter and returns its import times.
+
+    :param str module: The name of the module to import
+    :return: A dictionary with the self and cumulative import times of the module, in
+      microseconds
+    :rtype: dict[str, int]
+
+    :raises RuntimeError: The module could not be imported
+    """
+    root_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+    p = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=root_dir,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+
+    if p.returncode != 0:
+        raise RuntimeError(f"importing '{module}' failed:\n{p.stderr}")
+
+    for line in p.stderr.splitlines():
+        if line.startswith("import time:") and line.rsplit("|", 1)[1].strip() == module:
+            self_us, cumulative_us, _ = line[len("import time:") :].split("|")
+            return {"self": int(self_us), "cumulative": int(cumulative_us)}
+
+    raise RuntimeError(f"no import time recorded for '{module}'")
+
+
+def run(modules: List[str], runs: int) -> Dict[str, Dict[str, float]]:
+    """Measures the import times of several modules.
+
+    :param modules: The names of the modules to import
+    :type modules: list[str]
+    :param int runs: The number of measurements taken per module
+    :return: A dictionary mapping each module into the median self and cumulative
+      import times, in milliseconds
+    :rtype: dict[str, dict[str, float]]
+    """
+    results = {}
+
+    for m in modules:
+        samples = [import_time(m) for _ in range(runs)]
+        results[m] = {
+            k: statistics.median(s[k] for s in samples) / 1000
+            for k in ("self", "cumulative")
+        }
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("-n", "--runs", type=int, default=5)
+    parser.add_argument("-o", "--output", dest="output_path")
+    args = parser.parse_args()
+
+    results = run(args.modules, args.runs)
+
+    for m, r in results.items():
+        print(f"{m:<40} {r['cumulative']:>10.1f} ms  (self {r['self']:.1f} ms)")
+
+    if args.output_path:
+        with open(args.output_path, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
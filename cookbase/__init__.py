@@ -8,7 +8,7 @@ Full documentation published on https://cookbase.readthedocs.io.
 :copyright: (c) 2019--2020 by Hernán Blanco.
 :license: GNU General Public License v3.0, see LICENSE for more details.
 """
-from cookbase import schema, utils
+import importlib
 
 __all__ = [
     "db",
@@ -20,3 +20,12 @@ __all__ = [
     "utils",
     "validation",
 ]
+
+
+def __getattr__(name):
+    """Imports the subpackages and modules of :mod:`cookbase` on first access, so that
+    importing the package alone does not load their dependencies."""
+    if name in __all__:
+        return importlib.import_module(f"{__name__}.{name}")
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,10 +1,16 @@
 """Module that parses the command-line arguments."""
 import argparse
 
-import cookbase
 from cookbase.utils import _HelpAction
 
 
+def _run_schema_builder(args):
+    """Run the Cookbase Schema Builder, importing it only when requested."""
+    from cookbase.schema import builder
+
+    builder.main(args)
+
+
 def parse_cli():
     """Parse the arguments provided for the package execution."""
     parser = argparse.ArgumentParser(
@@ -24,7 +30,7 @@ def parse_cli():
         dest="config_path",
         help="path to the custom configuration file",
     )
-    parser_builder.set_defaults(func=cookbase.schema.builder.main)
+    parser_builder.set_defaults(func=_run_schema_builder)
 
     args = parser.parse_args()
     args.func(args)
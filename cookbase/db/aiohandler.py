@@ -0,0 +1,553 @@
+"""An :mod:`asyncio` counterpart of :mod:`cookbase.db.handler`.
+
+:class:`AsyncDBHandler` works on any database object exposing the asynchronous
+collection interface of `Motor <https://motor.readthedocs.io/>`_, which is used by
+default to connect to MongoDB. Motor is an optional dependency, installed with the
+:code:`async` extra of the package.
+"""
+
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+import pymongo
+from bson.objectid import ObjectId
+from cookbase.db.cache import CacheInfo, DocumentCache, cached, cached_many
+from cookbase.db.exceptions import (
+    BulkCBRInsertionError,
+    CBRGraphInsertionError,
+    CBRInsertionError,
+    DBClientConnectionError,
+)
+from cookbase.db.handler import (
+    CBRGRAPH_PROJECTION,
+    InsertCBRResult,
+    InvalidationListener,
+    bulk_cbrgraph_documents,
+    bulk_insert_results,
+    bulk_write_failures,
+    cbrgraph_document,
+    cbrgraph_from_document,
+    chunked,
+    read_mongodb_url,
+)
+from cookbase.db.utils import deunderscore_id, projection
+from cookbase.graph.cbrgraph import CBRGraph
+from cookbase.graph.compact import CompactCBRGraph
+from cookbase.metrics import query_timer, timed_query
+
+
+class AsyncDBHandler:
+    """A class that handles an asynchronous connection to the database in order to
+    store and retrieve the different :doc:`Cookbase Data Model (CBDM) <cbdm>` elements
+    without blocking the event loop.
+
+    Its methods mirror those of :class:`cookbase.db.handler.DBHandler`, as coroutines.
+
+    :param database: The asynchronous database object, such as a
+      :class:`motor.motor_asyncio.AsyncIOMotorDatabase`
+    :type database: Any
+    :param int cache_size: Maximum number of :ref:`CBI <cbi>`, :ref:`CBA <cba>` and
+      :ref:`CBP <cbp>` documents held in an in-process cache, defaults to :const:`0`
+      (no cache)
+    :param cache_ttl: Seconds a cached document is held before being requested again,
+      defaults to :const:`None` (no expiration)
+    :type cache_ttl: float, optional
+    :param binary_graphs: A flag indicating whether the inserted :doc:`CBRGraphs
+      <cbrg>` are stored in binary form, as in
+      :class:`cookbase.db.handler.DBHandler`, defaults to :const:`False`
+    :type binary_graphs: bool, optional
+
+    :ivar _db: The asynchronous database object
+    :vartype _db: Any
+    :ivar cache: The catalogue documents cache, or :const:`None` if disabled
+    :vartype cache: cookbase.db.cache.DocumentCache or None
+    :ivar bool binary_graphs: Whether the inserted :doc:`CBRGraphs <cbrg>` are stored
+      in binary form
+    :ivar int catalogue_version: A counter increased by every call to
+      :meth:`invalidate_cache`, identifying the state of the catalogue seen by the
+      handler in this process
+    :ivar _invalidation_listeners: The callables notified by :meth:`invalidate_cache`
+    :vartype _invalidation_listeners: list[InvalidationListener]
+    """
+
+    def __init__(
+        self,
+        database: Any,
+        cache_size: int = 0,
+        cache_ttl: Optional[float] = None,
+        binary_graphs: bool = False,
+    ):
+        """Constructor method."""
+        self._db: Any = database
+        self.cache: Optional[DocumentCache] = (
+            DocumentCache(cache_size, cache_ttl) if cache_size > 0 else None
+        )
+        self.binary_graphs: bool = binary_graphs
+        self.catalogue_version: int = 0
+        self._invalidation_listeners: List[InvalidationListener] = []
+
+    @classmethod
+    def from_url(
+        cls,
+        mongodb_url: str,
+        db_name: str = "cookbase",
+        cache_size: int = 0,
+        cache_ttl: Optional[float] = None,
+        binary_graphs: bool = False,
+    ) -> "AsyncDBHandler":
+        """Creates a handler connected to MongoDB through Motor.
+
+        :param str mongodb_url: A `MongoDB connection URI
+          <https://docs.mongodb.com/manual/reference/connection-string/>`_
+        :param str db_name: The name of the database to connect to, defaults to
+          :const:`'cookbase'`
+        :param int cache_size: Maximum number of catalogue documents held in the
+          handler's cache, defaults to :const:`0` (no cache)
+        :param cache_ttl: Seconds a cached document is held before expiring, defaults
+          to :const:`None` (no expiration)
+        :type cache_ttl: float, optional
+        :param binary_graphs: A flag indicating whether the inserted :doc:`CBRGraphs
+          <cbrg>` are stored in binary form, defaults to :const:`False`
+        :type binary_graphs: bool, optional
+        :return: The database handler
+        :rtype: AsyncDBHandler
+
+        :raises ImportError: Motor is not installed
+        :raises DBClientConnectionError: The database client could not be created
+        """
+        import uritools
+        from motor.motor_asyncio import AsyncIOMotorClient
+
+        try:
+            client = AsyncIOMotorClient(uritools.urijoin(mongodb_url, db_name))
+        except pymongo.errors.PyMongoError as e:
+            raise DBClientConnectionError(f"mongodb:{db_name}") from e
+
+        return cls(client[db_name], cache_size, cache_ttl, binary_graphs)
+
+    @cached("cbi")
+    @timed_query("cbi")
+    async def get_cbi(
+        self, cbi_id: int, fields: Optional[Iterable[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Retrieves a :ref:`Cookbase Ingredient (CBI) <cbi>` from database.
+
+        :param int cbi_id: :ref:`CBI <cbi>` identifier
+        :param fields: The dot-separated paths of the only fields to be retrieved
+          besides the identifier, defaults to :const:`None` (all fields)
+        :type fields: Iterable[str], optional
+        :return: The requested :ref:`CBI <cbi>`
+        :rtype: dict[str, Any]
+        """
+        return deunderscore_id(await self._db.cbi.find_one(cbi_id, projection(fields)))
+
+    @cached("cba")
+    @timed_query("cba")
+    async def get_cba(
+        self, cba_id: int, fields: Optional[Iterable[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Retrieves a :ref:`Cookbase Appliance (CBA) <cba>` from database.
+
+        :param int cba_id: :ref:`CBA <cba>` identifier
+        :param fields: The dot-separated paths of the only fields to be retrieved
+          besides the identifier, defaults to :const:`None` (all fields)
+        :type fields: Iterable[str], optional
+        :return: The requested :ref:`CBA <cba>`
+        :rtype: dict[str, Any]
+        """
+        return deunderscore_id(await self._db.cba.find_one(cba_id, projection(fields)))
+
+    @cached("cbp")
+    @timed_query("cbp")
+    async def get_cbp(
+        self, cbp_id: int, fields: Optional[Iterable[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Retrieves a :ref:`Cookbase Process (CBP) <cbp>` from database.
+
+        :param int cbp_id: :ref:`CBP <cbp>` identifier
+        :param fields: The dot-separated paths of the only fields to be retrieved
+          besides the identifier, defaults to :const:`None` (all fields)
+        :type fields: Iterable[str], optional
+        :return: The requested :ref:`CBP <cbp>`
+        :rtype: dict[str, Any]
+        """
+        return deunderscore_id(await self._db.cbp.find_one(cbp_id, projection(fields)))
+
+    @cached_many("cbi")
+    @timed_query("cbi")
+    async def get_cbis(
+        self, cbi_ids: Iterable[int], fields: Optional[Iterable[str]] = None
+    ) -> Dict[int, Dict[str, Any]]:
+        """Retrieves a set of :ref:`Cookbase Ingredients (CBIs) <cbi>` from database in a
+        single query.
+
+        :param cbi_ids: :ref:`CBI <cbi>` identifiers
+        :type cbi_ids: Iterable[int]
+        :param fields: The dot-separated paths of the only fields to be retrieved
+          besides the identifier, defaults to :const:`None` (all fields)
+        :type fields: Iterable[str], optional
+        :return: A dictionary mapping the identifier of each :ref:`CBI <cbi>` found into
+          the :ref:`CBI <cbi>` itself
+        :rtype: dict[int, dict[str, Any]]
+        """
+        return await self._find_many(self._db.cbi, cbi_ids, fields)
+
+    @cached_many("cba")
+    @timed_query("cba")
+    async def get_cbas(
+        self, cba_ids: Iterable[int], fields: Optional[Iterable[str]] = None
+    ) -> Dict[int, Dict[str, Any]]:
+        """Retrieves a set of :ref:`Cookbase Appliances (CBAs) <cba>` from database in a
+        single query.
+
+        :param cba_ids: :ref:`CBA <cba>` identifiers
+        :type cba_ids: Iterable[int]
+        :param fields: The dot-separated paths of the only fields to be retrieved
+          besides the identifier, defaults to :const:`None` (all fields)
+        :type fields: Iterable[str], optional
+        :return: A dictionary mapping the identifier of each :ref:`CBA <cba>` found into
+          the :ref:`CBA <cba>` itself
+        :rtype: dict[int, dict[str, Any]]
+        """
+        return await self._find_many(self._db.cba, cba_ids, fields)
+
+    @cached_many("cbp")
+    @timed_query("cbp")
+    async def get_cbps(
+        self, cbp_ids: Iterable[int], fields: Optional[Iterable[str]] = None
+    ) -> Dict[int, Dict[str, Any]]:
+        """Retrieves a set of :ref:`Cookbase Processes (CBPs) <cbp>` from database in a
+        single query.
+
+        :param cbp_ids: :ref:`CBP <cbp>` identifiers
+        :type cbp_ids: Iterable[int]
+        :param fields: The dot-separated paths of the only fields to be retrieved
+          besides the identifier, defaults to :const:`None` (all fields)
+        :type fields: Iterable[str], optional
+        :return: A dictionary mapping the identifier of each :ref:`CBP <cbp>` found into
+          the :ref:`CBP <cbp>` itself
+        :rtype: dict[int, dict[str, Any]]
+        """
+        return await self._find_many(self._db.cbp, cbp_ids, fields)
+
+    async def iter_cbas(
+        self, fields: Optional[Iterable[str]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterates over all the :ref:`Cookbase Appliances (CBAs) <cba>` in database.
+
+        :param fields: The dot-separated paths of the only fields to be retrieved
+          besides the identifier, defaults to :const:`None` (all fields)
+        :type fields: Iterable[str], optional
+        :return: An asynchronous iterator over the :ref:`CBAs <cba>`
+        :rtype: AsyncIterator[dict[str, Any]]
+        """
+        async for doc in self._db.cba.find(projection=projection(fields)):
+            yield deunderscore_id(doc)
+
+    @staticmethod
+    async def _find_many(
+        collection: Any,
+        ids: Iterable[Hashable],
+        fields: Optional[Iterable[str]] = None,
+    ) -> Dict[Hashable, Dict[str, Any]]:
+        """Retrieves the documents of a collection matching any of the given identifiers
+        through a single :code:`$in` query.
+
+        :param collection: The database collection to query
+        :type collection: motor.motor_asyncio.AsyncIOMotorCollection
+        :param ids: The document identifiers
+        :type ids: Iterable[Hashable]
+        :param fields: The dot-separated paths of the only fields to be retrieved
+          besides the identifier, defaults to :const:`None` (all fields)
+        :type fields: Iterable[str], optional
+        :return: A dictionary mapping the identifier of each document found into the
+          document itself
+        :rtype: dict[Hashable, dict[str, Any]]
+        """
+        ids = list(set(ids))
+
+        if not ids:
+            return {}
+
+        cursor = collection.find({"_id": {"$in": ids}}, projection(fields))
+        docs = await cursor.to_list(None)
+        return {d["id"]: d for d in map(deunderscore_id, docs)}
+
+    @timed_query("cbr")
+    async def get_cbr(self, query: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Retrieves a :ref:`CBR <cbr>` from database.
+
+        :param query: A dictionary specifying the query
+        :type query: dict[str, Any]
+        :return: The requested :ref:`CBR <cbr>`
+        :rtype: dict[str, Any]
+        """
+        return deunderscore_id(await self._db.cbr.find_one(query))
+
+    @timed_query("cbrgraphs")
+    async def get_cbrgraph(
+        self, cbr_id: Any, compact: bool = False
+    ) -> Optional[Union[CBRGraph, CompactCBRGraph]]:
+        """Retrieves the stored :doc:`CBRGraph <cbrg>` of a :ref:`CBR <cbr>` from
+        database, as in :meth:`cookbase.db.handler.DBHandler.get_cbrgraph`.
+
+        :param cbr_id: The database identifier of the :ref:`CBR <cbr>`
+        :type cbr_id: ObjectId or str
+        :param compact: A flag indicating whether the graph is returned as a
+          :class:`cookbase.graph.compact.CompactCBRGraph`, defaults to :const:`False`
+        :type compact: bool, optional
+        :return: The requested :doc:`CBRGraph <cbrg>`, or :const:`None` if not found
+        :rtype: CBRGraph or cookbase.graph.compact.CompactCBRGraph or None
+        """
+        doc = await self._db.cbrgraphs.find_one(
+            {"_id": ObjectId(str(cbr_id))}, CBRGRAPH_PROJECTION
+        )
+        return cbrgraph_from_document(doc, compact) if doc is not None else None
+
+    async def iter_cbrgraphs(
+        self,
+        query: Optional[Dict[str, Any]] = None,
+        batch_size: int = 1000,
+        compact: bool = False,
+    ) -> AsyncIterator[Union[CBRGraph, CompactCBRGraph]]:
+        """Iterates over the stored :doc:`CBRGraphs <cbrg>` matching a query, as in
+        :meth:`cookbase.db.handler.DBHandler.iter_cbrgraphs`.
+
+        :param query: A dictionary specifying the query on the :code:`cbrgraphs`
+          collection, defaults to :const:`None` (every stored graph)
+        :type query: dict[str, Any], optional
+        :param int batch_size: The number of documents requested to the database in
+          each round trip, defaults to :const:`1000`
+        :param compact: A flag indicating whether the graphs are returned as
+          :class:`cookbase.graph.compact.CompactCBRGraph` objects, defaults to
+          :const:`False`
+        :type compact: bool, optional
+        :return: An asynchronous iterator over the :doc:`CBRGraphs <cbrg>`
+        :rtype: AsyncIterator[CBRGraph or cookbase.graph.compact.CompactCBRGraph]
+        """
+        cursor = self._db.cbrgraphs.find(
+            query or {}, CBRGRAPH_PROJECTION, batch_size=batch_size
+        )
+
+        async for doc in cursor:
+            yield cbrgraph_from_document(doc, compact)
+
+    async def insert_cbr(
+        self, cbr: Dict[str, Any], cbrgraph: Optional[CBRGraph] = None
+    ) -> InsertCBRResult:
+        """Inserts a :ref:`CBR <cbr>` into database with its :doc:`CBRGraph <cbrg>` (if
+        given).
+
+        :param cbr: A dictionary representing the :ref:`CBR <cbr>`
+        :type cbr: dict[str, Any]
+        :param cbrgraph: The :doc:`CBRGraph <cbrg>` of the :ref:`CBR <cbr>`
+        :type cbrgraph: CBRGraph, optional
+        :return: A :class:`cookbase.db.handler.InsertCBRResult` object holding the
+          insertion results.
+        :rtype: cookbase.db.handler.InsertCBRResult
+
+        :raises CBRInsertionError: The :ref:`CBR <cbr>` could not be stored
+        :raises CBRGraphInsertionError: The :doc:`CBRGraph <cbrg>` could not be stored
+        :raises pymongo.errors.PyMongoError: Database error produced during insertion
+        """
+        with query_timer("cbr"):
+            r_cbr = await self._db.cbr.insert_one(cbr)
+
+        if not r_cbr.acknowledged:
+            raise CBRInsertionError(InsertCBRResult())
+        elif not cbrgraph:
+            return InsertCBRResult(cbr_id=r_cbr.inserted_id)
+
+        graph_doc = cbrgraph_document(cbrgraph, r_cbr.inserted_id, self.binary_graphs)
+
+        with query_timer("cbrgraphs"):
+            r_graph = await self._db.cbrgraphs.insert_one(graph_doc)
+
+        if not r_graph.acknowledged:
+            raise CBRGraphInsertionError(InsertCBRResult(cbr_id=r_cbr.inserted_id))
+
+        return InsertCBRResult(
+            cbr_id=r_cbr.inserted_id, cbrgraph_id=r_graph.inserted_id
+        )
+
+    async def insert_cbrs(
+        self,
+        items: Iterable[Tuple[Dict[str, Any], Optional[CBRGraph]]],
+        chunk_size: int = 1000,
+    ) -> List[InsertCBRResult]:
+        """Inserts several :ref:`CBRs <cbr>` into database with their :doc:`CBRGraphs
+        <cbrg>` (if given), in chunks of unordered :code:`insert_many` operations, as
+        in :meth:`cookbase.db.handler.DBHandler.insert_cbrs`.
+
+        :param items: 2-tuples of a dictionary representing a :ref:`CBR <cbr>` and its
+          :doc:`CBRGraph <cbrg>`, or :const:`None`
+        :type items: Iterable[tuple[dict[str, Any], CBRGraph or None]]
+        :param int chunk_size: The maximum number of documents inserted into each
+          collection at once, defaults to :const:`1000`
+        :return: A :class:`cookbase.db.handler.InsertCBRResult` object holding the
+          insertion results of each item, in order
+        :rtype: list[cookbase.db.handler.InsertCBRResult]
+
+        :raises BulkCBRInsertionError: Some :ref:`CBRs <cbr>` or :doc:`CBRGraphs
+          <cbrg>` could not be stored
+        :raises pymongo.errors.PyMongoError: Database error produced during insertion
+        """
+        results = []
+        errors = {}
+
+        for chunk in chunked(items, chunk_size):
+            cbrs = [cbr for cbr, _ in chunk]
+
+            for cbr in cbrs:
+                cbr.setdefault("_id", ObjectId())
+
+            failed_cbrs = await self._insert_many(self._db.cbr, cbrs)
+            graph_docs, graph_positions = bulk_cbrgraph_documents(
+                chunk, failed_cbrs, self.binary_graphs
+            )
+            failed_graphs = await self._insert_many(self._db.cbrgraphs, graph_docs)
+            results.extend(
+                bulk_insert_results(
+                    chunk,
+                    failed_cbrs,
+                    graph_positions,
+                    failed_graphs,
+                    errors,
+                    len(results),
+                )
+            )
+
+        if errors:
+            raise BulkCBRInsertionError(results, errors)
+
+        return results
+
+    async def _insert_many(
+        self, collection: Any, docs: List[Dict[str, Any]]
+    ) -> Set[int]:
+        """Inserts some documents into a collection with an unordered
+        :code:`insert_many`.
+
+        :param collection: The asynchronous collection
+        :type collection: Any
+        :param docs: The documents
+        :type docs: list[dict[str, Any]]
+        :return: The positions of the documents that could not be stored
+        :rtype: set[int]
+        """
+        if not docs:
+            return set()
+
+        try:
+            with query_timer(collection.name):
+                r = await collection.insert_many(docs, ordered=False)
+        except pymongo.errors.BulkWriteError as e:
+            return bulk_write_failures(e)
+
+        return set() if r.acknowledged else set(range(len(docs)))
+
+    def invalidate_cache(
+        self, collection: Optional[str] = None, doc_id: Optional[Hashable] = None
+    ) -> None:
+        """Removes documents from the catalogue documents cache, increases
+        :attr:`catalogue_version` and notifies the invalidation listeners, as in
+        :meth:`cookbase.db.handler.DBHandler.invalidate_cache`.
+
+        :param collection: The collection whose documents are removed, defaults to
+          :const:`None` (all collections)
+        :type collection: str, optional
+        :param doc_id: The identifier of the only document to remove from
+          `collection`, defaults to :const:`None` (all documents)
+        :type doc_id: Hashable, optional
+        """
+        self.catalogue_version += 1
+
+        if self.cache is not None:
+            self.cache.invalidate(collection, doc_id)
+
+        for listener in list(self._invalidation_listeners):
+            listener(collection, doc_id)
+
+    def add_invalidation_listener(self, listener: InvalidationListener) -> None:
+        """Registers a callable notified by :meth:`invalidate_cache`, as in
+        :meth:`cookbase.db.handler.DBHandler.add_invalidation_listener`.
+
+        :param listener: The callable to be notified
+        :type listener: InvalidationListener
+        """
+        self._invalidation_listeners.append(listener)
+
+    def remove_invalidation_listener(self, listener: InvalidationListener) -> None:
+        """Unregisters a callable registered by :meth:`add_invalidation_listener`, as
+        in :meth:`cookbase.db.handler.DBHandler.remove_invalidation_listener`.
+
+        :param listener: The callable no longer to be notified
+        :type listener: InvalidationListener
+        """
+        if listener in self._invalidation_listeners:
+            self._invalidation_listeners.remove(listener)
+
+    def cache_info(self) -> Optional[CacheInfo]:
+        """Returns the statistics of the catalogue documents cache.
+
+        :return: The cache statistics, or :const:`None` if the cache is disabled
+        :rtype: cookbase.db.cache.CacheInfo or None
+        """
+        return self.cache.info() if self.cache is not None else None
+
+
+def get_async_handler(
+    credentials_path: Optional[str] = None,
+    force_new_instance: bool = False,
+    cache_size: int = 0,
+    cache_ttl: Optional[float] = None,
+    binary_graphs: bool = False,
+) -> AsyncDBHandler:
+    """Provides the asynchronous database handler instance.
+
+    The first time this function is called (or if the `force_new_instance` flag is set
+    to :const:`True`) an :class:`AsyncDBHandler` connected through Motor is created
+    according to the credentials provided in the file located at `credentials_path`, as
+    in :func:`cookbase.db.handler.get_handler`; afterwards, the already available
+    instance is returned, disregarding the arguments.
+
+    :param credentials_path: Path to the file containing the connection credentials
+    :type credentials_path: str or None, optional
+    :param force_new_instance: A flag indicating whether a new database handler
+      instance must be initialized, defaults to :const:`False`
+    :type force_new_instance: bool, optional
+    :param int cache_size: Maximum number of catalogue documents held in the handler's
+      cache, defaults to :const:`0` (no cache)
+    :param cache_ttl: Seconds a cached document is held before expiring, defaults to
+      :const:`None` (no expiration)
+    :type cache_ttl: float, optional
+    :param binary_graphs: A flag indicating whether the inserted :doc:`CBRGraphs
+      <cbrg>` are stored in binary form, defaults to :const:`False`
+    :type binary_graphs: bool, optional
+    :return: An :class:`AsyncDBHandler` instance connected to the default database
+    :rtype: AsyncDBHandler
+    """
+    global _async_db_handler
+
+    if _async_db_handler is None or force_new_instance:
+        _async_db_handler = AsyncDBHandler.from_url(
+            read_mongodb_url(credentials_path),
+            cache_size=cache_size,
+            cache_ttl=cache_ttl,
+            binary_graphs=binary_graphs,
+        )
+
+    return _async_db_handler
+
+
+_async_db_handler = None
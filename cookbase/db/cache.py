@@ -0,0 +1,325 @@
+"""An in-process cache for the :doc:`Cookbase Data Model (CBDM) <cbdm>` catalogue
+documents (:ref:`CBIs <cbi>`, :ref:`CBAs <cba>` and :ref:`CBPs <cbp>`) retrieved by
+:class:`cookbase.db.handler.DBHandler`."""
+import copy
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from attr import attrib, attrs
+from cookbase.db.utils import covers_fields, normalize_fields, project
+
+
+@attrs
+class CacheInfo:
+    """A class containing the statistics of a :class:`DocumentCache`.
+
+    :param int hits: Number of lookups served from the cache
+    :param int misses: Number of lookups not found (or expired) in the cache
+    :param int size: Number of documents currently held
+    :param int maxsize: Maximum number of documents held
+    :param ttl: Seconds a document is held before expiring, or :const:`None` if
+      documents do not expire
+    :type ttl: float, optional
+
+    """
+
+    hits: int = attrib()
+    misses: int = attrib()
+    size: int = attrib()
+    maxsize: int = attrib()
+    ttl: Optional[float] = attrib(default=None)
+
+
+class DocumentCache:
+    """A size-bounded, least-recently-used cache of database documents whose entries
+    expire after a given time-to-live.
+
+    Documents are keyed by their collection name and identifier. The cache keeps its
+    own copy of each document and hands out copies of it, so callers are free to
+    modify the documents they receive.
+
+    A document may be held with only some of its fields, as retrieved through a
+    projection, in which case it only serves the lookups requesting a subset of them. A
+    held document is never replaced by a copy of it holding a subset of its fields, so
+    the narrower lookups keep being served from the wider copy.
+
+    :param int maxsize: Maximum number of documents held, defaults to :const:`1024`
+    :param ttl: Seconds a document is held before expiring, defaults to :const:`None`
+      (no expiration)
+    :type ttl: float, optional
+    :param timer: Function returning the current time in seconds, defaults to
+      :func:`time.monotonic`
+    :type timer: Callable[[], float], optional
+
+    :ivar int hits: Number of lookups served from the cache
+    :ivar int misses: Number of lookups not found (or expired) in the cache
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: Optional[float] = None,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        """Constructor method."""
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._timer = timer
+        self._entries: Dict[
+            Tuple[str, Hashable], Tuple[float, Any, Optional[Tuple[str, ...]]]
+        ] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self,
+        collection: str,
+        doc_id: Hashable,
+        fields: Optional[Iterable[str]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Retrieves a copy of a cached document.
+
+        :param str collection: The collection name
+        :param Hashable doc_id: The document identifier
+        :param fields: The dot-separated paths of the only fields requested besides the
+          identifier, defaults to :const:`None` (all fields)
+        :type fields: Iterable[str], optional
+        :return: A copy of the requested fields of the document, or :const:`None` if it
+          is not cached, has expired or is not held with all the requested fields
+        :rtype: dict[str, Any] or None
+        """
+        key = (collection, doc_id)
+
+        with self._lock:
+            try:
+                expires_at, doc, held = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return None
+
+            if not covers_fields(fields, held):
+                self.misses += 1
+                return None
+
+            if expires_at <= self._timer():
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        return project(doc, fields)
+
+    def put(
+        self,
+        collection: str,
+        doc_id: Hashable,
+        doc: Dict[str, Any],
+        fields: Optional[Iterable[str]] = None,
+    ) -> None:
+        """Stores a copy of a document, evicting the least recently used document if the
+        cache is full, unless it is already held with all the fields of `doc`.
+
+        :param str collection: The collection name
+        :param Hashable doc_id: The document identifier
+        :param doc: The document
+        :type doc: dict[str, Any]
+        :param fields: The dot-separated paths of the only fields `doc` was retrieved
+          with besides the identifier, defaults to :const:`None` (all fields)
+        :type fields: Iterable[str], optional
+        """
+        expires_at = self._timer() + self.ttl if self.ttl is not None else float("inf")
+        doc = copy.deepcopy(doc)
+        fields = normalize_fields(fields)
+
+        key = (collection, doc_id)
+
+        with self._lock:
+            held = self._entries.get(key)
+
+            if (
+                held is None
+                or held[0] <= self._timer()
+                or not covers_fields(fields, held[2])
+            ):
+                self._entries[key] = (expires_at, doc, fields)
+
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(
+        self, collection: Optional[str] = None, doc_id: Optional[Hashable] = None
+    ) -> None:
+        """Removes documents from the cache.
+
+        :param collection: The collection whose documents are removed, defaults to
+          :const:`None` (all collections)
+        :type collection: str, optional
+        :param doc_id: The identifier of the only document to remove from
+          `collection`, defaults to :const:`None` (all documents)
+        :type doc_id: Hashable, optional
+        """
+        with self._lock:
+            if collection is None:
+                self._entries.clear()
+            elif doc_id is not None:
+                self._entries.pop((collection, doc_id), None)
+            else:
+                for key in [k for k in self._entries if k[0] == collection]:
+                    del self._entries[key]
+
+    def info(self) -> CacheInfo:
+        """Returns the cache statistics.
+
+        :return: The cache statistics
+        :rtype: CacheInfo
+        """
+        with self._lock:
+            return CacheInfo(
+                self.hits, self.misses, len(self._entries), self.maxsize, self.ttl
+            )
+
+
+def cached(collection: str) -> Callable:
+    """Decorator function that serves a :class:`cookbase.db.handler.DBHandler` (or
+    :class:`cookbase.db.aiohandler.AsyncDBHandler`) single document getter from the
+    handler's :class:`DocumentCache`, if it has one.
+
+    The getter takes the document identifier and the fields to be retrieved, which are
+    normalized by :func:`cookbase.db.utils.normalize_fields` before calling it.
+
+    :param str collection: The name of the collection the getter reads from
+    """
+
+    def decorator(f: Callable):
+        if inspect.iscoroutinefunction(f):
+
+            @wraps(f)
+            async def async_wrapper(self, doc_id, fields=None):
+                fields = normalize_fields(fields)
+
+                if self.cache is None:
+                    return await f(self, doc_id, fields)
+
+                doc = self.cache.get(collection, doc_id, fields)
+
+                if doc is None:
+                    doc = await f(self, doc_id, fields)
+
+                    if doc is not None:
+                        self.cache.put(collection, doc_id, doc, fields)
+
+                return doc
+
+            return async_wrapper
+
+        @wraps(f)
+        def wrapper(self, doc_id, fields=None):
+            fields = normalize_fields(fields)
+
+            if self.cache is None:
+                return f(self, doc_id, fields)
+
+            doc = self.cache.get(collection, doc_id, fields)
+
+            if doc is None:
+                doc = f(self, doc_id, fields)
+
+                if doc is not None:
+                    self.cache.put(collection, doc_id, doc, fields)
+
+            return doc
+
+        return wrapper
+
+    return decorator
+
+
+def cached_many(collection: str) -> Callable:
+    """Decorator function that serves a :class:`cookbase.db.handler.DBHandler` (or
+    :class:`cookbase.db.aiohandler.AsyncDBHandler`) bulk document getter from the
+    handler's :class:`DocumentCache`, if it has one, so that only the documents not
+    cached are requested.
+
+    The getter takes the document identifiers and the fields to be retrieved, which are
+    normalized by :func:`cookbase.db.utils.normalize_fields` before calling it.
+
+    :param str collection: The name of the collection the getter reads from
+    """
+
+    def lookup(
+        cache: DocumentCache,
+        doc_ids: Iterable[Hashable],
+        fields: Optional[Tuple[str, ...]],
+    ):
+        docs = {}
+        missing = []
+
+        for doc_id in set(doc_ids):
+            doc = cache.get(collection, doc_id, fields)
+
+            if doc is None:
+                missing.append(doc_id)
+            else:
+                docs[doc_id] = doc
+
+        return docs, missing
+
+    def update(
+        cache: DocumentCache,
+        docs: Dict[Hashable, Any],
+        found: Dict[Hashable, Any],
+        fields: Optional[Tuple[str, ...]],
+    ):
+        for doc_id, doc in found.items():
+            cache.put(collection, doc_id, doc, fields)
+
+        docs.update(found)
+        return docs
+
+    def decorator(f: Callable):
+        if inspect.iscoroutinefunction(f):
+
+            @wraps(f)
+            async def async_wrapper(self, doc_ids: Iterable[Hashable], fields=None):
+                fields = normalize_fields(fields)
+
+                if self.cache is None:
+                    return await f(self, doc_ids, fields)
+
+                docs, missing = lookup(self.cache, doc_ids, fields)
+
+                if missing:
+                    found = await f(self, missing, fields)
+                    update(self.cache, docs, found, fields)
+
+                return docs
+
+            return async_wrapper
+
+        @wraps(f)
+        def wrapper(self, doc_ids: Iterable[Hashable], fields=None):
+            fields = normalize_fields(fields)
+
+            if self.cache is None:
+                return f(self, doc_ids, fields)
+
+            docs, missing = lookup(self.cache, doc_ids, fields)
+
+            if missing:
+                found = f(self, missing, fields)
+                update(self.cache, docs, found, fields)
+
+            return docs
+
+        return wrapper
+
+    return decorator
@@ -72,6 +72,31 @@ class CBRGraphInsertionError(InsertionError):
         return "Storing CBRGraph in database failed"
 
 
+class BulkCBRInsertionError(InsertionError):
+    """Raised when some of the insertions of a bulk CBR insertion resulted
+    unsuccessful, once every item has been attempted.
+
+    :ivar partial_result: The results of every item, in order, where the identifiers
+      of the unsuccessful insertions are :const:`None`
+    :vartype partial_result: list[cookbase.db.handler.InsertCBRResult]
+    :ivar errors: A dictionary mapping the position of each failing item into a
+      :class:`CBRInsertionError` or a :class:`CBRGraphInsertionError` holding its
+      partial result
+    :vartype errors: dict[int, InsertionError]
+
+    """
+
+    def __init__(self, partial_result, errors):
+        self.partial_result = partial_result
+        self.errors = errors
+
+    def __str__(self):
+        return (
+            f"Storing {len(self.errors)} of {len(self.partial_result)} CBRs in "
+            "database failed"
+        )
+
+
 class InvalidDBTypeError(DBHandlerException):
     """Raised when trying to use an invalid database type.
 
@@ -1,20 +1,39 @@
 import os
 import pathlib
-from typing import Any, Dict, Optional, Union
+import threading
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 import pymongo
 import uritools
 from attr import attrib, attrs
+from bson.binary import Binary
 from bson.objectid import ObjectId
+from cookbase.db.cache import CacheInfo, DocumentCache, cached, cached_many
 from cookbase.db.exceptions import (
+    BulkCBRInsertionError,
     CBRGraphInsertionError,
     CBRInsertionError,
     DBClientConnectionError,
     DBNotRegisteredError,
     InvalidDBTypeError,
 )
-from cookbase.db.utils import demongofy
+from cookbase.db.utils import demongofy, deunderscore_id, projection
 from cookbase.graph.cbrgraph import CBRGraph
+from cookbase.graph.compact import CompactCBRGraph
+from cookbase.metrics import query_timer, timed_query
 
 
 @attrs
@@ -36,6 +55,22 @@ class InsertCBRResult:
     cbrgraph_id: Optional[ObjectId] = attrib(default=None)
 
 
+#: The projection of the :code:`cbrgraphs` documents on the fields needed to rebuild a
+#: :doc:`CBRGraph <cbrg>`, either in node-link or in binary form
+CBRGRAPH_PROJECTION = {
+    "_id": False,
+    "graph": True,
+    "nodes": True,
+    "links": True,
+    "data": True,
+}
+
+#: A callable notified with the collection and the document identifier (each
+#: :const:`None` if all of them) whose documents are invalidated, as registered by
+#: :meth:`DBHandler.add_invalidation_listener`
+InvalidationListener = Callable[[Optional[str], Optional[Hashable]], None]
+
+
 class DBHandler:
     """A class that handles connections to database instances in order to store and
     retrieve the different :doc:`Cookbase Data Model (CBDM) <cbdm>` elements.
@@ -47,6 +82,17 @@ class DBHandler:
       :attr:`DBTypes.MONGODB`
     :param str db_name: The name of the database to connect to, defaults to
       :const:`'cookbase'`
+    :param int cache_size: Maximum number of :ref:`CBI <cbi>`, :ref:`CBA <cba>` and
+      :ref:`CBP <cbp>` documents held in an in-process cache, defaults to :const:`0`
+      (no cache)
+    :param cache_ttl: Seconds a cached document is held before being requested again,
+      defaults to :const:`None` (no expiration)
+    :type cache_ttl: float, optional
+    :param binary_graphs: A flag indicating whether the inserted :doc:`CBRGraphs
+      <cbrg>` are stored in the compact binary encoding of
+      :meth:`cookbase.graph.cbrgraph.CBRGraph.to_bytes` instead of as node-link
+      documents, defaults to :const:`False`
+    :type binary_graphs: bool, optional
 
     :raises DBClientConnectionError: The database connection could not be established
     :raises InvalidDBTypeError: The given database type is not registered as a valid
@@ -59,6 +105,15 @@ class DBHandler:
     :vartype _connections: dict[str, Any]
     :ivar _default_db: The default database client
     :vartype _default_db: Any
+    :ivar cache: The catalogue documents cache, or :const:`None` if disabled
+    :vartype cache: cookbase.db.cache.DocumentCache or None
+    :ivar bool binary_graphs: Whether the inserted :doc:`CBRGraphs <cbrg>` are stored
+      in binary form
+    :ivar int catalogue_version: A counter increased by every call to
+      :meth:`invalidate_cache`, identifying the state of the catalogue seen by the
+      handler in this process
+    :ivar _invalidation_listeners: The callables notified by :meth:`invalidate_cache`
+    :vartype _invalidation_listeners: list[InvalidationListener]
     """
 
     class DBTypes:
@@ -73,8 +128,26 @@ class DBHandler:
         mongodb_url: str,
         db_type: str = DBTypes.MONGODB,
         db_name: str = "cookbase",
+        cache_size: int = 0,
+        cache_ttl: Optional[float] = None,
+        binary_graphs: bool = False,
     ):
         """Constructor method."""
+        self._init_args: Dict[str, Any] = {
+            "mongodb_url": mongodb_url,
+            "db_type": db_type,
+            "db_name": db_name,
+            "cache_size": cache_size,
+            "cache_ttl": cache_ttl,
+            "binary_graphs": binary_graphs,
+        }
+        self.cache: Optional[DocumentCache] = (
+            DocumentCache(cache_size, cache_ttl) if cache_size > 0 else None
+        )
+        self.binary_graphs: bool = binary_graphs
+        self.catalogue_version: int = 0
+        self._invalidation_listeners: List[InvalidationListener] = []
+
         if db_type == self.DBTypes.MONGODB:
             self._default_db_id: str = f"{db_type}:{db_name}"
 
@@ -93,6 +166,16 @@ class DBHandler:
         else:
             raise InvalidDBTypeError(db_type)
 
+    @property
+    def init_args(self) -> Dict[str, Any]:
+        """The arguments the handler was constructed with, by name (with the current
+        value of :attr:`binary_graphs`), from which an equivalent handler can be
+        constructed, e.g. in another process.
+
+        :rtype: dict[str, Any]
+        """
+        return dict(self._init_args, binary_graphs=self.binary_graphs)
+
     def get_db_client(self, db_id: str = "mongodb:cookbase") -> Any:
         """Retrieves the requested database client.
 
@@ -116,36 +199,159 @@ class DBHandler:
         else:
             raise InvalidDBTypeError(db_type)
 
+    @cached("cbi")
+    @timed_query("cbi")
     @demongofy
-    def get_cbi(self, cbi_id: int) -> Dict[str, Any]:
+    def get_cbi(
+        self, cbi_id: int, fields: Optional[Iterable[str]] = None
+    ) -> Dict[str, Any]:
         """Retrieves a :ref:`Cookbase Ingredient (CBI) <cbi>` from database.
 
         :param int cbi_id: :ref:`CBI <cbi>` identifier
+        :param fields: The dot-separated paths of the only fields to be retrieved
+          besides the identifier, defaults to :const:`None` (all fields)
+        :type fields: Iterable[str], optional
         :return: The requested :ref:`CBI <cbi>`
         :rtype: dict[str, Any]
         """
-        return self._default_db.cbi.find_one(cbi_id)
+        return self._default_db.cbi.find_one(cbi_id, projection(fields))
 
+    @cached("cba")
+    @timed_query("cba")
     @demongofy
-    def get_cba(self, cba_id: int) -> Dict[str, Any]:
+    def get_cba(
+        self, cba_id: int, fields: Optional[Iterable[str]] = None
+    ) -> Dict[str, Any]:
         """Retrieves a :ref:`Cookbase Appliance (CBA) <cba>` from database.
 
         :param int cba_id: :ref:`CBA <cba>` identifier
+        :param fields: The dot-separated paths of the only fields to be retrieved
+          besides the identifier, defaults to :const:`None` (all fields)
+        :type fields: Iterable[str], optional
         :return: The requested :ref:`CBA <cba>`
         :rtype: dict[str, Any]
         """
-        return self._default_db.cba.find_one(cba_id)
+        return self._default_db.cba.find_one(cba_id, projection(fields))
 
+    @cached("cbp")
+    @timed_query("cbp")
     @demongofy
-    def get_cbp(self, cbp_id: int) -> Dict[str, Any]:
+    def get_cbp(
+        self, cbp_id: int, fields: Optional[Iterable[str]] = None
+    ) -> Dict[str, Any]:
         """Retrieves a :ref:`Cookbase Process (CBP) <cbp>` from database.
 
         :param int cbp_id: :ref:`CBP <cbp>` identifier
+        :param fields: The dot-separated paths of the only fields to be retrieved
+          besides the identifier, defaults to :const:`None` (all fields)
+        :type fields: Iterable[str], optional
         :return: The requested :ref:`CBP <cbp>`
         :rtype: dict[str, Any]
         """
-        return self._default_db.cbp.find_one(cbp_id)
+        return self._default_db.cbp.find_one(cbp_id, projection(fields))
+
+    @cached_many("cbi")
+    @timed_query("cbi")
+    def get_cbis(
+        self, cbi_ids: Iterable[int], fields: Optional[Iterable[str]] = None
+    ) -> Dict[int, Dict[str, Any]]:
+        """Retrieves a set of :ref:`Cookbase Ingredients (CBIs) <cbi>` from database in a
+        single query.
+
+        :param cbi_ids: :ref:`CBI <cbi>` identifiers
+        :type cbi_ids: Iterable[int]
+        :param fields: The dot-separated paths of the only fields to be retrieved
+          besides the identifier, defaults to :const:`None` (all fields)
+        :type fields: Iterable[str], optional
+        :return: A dictionary mapping the identifier of each :ref:`CBI <cbi>` found into
+          the :ref:`CBI <cbi>` itself
+        :rtype: dict[int, dict[str, Any]]
+        """
+        return self._find_many(self._default_db.cbi, cbi_ids, fields)
+
+    @cached_many("cba")
+    @timed_query("cba")
+    def get_cbas(
+        self, cba_ids: Iterable[int], fields: Optional[Iterable[str]] = None
+    ) -> Dict[int, Dict[str, Any]]:
+        """Retrieves a set of :ref:`Cookbase Appliances (CBAs) <cba>` from database in a
+        single query.
+
+        :param cba_ids: :ref:`CBA <cba>` identifiers
+        :type cba_ids: Iterable[int]
+        :param fields: The dot-separated paths of the only fields to be retrieved
+          besides the identifier, defaults to :const:`None` (all fields)
+        :type fields: Iterable[str], optional
+        :return: A dictionary mapping the identifier of each :ref:`CBA <cba>` found into
+          the :ref:`CBA <cba>` itself
+        :rtype: dict[int, dict[str, Any]]
+        """
+        return self._find_many(self._default_db.cba, cba_ids, fields)
+
+    @cached_many("cbp")
+    @timed_query("cbp")
+    def get_cbps(
+        self, cbp_ids: Iterable[int], fields: Optional[Iterable[str]] = None
+    ) -> Dict[int, Dict[str, Any]]:
+        """Retrieves a set of :ref:`Cookbase Processes (CBPs) <cbp>` from database in a
+        single query.
+
+        :param cbp_ids: :ref:`CBP <cbp>` identifiers
+        :type cbp_ids: Iterable[int]
+        :param fields: The dot-separated paths of the only fields to be retrieved
+          besides the identifier, defaults to :const:`None` (all fields)
+        :type fields: Iterable[str], optional
+        :return: A dictionary mapping the identifier of each :ref:`CBP <cbp>` found into
+          the :ref:`CBP <cbp>` itself
+        :rtype: dict[int, dict[str, Any]]
+        """
+        return self._find_many(self._default_db.cbp, cbp_ids, fields)
+
+    def iter_cbas(
+        self, fields: Optional[Iterable[str]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Iterates over all the :ref:`Cookbase Appliances (CBAs) <cba>` in database.
+
+        :param fields: The dot-separated paths of the only fields to be retrieved
+          besides the identifier, defaults to :const:`None` (all fields)
+        :type fields: Iterable[str], optional
+        :return: An iterator over the :ref:`CBAs <cba>`
+        :rtype: Iterator[dict[str, Any]]
+        """
+        return map(
+            deunderscore_id, self._default_db.cba.find(projection=projection(fields))
+        )
+
+    @staticmethod
+    def _find_many(
+        collection: Any,
+        ids: Iterable[Hashable],
+        fields: Optional[Iterable[str]] = None,
+    ) -> Dict[Hashable, Dict[str, Any]]:
+        """Retrieves the documents of a collection matching any of the given identifiers
+        through a single :code:`$in` query.
+
+        :param collection: The database collection to query
+        :type collection: pymongo.collection.Collection
+        :param ids: The document identifiers
+        :type ids: Iterable[Hashable]
+        :param fields: The dot-separated paths of the only fields to be retrieved
+          besides the identifier, defaults to :const:`None` (all fields)
+        :type fields: Iterable[str], optional
+        :return: A dictionary mapping the identifier of each document found into the
+          document itself
+        :rtype: dict[Hashable, dict[str, Any]]
+        """
+        ids = list(set(ids))
+
+        if not ids:
+            return {}
+
+        cursor = collection.find({"_id": {"$in": ids}}, projection(fields))
+        docs = map(deunderscore_id, cursor)
+        return {d["id"]: d for d in docs}
 
+    @timed_query("cbr")
     @demongofy
     def get_cbr(self, query: Dict[str, Any]) -> Dict[str, Any]:
         """Retrieves a :ref:`CBR <cbr>` from database.
@@ -157,6 +363,60 @@ class DBHandler:
         """
         return self._default_db.cbr.find_one(query)
 
+    @timed_query("cbrgraphs")
+    def get_cbrgraph(
+        self, cbr_id: Any, compact: bool = False
+    ) -> Optional[Union[CBRGraph, CompactCBRGraph]]:
+        """Retrieves the stored :doc:`CBRGraph <cbrg>` of a :ref:`CBR <cbr>` from
+        database, rebuilding it from its document without visiting the :ref:`CBR
+        <cbr>`. Both node-link and binary documents are read.
+
+        :param cbr_id: The database identifier of the :ref:`CBR <cbr>`, which its
+          :doc:`CBRGraph <cbrg>` shares
+        :type cbr_id: ObjectId or str
+        :param compact: A flag indicating whether the graph is returned as a
+          :class:`cookbase.graph.compact.CompactCBRGraph`, much faster to decode from a
+          binary document, defaults to :const:`False`
+        :type compact: bool, optional
+        :return: The requested :doc:`CBRGraph <cbrg>`, or :const:`None` if not found
+        :rtype: CBRGraph or cookbase.graph.compact.CompactCBRGraph or None
+        """
+        doc = self._default_db.cbrgraphs.find_one(
+            {"_id": ObjectId(str(cbr_id))}, CBRGRAPH_PROJECTION
+        )
+        return cbrgraph_from_document(doc, compact) if doc is not None else None
+
+    def iter_cbrgraphs(
+        self,
+        query: Optional[Dict[str, Any]] = None,
+        batch_size: int = 1000,
+        compact: bool = False,
+    ) -> Iterator[Union[CBRGraph, CompactCBRGraph]]:
+        """Iterates over the stored :doc:`CBRGraphs <cbrg>` matching a query, rebuilding
+        each of them from its document as the database cursor delivers them.
+
+        Only the fields of :data:`CBRGRAPH_PROJECTION` are transferred, so the stored
+        :ref:`CBRs <cbr>` are never read. The identifier of the :ref:`CBR <cbr>` of
+        each graph is found in its :code:`cbrId` graph attribute.
+
+        :param query: A dictionary specifying the query on the :code:`cbrgraphs`
+          collection (e.g. :code:`{'graph.name': 'Pizza mozzarella'}`), defaults to
+          :const:`None` (every stored graph)
+        :type query: dict[str, Any], optional
+        :param int batch_size: The number of documents requested to the database in
+          each round trip, defaults to :const:`1000`
+        :param compact: A flag indicating whether the graphs are returned as
+          :class:`cookbase.graph.compact.CompactCBRGraph` objects, as in
+          :meth:`get_cbrgraph`, defaults to :const:`False`
+        :type compact: bool, optional
+        :return: An iterator over the :doc:`CBRGraphs <cbrg>`
+        :rtype: Iterator[CBRGraph or cookbase.graph.compact.CompactCBRGraph]
+        """
+        cursor = self._default_db.cbrgraphs.find(
+            query or {}, CBRGRAPH_PROJECTION, batch_size=batch_size
+        )
+        return (cbrgraph_from_document(doc, compact) for doc in cursor)
+
     def insert_cbr(
         self, cbr: Dict[str, Any], cbrgraph: Optional[CBRGraph] = None
     ) -> InsertCBRResult:
@@ -175,7 +435,8 @@ class DBHandler:
         :raises pymongo.errors.PyMongoError: Database error produced during insertion
         """
         try:
-            r_cbr = self._default_db.cbr.insert_one(cbr)
+            with query_timer("cbr"):
+                r_cbr = self._default_db.cbr.insert_one(cbr)
         except pymongo.errors.PyMongoError:
             raise
 
@@ -184,12 +445,13 @@ class DBHandler:
         elif not cbrgraph:
             return InsertCBRResult(cbr_id=r_cbr.inserted_id)
         else:
-            cbrgraph_dict = cbrgraph.get_serializable_graph()
-            cbrgraph_dict["_id"] = ObjectId(str(r_cbr.inserted_id))
-            cbrgraph_dict["graph"]["cbrId"] = str(cbrgraph_dict["_id"])
+            cbrgraph_dict = cbrgraph_document(
+                cbrgraph, r_cbr.inserted_id, self.binary_graphs
+            )
 
             try:
-                r_graph = self._default_db.cbrgraphs.insert_one(cbrgraph_dict)
+                with query_timer("cbrgraphs"):
+                    r_graph = self._default_db.cbrgraphs.insert_one(cbrgraph_dict)
             except pymongo.errors.PyMongoError:
                 raise
 
@@ -200,6 +462,140 @@ class DBHandler:
                     cbr_id=r_cbr.inserted_id, cbrgraph_id=r_graph.inserted_id
                 )
 
+    def insert_cbrs(
+        self,
+        items: Iterable[Tuple[Dict[str, Any], Optional[CBRGraph]]],
+        chunk_size: int = 1000,
+    ) -> List[InsertCBRResult]:
+        """Inserts several :ref:`CBRs <cbr>` into database with their :doc:`CBRGraphs
+        <cbrg>` (if given), as :meth:`insert_cbr` does for one of them.
+
+        The items are taken in chunks of `chunk_size`, and each chunk is stored with
+        one unordered :code:`insert_many` on the :code:`cbr` collection followed by
+        another one on the :code:`cbrgraphs` collection for the graphs of the
+        :ref:`CBRs <cbr>` stored, so that an item failing does not prevent the
+        insertion of the rest. Every :ref:`CBR <cbr>` is given an :code:`_id` field
+        before being inserted, if it lacks one.
+
+        :param items: 2-tuples of a dictionary representing a :ref:`CBR <cbr>` and its
+          :doc:`CBRGraph <cbrg>`, or :const:`None`
+        :type items: Iterable[tuple[dict[str, Any], CBRGraph or None]]
+        :param int chunk_size: The maximum number of documents inserted into each
+          collection at once, defaults to :const:`1000`
+        :return: A :class:`InsertCBRResult` object holding the insertion results of
+          each item, in order
+        :rtype: list[InsertCBRResult]
+
+        :raises BulkCBRInsertionError: Some :ref:`CBRs <cbr>` or :doc:`CBRGraphs
+          <cbrg>` could not be stored
+        :raises pymongo.errors.PyMongoError: Database error produced during insertion
+        """
+        results = []
+        errors = {}
+
+        for chunk in chunked(items, chunk_size):
+            cbrs = [cbr for cbr, _ in chunk]
+
+            for cbr in cbrs:
+                cbr.setdefault("_id", ObjectId())
+
+            failed_cbrs = self._insert_many(self._default_db.cbr, cbrs)
+            graph_docs, graph_positions = bulk_cbrgraph_documents(
+                chunk, failed_cbrs, self.binary_graphs
+            )
+            failed_graphs = self._insert_many(self._default_db.cbrgraphs, graph_docs)
+            results.extend(
+                bulk_insert_results(
+                    chunk,
+                    failed_cbrs,
+                    graph_positions,
+                    failed_graphs,
+                    errors,
+                    len(results),
+                )
+            )
+
+        if errors:
+            raise BulkCBRInsertionError(results, errors)
+
+        return results
+
+    def _insert_many(self, collection: Any, docs: List[Dict[str, Any]]) -> Set[int]:
+        """Inserts some documents into a collection with an unordered
+        :code:`insert_many`.
+
+        :param collection: The collection
+        :type collection: Any
+        :param docs: The documents
+        :type docs: list[dict[str, Any]]
+        :return: The positions of the documents that could not be stored
+        :rtype: set[int]
+        """
+        if not docs:
+            return set()
+
+        try:
+            with query_timer(collection.name):
+                r = collection.insert_many(docs, ordered=False)
+        except pymongo.errors.BulkWriteError as e:
+            return bulk_write_failures(e)
+
+        return set() if r.acknowledged else set(range(len(docs)))
+
+    def invalidate_cache(
+        self, collection: Optional[str] = None, doc_id: Optional[Hashable] = None
+    ) -> None:
+        """Removes documents from the catalogue documents cache, so that they are
+        requested again to the database, increases :attr:`catalogue_version`, so that
+        the validation results obtained with the previous documents are no longer
+        served from a :class:`cookbase.validation.cache.ValidationResultCache`, and
+        notifies the listeners registered by :meth:`add_invalidation_listener`. It has
+        no effect on the documents if the cache is disabled.
+
+        :param collection: The collection (:const:`'cbi'`, :const:`'cba'` or
+          :const:`'cbp'`) whose documents are removed, defaults to :const:`None` (all
+          collections)
+        :type collection: str, optional
+        :param doc_id: The identifier of the only document to remove from
+          `collection`, defaults to :const:`None` (all documents)
+        :type doc_id: Hashable, optional
+        """
+        self.catalogue_version += 1
+
+        if self.cache is not None:
+            self.cache.invalidate(collection, doc_id)
+
+        for listener in list(self._invalidation_listeners):
+            listener(collection, doc_id)
+
+    def add_invalidation_listener(self, listener: InvalidationListener) -> None:
+        """Registers a callable notified with the collection and document identifier
+        given to every call to :meth:`invalidate_cache`, so that data derived from the
+        catalogue documents can be refreshed.
+
+        :param listener: The callable to be notified
+        :type listener: InvalidationListener
+        """
+        self._invalidation_listeners.append(listener)
+
+    def remove_invalidation_listener(self, listener: InvalidationListener) -> None:
+        """Unregisters a callable registered by :meth:`add_invalidation_listener`, if
+        registered.
+
+        :param listener: The callable no longer to be notified
+        :type listener: InvalidationListener
+        """
+        if listener in self._invalidation_listeners:
+            self._invalidation_listeners.remove(listener)
+
+    def cache_info(self) -> Optional[CacheInfo]:
+        """Returns the statistics of the catalogue documents cache.
+
+        :return: The cache statistics, or :const:`None` if the cache is disabled
+        :rtype: cookbase.db.cache.CacheInfo or None
+        """
+        return self.cache.info() if self.cache is not None else None
+
     def close_connections(self):
         """Closes all connections registered by this :class:`DBHandler` object."""
         try:
@@ -216,8 +612,211 @@ class DBHandler:
         self.close_connections()
 
 
+def cbrgraph_document(
+    cbrgraph: Union[CBRGraph, CompactCBRGraph], cbr_id: Any, binary: bool = False
+) -> Dict[str, Any]:
+    """Provides the database document storing a :doc:`CBRGraph <cbrg>`, which shares
+    the identifier of its :ref:`CBR <cbr>`.
+
+    A binary document keeps the graph attributes in its :code:`graph` field, so that
+    it can be queried as a node-link one, and the encoded graph in its :code:`data`
+    field. A :class:`cookbase.graph.compact.CompactCBRGraph` is encoded straight from
+    its arrays.
+
+    :param cbrgraph: The :doc:`CBRGraph <cbrg>`
+    :type cbrgraph: CBRGraph or cookbase.graph.compact.CompactCBRGraph
+    :param cbr_id: The database identifier of the :ref:`CBR <cbr>`
+    :type cbr_id: ObjectId
+    :param binary: A flag indicating whether the graph is stored in the binary
+      encoding of :meth:`cookbase.graph.cbrgraph.CBRGraph.to_bytes`, defaults to
+      :const:`False`
+    :type binary: bool, optional
+    :return: The document to be inserted into the :code:`cbrgraphs` collection
+    :rtype: dict[str, Any]
+    """
+    if binary:
+        if isinstance(cbrgraph, CompactCBRGraph):
+            graph_attr = cbrgraph.graph
+        else:
+            graph_attr = cbrgraph.g.graph
+
+        doc = {"graph": dict(graph_attr), "data": Binary(cbrgraph.to_bytes())}
+    else:
+        doc = cbrgraph.get_serializable_graph()
+
+    doc["_id"] = ObjectId(str(cbr_id))
+    doc["graph"]["cbrId"] = str(doc["_id"])
+    return doc
+
+
+def cbrgraph_from_document(
+    doc: Dict[str, Any], compact: bool = False
+) -> Union[CBRGraph, CompactCBRGraph]:
+    """Rebuilds a :doc:`CBRGraph <cbrg>` from its document in the :code:`cbrgraphs`
+    collection, as provided by :func:`cbrgraph_document` in either form.
+
+    :param doc: The document
+    :type doc: dict[str, Any]
+    :param compact: A flag indicating whether the graph is rebuilt as a
+      :class:`cookbase.graph.compact.CompactCBRGraph`, which is decoded from a binary
+      document with no :mod:`networkx` graph being built, defaults to :const:`False`
+    :type compact: bool, optional
+    :return: The :doc:`CBRGraph <cbrg>`
+    :rtype: CBRGraph or cookbase.graph.compact.CompactCBRGraph
+    """
+    if "data" not in doc:
+        cbrgraph = CBRGraph.from_serializable_graph(doc)
+        return CompactCBRGraph.from_networkx(cbrgraph.g) if compact else cbrgraph
+
+    if compact:
+        cbrgraph = CompactCBRGraph.from_bytes(doc["data"])
+        cbrgraph.graph.update(doc.get("graph", ()))
+    else:
+        cbrgraph = CBRGraph.from_bytes(doc["data"])
+        cbrgraph.g.graph.update(doc.get("graph", ()))
+
+    return cbrgraph
+
+
+def chunked(iterable: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Splits an iterable into lists of `size` items, the last one being possibly
+    shorter.
+
+    :param iterable: The iterable
+    :type iterable: Iterable[Any]
+    :param int size: The number of items of each list
+    :return: An iterator over the lists
+    :rtype: Iterator[list[Any]]
+    """
+    it = iter(iterable)
+    chunk = list(islice(it, size))
+
+    while chunk:
+        yield chunk
+        chunk = list(islice(it, size))
+
+
+def bulk_write_failures(error: pymongo.errors.BulkWriteError) -> Set[int]:
+    """Provides the positions of the documents that an unordered :code:`insert_many`
+    could not store.
+
+    :param error: The error raised by :code:`insert_many`
+    :type error: pymongo.errors.BulkWriteError
+    :return: The positions of the documents, within the inserted ones
+    :rtype: set[int]
+    """
+    return {e["index"] for e in error.details.get("writeErrors", ())}
+
+
+def bulk_cbrgraph_documents(
+    items: List[Tuple[Dict[str, Any], Optional[CBRGraph]]],
+    failed_cbrs: Set[int],
+    binary: bool = False,
+) -> Tuple[List[Dict[str, Any]], List[int]]:
+    """Provides the database documents storing the :doc:`CBRGraphs <cbrg>` of the
+    stored :ref:`CBRs <cbr>` of a bulk insertion, as :func:`cbrgraph_document` does.
+
+    :param items: 2-tuples of an inserted :ref:`CBR <cbr>` and its :doc:`CBRGraph
+      <cbrg>`, or :const:`None`
+    :type items: list[tuple[dict[str, Any], CBRGraph or None]]
+    :param failed_cbrs: The positions of the :ref:`CBRs <cbr>` that could not be
+      stored
+    :type failed_cbrs: set[int]
+    :param binary: A flag indicating whether the graphs are stored in binary form,
+      defaults to :const:`False`
+    :type binary: bool, optional
+    :return: The documents to be inserted into the :code:`cbrgraphs` collection and
+      the position of the item of each of them
+    :rtype: tuple[list[dict[str, Any]], list[int]]
+    """
+    docs = []
+    positions = []
+
+    for i, (cbr, cbrgraph) in enumerate(items):
+        if cbrgraph and i not in failed_cbrs:
+            docs.append(cbrgraph_document(cbrgraph, cbr["_id"], binary))
+            positions.append(i)
+
+    return docs, positions
+
+
+def bulk_insert_results(
+    items: List[Tuple[Dict[str, Any], Optional[CBRGraph]]],
+    failed_cbrs: Set[int],
+    graph_positions: List[int],
+    failed_graphs: Set[int],
+    errors: Dict[int, Any],
+    offset: int = 0,
+) -> List[InsertCBRResult]:
+    """Provides the results of the items of a bulk insertion, recording the errors of
+    the failing ones.
+
+    :param items: 2-tuples of an inserted :ref:`CBR <cbr>` and its :doc:`CBRGraph
+      <cbrg>`, or :const:`None`
+    :type items: list[tuple[dict[str, Any], CBRGraph or None]]
+    :param failed_cbrs: The positions of the :ref:`CBRs <cbr>` that could not be
+      stored
+    :type failed_cbrs: set[int]
+    :param graph_positions: The position of the item of each inserted :doc:`CBRGraph
+      <cbrg>` document, as returned by :func:`bulk_cbrgraph_documents`
+    :type graph_positions: list[int]
+    :param failed_graphs: The positions of the :doc:`CBRGraph <cbrg>` documents that
+      could not be stored
+    :type failed_graphs: set[int]
+    :param errors: A dictionary where the
+      :class:`cookbase.db.exceptions.CBRInsertionError` or
+      :class:`cookbase.db.exceptions.CBRGraphInsertionError` of each failing item is
+      recorded by position
+    :type errors: dict[int, InsertionError]
+    :param int offset: The position of the first item in the whole insertion,
+      defaults to :const:`0`
+    :return: The results of the items, in order
+    :rtype: list[InsertCBRResult]
+    """
+    results = []
+
+    for i, (cbr, _) in enumerate(items):
+        if i in failed_cbrs:
+            results.append(InsertCBRResult())
+            errors[offset + i] = CBRInsertionError(InsertCBRResult())
+        else:
+            results.append(InsertCBRResult(cbr_id=cbr["_id"]))
+
+    for j, i in enumerate(graph_positions):
+        if j in failed_graphs:
+            errors[offset + i] = CBRGraphInsertionError(
+                InsertCBRResult(cbr_id=results[i].cbr_id)
+            )
+        else:
+            results[i].cbrgraph_id = ObjectId(str(results[i].cbr_id))
+
+    return results
+
+
+def read_mongodb_url(credentials_path: Optional[str] = None) -> str:
+    """Reads the MongoDB connection URI from a credentials file.
+
+    :param credentials_path: Path to the file containing the connection credentials,
+      defaults to the :file:`credentials.txt` file at the repository root
+    :type credentials_path: str, optional
+    :return: The MongoDB connection URI
+    :rtype: str
+    """
+    if not credentials_path:
+        credentials_path = os.path.join(
+            pathlib.Path(__file__).parent.absolute(), "../../credentials.txt"
+        )
+
+    with open(credentials_path) as f:
+        return f.readline()
+
+
 def get_handler(
-    credentials_path: Optional[str] = None, force_new_instance: bool = False
+    credentials_path: Optional[str] = None,
+    force_new_instance: bool = False,
+    cache_size: int = 0,
+    cache_ttl: Optional[float] = None,
+    binary_graphs: bool = False,
 ):
     """Provides the database handler instance.
 
@@ -226,33 +825,42 @@ def get_handler(
     to the credentials provided in the file located at `credentials_path`; if called
     after the first time (and being the `force_new_instance` flag set to
     :const:`False`), it returns the already available instance, disregarding the
-    `credentials_path` argument.
+    `credentials_path`, cache and storage arguments.
 
     :param credentials_path: Path to the file containing the connection credentials
     :type credentials_path: str or None, optional
     :param force_new_instance: A flag indicating whether a new database handler
       instance must be initialized, defaults to :const:`False`
     :type force_new_instance: bool, optional
+    :param int cache_size: Maximum number of catalogue documents held in the handler's
+      cache, defaults to :const:`0` (no cache)
+    :param cache_ttl: Seconds a cached document is held before expiring, defaults to
+      :const:`None` (no expiration)
+    :type cache_ttl: float, optional
+    :param binary_graphs: A flag indicating whether the inserted :doc:`CBRGraphs
+      <cbrg>` are stored in binary form, defaults to :const:`False`
+    :type binary_graphs: bool, optional
     :return: A :class:`DBHandler` instance connected to the default database
     :rtype: DBHandler
     """
     global _db_handler
 
-    if not _db_handler or force_new_instance:
-        if not credentials_path:
-            credentials_path = os.path.join(
-                pathlib.Path(__file__).parent.absolute(), "../../credentials.txt"
+    with _db_handler_lock:
+        if not _db_handler or force_new_instance:
+            _db_handler = DBHandler(
+                read_mongodb_url(credentials_path),
+                "mongodb",
+                "cookbase",
+                cache_size,
+                cache_ttl,
+                binary_graphs,
             )
 
-        with open(credentials_path) as f:
-            mongodb_url = f.readline()
-
-        _db_handler = DBHandler(mongodb_url, "mongodb", "cookbase")
-
-    return _db_handler
+        return _db_handler
 
 
 _db_handler = None
+_db_handler_lock = threading.Lock()
 
 
 if __name__ == "__main__":
@@ -1,5 +1,6 @@
+import copy
 from functools import wraps
-from typing import Callable
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
 
 
 def underscore_id(o):
@@ -30,3 +31,102 @@ def demongofy(f: Callable):
         return deunderscore_id(f(*args, **kwargs))
 
     return wrapper
+
+
+def normalize_fields(fields: Optional[Iterable[str]]) -> Optional[Tuple[str, ...]]:
+    """Sorts a set of document fields, removing duplicates and the fields nested in
+    other fields of the set.
+
+    :param fields: The dot-separated paths of the fields, or :const:`None` for whole
+      documents
+    :type fields: Iterable[str], optional
+    :return: The normalized paths, or :const:`None` if `fields` is :const:`None`
+    :rtype: tuple[str, ...] or None
+    """
+    if fields is None:
+        return None
+
+    normalized = []
+
+    for field in sorted(set(fields)):
+        if not any(field.startswith(f + ".") for f in normalized):
+            normalized.append(field)
+
+    return tuple(normalized)
+
+
+def covers_fields(
+    fields: Optional[Iterable[str]], available: Optional[Iterable[str]]
+) -> bool:
+    """Checks whether a set of document fields is available in a document holding
+    another set of fields.
+
+    :param fields: The dot-separated paths of the requested fields, or :const:`None`
+      for whole documents
+    :type fields: Iterable[str], optional
+    :param available: The dot-separated paths of the fields held, or :const:`None` for
+      whole documents
+    :type available: Iterable[str], optional
+    :return: :const:`True` if every field in `fields` is held, :const:`False` otherwise
+    :rtype: bool
+    """
+    if available is None:
+        return True
+
+    if fields is None:
+        return False
+
+    available = tuple(available)
+    return all(any(f == a or f.startswith(a + ".") for a in available) for f in fields)
+
+
+def projection(fields: Optional[Iterable[str]]) -> Optional[Dict[str, bool]]:
+    """Builds the MongoDB projection including a set of document fields.
+
+    :param fields: The dot-separated paths of the fields to be included besides the
+      document identifier, or :const:`None` for whole documents
+    :type fields: Iterable[str], optional
+    :return: The projection, or :const:`None` if `fields` is :const:`None`
+    :rtype: dict[str, bool] or None
+    """
+    if fields is None:
+        return None
+
+    result = {"_id": True}
+    result.update((f, True) for f in normalize_fields(fields))
+    return result
+
+
+def project(doc: Dict[str, Any], fields: Optional[Iterable[str]]) -> Dict[str, Any]:
+    """Copies the given fields of a document, and its identifier, as done by the
+    MongoDB projection built by :func:`projection`.
+
+    :param doc: The document
+    :type doc: dict[str, Any]
+    :param fields: The dot-separated paths of the fields to be copied, or
+      :const:`None` for whole documents
+    :type fields: Iterable[str], optional
+    :return: A copy of the given fields of `doc`
+    :rtype: dict[str, Any]
+    """
+    if fields is None:
+        return copy.deepcopy(doc)
+
+    result = {k: doc[k] for k in ("_id", "id") if k in doc}
+
+    for field in normalize_fields(fields):
+        *parents, name = field.split(".")
+        source, target = doc, result
+
+        for parent in parents:
+            source = source.get(parent)
+
+            if not isinstance(source, dict):
+                break
+
+            target = target.setdefault(parent, {})
+        else:
+            if name in source:
+                target[name] = copy.deepcopy(source[name])
+
+    return result
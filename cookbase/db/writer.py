@@ -0,0 +1,244 @@
+"""A write-behind queue storing validated :ref:`Cookbase Recipes (CBRs) <cbr>` and
+their :doc:`Cookbase Recipe Graphs (CBRGraphs) <cbrg>` in the background, so that
+validations do not wait for the database."""
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import json_util
+from cookbase.db import handler
+from cookbase.db.exceptions import BulkCBRInsertionError
+from cookbase.graph.cbrgraph import CBRGraph
+from cookbase.logging import logger
+
+
+class StorageWriter:
+    """A bounded queue of :ref:`CBRs <cbr>` to be stored in database with their
+    :doc:`CBRGraphs <cbrg>`, drained by a worker thread in batches inserted through
+    :meth:`cookbase.db.handler.DBHandler.insert_cbrs`.
+
+    Each submitted item is given a :class:`concurrent.futures.Future` resolved into
+    its :class:`cookbase.db.handler.InsertCBRResult`, or into the error that
+    prevented storing it: a :class:`cookbase.db.exceptions.CBRInsertionError` or
+    :class:`cookbase.db.exceptions.CBRGraphInsertionError` holding its partial result,
+    or the database error that made its whole batch fail. Failures are logged and, if
+    `dead_letter_path` is given, appended to that file along with the items, as JSON
+    lines in `MongoDB Extended JSON
+    <https://docs.mongodb.com/manual/reference/mongodb-extended-json/>`_, so that they
+    can be inserted again.
+
+    :param db_handler: The database handler storing the items, defaults to the one
+      provided by :func:`cookbase.db.handler.get_handler` when the first batch is
+      stored
+    :type db_handler: cookbase.db.handler.DBHandler, optional
+    :param int max_queued: Maximum number of items waiting to be stored, beyond which
+      :meth:`submit` blocks, defaults to :const:`1000`
+    :param int batch_size: Maximum number of items stored at once, defaults to
+      :const:`100`
+    :param dead_letter_path: Path to the file where the items that could not be
+      stored are appended, defaults to :const:`None` (not recorded)
+    :type dead_letter_path: str, optional
+
+    :ivar int failures: Number of items that could not be stored
+    """
+
+    def __init__(
+        self,
+        db_handler: Optional[handler.DBHandler] = None,
+        max_queued: int = 1000,
+        batch_size: int = 100,
+        dead_letter_path: Optional[str] = None,
+    ):
+        """Constructor method."""
+        self._db_handler = db_handler
+        self.batch_size = batch_size
+        self.dead_letter_path = dead_letter_path
+        self.failures = 0
+        self._queue: "queue.Queue[Optional[Tuple[Any, ...]]]" = queue.Queue(max_queued)
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        # Items submitted and not yet stored (or failed)
+        self._unfinished = 0
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name="cookbase-storage-writer", daemon=True
+        )
+        self._thread.start()
+
+    def submit(
+        self, cbr: Dict[str, Any], cbrgraph: Optional[CBRGraph] = None
+    ) -> "Future[handler.InsertCBRResult]":
+        """Queues a :ref:`CBR <cbr>` to be stored in database with its :doc:`CBRGraph
+        <cbrg>` (if given), blocking while the queue is full.
+
+        :param cbr: A dictionary representing the :ref:`CBR <cbr>`
+        :type cbr: dict[str, Any]
+        :param cbrgraph: The :doc:`CBRGraph <cbrg>` of the :ref:`CBR <cbr>`
+        :type cbrgraph: CBRGraph, optional
+        :return: A future resolved into the insertion results once stored
+        :rtype: concurrent.futures.Future[cookbase.db.handler.InsertCBRResult]
+
+        :raises RuntimeError: The writer is closed
+        """
+        future: "Future[handler.InsertCBRResult]" = Future()
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Storage writer is closed")
+
+            self._unfinished += 1
+
+        self._queue.put((cbr, cbrgraph, future))
+        return future
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Waits until every submitted item has been stored (or has failed).
+
+        :param timeout: Maximum number of seconds to wait, defaults to :const:`None`
+          (no limit)
+        :type timeout: float, optional
+        :return: :const:`True` if no item is left, :const:`False` if the timeout
+          expired
+        :rtype: bool
+        """
+        with self._idle:
+            return self._idle.wait_for(lambda: self._unfinished == 0, timeout)
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """Stops accepting items and waits until every submitted item has been stored
+        (or has failed), after which the worker thread finishes.
+
+        :param timeout: Maximum number of seconds to wait, defaults to :const:`None`
+          (no limit)
+        :type timeout: float, optional
+        :return: :const:`True` if no item is left, :const:`False` if the timeout
+          expired, in which case the remaining items are still stored in the
+          background
+        :rtype: bool
+        """
+        with self._lock:
+            self._closed = True
+            idle = self._unfinished == 0
+
+        if idle:
+            # Otherwise, the worker finishes after storing the last item
+            self._queue.put(None)
+
+        start = time.monotonic()
+        flushed = self.flush(timeout)
+
+        if flushed:
+            self._thread.join(
+                None if timeout is None else max(timeout - time.monotonic() + start, 0)
+            )
+
+        return flushed
+
+    @property
+    def closed(self) -> bool:
+        """Whether the writer no longer accepts items."""
+        return self._closed
+
+    def __enter__(self) -> "StorageWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        """Drains the queue in batches until the writer is closed and idle."""
+        while True:
+            item = self._queue.get()
+
+            if item is None:
+                return
+
+            batch = [item]
+
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+                if item is None:
+                    self._write(batch)
+                    return
+
+                batch.append(item)
+
+            self._write(batch)
+
+            with self._lock:
+                if self._closed and self._unfinished == 0:
+                    return
+
+    def _write(self, batch: List[Tuple[Any, ...]]) -> None:
+        """Stores a batch of items, resolving their futures.
+
+        :param batch: 3-tuples of :ref:`CBR <cbr>`, :doc:`CBRGraph <cbrg>` and future
+        :type batch: list[tuple[Any, ...]]
+        """
+        items = [(cbr, cbrgraph) for cbr, cbrgraph, _ in batch]
+        errors: Dict[int, Exception] = {}
+
+        try:
+            if self._db_handler is None:
+                self._db_handler = handler.get_handler()
+
+            results = self._db_handler.insert_cbrs(items, self.batch_size)
+        except BulkCBRInsertionError as e:
+            results = e.partial_result
+            errors = e.errors
+        except Exception as e:
+            results = [None] * len(batch)
+            errors = dict.fromkeys(range(len(batch)), e)
+
+        if errors:
+            logger.error(f"Storing {len(errors)} CBRs in database failed")
+            self._record_failures([(items[i], e) for i, e in errors.items()])
+
+        for i, (_, _, future) in enumerate(batch):
+            if i in errors:
+                future.set_exception(errors[i])
+            else:
+                future.set_result(results[i])
+
+        with self._idle:
+            self.failures += len(errors)
+            self._unfinished -= len(batch)
+
+            if self._unfinished == 0:
+                self._idle.notify_all()
+
+    def _record_failures(
+        self, failures: List[Tuple[Tuple[Dict[str, Any], Any], Exception]]
+    ) -> None:
+        """Appends the items that could not be stored to :attr:`dead_letter_path`, if
+        any, forcing them to disk.
+
+        :param failures: 2-tuples of item and error
+        :type failures: list[tuple[tuple[dict[str, Any], Any], Exception]]
+        """
+        if self.dead_letter_path is None:
+            return
+
+        try:
+            with open(self.dead_letter_path, "a") as f:
+                for (cbr, cbrgraph), error in failures:
+                    record = {
+                        "cbr": cbr,
+                        "cbrgraph": (
+                            cbrgraph.get_serializable_graph() if cbrgraph else None
+                        ),
+                        "error": f"{type(error).__name__}: {error}",
+                    }
+                    f.write(json_util.dumps(record) + "\n")
+
+                f.flush()
+                os.fsync(f.fileno())
+        except OSError:
+            logger.exception("Recording the CBRs that could not be stored failed")
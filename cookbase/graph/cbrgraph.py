@@ -1,11 +1,176 @@
-from typing import Any, Dict, Hashable, List
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Hashable,
+    Iterable,
+    KeysView,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 import networkx as nx
+from attr import attrib, attrs
+from cookbase.graph.cbrindex import CBRIndex
 from cookbase.logging import logger
 from cookbase.validation.globals import Definitions
 from networkx.readwrite import json_graph
 
 
+@attrs(frozen=True)
+class ProcessesSummary:
+    """A class containing the structures derived from the processes' subgraph of a
+    :doc:`CBRGraph <cbrg>`, computed in a single pass over the degrees of its process
+    nodes.
+
+    :param int version: The version of the graph the summary was computed from
+    :param roots: The root process nodes, in graph order
+    :type roots: tuple[Hashable, ...]
+    :param leaves: The leaf process nodes, in graph order
+    :type leaves: tuple[Hashable, ...]
+    :param path_joining: The process nodes with more than one process predecessor or
+      successor, in graph order
+    :type path_joining: tuple[Hashable, ...]
+
+    :ivar root_set: The nodes of :attr:`roots`, for constant-time membership tests
+    :vartype root_set: frozenset[Hashable]
+    :ivar leaf_set: The nodes of :attr:`leaves`
+    :vartype leaf_set: frozenset[Hashable]
+    :ivar path_joining_set: The nodes of :attr:`path_joining`
+    :vartype path_joining_set: frozenset[Hashable]
+
+    """
+
+    version: int = attrib()
+    roots: Tuple[Hashable, ...] = attrib()
+    leaves: Tuple[Hashable, ...] = attrib()
+    path_joining: Tuple[Hashable, ...] = attrib()
+    root_set: FrozenSet[Hashable] = attrib(init=False, eq=False, repr=False)
+    leaf_set: FrozenSet[Hashable] = attrib(init=False, eq=False, repr=False)
+    path_joining_set: FrozenSet[Hashable] = attrib(init=False, eq=False, repr=False)
+
+    def __attrs_post_init__(self):
+        object.__setattr__(self, "root_set", frozenset(self.roots))
+        object.__setattr__(self, "leaf_set", frozenset(self.leaves))
+        object.__setattr__(self, "path_joining_set", frozenset(self.path_joining))
+
+
+@attrs(frozen=True)
+class ApplianceConflict:
+    """A class describing an appliance used in two concurrent preparation paths of a
+    :doc:`CBRGraph <cbrg>`, that is, paths none of which precedes the other.
+
+    :param str appliance: The appliance reference
+    :param processes: The processes using the appliance in the first path, in order
+    :type processes: tuple[Hashable, ...]
+    :param other_processes: The processes using the appliance in the second path, in
+      order
+    :type other_processes: tuple[Hashable, ...]
+
+    """
+
+    appliance: str = attrib()
+    processes: Tuple[Hashable, ...] = attrib()
+    other_processes: Tuple[Hashable, ...] = attrib()
+
+
+def reachability_bitsets(
+    n: int, succ: Mapping[int, Iterable[int]], pred: Mapping[int, Iterable[int]]
+) -> List[int]:
+    """Computes the transitive reachability between the nodes of a directed graph
+    numbered from :const:`0` to :code:`n - 1`, usually in topological order.
+
+    :param int n: The number of nodes
+    :param succ: The successors of each node, by node number
+    :type succ: Mapping[int, Iterable[int]]
+    :param pred: The predecessors of each node, by node number
+    :type pred: Mapping[int, Iterable[int]]
+    :return: A bitset for each node, by node number, where bit :code:`j` of node
+      :code:`i` is set if node :code:`j` follows or precedes node :code:`i` (or is
+      node :code:`i` itself)
+    :rtype: list[int]
+    """
+    descendants = [1 << i for i in range(n)]
+    ancestors = list(descendants)
+    changed = True
+
+    # Nodes numbered in topological order only need a single pass in each direction,
+    # unless they form a cycle
+    while changed:
+        changed = False
+
+        for i in reversed(range(n)):
+            reach = descendants[i]
+
+            for j in succ[i]:
+                reach |= descendants[j]
+
+            if reach != descendants[i]:
+                descendants[i] = reach
+                changed = True
+
+        for i in range(n):
+            reach = ancestors[i]
+
+            for j in pred[i]:
+                reach |= ancestors[j]
+
+            if reach != ancestors[i]:
+                ancestors[i] = reach
+                changed = True
+
+    return [d | a for d, a in zip(descendants, ancestors)]
+
+
+def find_appliance_conflicts(
+    uses: Sequence[Mapping[str, Tuple[Hashable, ...]]], related: Sequence[int]
+) -> List[ApplianceConflict]:
+    """Finds the appliances used by two preparation paths none of which reaches the
+    other.
+
+    An inverted index maps each appliance into the bitset of the paths using it, so
+    only the pairs of paths actually in conflict are visited, once each.
+
+    :param uses: The processes using each appliance in each path, by path number
+    :type uses: Sequence[Mapping[str, tuple[Hashable, ...]]]
+    :param related: The reachability bitset of each path, as returned by
+      :func:`reachability_bitsets`
+    :type related: Sequence[int]
+    :return: The conflicts found, by appliance in order of first use and then by path
+      number
+    :rtype: list[ApplianceConflict]
+    """
+    # The bitset of the paths using each appliance
+    appliance_paths = {}
+
+    for i, appliances in enumerate(uses):
+        for app_ref in appliances:
+            appliance_paths[app_ref] = appliance_paths.get(app_ref, 0) | 1 << i
+
+    conflicts = []
+
+    for app_ref, paths in appliance_paths.items():
+        remaining = paths
+
+        while remaining:
+            i = (remaining & -remaining).bit_length() - 1
+            remaining &= remaining - 1
+            concurrent = remaining & ~related[i]
+            processes = uses[i][app_ref]
+
+            while concurrent:
+                j = (concurrent & -concurrent).bit_length() - 1
+                concurrent &= concurrent - 1
+                conflicts.append(
+                    ApplianceConflict(app_ref, processes, uses[j][app_ref])
+                )
+
+    return conflicts
+
+
 class CBRGraph:
     """A class that provides the structures and methods needed to build, manipulate and
     analyze :doc:`Cookbase Recipe Graphs (CBRGraphs) <cbrg>`.
@@ -18,9 +183,20 @@ class CBRGraph:
     :vartype g: networkx.classes.digraph.DiGraph
     :ivar _appliances: A dictionary of appliance references included in the recipe
     :vartype _appliances: dict[str]
+    :ivar _appliance_processes: The references of the processes using each appliance
+    :vartype _appliance_processes: dict[str, set[str]]
+    :ivar _nodes_by_type: The nodes of each type (:code:`cbi`, :code:`cbp` and
+      :code:`unref_foodstuff`), as dictionaries with :const:`None` values used as
+      insertion-ordered sets, kept up to date as nodes are added, retyped or removed
+    :vartype _nodes_by_type: dict[str, dict[Hashable, None]]
     :ivar _pending_processes_edges: A list of 2-tuples denoting the edges pending to be
       added
     :vartype _pending_processes_edges: list[tuple[str, str]]
+    :ivar _version: The version of the graph, increased by every change made through
+      the methods of this class
+    :vartype _version: int
+    :ivar _summary: The last computed summary of the processes' subgraph
+    :vartype _summary: ProcessesSummary or None
 
     """
 
@@ -28,7 +204,52 @@ class CBRGraph:
         """Constructor method."""
         self.g = nx.DiGraph()
         self._appliances = {}
+        self._appliance_processes = {}
+        self._nodes_by_type = {"cbi": {}, "cbp": {}, "unref_foodstuff": {}}
         self._pending_processes_edges = []
+        self._version = 0
+        self._summary = None
+
+    @property
+    def version(self) -> int:
+        """The version of the graph, increased by every change made through the
+        methods of this class. Changes made directly on :attr:`g` must be followed by
+        a call to :meth:`mark_changed`.
+
+        :rtype: int
+        """
+        return self._version
+
+    def mark_changed(self) -> None:
+        """Increases the graph version, discarding the structures derived from the
+        previous one."""
+        self._version += 1
+
+    def _add_node(self, node: Hashable, **attr: Any) -> None:
+        """Adds a node to the graph, or updates its attributes."""
+        self.g.add_node(node, **attr)
+        self._index_node(node)
+        self.mark_changed()
+
+    def _index_node(self, node: Hashable) -> None:
+        """Files a node under its current type, keeping its position if the type did
+        not change."""
+        node_type = self.g.nodes[node].get("type")
+
+        for t, nodes in self._nodes_by_type.items():
+            if t != node_type:
+                nodes.pop(node, None)
+
+        self._nodes_by_type.setdefault(node_type, {})[node] = None
+
+    def _remove_node(self, node: Hashable) -> None:
+        """Removes a node and its edges from the graph."""
+        self.g.remove_node(node)
+
+        for nodes in self._nodes_by_type.values():
+            nodes.pop(node, None)
+
+        self.mark_changed()
 
     def add_ingredient(self, ingredient_ref: str, ingredient: Dict[str, Any]) -> None:
         """Adds an ingredient to the graph.
@@ -38,7 +259,7 @@ class CBRGraph:
           :ref:`CBR Ingredient <cbr-ingredients>`
         :type ingredient: dict[str, Any]
         """
-        self.g.add_node(ingredient_ref, type="cbi", cbiId=ingredient["cbiId"])
+        self._add_node(ingredient_ref, type="cbi", cbiId=ingredient["cbiId"])
 
     def add_appliance(self, appliance_ref: str, appliance: Dict[str, Any]) -> None:
         """Adds an appliance to the graph.
@@ -65,20 +286,13 @@ class CBRGraph:
           :ref:`CBR Process <cbr-preparation>`
         :type process: dict[str, Any]
         """
-        # Building appliances dictionary
-        a = {}
-
-        for app in process["appliances"]:
-            app_ref = app["appliance"]
-            a[app_ref] = self._appliances[app_ref]
-            a[app_ref]["usedAfter"] = app["usedAfter"]
-
-        self.g.add_node(process_ref, type="cbp", cbpId=process["cbpId"], appliances=a)
+        self._add_process_node(process_ref, process)
 
         # Adding foodstuff edges
         def add_foodstuff_edge(foodstuff_ref, process_ref):
-            if foodstuff_ref in self.get_ingredients() or (
-                foodstuff_ref in self.get_processes()
+            if (
+                foodstuff_ref in self._nodes_by_type["cbi"]
+                or foodstuff_ref in self._nodes_by_type["cbp"]
             ):
                 self.g.add_edge(foodstuff_ref, process_ref)
             else:
@@ -92,6 +306,20 @@ class CBRGraph:
                     for i in process[fk]:
                         add_foodstuff_edge(i, process_ref)
 
+        self.mark_changed()
+
+    def _add_process_node(self, process_ref: str, process: Dict[str, Any]) -> None:
+        """Adds a process to the graph, without its in-edges."""
+        # Building appliances dictionary
+        a = {}
+
+        for app in process["appliances"]:
+            app_ref = app["appliance"]
+            a[app_ref] = dict(self._appliances[app_ref], usedAfter=app["usedAfter"])
+            self._appliance_processes.setdefault(app_ref, set()).add(process_ref)
+
+        self._add_node(process_ref, type="cbp", cbpId=process["cbpId"], appliances=a)
+
     def resolve_pending_processes_edges(self) -> None:
         """Attempts to add edges that could not have been added to the graph before."""
         not_found = []
@@ -99,25 +327,40 @@ class CBRGraph:
         for i in range(len(self._pending_processes_edges)):
             in_process, out_process = self._pending_processes_edges[i]
 
-            if in_process in self.get_processes():
+            if in_process in self._nodes_by_type["cbp"]:
                 self.g.add_edge(in_process, out_process)
             else:
                 not_found.append(self._pending_processes_edges[i])
 
         self._pending_processes_edges = not_found
+        self.mark_changed()
 
     def clear(self) -> None:
         """Clears the graph and internal structures."""
         self.g.clear()
         self._appliances.clear()
+        self._appliance_processes.clear()
         self._pending_processes_edges.clear()
 
-    def build_graph(self, data: Dict[str, Any]) -> None:
-        """Adds a process and its in-edges to the graph.
+        for nodes in self._nodes_by_type.values():
+            nodes.clear()
+
+        self.mark_changed()
+
+    def build_graph(
+        self, data: Dict[str, Any], index: Optional[CBRIndex] = None
+    ) -> None:
+        """Builds the graph from the data of a CBR, replacing any previous content.
 
         :param data: A dictionary containing all the data from a CBR
         :type data: dict[str, Any]
+        :param index: The index of the references between the items of the CBR,
+          defaults to building it from `data`
+        :type index: cookbase.graph.cbrindex.CBRIndex, optional
         """
+        if index is None:
+            index = CBRIndex.from_cbr(data)
+
         self.clear()
         self.g.graph["name"] = data["info"]["name"]
 
@@ -128,93 +371,280 @@ class CBRGraph:
             self.add_appliance(k, v)
 
         for k, v in data["preparation"].items():
-            self.add_process(k, v)
+            self._add_process_node(k, v)
 
-        self.resolve_pending_processes_edges()
+        self.g.add_edges_from(index.foodstuff_edges)
 
-        for in_foodstuff, out_process in self._pending_processes_edges:
-            self.g.add_node(in_foodstuff, type="unref_foodstuff")
+        for in_foodstuff, out_process in index.unresolved_foodstuffs:
+            self._add_node(in_foodstuff, type="unref_foodstuff")
             self.g.add_edge(in_foodstuff, out_process)
             logger.error(
                 "Neither ingredient nor process found with reference "
                 f"'{in_foodstuff}'"
             )
 
+        self.mark_changed()
+
+    def _node_state(self, node: Hashable) -> Optional[Tuple[Dict[str, Any], set]]:
+        if node not in self.g:
+            return None
+
+        return dict(self.g.nodes[node]), set(self.g.predecessors(node))
+
+    def update_graph(
+        self, data: Dict[str, Any], changes: Mapping[str, Iterable[str]]
+    ) -> bool:
+        """Updates the graph in place after some items of the :ref:`CBR <cbr>` it was
+        built from have been added, removed or modified, producing the same graph as
+        :meth:`build_graph` would.
+
+        Only the changed ingredients and processes, the processes using a changed
+        appliance and the foodstuffs referred by any of them are visited.
+
+        :param data: A dictionary containing all the data from the new CBR
+        :type data: dict[str, Any]
+        :param changes: The references of the changed items, by section name
+          (:code:`ingredients`, :code:`appliances` and :code:`preparation`)
+        :type changes: Mapping[str, Iterable[str]]
+        :return: :const:`True` if any node or edge of the graph changed
+        :rtype: bool
+        """
+        ingredients = data["ingredients"]
+        preparation = data["preparation"]
+        before = {}
+        orphan_candidates = set()
+
+        def touch(node):
+            if node not in before:
+                before[node] = self._node_state(node)
+
+        def detach_process(process_ref):
+            touch(process_ref)
+
+            for in_foodstuff in list(self.g.predecessors(process_ref)):
+                self.g.remove_edge(in_foodstuff, process_ref)
+                orphan_candidates.add(in_foodstuff)
+
+            for app_ref in self.g.nodes[process_ref].get("appliances", ()):
+                self._appliance_processes.get(app_ref, set()).discard(process_ref)
+
+        def unreference(node):
+            # Removes a node, unless still referred by a process
+            touch(node)
+
+            if self.g.out_degree(node) > 0:
+                self.g.nodes[node].clear()
+                self._add_node(node, type="unref_foodstuff")
+            else:
+                self._remove_node(node)
+
+        self.g.graph["name"] = data["info"]["name"]
+        self._pending_processes_edges = []
+        processes = set(changes.get("preparation", ()))
+
+        for app_ref in changes.get("appliances", ()):
+            processes.update(self._appliance_processes.get(app_ref, ()))
+
+            if app_ref in data["appliances"]:
+                self.add_appliance(app_ref, data["appliances"][app_ref])
+            else:
+                self._appliances.pop(app_ref, None)
+
+        for ingredient_ref in changes.get("ingredients", ()):
+            if ingredient_ref in ingredients:
+                touch(ingredient_ref)
+
+                if ingredient_ref in self.g:
+                    self.g.nodes[ingredient_ref].clear()
+
+                self.add_ingredient(ingredient_ref, ingredients[ingredient_ref])
+            elif ingredient_ref in self.g:
+                unreference(ingredient_ref)
+
+        for process_ref in processes:
+            if process_ref in self.g and self.g.nodes[process_ref]["type"] == "cbp":
+                detach_process(process_ref)
+
+                if process_ref not in preparation:
+                    unreference(process_ref)
+
+        for process_ref in processes:
+            if process_ref not in preparation:
+                continue
+
+            touch(process_ref)
+
+            if process_ref in self.g:
+                self.g.nodes[process_ref].clear()
+
+            self.add_process(process_ref, preparation[process_ref])
+
+        for in_foodstuff, out_process in self._pending_processes_edges:
+            if in_foodstuff in preparation:
+                # Process added after the one referring to it
+                self.g.add_edge(in_foodstuff, out_process)
+            else:
+                touch(in_foodstuff)
+
+                if in_foodstuff not in self.g:
+                    self._add_node(in_foodstuff, type="unref_foodstuff")
+
+                self.g.add_edge(in_foodstuff, out_process)
+                logger.error(
+                    "Neither ingredient nor process found with reference "
+                    f"'{in_foodstuff}'"
+                )
+
+        self._pending_processes_edges = []
+
+        for node in orphan_candidates:
+            if (
+                node in self.g
+                and self.g.nodes[node].get("type") == "unref_foodstuff"
+                and self.g.out_degree(node) == 0
+            ):
+                touch(node)
+                self._remove_node(node)
+
+        self.mark_changed()
+        return any(state != self._node_state(n) for n, state in before.items())
+
     def aggregated_appliances_graph(self) -> nx.DiGraph:
         """Returns a graph where each node represents a concurrent preparation path of a
         :doc:`CBRGraph <cbrg>`, containing an inverted index on the appliances used in
         that path together with the list of processes that used it.
 
+        Paths are maximal chains of processes reachable from a root process, split at
+        path-joining processes, which form paths on their own. They are found in a
+        single pass over the processes in topological order (followed, if the
+        processes form a cycle, by the remaining ones in graph order), and are
+        numbered in that order.
+
+        Each node of the returned graph holds the :code:`processes` of its path, in
+        order, and the :code:`appliances` inverted index.
+
         :return: An aggregated appliances graph
         :rtype: networkx.classes.digraph.DiGraph
         """
-        # TODO: This operation is implemented single-threaded. Consider
-        # multi-threading.
-        roots = self.get_root_processes()
-        pj_processes = self.path_joining_processes()
-        leaf_processes = self.get_leaf_processes()
+        summary = self.processes_summary()
+        processes = self._nodes_by_type["cbp"]
+        succ, pred = self.g.succ, self.g.pred
         aggregated_graph = nx.DiGraph()
-        # A dictionary with key the ag_id, and value the starting process of a
-        # path
-        current_ag_leaves = {}
-        # A map of the path-starting process reference into the aggregated path
-        # id
-        first_pg_to_ag = {}
-
-        for i in range(len(roots)):
-            aggregated_graph.add_node(i)
-            current_ag_leaves[i] = roots[i]
-            first_pg_to_ag[roots[i]] = i
-
-        ag_id_counter = len(current_ag_leaves)
-
-        while current_ag_leaves:
-            ag_nodes_already_generated = set()
-            pg_nodes_to_generate = set()
-
-            for ag_id, p in current_ag_leaves.items():
-                appliances = {}
-                s = p
-
-                while True:
-                    # Build inverted index on appliance for given process path
-                    for app_ref in self.g.nodes[s]["appliances"].keys():
-                        if app_ref not in appliances:
-                            appliances[app_ref] = [s]
-                        else:
-                            appliances[app_ref].append(s)
-
-                    if s in pj_processes or s in leaf_processes:
-                        break
-
-                    # Not path-joining nor leaf: check if path continues
-                    t = next(self.g.successors(s))
-
-                    if t in pj_processes:
-                        break
-                    else:
-                        s = t  # Iterate over path
-
-                aggregated_graph.add_node(ag_id, appliances=appliances)
-                ag_nodes_already_generated.add(ag_id)
-
-                for v in self.g.successors(s):
-                    pg_nodes_to_generate.add((ag_id, v))
-
-            for n in ag_nodes_already_generated:
-                del current_ag_leaves[n]
-
-            for ag_id, v in pg_nodes_to_generate:
-                if v not in first_pg_to_ag:
-                    aggregated_graph.add_edge(ag_id, ag_id_counter)
-                    current_ag_leaves[ag_id_counter] = v
-                    first_pg_to_ag[v] = ag_id_counter
-                    ag_id_counter += 1
-                else:
-                    aggregated_graph.add_edge(ag_id, first_pg_to_ag[v])
+        # The path of each process, and the last process of each path
+        path_of = {}
+        path_ends = []
+
+        for p in self._processes_order(summary):
+            if p in path_of:
+                continue
+
+            if p not in summary.root_set and p not in summary.path_joining_set:
+                # Single predecessor, whose path continues here unless it is
+                # path-joining
+                q = next(q for q in pred[p] if q in processes)
+
+                if q not in summary.path_joining_set:
+                    continue
+
+            path_id = len(path_ends)
+            path = []
+            appliances = {}
+            s = p
+
+            while True:
+                # Build inverted index on appliance for given process path
+                path_of[s] = path_id
+                path.append(s)
+
+                for app_ref in self.g.nodes[s]["appliances"]:
+                    appliances.setdefault(app_ref, []).append(s)
+
+                if s in summary.path_joining_set or s in summary.leaf_set:
+                    break
+
+                # Not path-joining nor leaf: the path continues to its only successor
+                t = next(t for t in succ[s] if t in processes)
+
+                if t in summary.path_joining_set or t in path_of:
+                    break
+
+                s = t
+
+            aggregated_graph.add_node(path_id, processes=path, appliances=appliances)
+            path_ends.append(s)
+
+        for path_id, s in enumerate(path_ends):
+            for v in succ[s]:
+                if v in path_of:
+                    aggregated_graph.add_edge(path_id, path_of[v])
 
         return aggregated_graph
 
+    def _processes_order(self, summary: ProcessesSummary) -> List[Hashable]:
+        """Sorts the processes reachable from a root process topologically, followed
+        by those in a cycle in graph order."""
+        processes = self._nodes_by_type["cbp"]
+        pending = {
+            p: sum(1 for q in self.g.pred[p] if q in processes) for p in processes
+        }
+        order = list(summary.roots)
+
+        for p in order:
+            for t in self.g.succ[p]:
+                if t in pending:
+                    pending[t] -= 1
+
+                    if pending[t] == 0:
+                        order.append(t)
+
+        if len(order) < len(processes):
+            # Processes in a cycle, added if reachable from a root
+            ordered = set(order)
+            reachable = set(summary.roots)
+            stack = list(summary.roots)
+
+            while stack:
+                for t in self.g.succ[stack.pop()]:
+                    if t in processes and t not in reachable:
+                        reachable.add(t)
+                        stack.append(t)
+
+            order.extend(p for p in self.g if p in reachable and p not in ordered)
+
+        return order
+
+    @staticmethod
+    def paths_reachability(aggregated_graph: nx.DiGraph) -> List[int]:
+        """Computes the transitive reachability between the paths of an aggregated
+        appliances graph, as returned by :meth:`aggregated_appliances_graph`.
+
+        :param aggregated_graph: The aggregated appliances graph
+        :type aggregated_graph: networkx.classes.digraph.DiGraph
+        :return: A bitset for each path, by path number, where bit :code:`j` of path
+          :code:`i` is set if path :code:`j` follows or precedes path :code:`i` (or is
+          path :code:`i` itself)
+        :rtype: list[int]
+        """
+        return reachability_bitsets(
+            len(aggregated_graph), aggregated_graph.succ, aggregated_graph.pred
+        )
+
+    def appliance_conflicts(self) -> List[ApplianceConflict]:
+        """Finds the appliances used by two concurrent preparation paths, that is,
+        paths of :meth:`aggregated_appliances_graph` none of which reaches the other,
+        by means of :func:`find_appliance_conflicts`.
+
+        :return: The conflicts found, by appliance in order of first use and then by
+          path number
+        :rtype: list[ApplianceConflict]
+        """
+        ag = self.aggregated_appliances_graph()
+        uses = [
+            {a: tuple(procs) for a, procs in appliances.items()}
+            for _, appliances in ag.nodes(data="appliances")
+        ]
+        return find_appliance_conflicts(uses, self.paths_reachability(ag))
+
     def processes_subgraph_view(self) -> nx.DiGraph:
         """Returns the subgraph view of the :doc:`CBRGraph <cbrg>` including only its
         processes.
@@ -222,29 +652,80 @@ class CBRGraph:
         :return: The processes' subgraph view from the :doc:`CBRGraph <cbrg>`
         :rtype: networkx.classes.digraph.DiGraph
         """
+        return nx.subgraph_view(
+            self.g, filter_node=self._nodes_by_type["cbp"].__contains__
+        )
 
-        def filter_process(node):
-            return self.g.nodes[node]["type"] == "cbp"
+    def get_ingredients(self) -> KeysView[Hashable]:
+        """Returns the nodes representing ingredients in the :doc:`CBRGraph <cbrg>`.
 
-        return nx.subgraph_view(self.g, filter_node=filter_process)
+        The returned set-like view is kept up to date as the graph changes, and
+        supports constant-time membership tests.
 
-    def get_ingredients(self) -> List[Hashable]:
-        """Returns the list of nodes representing ingredients in the :doc:`CBRGraph
-        <cbrg>`.
+        :return: A view on the ingredient nodes in the :doc:`CBRGraph <cbrg>`
+        :rtype: KeysView[Hashable]
+        """
+        return self._nodes_by_type["cbi"].keys()
 
-        :return: The list of ingredient nodes in the :doc:`CBRGraph <cbrg>`
-        :rtype: list[Hashable]
+    def get_processes(self) -> KeysView[Hashable]:
+        """Returns the nodes representing processes in the :doc:`CBRGraph <cbrg>`.
+
+        The returned set-like view is kept up to date as the graph changes, and
+        supports constant-time membership tests.
+
+        :return: A view on the process nodes in the :doc:`CBRGraph <cbrg>`
+        :rtype: KeysView[Hashable]
         """
-        return [i for i, _ in self.g.nodes(data="type") if _ == "cbi"]
+        return self._nodes_by_type["cbp"].keys()
 
-    def get_processes(self) -> List[Hashable]:
-        """Returns the list of nodes representing processes in the :doc:`CBRGraph
-        <cbrg>`.
+    def out_degree(self, node: Hashable) -> int:
+        """Returns the number of nodes directly following a node of the
+        :doc:`CBRGraph <cbrg>`, that is, the processes using it if it is a foodstuff.
 
-        :return: The list of process nodes in the :doc:`CBRGraph <cbrg>`
-        :rtype: list[Hashable]
+        :param Hashable node: The node
+        :return: The out-degree of `node`
+        :rtype: int
+        """
+        return self.g.out_degree(node)
+
+    def processes_summary(self) -> ProcessesSummary:
+        """Returns the root, leaf and path-joining nodes of the processes' subgraph.
+
+        They are computed in a single pass over the process nodes the first time they
+        are requested, and shared by every caller until the graph changes.
+
+        :return: The summary of the processes' subgraph
+        :rtype: ProcessesSummary
         """
-        return [i for i, _ in self.g.nodes(data="type") if _ == "cbp"]
+        summary = self._summary
+
+        if summary is not None and summary.version == self._version:
+            return summary
+
+        processes = self._nodes_by_type["cbp"]
+        roots, leaves, path_joining = [], [], []
+
+        for p in self.g:
+            if p not in processes:
+                continue
+
+            in_degree = sum(1 for q in self.g.pred[p] if q in processes)
+            out_degree = sum(1 for q in self.g.succ[p] if q in processes)
+
+            if in_degree == 0:
+                roots.append(p)
+
+            if out_degree == 0:
+                leaves.append(p)
+
+            if in_degree > 1 or out_degree > 1:
+                path_joining.append(p)
+
+        summary = ProcessesSummary(
+            self._version, tuple(roots), tuple(leaves), tuple(path_joining)
+        )
+        self._summary = summary
+        return summary
 
     def get_root_processes(self) -> List[Hashable]:
         """Returns the list of root nodes from the processes' subgraph.
@@ -252,7 +733,7 @@ class CBRGraph:
         :return: The list of process root nodes from the processes' subgraph
         :rtype: list[Hashable]
         """
-        return [i for i, _ in self.processes_subgraph_view().in_degree() if _ == 0]
+        return list(self.processes_summary().roots)
 
     def path_joining_processes(self) -> List[Hashable]:
         """Returns the list of process nodes that represent a junction point
@@ -261,14 +742,7 @@ class CBRGraph:
         :return: The list of merging process nodes from the processes' subgraph
         :rtype: list[Hashable]
         """
-        pjp = []
-        psw = self.processes_subgraph_view()
-
-        for i in list(psw.nodes):
-            if psw.in_degree(i) > 1 or psw.out_degree(i) > 1:
-                pjp.append(i)
-
-        return pjp
+        return list(self.processes_summary().path_joining)
 
     def get_leaf_processes(self) -> List[Hashable]:
         """Returns the list of leaf nodes from the processes' subgraph.
@@ -276,7 +750,105 @@ class CBRGraph:
         :return: The list of process leaf nodes from the processes' subgraph.
         :rtype: list[Hashable]
         """
-        return [i for i, _ in self.processes_subgraph_view().out_degree() if _ == 0]
+        return list(self.processes_summary().leaves)
+
+    @staticmethod
+    def from_serializable_graph(data: Mapping[str, Any]) -> "CBRGraph":
+        """Rebuilds a :doc:`CBRGraph <cbrg>` from its JSON-serializable format, as
+        returned by :meth:`get_serializable_graph` or stored in the :code:`cbrgraphs`
+        database collection, without visiting its :ref:`CBR <cbr>`.
+
+        Only the appliances used by some process are kept in the serializable format,
+        so those are the only ones the rebuilt graph knows of.
+
+        :param data: The node-link data of the :doc:`CBRGraph <cbrg>`, of which the
+          :code:`graph`, :code:`nodes` and :code:`links` fields are read
+        :type data: Mapping[str, Any]
+        :return: The :doc:`CBRGraph <cbrg>`
+        :rtype: CBRGraph
+        """
+        nodes = []
+
+        for node in data["nodes"]:
+            attr = dict(node)
+            nodes.append((attr.pop("id"), attr))
+
+        return CBRGraph.from_node_data(
+            data.get("graph", {}),
+            nodes,
+            ((link["source"], link["target"]) for link in data["links"]),
+        )
+
+    @staticmethod
+    def from_node_data(
+        graph_attr: Mapping[str, Any],
+        nodes: Iterable[Tuple[Hashable, Dict[str, Any]]],
+        edges: Iterable[Tuple[Hashable, Hashable]],
+    ) -> "CBRGraph":
+        """Rebuilds a :doc:`CBRGraph <cbrg>` from the attributes of its graph, nodes
+        and edges, as held by :attr:`g`.
+
+        :param graph_attr: The attributes of the graph
+        :type graph_attr: Mapping[str, Any]
+        :param nodes: 2-tuples of node and node attributes, in graph order
+        :type nodes: Iterable[tuple[Hashable, dict[str, Any]]]
+        :param edges: 2-tuples of source and target nodes
+        :type edges: Iterable[tuple[Hashable, Hashable]]
+        :return: The :doc:`CBRGraph <cbrg>`
+        :rtype: CBRGraph
+        """
+        graph = CBRGraph()
+        g = graph.g
+        g.graph.update(graph_attr)
+        nodes = list(nodes)
+        g.add_nodes_from(nodes)
+        nodes_by_type = graph._nodes_by_type
+
+        for ref, attr in nodes:
+            # Node references are unique, so no node is filed under another type
+            nodes_by_type.setdefault(attr.get("type"), {})[ref] = None
+
+            for app_ref, app in attr.get("appliances", {}).items():
+                if app_ref not in graph._appliances:
+                    graph._appliances[app_ref] = {
+                        k: v for k, v in app.items() if k != "usedAfter"
+                    }
+
+                graph._appliance_processes.setdefault(app_ref, set()).add(ref)
+
+        g.add_edges_from(edges)
+        graph.mark_changed()
+        return graph
+
+    @staticmethod
+    def from_bytes(data: bytes) -> "CBRGraph":
+        """Rebuilds a :doc:`CBRGraph <cbrg>` from its binary encoding, as returned by
+        :meth:`to_bytes`.
+
+        :param bytes data: The encoded :doc:`CBRGraph <cbrg>`
+        :return: The :doc:`CBRGraph <cbrg>`
+        :rtype: CBRGraph
+
+        :raises ValueError: `data` is not an encoded :doc:`CBRGraph <cbrg>` of a
+          supported version
+        """
+        from cookbase.graph.compact import CompactCBRGraph
+
+        return CompactCBRGraph.from_bytes(data).to_cbrgraph()
+
+    def to_bytes(self, compress: bool = True) -> bytes:
+        """Returns the :doc:`CBRGraph <cbrg>` data in the compact binary encoding
+        described in :mod:`cookbase.graph.compact`.
+
+        :param compress: A flag indicating whether the encoded data is compressed with
+          :mod:`zlib`, defaults to :const:`True`
+        :type compress: bool, optional
+        :return: The encoded :doc:`CBRGraph <cbrg>`
+        :rtype: bytes
+        """
+        from cookbase.graph.compact import CompactCBRGraph
+
+        return CompactCBRGraph.from_networkx(self.g).to_bytes(compress)
 
     def get_serializable_graph(self) -> Dict[str, Any]:
         """Returns the :doc:`CBRGraph <cbrg>` data in a JSON-serializable format.
@@ -0,0 +1,139 @@
+"""A module implementing an index of the references held by a :ref:`Cookbase Recipe
+(CBR) <cbr>`, built in a single traversal and shared by the validation rules and the
+construction of its :doc:`Cookbase Recipe Graph (CBRGraph) <cbrg>`."""
+import sys
+from typing import Any, Dict, List, Tuple
+
+from attr import attrib, attrs
+from cookbase.validation.globals import Definitions
+
+
+@attrs
+class CBRIndex:
+    """A class containing the references between the items of a :ref:`CBR <cbr>`.
+
+    Every reference is interned, and the items of each section are numbered in the
+    order they appear in the :ref:`CBR <cbr>`.
+
+    :param ingredients: The position of each :ref:`CBR Ingredient <cbr-ingredients>`
+      by reference
+    :type ingredients: dict[str, int]
+    :param appliances: The position of each :ref:`CBR Appliance <cbr-appliances>` by
+      reference
+    :type appliances: dict[str, int]
+    :param processes: The position of each :ref:`CBR Process <cbr-preparation>` by
+      reference
+    :type processes: dict[str, int]
+    :param foodstuff_edges: The 2-tuples of foodstuff and process references denoting
+      the foodstuffs used by each process, for those foodstuffs found in the
+      :ref:`CBR <cbr>`, in the order a :doc:`CBRGraph <cbrg>` adds them
+    :type foodstuff_edges: list[tuple[str, str]]
+    :param appliance_uses: The references of the processes using each appliance, in
+      order
+    :type appliance_uses: dict[str, list[str]]
+    :param unresolved_foodstuffs: The 2-tuples of foodstuff and process references
+      whose foodstuff is neither an ingredient nor a process
+    :type unresolved_foodstuffs: list[tuple[str, str]]
+    :param unresolved_appliances: The 2-tuples of appliance and process references
+      whose appliance is not found in the :code:`appliances` section
+    :type unresolved_appliances: list[tuple[str, str]]
+
+    """
+
+    ingredients: Dict[str, int] = attrib(factory=dict)
+    appliances: Dict[str, int] = attrib(factory=dict)
+    processes: Dict[str, int] = attrib(factory=dict)
+    foodstuff_edges: List[Tuple[str, str]] = attrib(factory=list)
+    appliance_uses: Dict[str, List[str]] = attrib(factory=dict)
+    unresolved_foodstuffs: List[Tuple[str, str]] = attrib(factory=list)
+    unresolved_appliances: List[Tuple[str, str]] = attrib(factory=list)
+
+    @staticmethod
+    def build(
+        ingredients: Dict[str, Any],
+        appliances: Dict[str, Any],
+        processes: Dict[str, Any],
+    ) -> "CBRIndex":
+        """Builds the index of the sections of a :ref:`CBR <cbr>`, traversing each of
+        them once.
+
+        :param ingredients: The :code:`ingredients` property of the :ref:`CBR <cbr>`
+        :type ingredients: dict[str, Any]
+        :param appliances: The :code:`appliances` property of the :ref:`CBR <cbr>`
+        :type appliances: dict[str, Any]
+        :param processes: The :code:`preparation` property of the :ref:`CBR <cbr>`
+        :type processes: dict[str, Any]
+        :return: The index
+        :rtype: CBRIndex
+        """
+        index = CBRIndex(
+            {sys.intern(r): n for n, r in enumerate(ingredients)},
+            {sys.intern(r): n for n, r in enumerate(appliances)},
+            {sys.intern(r): n for n, r in enumerate(processes)},
+        )
+        index.appliance_uses = {r: [] for r in index.appliances}
+        # Edges from processes defined later, which a CBRGraph adds last
+        deferred_edges = []
+
+        for process_ref, process in processes.items():
+            process_ref = sys.intern(process_ref)
+            position = index.processes[process_ref]
+
+            for fk in Definitions.foodstuff_keywords:
+                refs = process.get(fk)
+
+                if refs is None:
+                    continue
+
+                for r in (refs,) if isinstance(refs, str) else refs:
+                    r = sys.intern(r)
+
+                    if r in index.ingredients or (
+                        index.processes.get(r, position + 1) <= position
+                    ):
+                        index.foodstuff_edges.append((r, process_ref))
+                    elif r in index.processes:
+                        deferred_edges.append((r, process_ref))
+                    else:
+                        index.unresolved_foodstuffs.append((r, process_ref))
+
+            for a in process["appliances"]:
+                uses = index.appliance_uses.get(a["appliance"])
+
+                if uses is None:
+                    index.unresolved_appliances.append(
+                        (sys.intern(a["appliance"]), process_ref)
+                    )
+                else:
+                    uses.append(process_ref)
+
+        index.foodstuff_edges.extend(deferred_edges)
+        return index
+
+    @staticmethod
+    def from_cbr(cbr: Dict[str, Any]) -> "CBRIndex":
+        """Builds the index of a :ref:`CBR <cbr>`.
+
+        :param cbr: The :ref:`CBR <cbr>`
+        :type cbr: dict[str, Any]
+        :return: The index
+        :rtype: CBRIndex
+        """
+        return CBRIndex.build(cbr["ingredients"], cbr["appliances"], cbr["preparation"])
+
+    def unused_ingredients(self) -> List[str]:
+        """Returns the references of the ingredients not used by any process.
+
+        :return: The unused ingredient references, in order
+        :rtype: list[str]
+        """
+        used = {f for f, _ in self.foodstuff_edges}
+        return [r for r in self.ingredients if r not in used]
+
+    def unused_appliances(self) -> List[str]:
+        """Returns the references of the appliances not used by any process.
+
+        :return: The unused appliance references, in order
+        :rtype: list[str]
+        """
+        return [r for r, uses in self.appliance_uses.items() if not uses]
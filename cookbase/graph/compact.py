@@ -0,0 +1,819 @@
+"""A module implementing a compact, array-backed :doc:`Cookbase Recipe Graph (CBRGraph)
+<cbrg>`, suited to the many graphs built during validation and discarded afterwards.
+
+A :class:`CompactCBRGraph` numbers its nodes and keeps their types, catalogue
+identifiers, edges and appliance uses in flat :mod:`array` buffers, with the edges in
+compressed sparse row (CSR) form: the neighbours of node :code:`i` are the items of a
+targets array between positions :code:`offsets[i]` and :code:`offsets[i + 1]`. It is
+built straight from a :class:`cookbase.graph.cbrindex.CBRIndex`, provides the analysis
+methods of :class:`cookbase.graph.cbrgraph.CBRGraph` used by the Graph validation rules
+and is converted into a `NetworkX <https://networkx.github.io/>`_ graph on demand.
+
+The same buffers back a versioned binary encoding of a graph, far smaller and faster to
+read than its node-link JSON. An encoded graph starts with the magic bytes
+:code:`CBRG`, a format version byte and a flags byte, followed by a payload
+compressed with :mod:`zlib` if the :data:`ZLIB_FLAG` bit is set. The payload is a
+sequence of length-prefixed fields, every integer being little-endian: the graph
+attributes as JSON, a table of the distinct node and appliance references, the node
+and appliance references as positions in that table, the node types and catalogue
+identifiers, the predecessors of every node in CSR form and the appliance uses.
+"""
+
+import json
+import struct
+import sys
+import zlib
+from array import array
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Sequence, Tuple
+
+import networkx as nx
+from attr import attrib, attrs
+from cookbase.graph.cbrgraph import (
+    ApplianceConflict,
+    CBRGraph,
+    ProcessesSummary,
+    find_appliance_conflicts,
+    reachability_bitsets,
+)
+from cookbase.graph.cbrindex import CBRIndex
+from cookbase.logging import logger
+from networkx.readwrite import json_graph
+
+#: The node types, by type code
+NODE_TYPES = ("cbi", "cbp", "unref_foodstuff")
+CBI, CBP, UNREF_FOODSTUFF = range(len(NODE_TYPES))
+
+#: The catalogue identifier of the nodes and appliances not referring to any
+NO_ID = -1
+
+#: The magic bytes starting an encoded graph
+MAGIC = b"CBRG"
+#: The version of the binary encoding written by :meth:`CompactCBRGraph.to_bytes`
+FORMAT_VERSION = 1
+#: The flag bit set when the payload of an encoded graph is compressed
+ZLIB_FLAG = 0x01
+
+_HEADER = struct.Struct("<4sBB")
+_COUNT = struct.Struct("<I")
+
+
+def _pack_bytes(data: bytes) -> bytes:
+    """Prefixes some data with its length."""
+    return _COUNT.pack(len(data)) + data
+
+
+def _pack_array(a: array) -> bytes:
+    """Packs an array as its length followed by its little-endian items."""
+    if sys.byteorder == "big":
+        a = array(a.typecode, a)
+        a.byteswap()
+
+    return _COUNT.pack(len(a)) + a.tobytes()
+
+
+class _Reader:
+    """Reads the fields packed by :func:`_pack_bytes` and :func:`_pack_array` in
+    order."""
+
+    def __init__(self, data: bytes):
+        self._data = memoryview(data)
+        self._position = 0
+
+    def _take(self, size: int) -> memoryview:
+        start = self._position
+        self._position += size
+
+        if self._position > len(self._data):
+            raise ValueError("Truncated CBRGraph encoding")
+
+        return self._data[start : self._position]
+
+    def _count(self) -> int:
+        return _COUNT.unpack(self._take(_COUNT.size))[0]
+
+    def read_bytes(self) -> memoryview:
+        return self._take(self._count())
+
+    def read_array(self, typecode: str) -> array:
+        a = array(typecode)
+        a.frombytes(self._take(self._count() * a.itemsize))
+
+        if sys.byteorder == "big":
+            a.byteswap()
+
+        return a
+
+
+def _csr(n: int, keys: Sequence[int], values: Sequence[int]) -> Tuple[array, array]:
+    """Groups the values by key in compressed sparse row form, keeping their order."""
+    offsets = [0] * (n + 1)
+
+    for k in keys:
+        offsets[k + 1] += 1
+
+    for i in range(n):
+        offsets[i + 1] += offsets[i]
+
+    targets = array("i", [0]) * len(values)
+    fill = offsets[:-1]
+
+    for k, v in zip(keys, values):
+        targets[fill[k]] = v
+        fill[k] += 1
+
+    return array("i", offsets), targets
+
+
+@attrs
+class CompactCBRGraph:
+    """A class holding a :doc:`CBRGraph <cbrg>` in flat arrays indexed by node number.
+
+    Nodes are numbered in the order a :class:`cookbase.graph.cbrgraph.CBRGraph` adds
+    them. The graph is not meant to be modified once built: it is usually obtained from
+    :meth:`from_cbr`, and converted by :meth:`to_networkx` when the NetworkX API is
+    needed.
+
+    :param graph: The attributes of the graph, such as the :code:`name` of the recipe
+    :type graph: dict[str, Any]
+    :param nodes: The reference of each node
+    :type nodes: list[str]
+    :param types: The type code of each node, as an index of :data:`NODE_TYPES`
+    :type types: array.array
+    :param cb_ids: The :code:`cbiId` or :code:`cbpId` of each node, or :data:`NO_ID`
+    :type cb_ids: array.array
+    :param succ_offsets: The offsets of the successors of each node in `succ_targets`
+    :type succ_offsets: array.array
+    :param succ_targets: The successors of every node
+    :type succ_targets: array.array
+    :param pred_offsets: The offsets of the predecessors of each node in
+      `pred_targets`
+    :type pred_offsets: array.array
+    :param pred_targets: The predecessors of every node
+    :type pred_targets: array.array
+    :param appliances: The reference of each :ref:`CBR Appliance <cbr-appliances>`
+    :type appliances: list[str]
+    :param appliance_cba_ids: The :code:`cbaId` of each appliance, or :data:`NO_ID` if
+      it is virtual
+    :type appliance_cba_ids: array.array
+    :param use_offsets: The offsets of the appliance uses of each node in
+      `use_appliances`
+    :type use_offsets: array.array
+    :param use_appliances: The appliance used by every appliance use
+    :type use_appliances: array.array
+    :param used_after: The :code:`usedAfter` flag of every appliance use
+    :type used_after: array.array
+
+    :ivar _ids: The number of each node by reference
+    :vartype _ids: dict[str, int]
+    :ivar _summary: The summary of the processes' subgraph, once computed
+    :vartype _summary: ProcessesSummary or None
+    :ivar _roles: The numbers of the root, leaf and path-joining processes, once
+      computed
+    :vartype _roles: tuple[list[int], list[int], list[int]] or None
+
+    """
+
+    graph: Dict[str, Any] = attrib()
+    nodes: List[str] = attrib()
+    types: array = attrib()
+    cb_ids: array = attrib()
+    succ_offsets: array = attrib()
+    succ_targets: array = attrib()
+    pred_offsets: array = attrib()
+    pred_targets: array = attrib()
+    appliances: List[str] = attrib()
+    appliance_cba_ids: array = attrib()
+    use_offsets: array = attrib()
+    use_appliances: array = attrib()
+    used_after: array = attrib()
+    _ids: Dict[str, int] = attrib(init=False, eq=False, repr=False)
+    _summary: Optional[ProcessesSummary] = attrib(
+        init=False, default=None, eq=False, repr=False
+    )
+    _roles: Optional[Tuple[List[int], List[int], List[int]]] = attrib(
+        init=False, default=None, eq=False, repr=False
+    )
+
+    def __attrs_post_init__(self):
+        self._ids = {r: i for i, r in enumerate(self.nodes)}
+
+    @staticmethod
+    def from_cbr(
+        data: Dict[str, Any], index: Optional[CBRIndex] = None
+    ) -> "CompactCBRGraph":
+        """Builds the graph of a :ref:`CBR <cbr>`, with the same nodes, attributes and
+        edges :meth:`cookbase.graph.cbrgraph.CBRGraph.build_graph` would add.
+
+        :param data: A dictionary containing all the data from a CBR
+        :type data: dict[str, Any]
+        :param index: The index of the references between the items of the CBR,
+          defaults to building it from `data`
+        :type index: cookbase.graph.cbrindex.CBRIndex, optional
+        :return: The graph
+        :rtype: CompactCBRGraph
+
+        :raises KeyError: A process uses an appliance not found in the
+          :code:`appliances` section
+        """
+        if index is None:
+            index = CBRIndex.from_cbr(data)
+
+        ids = {}
+        nodes = []
+        types = array("b")
+        cb_ids = array("q")
+
+        def add_node(ref, node_type, cb_id):
+            i = ids.get(ref)
+
+            if i is None:
+                i = ids[ref] = len(nodes)
+                nodes.append(ref)
+                types.append(node_type)
+                cb_ids.append(cb_id)
+            else:
+                types[i] = node_type
+                cb_ids[i] = cb_id
+
+            return i
+
+        ingredients = data["ingredients"]
+        preparation = data["preparation"]
+
+        for ref in index.ingredients:
+            add_node(ref, CBI, ingredients[ref]["cbiId"])
+
+        appliance_cba_ids = array(
+            "q",
+            (a.get("cbaId", NO_ID) for a in data["appliances"].values()),
+        )
+        # The appliance uses of each process, with a process using an appliance twice
+        # keeping the position of the first use and the usedAfter flag of the last one
+        process_uses = {}
+
+        for ref in index.processes:
+            process = preparation[ref]
+            uses = process_uses[add_node(ref, CBP, process["cbpId"])] = {}
+
+            for a in process["appliances"]:
+                uses[index.appliances[a["appliance"]]] = a["usedAfter"]
+
+        edges = list(index.foodstuff_edges)
+
+        for in_foodstuff, out_process in index.unresolved_foodstuffs:
+            add_node(in_foodstuff, UNREF_FOODSTUFF, NO_ID)
+            edges.append((in_foodstuff, out_process))
+            logger.error(
+                "Neither ingredient nor process found with reference "
+                f"'{in_foodstuff}'"
+            )
+
+        n = len(nodes)
+        sources = array("i")
+        targets = array("i")
+        seen = set()
+
+        for u, v in edges:
+            edge = ids[u], ids[v]
+
+            if edge not in seen:
+                seen.add(edge)
+                sources.append(edge[0])
+                targets.append(edge[1])
+
+        use_offsets = array("i", [0])
+        use_appliances = array("i")
+        used_after = array("b")
+
+        for i in range(n):
+            for app, after in process_uses.get(i, {}).items():
+                use_appliances.append(app)
+                used_after.append(after)
+
+            use_offsets.append(len(use_appliances))
+
+        return CompactCBRGraph(
+            {"name": data["info"]["name"]},
+            nodes,
+            types,
+            cb_ids,
+            *_csr(n, sources, targets),
+            *_csr(n, targets, sources),
+            list(index.appliances),
+            appliance_cba_ids,
+            use_offsets,
+            use_appliances,
+            used_after,
+        )
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def _succ(self, i: int) -> array:
+        return self.succ_targets[self.succ_offsets[i] : self.succ_offsets[i + 1]]
+
+    def _pred(self, i: int) -> array:
+        return self.pred_targets[self.pred_offsets[i] : self.pred_offsets[i + 1]]
+
+    def _uses(self, i: int) -> array:
+        return self.use_appliances[self.use_offsets[i] : self.use_offsets[i + 1]]
+
+    def _nodes_of_type(self, node_type: int) -> Tuple[str, ...]:
+        types = self.types
+        return tuple(r for i, r in enumerate(self.nodes) if types[i] == node_type)
+
+    def get_ingredients(self) -> Tuple[str, ...]:
+        """Returns the nodes representing ingredients in the :doc:`CBRGraph <cbrg>`.
+
+        :return: The ingredient nodes, in graph order
+        :rtype: tuple[str, ...]
+        """
+        return self._nodes_of_type(CBI)
+
+    def get_processes(self) -> Tuple[str, ...]:
+        """Returns the nodes representing processes in the :doc:`CBRGraph <cbrg>`.
+
+        :return: The process nodes, in graph order
+        :rtype: tuple[str, ...]
+        """
+        return self._nodes_of_type(CBP)
+
+    def out_degree(self, node: Hashable) -> int:
+        """Returns the number of nodes directly following a node of the
+        :doc:`CBRGraph <cbrg>`, that is, the processes using it if it is a foodstuff.
+
+        :param Hashable node: The node
+        :return: The out-degree of `node`
+        :rtype: int
+        """
+        i = self._ids[node]
+        return self.succ_offsets[i + 1] - self.succ_offsets[i]
+
+    def _process_roles(self) -> Tuple[List[int], List[int], List[int]]:
+        """Finds the root, leaf and path-joining processes, by number."""
+        if self._roles is not None:
+            return self._roles
+
+        types = self.types
+        roots, leaves, path_joining = [], [], []
+
+        for p in range(len(self.nodes)):
+            if types[p] != CBP:
+                continue
+
+            in_degree = sum(1 for q in self._pred(p) if types[q] == CBP)
+            out_degree = sum(1 for q in self._succ(p) if types[q] == CBP)
+
+            if in_degree == 0:
+                roots.append(p)
+
+            if out_degree == 0:
+                leaves.append(p)
+
+            if in_degree > 1 or out_degree > 1:
+                path_joining.append(p)
+
+        self._roles = roots, leaves, path_joining
+        return self._roles
+
+    def processes_summary(self) -> ProcessesSummary:
+        """Returns the root, leaf and path-joining nodes of the processes' subgraph,
+        computed the first time they are requested.
+
+        :return: The summary of the processes' subgraph
+        :rtype: ProcessesSummary
+        """
+        if self._summary is None:
+            nodes = self.nodes
+            self._summary = ProcessesSummary(
+                0, *(tuple(nodes[p] for p in role) for role in self._process_roles())
+            )
+
+        return self._summary
+
+    def get_root_processes(self) -> List[Hashable]:
+        """Returns the list of root nodes from the processes' subgraph.
+
+        :return: The list of process root nodes from the processes' subgraph
+        :rtype: list[Hashable]
+        """
+        return list(self.processes_summary().roots)
+
+    def path_joining_processes(self) -> List[Hashable]:
+        """Returns the list of process nodes that represent a junction point
+        of two or more preparation paths.
+
+        :return: The list of merging process nodes from the processes' subgraph
+        :rtype: list[Hashable]
+        """
+        return list(self.processes_summary().path_joining)
+
+    def get_leaf_processes(self) -> List[Hashable]:
+        """Returns the list of leaf nodes from the processes' subgraph.
+
+        :return: The list of process leaf nodes from the processes' subgraph.
+        :rtype: list[Hashable]
+        """
+        return list(self.processes_summary().leaves)
+
+    def _processes_order(self) -> List[int]:
+        """Sorts the processes reachable from a root process topologically, followed
+        by those in a cycle in graph order."""
+        types = self.types
+        roots = self._process_roles()[0]
+        pending = {
+            p: sum(1 for q in self._pred(p) if types[q] == CBP)
+            for p in range(len(self.nodes))
+            if types[p] == CBP
+        }
+        order = list(roots)
+
+        for p in order:
+            for t in self._succ(p):
+                if t in pending:
+                    pending[t] -= 1
+
+                    if pending[t] == 0:
+                        order.append(t)
+
+        if len(order) < len(pending):
+            # Processes in a cycle, added if reachable from a root
+            ordered = set(order)
+            reachable = set(roots)
+            stack = list(roots)
+
+            while stack:
+                for t in self._succ(stack.pop()):
+                    if types[t] == CBP and t not in reachable:
+                        reachable.add(t)
+                        stack.append(t)
+
+            order.extend(p for p in sorted(reachable) if p not in ordered)
+
+        return order
+
+    def _paths(self) -> Tuple[List[List[int]], List[Dict[int, List[int]]], List[int]]:
+        """Decomposes the processes into the concurrent preparation paths of
+        :meth:`cookbase.graph.cbrgraph.CBRGraph.aggregated_appliances_graph`.
+
+        :return: The processes of each path, the processes using each appliance in each
+          path and the path of each node (or :const:`-1`), all by number
+        :rtype: tuple[list[list[int]], list[dict[int, list[int]]], list[int]]
+        """
+        types = self.types
+        roots, leaves, path_joining = (set(r) for r in self._process_roles())
+        path_of = [-1] * len(self.nodes)
+        paths = []
+        path_appliances = []
+
+        for p in self._processes_order():
+            if path_of[p] >= 0:
+                continue
+
+            if p not in roots and p not in path_joining:
+                # Single predecessor, whose path continues here unless it is
+                # path-joining
+                q = next(q for q in self._pred(p) if types[q] == CBP)
+
+                if q not in path_joining:
+                    continue
+
+            path_id = len(paths)
+            path = []
+            appliances = {}
+            s = p
+
+            while True:
+                path_of[s] = path_id
+                path.append(s)
+
+                for app in self._uses(s):
+                    appliances.setdefault(app, []).append(s)
+
+                if s in path_joining or s in leaves:
+                    break
+
+                # Not path-joining nor leaf: the path continues to its only successor
+                t = next(t for t in self._succ(s) if types[t] == CBP)
+
+                if t in path_joining or path_of[t] >= 0:
+                    break
+
+                s = t
+
+            paths.append(path)
+            path_appliances.append(appliances)
+
+        return paths, path_appliances, path_of
+
+    def _paths_edges(
+        self, paths: List[List[int]], path_of: List[int]
+    ) -> List[List[int]]:
+        """Finds the paths following each path, in order and without repetitions."""
+        succ = []
+
+        for path in paths:
+            following = {}
+
+            for v in self._succ(path[-1]):
+                if path_of[v] >= 0:
+                    following[path_of[v]] = None
+
+            succ.append(list(following))
+
+        return succ
+
+    def aggregated_appliances_graph(self) -> nx.DiGraph:
+        """Returns a graph where each node represents a concurrent preparation path,
+        as :meth:`cookbase.graph.cbrgraph.CBRGraph.aggregated_appliances_graph` does.
+
+        :return: An aggregated appliances graph
+        :rtype: networkx.classes.digraph.DiGraph
+        """
+        nodes, appliances = self.nodes, self.appliances
+        paths, path_appliances, path_of = self._paths()
+        aggregated_graph = nx.DiGraph()
+
+        for path_id, (path, uses) in enumerate(zip(paths, path_appliances)):
+            aggregated_graph.add_node(
+                path_id,
+                processes=[nodes[s] for s in path],
+                appliances={
+                    appliances[a]: [nodes[s] for s in procs]
+                    for a, procs in uses.items()
+                },
+            )
+
+        for path_id, following in enumerate(self._paths_edges(paths, path_of)):
+            for v in following:
+                aggregated_graph.add_edge(path_id, v)
+
+        return aggregated_graph
+
+    def appliance_conflicts(self) -> List[ApplianceConflict]:
+        """Finds the appliances used by two concurrent preparation paths, as
+        :meth:`cookbase.graph.cbrgraph.CBRGraph.appliance_conflicts` does, without
+        building the aggregated appliances graph.
+
+        :return: The conflicts found, by appliance in order of first use and then by
+          path number
+        :rtype: list[ApplianceConflict]
+        """
+        nodes, appliances = self.nodes, self.appliances
+        paths, path_appliances, path_of = self._paths()
+        succ = self._paths_edges(paths, path_of)
+        pred = [[] for _ in paths]
+
+        for i, following in enumerate(succ):
+            for j in following:
+                pred[j].append(i)
+
+        uses = [
+            {appliances[a]: tuple(nodes[s] for s in procs) for a, procs in u.items()}
+            for u in path_appliances
+        ]
+        return find_appliance_conflicts(
+            uses, reachability_bitsets(len(paths), succ, pred)
+        )
+
+    def _node_attributes(self, i: int) -> Dict[str, Any]:
+        """Provides the attributes a :class:`cookbase.graph.cbrgraph.CBRGraph` holds
+        for a node."""
+        node_type = self.types[i]
+
+        if node_type == CBI:
+            return {"type": "cbi", "cbiId": self.cb_ids[i]}
+
+        if node_type == UNREF_FOODSTUFF:
+            return {"type": "unref_foodstuff"}
+
+        appliances = {}
+
+        for position in range(self.use_offsets[i], self.use_offsets[i + 1]):
+            a = self.use_appliances[position]
+            cba_id = self.appliance_cba_ids[a]
+
+            if cba_id == NO_ID:
+                app = {"type": "cba-virtual"}
+            else:
+                app = {"type": "cba", "cbaId": cba_id}
+
+            app["usedAfter"] = bool(self.used_after[position])
+            appliances[self.appliances[a]] = app
+
+        return {"type": "cbp", "cbpId": self.cb_ids[i], "appliances": appliances}
+
+    def to_networkx(self) -> nx.DiGraph:
+        """Converts the graph into the :mod:`networkx` directed graph a
+        :class:`cookbase.graph.cbrgraph.CBRGraph` would hold in its :code:`g`
+        attribute, with the same nodes, attributes and edges.
+
+        :return: The :mod:`networkx` graph
+        :rtype: networkx.classes.digraph.DiGraph
+        """
+        g = nx.DiGraph()
+        g.graph.update(self.graph)
+        nodes = self.nodes
+
+        for i, node in enumerate(nodes):
+            g.add_node(node, **self._node_attributes(i))
+
+        g.add_edges_from(self._edges())
+        return g
+
+    def _edges(self) -> Iterator[Tuple[str, str]]:
+        """Yields the edges, by reference, grouped by target node."""
+        nodes = self.nodes
+
+        for i, node in enumerate(nodes):
+            for j in self._pred(i):
+                yield nodes[j], node
+
+    def to_cbrgraph(self) -> CBRGraph:
+        """Converts the graph into a :class:`cookbase.graph.cbrgraph.CBRGraph`.
+
+        :return: The :doc:`CBRGraph <cbrg>`
+        :rtype: cookbase.graph.cbrgraph.CBRGraph
+        """
+        return CBRGraph.from_node_data(
+            self.graph,
+            ((node, self._node_attributes(i)) for i, node in enumerate(self.nodes)),
+            self._edges(),
+        )
+
+    @staticmethod
+    def from_networkx(g: nx.DiGraph) -> "CompactCBRGraph":
+        """Converts the :mod:`networkx` directed graph held by a
+        :class:`cookbase.graph.cbrgraph.CBRGraph` in its :code:`g` attribute.
+
+        Only the appliances used by some process are known to the returned graph.
+
+        :param g: The :mod:`networkx` graph
+        :type g: networkx.classes.digraph.DiGraph
+        :return: The graph
+        :rtype: CompactCBRGraph
+        """
+        nodes = list(g)
+        ids = {r: i for i, r in enumerate(nodes)}
+        types = array("b")
+        cb_ids = array("q")
+        appliance_ids = {}
+        appliance_cba_ids = array("q")
+        use_offsets = array("i", [0])
+        use_appliances = array("i")
+        used_after = array("b")
+
+        for attr in g.nodes.values():
+            types.append(NODE_TYPES.index(attr["type"]))
+            cb_ids.append(attr.get("cbiId", attr.get("cbpId", NO_ID)))
+
+            for app_ref, app in attr.get("appliances", {}).items():
+                a = appliance_ids.get(app_ref)
+
+                if a is None:
+                    a = appliance_ids[app_ref] = len(appliance_ids)
+                    appliance_cba_ids.append(app.get("cbaId", NO_ID))
+
+                use_appliances.append(a)
+                used_after.append(app["usedAfter"])
+
+            use_offsets.append(len(use_appliances))
+
+        sources = array("i")
+        targets = array("i")
+
+        for v, pred in g.pred.items():
+            for u in pred:
+                sources.append(ids[u])
+                targets.append(ids[v])
+
+        n = len(nodes)
+        return CompactCBRGraph(
+            dict(g.graph),
+            nodes,
+            types,
+            cb_ids,
+            *_csr(n, sources, targets),
+            *_csr(n, targets, sources),
+            list(appliance_ids),
+            appliance_cba_ids,
+            use_offsets,
+            use_appliances,
+            used_after,
+        )
+
+    def to_bytes(self, compress: bool = True) -> bytes:
+        """Encodes the graph in the versioned binary format described in
+        :mod:`cookbase.graph.compact`.
+
+        :param compress: A flag indicating whether the payload is compressed with
+          :mod:`zlib`, defaults to :const:`True`
+        :type compress: bool, optional
+        :return: The encoded graph
+        :rtype: bytes
+
+        :raises TypeError: The graph attributes are not JSON-serializable
+        """
+        strings = {}
+
+        def intern(ref):
+            return strings.setdefault(ref, len(strings))
+
+        node_strings = array("i", map(intern, self.nodes))
+        appliance_strings = array("i", map(intern, self.appliances))
+        encoded = [r.encode() for r in strings]
+        payload = b"".join(
+            (
+                _pack_bytes(json.dumps(self.graph).encode()),
+                _pack_array(array("i", map(len, encoded))),
+                _pack_bytes(b"".join(encoded)),
+                _pack_array(node_strings),
+                _pack_array(self.types),
+                _pack_array(self.cb_ids),
+                _pack_array(self.pred_offsets),
+                _pack_array(self.pred_targets),
+                _pack_array(appliance_strings),
+                _pack_array(self.appliance_cba_ids),
+                _pack_array(self.use_offsets),
+                _pack_array(self.use_appliances),
+                _pack_array(self.used_after),
+            )
+        )
+
+        if compress:
+            return _HEADER.pack(MAGIC, FORMAT_VERSION, ZLIB_FLAG) + zlib.compress(
+                payload
+            )
+
+        return _HEADER.pack(MAGIC, FORMAT_VERSION, 0) + payload
+
+    @staticmethod
+    def from_bytes(data: bytes) -> "CompactCBRGraph":
+        """Decodes a graph encoded by :meth:`to_bytes`.
+
+        :param bytes data: The encoded graph
+        :return: The graph
+        :rtype: CompactCBRGraph
+
+        :raises ValueError: `data` is not an encoded graph of a supported version
+        """
+        try:
+            magic, version, flags = _HEADER.unpack_from(data)
+        except struct.error:
+            magic = None
+
+        if magic != MAGIC:
+            raise ValueError("Data is not an encoded CBRGraph")
+        elif version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported CBRGraph encoding version {version}")
+
+        payload = memoryview(data)[_HEADER.size :]
+
+        if flags & ZLIB_FLAG:
+            payload = zlib.decompress(payload)
+
+        reader = _Reader(payload)
+        graph_attr = json.loads(bytes(reader.read_bytes()))
+        lengths = reader.read_array("i")
+        blob = bytes(reader.read_bytes())
+        strings = []
+        position = 0
+
+        for length in lengths:
+            strings.append(sys.intern(blob[position : position + length].decode()))
+            position += length
+
+        nodes = [strings[i] for i in reader.read_array("i")]
+        types = reader.read_array("b")
+        cb_ids = reader.read_array("q")
+        pred_offsets = reader.read_array("i")
+        pred_targets = reader.read_array("i")
+        n = len(nodes)
+        targets = array("i")
+
+        for i in range(n):
+            targets.extend(array("i", [i]) * (pred_offsets[i + 1] - pred_offsets[i]))
+
+        return CompactCBRGraph(
+            graph_attr,
+            nodes,
+            types,
+            cb_ids,
+            *_csr(n, pred_targets, targets),
+            pred_offsets,
+            pred_targets,
+            [strings[i] for i in reader.read_array("i")],
+            reader.read_array("q"),
+            reader.read_array("i"),
+            reader.read_array("i"),
+            reader.read_array("b"),
+        )
+
+    def get_serializable_graph(self) -> Dict[str, Any]:
+        """Returns the :doc:`CBRGraph <cbrg>` data in a JSON-serializable format, as
+        :meth:`cookbase.graph.cbrgraph.CBRGraph.get_serializable_graph` does.
+
+        :return: A dict with the :doc:`CBRGraph <cbrg>` data
+        :rtype: dict[str, Any]
+        """
+        return json_graph.node_link_data(self.to_networkx())
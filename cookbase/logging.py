@@ -1,11 +1,11 @@
-import inspect
 import logging.config
 import os
-
-from ruamel.yaml import YAML
+import sys
 
 
 def config_logger():
+    from ruamel.yaml import YAML
+
     config_file_path = os.path.join(os.path.dirname(__file__), "logger-config.yaml")
 
     with open(config_file_path) as f:
@@ -24,18 +24,28 @@ def config_logger():
     #     logger.setLevel(logging.DEBUG)
     #     logger.addHandler(handler)
 
-    global logger
-    logger = logging.getLogger("validation")
 
+class _LazyLogger:
+    """Proxy to the :code:`validation` logger that reads the logger configuration the
+    first time the logger is used, instead of at import time.
+    """
+
+    _logger = None
+
+    def __getattr__(self, name):
+        if self._logger is None:
+            # ===========================================================================
+            # Hack to ensure correct logging from sphinx-build
+            # ===========================================================================
+            main_filename = os.path.basename(sys.argv[0]) if sys.argv else ""
+
+            if main_filename != "sphinx-build":
+                config_logger()
+            # ===========================================================================
+
+            _LazyLogger._logger = logging.getLogger("validation")
+
+        return getattr(self._logger, name)
 
-# =======================================================================================
-# Hack to ensure correct logging from sphinx-build
-# =======================================================================================
-stack = inspect.stack()
-path_splits = stack[len(stack) - 1].filename.rsplit("/", 1)
-main_filename = path_splits[len(path_splits) - 1]
-logger = None
 
-if main_filename != "sphinx-build":
-    config_logger()
-# =======================================================================================
+logger = _LazyLogger()
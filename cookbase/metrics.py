@@ -0,0 +1,206 @@
+"""Collection of timing metrics from the :ref:`Cookbase Recipe (CBR) <cbr>` validation
+process.
+
+Timings are gathered by a :class:`TimingsCollector` activated for the current execution
+context, so that the database layer and the rule engine record their measurements
+without it being passed around. When no collector is active, instrumented code only pays
+for a context variable lookup.
+"""
+import inspect
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Callable, Dict, Iterator, Optional
+
+from attr import attrib, attrs
+
+
+@attrs
+class QueryStats:
+    """A class containing the statistics of the database queries issued against a
+    collection.
+
+    :param int count: Number of queries, defaults to :const:`0`
+    :param float time: Total time spent in the queries, in seconds, defaults to
+      :const:`0.0`
+
+    """
+
+    count: int = attrib(default=0)
+    time: float = attrib(default=0.0)
+
+
+@attrs
+class ValidationTimings:
+    """A class containing the time breakdown of a :ref:`CBR <cbr>` validation. All times
+    are expressed in seconds.
+
+    :param schema_validation: Time spent validating against the :ref:`CBR <cbr>` Schema
+    :type schema_validation: float, optional
+    :param graph_build: Time spent building the :doc:`Cookbase Recipe Graph (CBRGraph)
+      <cbrg>`
+    :type graph_build: float, optional
+    :param storage: Time spent storing the :ref:`CBR <cbr>` and its :doc:`CBRGraph
+      <cbrg>` into database
+    :type storage: float, optional
+    :param total: Time spent in the whole validation
+    :type total: float, optional
+    :param rules: Time spent applying each validation rule, by rule name
+    :type rules: dict[str, float]
+    :param resources: Time spent providing each resource required by the validation
+      rules (including the :code:`cbrgraph`), by resource name
+    :type resources: dict[str, float]
+    :param db_queries: Statistics of the database queries, by collection name
+    :type db_queries: dict[str, QueryStats]
+
+    """
+
+    schema_validation: Optional[float] = attrib(default=None)
+    graph_build: Optional[float] = attrib(default=None)
+    storage: Optional[float] = attrib(default=None)
+    total: Optional[float] = attrib(default=None)
+    rules: Dict[str, float] = attrib(factory=dict)
+    resources: Dict[str, float] = attrib(factory=dict)
+    db_queries: Dict[str, QueryStats] = attrib(factory=dict)
+
+
+class TimingsCollector:
+    """A class that gathers the timings of a validation, which may be recorded from
+    several threads.
+
+    :ivar timings: The timings gathered
+    :vartype timings: ValidationTimings
+    """
+
+    def __init__(self):
+        """Constructor method."""
+        self.timings = ValidationTimings()
+        self._lock = threading.Lock()
+
+    def add_query(self, collection: str, seconds: float) -> None:
+        """Records a database query.
+
+        :param str collection: The name of the queried collection
+        :param float seconds: The duration of the query
+        """
+        with self._lock:
+            stats = self.timings.db_queries.setdefault(collection, QueryStats())
+            stats.count += 1
+            stats.time += seconds
+
+    def add_rule(self, name: str, seconds: float) -> None:
+        """Records the application of a validation rule.
+
+        :param str name: The name of the rule
+        :param float seconds: The duration of the rule application
+        """
+        with self._lock:
+            self.timings.rules[name] = seconds
+
+    def add_resource(self, name: str, seconds: float) -> None:
+        """Records the provision of a resource required by the validation rules.
+
+        :param str name: The name of the resource
+        :param float seconds: The duration of the resource provision
+        """
+        with self._lock:
+            self.timings.resources[name] = seconds
+
+            if name == "cbrgraph":
+                self.timings.graph_build = seconds
+
+    @contextmanager
+    def activate(self) -> Iterator["TimingsCollector"]:
+        """Context manager that makes this collector the active one in the current
+        context.
+        """
+        token = _collector.set(self)
+
+        try:
+            yield self
+        finally:
+            _collector.reset(token)
+
+
+def get_collector() -> Optional[TimingsCollector]:
+    """Provides the collector active in the current context.
+
+    :return: The active collector, or :const:`None` if timings are not being collected
+    :rtype: TimingsCollector or None
+    """
+    return _collector.get()
+
+
+def timed_query(collection: str) -> Callable:
+    """Decorator function that records the calls to a database query function (or
+    coroutine function) in the active :class:`TimingsCollector`, if any.
+
+    :param str collection: The name of the collection queried by the decorated function
+    """
+
+    def decorator(f: Callable):
+        if inspect.iscoroutinefunction(f):
+
+            @wraps(f)
+            async def async_wrapper(*args, **kwargs):
+                collector = _collector.get()
+
+                if collector is None:
+                    return await f(*args, **kwargs)
+
+                start = time.perf_counter()
+
+                try:
+                    return await f(*args, **kwargs)
+                finally:
+                    collector.add_query(collection, time.perf_counter() - start)
+
+            return async_wrapper
+
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            collector = _collector.get()
+
+            if collector is None:
+                return f(*args, **kwargs)
+
+            start = time.perf_counter()
+
+            try:
+                return f(*args, **kwargs)
+            finally:
+                collector.add_query(collection, time.perf_counter() - start)
+
+        return wrapper
+
+    return decorator
+
+
+@contextmanager
+def query_timer(collection: str) -> Iterator[None]:
+    """Context manager that records the database query issued within it in the active
+    :class:`TimingsCollector`, if any, for functions querying several collections.
+
+    :param str collection: The name of the collection queried within the context
+    """
+    collector = _collector.get()
+
+    if collector is None:
+        yield
+        return
+
+    start = time.perf_counter()
+
+    try:
+        yield
+    finally:
+        collector.add_query(collection, time.perf_counter() - start)
+
+
+#: A callable receiving the timings of every validation, to export them into an external
+#: metrics system
+MetricsHook = Callable[[ValidationTimings], None]
+
+_collector = ContextVar("cookbase_timings_collector", default=None)
@@ -1,4 +1,12 @@
 """Package for handling Cookbase Schema builds."""
-from cookbase.schema import builder
+import importlib
 
-__all__ = ["builder"]
+__all__ = ["builder", "registry"]
+
+
+def __getattr__(name):
+    """Imports the :mod:`cookbase.schema` modules on first access."""
+    if name in __all__:
+        return importlib.import_module(f"{__name__}.{name}")
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
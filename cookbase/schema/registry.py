@@ -0,0 +1,163 @@
+"""
+Cookbase Schema Registry.
+
+This module keeps an in-memory registry of the :doc:`Cookbase Data Model (CBDM) <cbdm>`
+schemas, indexed by their :code:`$id`. By default it is populated from the schemas
+bundled as package data in the :file:`cookbase/schema/schemas` directory, so that any
+JSON reference among them is resolved without network access. Retrieving unregistered
+schemas through HTTP is only performed if explicitly allowed.
+"""
+import json
+import os
+import pathlib
+from typing import Any, Dict, Optional
+from urllib.parse import urldefrag
+
+import jsonschema
+
+
+class SchemaRegistry:
+    """A class that maps the :code:`$id` of every known :doc:`CBDM <cbdm>` schema into
+    its document, and serves JSON reference resolution from them.
+
+    :param schemas_dir: Path to the local directory from where the schemas are loaded,
+      defaults to the bundled :file:`cookbase/schema/schemas` directory
+    :type schemas_dir: str, optional
+    :param allow_remote: A flag indicating whether schemas that are not registered may
+      be retrieved through HTTP (and registered afterwards), defaults to :const:`False`
+    :type allow_remote: bool, optional
+
+    :ivar str schemas_dir: Path to the local directory from where the schemas were
+      loaded
+    :ivar bool allow_remote: The remote retrieval flag
+    :ivar _schemas: A dictionary mapping each schema URI into its document
+    :vartype _schemas: dict[str, dict[str, Any]]
+    """
+
+    def __init__(self, schemas_dir: Optional[str] = None, allow_remote: bool = False):
+        """Constructor method."""
+        if not schemas_dir:
+            schemas_dir = os.path.join(
+                pathlib.Path(__file__).parent.absolute(), "schemas"
+            )
+
+        self.schemas_dir: str = schemas_dir
+        self.allow_remote: bool = allow_remote
+        self._schemas: Dict[str, Dict[str, Any]] = {}
+        self.load(schemas_dir)
+
+    def load(self, schemas_dir: str) -> None:
+        """Registers every JSON Schema document found under a local directory tree.
+
+        :param str schemas_dir: Path to the local directory containing the schemas
+        """
+        for root, _, files in os.walk(schemas_dir):
+            for name in sorted(files):
+                if name.endswith(".json"):
+                    with open(os.path.join(root, name)) as f:
+                        self.register(json.load(f))
+
+    def register(self, schema: Dict[str, Any], uri: Optional[str] = None) -> None:
+        """Registers a JSON Schema document.
+
+        :param schema: The JSON Schema document
+        :type schema: dict[str, Any]
+        :param uri: The URI identifying the document, defaults to its :code:`$id`
+        :type uri: str, optional
+
+        :raises ValueError: No URI is given and the document has no :code:`$id`
+        """
+        uri = uri or schema.get("$id")
+
+        if not uri:
+            raise ValueError("the schema has no '$id' and no URI was provided")
+
+        self._schemas[urldefrag(uri)[0]] = schema
+
+    def get(self, uri: str) -> Dict[str, Any]:
+        """Retrieves a registered schema by its URI (disregarding any fragment).
+
+        If the schema is not registered and remote retrieval is allowed, it is requested
+        through HTTP and registered.
+
+        :param str uri: The URI of the schema
+        :return: The requested schema
+        :rtype: dict[str, Any]
+
+        :raises jsonschema.exceptions.RefResolutionError: The schema is not registered
+          and remote retrieval is not allowed
+        :raises requests.exceptions.RequestException: The remote retrieval failed
+        """
+        url = urldefrag(uri)[0]
+
+        try:
+            return self._schemas[url]
+        except KeyError:
+            if not self.allow_remote:
+                raise jsonschema.exceptions.RefResolutionError(
+                    f"Schema '{url}' is not registered and remote retrieval is disabled"
+                )
+
+        import requests
+
+        r = requests.get(url)
+        r.raise_for_status()
+        self._schemas[url] = r.json()
+        return self._schemas[url]
+
+    def resolver_for(self, schema: Dict[str, Any]) -> jsonschema.RefResolver:
+        """Provides a resolver for a schema whose references are served by the
+        registry.
+
+        :param schema: The referring schema
+        :type schema: dict[str, Any]
+        :return: A resolver to be used when validating against `schema`
+        :rtype: jsonschema.RefResolver
+        """
+        return jsonschema.RefResolver(
+            schema.get("$id", ""),
+            schema,
+            store=self._schemas,
+            handlers={"http": self.get, "https": self.get},
+        )
+
+    def __contains__(self, uri: str) -> bool:
+        return urldefrag(uri)[0] in self._schemas
+
+    def __len__(self) -> int:
+        return len(self._schemas)
+
+
+def get_registry(
+    schemas_dir: Optional[str] = None,
+    allow_remote: bool = False,
+    force_new_instance: bool = False,
+) -> SchemaRegistry:
+    """Provides the schema registry instance.
+
+    The first time this function is called (or if the `force_new_instance` flag is set
+    to :const:`True`) a :class:`SchemaRegistry` object is instantiated with the given
+    arguments; afterwards, the already available instance is returned, disregarding
+    them.
+
+    :param schemas_dir: Path to the local directory from where the schemas are loaded,
+      defaults to the bundled :file:`cookbase/schema/schemas` directory
+    :type schemas_dir: str, optional
+    :param allow_remote: A flag indicating whether unregistered schemas may be retrieved
+      through HTTP, defaults to :const:`False`
+    :type allow_remote: bool, optional
+    :param force_new_instance: A flag indicating whether a new registry instance must be
+      initialized, defaults to :const:`False`
+    :type force_new_instance: bool, optional
+    :return: The schema registry
+    :rtype: SchemaRegistry
+    """
+    global _registry
+
+    if _registry is None or force_new_instance:
+        _registry = SchemaRegistry(schemas_dir, allow_remote)
+
+    return _registry
+
+
+_registry = None
@@ -0,0 +1,582 @@
+import asyncio
+import copy
+import unittest
+
+import pymongo
+from bson.objectid import ObjectId
+from cookbase import metrics
+from cookbase.db import aiohandler, exceptions, handler, utils, writer
+from cookbase.graph.cbrgraph import CBRGraph
+from cookbase.graph.compact import CompactCBRGraph
+from cookbase.parsers.utils import parse_cbr
+from cookbase.validation import cbr
+from cookbase.validation.cache import ValidationResultCache
+
+
+def project(doc, projection):
+    """Applies a MongoDB projection to a document, excluding top-level fields or
+    including (possibly nested) fields."""
+    if doc is None or projection is None:
+        return doc
+
+    included = [k for k, v in projection.items() if v and k != "_id"]
+
+    if not included:
+        return {k: v for k, v in doc.items() if projection.get(k, True)}
+
+    doc = utils.project(doc, included)
+
+    if not projection.get("_id", True):
+        del doc["_id"]
+
+    return doc
+
+
+class FakeInsertOneResult:
+    """In-process stand-in for :class:`pymongo.results.InsertOneResult`."""
+
+    def __init__(self, inserted_id):
+        self.acknowledged = True
+        self.inserted_id = inserted_id
+
+
+class FakeInsertManyResult:
+    """In-process stand-in for :class:`pymongo.results.InsertManyResult`."""
+
+    def __init__(self, inserted_ids):
+        self.acknowledged = True
+        self.inserted_ids = inserted_ids
+
+
+class FakeAsyncCursor:
+    """In-process stand-in for :class:`motor.motor_asyncio.AsyncIOMotorCursor`."""
+
+    def __init__(self, collection, docs, projection=None):
+        self._collection = collection
+        self._docs = [project(d, projection) for d in docs]
+
+    async def to_list(self, length):
+        async with self._collection.query():
+            return copy.deepcopy(self._docs[:length])
+
+    async def __aiter__(self):
+        async with self._collection.query():
+            docs = copy.deepcopy(self._docs)
+
+        for doc in docs:
+            yield doc
+
+
+class FakeAsyncCollection:
+    """In-process stand-in for :class:`motor.motor_asyncio.AsyncIOMotorCollection`,
+    which keeps track of the number of queries simultaneously in flight.
+    """
+
+    def __init__(self, database, name, docs=()):
+        self._database = database
+        self.name = name
+        self.docs = {d["_id"]: d for d in docs}
+
+    def query(self):
+        return self._database.query()
+
+    async def find_one(self, query, projection=None):
+        async with self.query():
+            doc_id = query.get("_id") if isinstance(query, dict) else query
+            return copy.deepcopy(project(self.docs.get(doc_id), projection))
+
+    def find(self, query=None, projection=None, batch_size=0):
+        if not query:
+            return FakeAsyncCursor(self, list(self.docs.values()), projection)
+
+        ids = query["_id"]["$in"]
+        return FakeAsyncCursor(
+            self, [self.docs[i] for i in ids if i in self.docs], projection
+        )
+
+    async def insert_one(self, doc):
+        async with self.query():
+            doc.setdefault("_id", ObjectId())
+            self.docs[doc["_id"]] = copy.deepcopy(doc)
+            return FakeInsertOneResult(doc["_id"])
+
+    async def insert_many(self, docs, ordered=True):
+        async with self.query():
+            inserted_ids = []
+            write_errors = []
+
+            for i, doc in enumerate(docs):
+                doc.setdefault("_id", ObjectId())
+
+                if doc["_id"] in self.docs:
+                    write_errors.append({"index": i, "code": 11000})
+                else:
+                    self.docs[doc["_id"]] = copy.deepcopy(doc)
+                    inserted_ids.append(doc["_id"])
+
+            if write_errors:
+                raise pymongo.errors.BulkWriteError(
+                    {"writeErrors": write_errors, "nInserted": len(inserted_ids)}
+                )
+
+            return FakeInsertManyResult(inserted_ids)
+
+
+class FakeAsyncDatabase:
+    """In-process stand-in for :class:`motor.motor_asyncio.AsyncIOMotorDatabase`, whose
+    queries take a short time to complete.
+    """
+
+    latency = 0.01
+
+    def __init__(self, cbis=(), cbas=(), cbps=()):
+        self.cbi = FakeAsyncCollection(self, "cbi", cbis)
+        self.cba = FakeAsyncCollection(self, "cba", cbas)
+        self.cbp = FakeAsyncCollection(self, "cbp", cbps)
+        self.cbr = FakeAsyncCollection(self, "cbr")
+        self.cbrgraphs = FakeAsyncCollection(self, "cbrgraphs")
+        self.queries = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def query(self):
+        database = self
+
+        class Query:
+            async def __aenter__(self):
+                database.queries += 1
+                database.in_flight += 1
+                database.max_in_flight = max(database.max_in_flight, database.in_flight)
+                await asyncio.sleep(database.latency)
+
+            async def __aexit__(self, *exc_info):
+                database.in_flight -= 1
+
+        return Query()
+
+    @classmethod
+    def from_cbrs(cls, cbrs):
+        """Creates a database holding a catalogue that covers the given :ref:`CBRs
+        <cbr>`."""
+        cbis, cbas, cbps = {}, {}, {}
+
+        for c in cbrs:
+            for i in c["ingredients"].values():
+                cbis[i["cbiId"]] = {
+                    "_id": i["cbiId"],
+                    "name": {"en": i["name"]["text"]},
+                }
+
+            for a in c["appliances"].values():
+                if "cbaId" in a:
+                    cbas[a["cbaId"]] = {
+                        "_id": a["cbaId"],
+                        "name": {"en": a["name"]["text"]},
+                        "info": {"familyLevel": 1, "functions": ["contains"]},
+                    }
+
+            for p in c["preparation"].values():
+                cbps[p["cbpId"]] = {
+                    "_id": p["cbpId"],
+                    "name": {"en": p["name"]["text"]},
+                    "info": {
+                        "validation": {"conditions": {"requiredAppliances": [[]]}}
+                    },
+                }
+
+        return cls(cbis.values(), cbas.values(), cbps.values())
+
+
+class TestAsyncDBHandler(unittest.TestCase):
+    """Test class for the :mod:`cookbase.db.aiohandler` module.
+
+    """
+
+    def setUp(self):
+        self.db = FakeAsyncDatabase(
+            cbis=[{"_id": 1, "name": "a"}, {"_id": 2, "name": "b"}],
+            cbas=[{"_id": 3, "name": "c"}],
+        )
+        self.db_handler = aiohandler.AsyncDBHandler(self.db, cache_size=8)
+
+    def test_get_cbi(self):
+        """Tests the :meth:`cookbase.db.aiohandler.AsyncDBHandler.get_cbi` method."""
+        # -- Testing correct results ---------------------------------------------------
+        self.assertEqual(
+            asyncio.run(self.db_handler.get_cbi(1)), {"id": 1, "name": "a"}
+        )
+        self.assertIsNone(asyncio.run(self.db_handler.get_cbi(4)))
+
+        # -- Testing cached results ----------------------------------------------------
+        queries = self.db.queries
+        self.assertEqual(
+            asyncio.run(self.db_handler.get_cbi(1)), {"id": 1, "name": "a"}
+        )
+        self.assertEqual(self.db.queries, queries)
+
+    def test_get_cbis(self):
+        """Tests the :meth:`cookbase.db.aiohandler.AsyncDBHandler.get_cbis` method."""
+        # -- Testing correct results ---------------------------------------------------
+        self.assertEqual(
+            asyncio.run(self.db_handler.get_cbis([1, 2, 4])),
+            {1: {"id": 1, "name": "a"}, 2: {"id": 2, "name": "b"}},
+        )
+        self.assertEqual(self.db.queries, 1)
+        self.assertEqual(asyncio.run(self.db_handler.get_cbis([])), {})
+
+        # -- Testing projected results -------------------------------------------------
+        self.assertEqual(
+            asyncio.run(self.db_handler.get_cbis([1, 2], ["info"])),
+            {1: {"id": 1}, 2: {"id": 2}},
+        )
+        self.assertEqual(self.db.queries, 1)
+
+    def test_iter_cbas(self):
+        """Tests the :meth:`cookbase.db.aiohandler.AsyncDBHandler.iter_cbas` method."""
+
+        async def collect():
+            return [cba async for cba in self.db_handler.iter_cbas()]
+
+        # -- Testing correct results ---------------------------------------------------
+        self.assertEqual(asyncio.run(collect()), [{"id": 3, "name": "c"}])
+
+        # -- Testing projected results -------------------------------------------------
+        async def collect_projected():
+            return [cba async for cba in self.db_handler.iter_cbas(["info"])]
+
+        self.assertEqual(asyncio.run(collect_projected()), [{"id": 3}])
+
+    def test_insert_cbr(self):
+        """Tests the :meth:`cookbase.db.aiohandler.AsyncDBHandler.insert_cbr`
+        method.
+        """
+        recipe = parse_cbr("resources/pizza-mozzarella.cbr")
+        graph = CBRGraph()
+        graph.build_graph(recipe)
+
+        # -- Testing correct results ---------------------------------------------------
+        result = asyncio.run(self.db_handler.insert_cbr(recipe, graph))
+        self.assertIsInstance(result, handler.InsertCBRResult)
+        self.assertEqual(result.cbr_id, result.cbrgraph_id)
+        self.assertIn(result.cbr_id, self.db.cbr.docs)
+        self.assertEqual(
+            self.db.cbrgraphs.docs[result.cbrgraph_id]["graph"]["cbrId"],
+            str(result.cbr_id),
+        )
+
+    def test_insert_cbrs(self):
+        """Tests the :meth:`cookbase.db.aiohandler.AsyncDBHandler.insert_cbrs`
+        method.
+        """
+        recipe = parse_cbr("resources/pizza-mozzarella.cbr")
+        graph = CBRGraph()
+        graph.build_graph(recipe)
+        items = [(copy.deepcopy(recipe), graph if i % 2 else None) for i in range(5)]
+
+        # -- Testing correct results ---------------------------------------------------
+        collector = metrics.TimingsCollector()
+
+        with collector.activate():
+            results = asyncio.run(self.db_handler.insert_cbrs(items, chunk_size=2))
+
+        self.assertEqual(len(results), 5)
+        self.assertEqual(len(self.db.cbr.docs), 5)
+        self.assertEqual(len(self.db.cbrgraphs.docs), 2)
+        self.assertEqual(self.db.queries, 5)
+        self.assertEqual(collector.timings.db_queries["cbr"].count, 3)
+        self.assertEqual(collector.timings.db_queries["cbrgraphs"].count, 2)
+
+        for (cbr, g), r in zip(items, results):
+            self.assertEqual(r.cbr_id, cbr["_id"])
+            self.assertEqual(r.cbrgraph_id, r.cbr_id if g else None)
+
+        # -- Testing partial failures --------------------------------------------------
+        orphan_id = ObjectId()
+        self.db.cbrgraphs.docs[orphan_id] = {"_id": orphan_id}
+        items = [
+            ({"_id": results[0].cbr_id}, graph),
+            ({"_id": orphan_id}, graph),
+            (copy.deepcopy(recipe), graph),
+            (copy.deepcopy(recipe), None),
+        ]
+
+        with self.assertRaises(exceptions.BulkCBRInsertionError) as cm:
+            asyncio.run(self.db_handler.insert_cbrs(items))
+
+        partial = cm.exception.partial_result
+        self.assertEqual(partial[0], handler.InsertCBRResult())
+        self.assertEqual(partial[1], handler.InsertCBRResult(cbr_id=orphan_id))
+        self.assertEqual(partial[2].cbrgraph_id, partial[2].cbr_id)
+        self.assertEqual(partial[3].cbrgraph_id, None)
+        self.assertEqual(sorted(cm.exception.errors), [0, 1])
+        self.assertIsInstance(cm.exception.errors[0], exceptions.CBRInsertionError)
+        self.assertIsInstance(cm.exception.errors[1], exceptions.CBRGraphInsertionError)
+        self.assertEqual(cm.exception.errors[1].partial_result, partial[1])
+
+    def test_get_cbrgraph(self):
+        """Tests the :meth:`cookbase.db.aiohandler.AsyncDBHandler.get_cbrgraph` and
+        :meth:`cookbase.db.aiohandler.AsyncDBHandler.iter_cbrgraphs` methods.
+        """
+        recipe = parse_cbr("resources/pizza-mozzarella.cbr")
+        graph = CBRGraph()
+        graph.build_graph(recipe)
+        result = asyncio.run(self.db_handler.insert_cbr(recipe, graph))
+
+        async def collect():
+            return [g async for g in self.db_handler.iter_cbrgraphs()]
+
+        # -- Testing correct results ---------------------------------------------------
+        stored = asyncio.run(self.db_handler.get_cbrgraph(result.cbr_id))
+        self.assertEqual(stored.g.graph["cbrId"], str(result.cbr_id))
+        self.assertEqual(
+            list(stored.g.nodes(data=True)), list(graph.g.nodes(data=True))
+        )
+        self.assertEqual(set(stored.g.edges), set(graph.g.edges))
+        self.assertIsNone(asyncio.run(self.db_handler.get_cbrgraph(ObjectId())))
+
+        graphs = asyncio.run(collect())
+        self.assertEqual(len(graphs), 1)
+        self.assertEqual(set(graphs[0].g.edges), set(graph.g.edges))
+
+        # -- Testing binary storage ----------------------------------------------------
+        self.db_handler.binary_graphs = True
+        result = asyncio.run(
+            self.db_handler.insert_cbr(
+                parse_cbr("resources/pizza-mozzarella.cbr"), graph
+            )
+        )
+        doc = self.db.cbrgraphs.docs[result.cbrgraph_id]
+        self.assertNotIn("nodes", doc)
+        self.assertEqual(doc["graph"]["name"], graph.g.graph["name"])
+
+        stored = asyncio.run(self.db_handler.get_cbrgraph(result.cbr_id))
+        self.assertEqual(stored.g.graph["cbrId"], str(result.cbr_id))
+        self.assertEqual(
+            list(stored.g.nodes(data=True)), list(graph.g.nodes(data=True))
+        )
+        self.assertEqual(set(stored.g.edges), set(graph.g.edges))
+        self.assertEqual(len(asyncio.run(collect())), 2)
+
+        stored = asyncio.run(self.db_handler.get_cbrgraph(result.cbr_id, compact=True))
+        self.assertIsInstance(stored, CompactCBRGraph)
+        self.assertEqual(stored.graph["cbrId"], str(result.cbr_id))
+        self.assertEqual(set(stored.to_networkx().edges), set(graph.g.edges))
+
+        # -- Testing binary storage of compact graphs ----------------------------------
+        recipe = parse_cbr("resources/pizza-mozzarella.cbr")
+        compact = CompactCBRGraph.from_cbr(recipe)
+        result = asyncio.run(self.db_handler.insert_cbr(recipe, compact))
+        self.assertNotIn("cbrId", compact.graph)
+
+        stored = asyncio.run(self.db_handler.get_cbrgraph(result.cbr_id))
+        self.assertEqual(stored.g.graph["cbrId"], str(result.cbr_id))
+        self.assertEqual(
+            list(stored.g.nodes(data=True)), list(graph.g.nodes(data=True))
+        )
+        self.assertEqual(set(stored.g.edges), set(graph.g.edges))
+
+
+class TestAsyncValidator(unittest.TestCase):
+    """Test class for the :class:`cookbase.validation.cbr.AsyncValidator` class.
+
+    """
+
+    def setUp(self):
+        self.good_cbr = parse_cbr("resources/pizza-mozzarella.cbr")
+        self.bad_cbr = parse_cbr("resources/pizza-demigrella.cbr")
+        self.db = FakeAsyncDatabase.from_cbrs([self.good_cbr, self.bad_cbr])
+        self.validator = cbr.AsyncValidator(
+            db_handler=aiohandler.AsyncDBHandler(self.db)
+        )
+
+    def test_validate(self):
+        """Tests the :meth:`cookbase.validation.cbr.AsyncValidator.validate` method."""
+        # -- Testing correct results ---------------------------------------------------
+        result = asyncio.run(self.validator.validate(self.good_cbr, strict=False))
+        self.assertTrue(result.is_valid(strict=False))
+        self.assertIsNotNone(result.cbrgraph)
+        # The catalogue lookups (and the CBA table build) are issued together
+        self.assertEqual(self.db.max_in_flight, 4)
+
+        result = asyncio.run(self.validator.validate(self.bad_cbr, strict=False))
+        self.assertFalse(result.is_valid(strict=False))
+        self.assertTrue(result.rules_results["ingredients_used_exactly_once"].errors)
+
+        result = asyncio.run(self.validator.validate({}))
+        self.assertFalse(result.schema_validated)
+
+        # -- Testing cached results ----------------------------------------------------
+        validator = cbr.AsyncValidator(
+            db_handler=self.validator.db_handler, result_cache=ValidationResultCache()
+        )
+        result = asyncio.run(validator.validate(self.good_cbr, strict=False))
+        self.assertFalse(result.from_cache)
+        result = asyncio.run(validator.validate(self.good_cbr, strict=False))
+        self.assertTrue(result.from_cache)
+        self.assertTrue(result.is_valid(strict=False))
+        self.assertEqual(validator.result_cache.cache_info().hits, 1)
+
+        # Invalidating catalogue documents discards the cached results
+        validator.db_handler.invalidate_cache("cbi", 0)
+        result = asyncio.run(validator.validate(self.good_cbr, strict=False))
+        self.assertFalse(result.from_cache)
+        validator._cba_table.load([])
+        result = asyncio.run(validator.validate(self.good_cbr, strict=False))
+        self.assertFalse(result.from_cache)
+
+        # -- Testing storage -----------------------------------------------------------
+        result = asyncio.run(
+            self.validator.validate(self.good_cbr, store=True, strict=False)
+        )
+        self.assertIn(result.storing_result.cbr_id, self.db.cbr.docs)
+
+        # -- Testing background storage ------------------------------------------------
+        class BlockingDBHandler:
+            def __init__(self, async_handler):
+                self.async_handler = async_handler
+
+            def insert_cbrs(self, items, chunk_size=1000):
+                return asyncio.run(self.async_handler.insert_cbrs(items, chunk_size))
+
+        self.validator.storage_writer = writer.StorageWriter(
+            BlockingDBHandler(self.validator._get_db_handler())
+        )
+
+        with self.validator.storage_writer:
+            result = asyncio.run(
+                self.validator.validate(
+                    parse_cbr("resources/pizza-mozzarella.cbr"),
+                    store=True,
+                    strict=False,
+                )
+            )
+            self.assertIsNotNone(result.storing)
+
+        # Closing the writer waits for the storing results to be set
+        self.assertEqual(result.storing.result(), result.storing_result)
+        self.assertIn(result.storing_result.cbr_id, self.db.cbrgraphs.docs)
+
+    def test_revalidate(self):
+        """Tests the :meth:`cookbase.validation.cbr.AsyncValidator.revalidate` method.
+        """
+
+        def outcome(result):
+            return {k: (v.errors, v.warnings) for k, v in result.rules_results.items()}
+
+        old_cbr = copy.deepcopy(self.good_cbr)
+        result = asyncio.run(self.validator.validate(old_cbr, strict=False))
+
+        # -- Testing unaffected resources ----------------------------------------------
+        new_cbr = copy.deepcopy(old_cbr)
+        ingredient = next(iter(new_cbr["ingredients"].values()))
+        ingredient["name"]["text"] += " (fresh)"
+        queries = self.db.queries
+        new_result = asyncio.run(
+            self.validator.revalidate(result, old_cbr, new_cbr, strict=False)
+        )
+        self.assertTrue(new_result.is_valid(strict=False))
+        self.assertEqual(self.db.queries, queries)
+
+        # -- Testing affected resources ------------------------------------------------
+        old_cbr, result = new_cbr, new_result
+        new_cbr = copy.deepcopy(old_cbr)
+        self.db.cbi.docs[1] = {"_id": 1, "name": {"en": "fresh mozzarella"}}
+        next(iter(new_cbr["ingredients"].values()))["cbiId"] = 1
+        queries = self.db.queries
+        new_result = asyncio.run(
+            self.validator.revalidate(result, old_cbr, new_cbr, strict=False)
+        )
+        # Only the newly referred CBI is retrieved
+        self.assertEqual(self.db.queries, queries + 1)
+        full_result = asyncio.run(self.validator.validate(new_cbr, strict=False))
+        self.assertEqual(outcome(new_result), outcome(full_result))
+
+    def test_get_cba_table(self):
+        """Tests that the
+        :meth:`cookbase.validation.cbr.AsyncValidator.get_cba_table` method refreshes
+        the CBAs invalidated through the database handler.
+        """
+        rule = "processes_and_appliances_are_valid_and_processes_requirements_met"
+
+        for cbp in self.db.cbp.docs.values():
+            cbp["info"]["validation"]["conditions"]["requiredAppliances"] = [
+                [{"function": "contains"}]
+            ]
+
+        # -- Testing correct results ---------------------------------------------------
+        result = asyncio.run(self.validator.validate(self.good_cbr, strict=False))
+        self.assertFalse(result.rules_results[rule].errors)
+
+        # -- Testing changed CBAs ------------------------------------------------------
+        for cba_id, cba in self.db.cba.docs.items():
+            cba["info"]["functions"] = ["heats"]
+            self.validator.db_handler.invalidate_cache("cba", cba_id)
+
+        result = asyncio.run(self.validator.validate(self.good_cbr, strict=False))
+        self.assertTrue(result.rules_results[rule].errors)
+
+        # -- Testing the whole collection invalidated ----------------------------------
+        for cba in self.db.cba.docs.values():
+            cba["info"]["functions"] = ["contains"]
+
+        self.validator.db_handler.invalidate_cache()
+        result = asyncio.run(self.validator.validate(self.good_cbr, strict=False))
+        self.assertFalse(result.rules_results[rule].errors)
+
+    def test_validate_many(self):
+        """Tests the :meth:`cookbase.validation.cbr.AsyncValidator.validate_many`
+        method.
+        """
+
+        async def validate_many(cbrs, **kwargs):
+            return [
+                (i, r.is_valid(strict=False))
+                async for i, r in self.validator.validate_many(
+                    cbrs, strict=False, **kwargs
+                )
+            ]
+
+        async def aiter_cbrs(cbrs):
+            for c in cbrs:
+                yield c
+
+        cbrs = [self.good_cbr, self.bad_cbr] * 4
+        expected = [(i, i % 2 == 0) for i in range(len(cbrs))]
+
+        # -- Testing ordered results ---------------------------------------------------
+        self.assertEqual(asyncio.run(validate_many(cbrs, max_pending=3)), expected)
+        self.assertEqual(asyncio.run(validate_many(aiter_cbrs(cbrs))), expected)
+
+        # -- Testing unordered results -------------------------------------------------
+        results = asyncio.run(validate_many(iter(cbrs), ordered=False, max_pending=3))
+        self.assertEqual(sorted(results), expected)
+
+        # -- Testing the number of pending validations ---------------------------------
+        self.db.max_in_flight = 0
+        asyncio.run(validate_many(cbrs, max_pending=1))
+        # The catalogue lookups of a single CBR are issued together
+        self.assertLessEqual(self.db.max_in_flight, 3)
+
+    def test_validate_concurrently(self):
+        """Tests concurrent calls to the
+        :meth:`cookbase.validation.cbr.AsyncValidator.validate` method.
+        """
+
+        async def validate_all():
+            return await asyncio.gather(
+                *(
+                    self.validator.validate(c, strict=False)
+                    for c in [self.good_cbr, self.bad_cbr] * 4
+                )
+            )
+
+        # -- Testing correct results ---------------------------------------------------
+        results = asyncio.run(validate_all())
+        self.assertEqual([r.is_valid(strict=False) for r in results], [True, False] * 4)
+        self.assertGreater(self.db.max_in_flight, 4)
+        # The CBA table is only built once
+        self.assertEqual(self.db.queries, 1 + 3 * 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
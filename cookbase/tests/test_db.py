@@ -1,10 +1,18 @@
 import os
 import pathlib
+import shutil
+import tempfile
+import threading
 import unittest
+import unittest.mock
 
 import pymongo
-from cookbase.db import exceptions, handler, utils
+from bson import json_util
+from bson.objectid import ObjectId
+from cookbase import metrics
+from cookbase.db import cache, exceptions, handler, utils, writer
 from cookbase.graph.cbrgraph import CBRGraph
+from cookbase.parsers.utils import parse_cbr
 
 
 class TestDBHandler(unittest.TestCase):
@@ -48,6 +56,12 @@ class TestDBHandler(unittest.TestCase):
         with self.assertRaises(exceptions.InvalidDBTypeError):
             handler.DBHandler(mongodb_url, db_type="FakeQL", db_name="valid_name")
 
+        # -- Testing construction arguments --------------------------------------------
+        db_handler = handler.DBHandler(mongodb_url, cache_size=4, binary_graphs=True)
+        init_args = db_handler.init_args
+        self.assertTrue(init_args["binary_graphs"])
+        self.assertEqual(handler.DBHandler(**init_args).init_args, init_args)
+
     def test_get_db_client(self):
         """Tests the :meth:`cookbase.db.handler.DBHandler.get_db_client` method."""
         # -- Testing correct result ----------------------------------------------------
@@ -91,6 +105,43 @@ class TestDBHandler(unittest.TestCase):
         )
         self.db_handler._default_db.cbp.delete_one({"_id": result.inserted_id})
 
+    def test_get_cbis(self):
+        """Tests the :meth:`cookbase.db.handler.DBHandler.get_cbis` method."""
+        test_dicts = [{"unit": "test"}, {"unit": "test"}]
+        result = self.db_handler._default_db.cbi.insert_many(test_dicts)
+        self.assertEqual(
+            self.db_handler.get_cbis(result.inserted_ids + result.inserted_ids),
+            {d["id"]: d for d in map(utils.deunderscore_id, test_dicts)},
+        )
+        self.assertEqual(self.db_handler.get_cbis([]), {})
+        self.db_handler._default_db.cbi.delete_many(
+            {"_id": {"$in": result.inserted_ids}}
+        )
+
+    def test_get_cbas(self):
+        """Tests the :meth:`cookbase.db.handler.DBHandler.get_cbas` method."""
+        test_dicts = [{"unit": "test"}, {"unit": "test"}]
+        result = self.db_handler._default_db.cba.insert_many(test_dicts)
+        self.assertEqual(
+            self.db_handler.get_cbas(result.inserted_ids),
+            {d["id"]: d for d in map(utils.deunderscore_id, test_dicts)},
+        )
+        self.db_handler._default_db.cba.delete_many(
+            {"_id": {"$in": result.inserted_ids}}
+        )
+
+    def test_get_cbps(self):
+        """Tests the :meth:`cookbase.db.handler.DBHandler.get_cbps` method."""
+        test_dicts = [{"unit": "test"}, {"unit": "test"}]
+        result = self.db_handler._default_db.cbp.insert_many(test_dicts)
+        self.assertEqual(
+            self.db_handler.get_cbps(result.inserted_ids),
+            {d["id"]: d for d in map(utils.deunderscore_id, test_dicts)},
+        )
+        self.db_handler._default_db.cbp.delete_many(
+            {"_id": {"$in": result.inserted_ids}}
+        )
+
     def test_get_cbr(self):
         """Tests the :meth:`cookbase.db.handler.DBHandler.get_cbr` method."""
         test_dict = {"unit": "test"}
@@ -101,6 +152,40 @@ class TestDBHandler(unittest.TestCase):
         )
         self.db_handler._default_db.cbr.delete_one({"_id": result.inserted_id})
 
+    def test_get_cbrgraph(self):
+        """Tests the :meth:`cookbase.db.handler.DBHandler.get_cbrgraph` and
+        :meth:`cookbase.db.handler.DBHandler.iter_cbrgraphs` methods.
+        """
+        recipe = parse_cbr("resources/pizza-mozzarella.cbr")
+        test_graph = CBRGraph()
+        test_graph.build_graph(recipe)
+        results = self.db_handler.insert_cbr(recipe, test_graph)
+
+        try:
+            # -- Testing correct result --------------------------------------------
+            graph = self.db_handler.get_cbrgraph(results.cbr_id)
+            self.assertEqual(graph.g.graph["cbrId"], str(results.cbr_id))
+            self.assertEqual(
+                dict(graph.g.nodes(data=True)), dict(test_graph.g.nodes(data=True))
+            )
+            self.assertEqual(set(graph.g.edges), set(test_graph.g.edges))
+
+            graphs = list(
+                self.db_handler.iter_cbrgraphs(
+                    {"graph.cbrId": str(results.cbr_id)}, batch_size=1
+                )
+            )
+            self.assertEqual(len(graphs), 1)
+            self.assertEqual(set(graphs[0].g.edges), set(test_graph.g.edges))
+        finally:
+            self.db_handler._default_db.cbr.delete_one({"_id": results.cbr_id})
+            self.db_handler._default_db.cbrgraphs.delete_one(
+                {"_id": results.cbrgraph_id}
+            )
+
+        # -- Testing missing CBRGraph ----------------------------------------------
+        self.assertIsNone(self.db_handler.get_cbrgraph(results.cbr_id))
+
     def test_insert_cbr(self):
         """Tests the :meth:`cookbase.db.handler.DBHandler.insert_cbr` method."""
         test_dict = {"unit": "test"}
@@ -152,6 +237,45 @@ class TestDBHandler(unittest.TestCase):
 
         # TODO: Cases where the insertions are not acknowledged are not tested
 
+    def test_insert_cbrs(self):
+        """Tests the :meth:`cookbase.db.handler.DBHandler.insert_cbrs` method."""
+        items = [
+            ({"unit": "test", "n": i}, CBRGraph() if i % 2 else None) for i in range(5)
+        ]
+        extra_item = ({"unit": "test"}, None)
+
+        try:
+            # -- Testing correct result ------------------------------------
+            collector = metrics.TimingsCollector()
+
+            with collector.activate():
+                results = self.db_handler.insert_cbrs(items, chunk_size=2)
+
+            self.assertEqual(collector.timings.db_queries["cbr"].count, 3)
+            self.assertEqual(collector.timings.db_queries["cbrgraphs"].count, 2)
+            self.assertEqual(
+                results,
+                [
+                    handler.InsertCBRResult(cbr["_id"], cbr["_id"] if g else None)
+                    for cbr, g in items
+                ],
+            )
+
+            # -- Testing partial failures (DuplicateKeyError) --------------
+            with self.assertRaises(exceptions.BulkCBRInsertionError) as cm:
+                self.db_handler.insert_cbrs([items[0], extra_item])
+
+            self.assertEqual(list(cm.exception.errors), [0])
+            self.assertIsInstance(cm.exception.errors[0], exceptions.CBRInsertionError)
+            self.assertEqual(
+                cm.exception.partial_result[1],
+                handler.InsertCBRResult(extra_item[0]["_id"]),
+            )
+        finally:
+            ids = [cbr["_id"] for cbr, _ in items + [extra_item] if "_id" in cbr]
+            self.db_handler._default_db.cbr.delete_many({"_id": {"$in": ids}})
+            self.db_handler._default_db.cbrgraphs.delete_many({"_id": {"$in": ids}})
+
     @unittest.skipIf(not test_exhaustive, "test_close_connections() explicitly skipped")
     def test_close_connections(self):
         """Tests the :meth:`cookbase.db.handler.DBHandler.close_connections` method."""
@@ -162,5 +286,200 @@ class TestDBHandler(unittest.TestCase):
         self.db_handler = handler.get_handler(force_new_instance=True)
 
 
+class TestDocumentCache(unittest.TestCase):
+    """Test class for the :mod:`cookbase.db.cache` module.
+
+    """
+
+    def setUp(self):
+        self.now = 0.0
+        self.cache = cache.DocumentCache(maxsize=2, ttl=10, timer=lambda: self.now)
+
+    def test_get(self):
+        """Tests the :meth:`cookbase.db.cache.DocumentCache.get` method."""
+        test_dict = {"id": 1, "info": {"functions": ["cuts"]}}
+        self.cache.put("cba", 1, test_dict)
+
+        # -- Testing correct result ----------------------------------------------------
+        self.assertEqual(self.cache.get("cba", 1), test_dict)
+        self.assertIsNone(self.cache.get("cbi", 1))
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+        # -- Testing isolation of cached documents from callers ------------------------
+        test_dict["info"]["functions"].append("bakes")
+        self.cache.get("cba", 1)["info"]["functions"].append("bakes")
+        self.assertEqual(self.cache.get("cba", 1)["info"]["functions"], ["cuts"])
+
+        # -- Testing projected documents -----------------------------------------------
+        self.assertEqual(
+            self.cache.get("cba", 1, ["info.functions"]),
+            {"id": 1, "info": {"functions": ["cuts"]}},
+        )
+        self.assertEqual(self.cache.get("cba", 1, ["name"]), {"id": 1})
+        self.cache.put("cbp", 1, {"id": 1, "info": {"parent": 2}}, ["info"])
+        self.assertEqual(self.cache.get("cbp", 1, ["info.parent"])["info"]["parent"], 2)
+        misses = self.cache.misses
+        self.assertIsNone(self.cache.get("cbp", 1))
+        self.assertIsNone(self.cache.get("cbp", 1, ["name", "info"]))
+        self.assertEqual(self.cache.misses, misses + 2)
+
+        # -- Testing expiration --------------------------------------------------------
+        self.now = 10.0
+        self.assertIsNone(self.cache.get("cba", 1))
+        self.assertEqual(self.cache.info().size, 1)
+
+    def test_put(self):
+        """Tests the :meth:`cookbase.db.cache.DocumentCache.put` method."""
+        # -- Testing least-recently-used eviction --------------------------------------
+        self.cache.put("cbi", 1, {"id": 1})
+        self.cache.put("cbi", 2, {"id": 2})
+        self.cache.get("cbi", 1)
+        self.cache.put("cbi", 3, {"id": 3})
+        self.assertIsNotNone(self.cache.get("cbi", 1))
+        self.assertIsNone(self.cache.get("cbi", 2))
+        self.assertIsNotNone(self.cache.get("cbi", 3))
+
+        # -- Testing projected documents -----------------------------------------------
+        test_dict = {"id": 1, "name": "Knife", "info": {"functions": ["cuts"]}}
+        self.cache.put("cba", 1, test_dict)
+        self.cache.put("cba", 1, {"id": 1, "name": "Knife"}, ["name"])
+        self.assertEqual(self.cache.get("cba", 1), test_dict)
+        self.now = 10.0
+        self.cache.put("cba", 1, {"id": 1, "name": "Fork"}, ["name"])
+        self.assertIsNone(self.cache.get("cba", 1))
+        self.assertEqual(self.cache.get("cba", 1, ["name"]), {"id": 1, "name": "Fork"})
+
+    def test_invalidate(self):
+        """Tests the :meth:`cookbase.db.cache.DocumentCache.invalidate` method."""
+        self.cache.put("cbi", 1, {"id": 1})
+        self.cache.put("cba", 1, {"id": 1})
+
+        self.cache.invalidate("cba", 2)
+        self.assertEqual(self.cache.info().size, 2)
+        self.cache.invalidate("cba")
+        self.assertIsNone(self.cache.get("cba", 1))
+        self.assertIsNotNone(self.cache.get("cbi", 1))
+        self.cache.invalidate()
+        self.assertEqual(self.cache.info().size, 0)
+
+
+class FakeDBHandler:
+    """In-process stand-in for :class:`cookbase.db.handler.DBHandler` storing CBRs in
+    bulk, failing those whose :code:`n` field is in `fail` and waiting for `gate`
+    before each batch.
+    """
+
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.gate = threading.Event()
+        self.gate.set()
+        self.batches = []
+
+    def insert_cbrs(self, items, chunk_size=1000):
+        self.gate.wait()
+        self.batches.append(len(items))
+        results = []
+        errors = {}
+
+        for i, (cbr, cbrgraph) in enumerate(items):
+            if cbr.get("n") in self.fail:
+                results.append(handler.InsertCBRResult())
+                errors[i] = exceptions.CBRInsertionError(handler.InsertCBRResult())
+            else:
+                cbr.setdefault("_id", ObjectId())
+                results.append(
+                    handler.InsertCBRResult(
+                        cbr["_id"], cbr["_id"] if cbrgraph is not None else None
+                    )
+                )
+
+        if errors:
+            raise exceptions.BulkCBRInsertionError(results, errors)
+
+        return results
+
+
+class TestStorageWriter(unittest.TestCase):
+    """Test class for the :mod:`cookbase.db.writer` module.
+
+    """
+
+    def setUp(self):
+        self.db_handler = FakeDBHandler(fail={1})
+        self.dead_letter_path = os.path.join(tempfile.mkdtemp(), "failed.jsonl")
+        self.writer = writer.StorageWriter(
+            self.db_handler,
+            max_queued=10,
+            batch_size=2,
+            dead_letter_path=self.dead_letter_path,
+        )
+
+    def tearDown(self):
+        self.writer.close()
+        shutil.rmtree(os.path.dirname(self.dead_letter_path))
+
+    def test_submit(self):
+        """Tests the :meth:`cookbase.db.writer.StorageWriter.submit` and
+        :meth:`cookbase.db.writer.StorageWriter.flush` methods.
+        """
+        self.db_handler.gate.clear()
+        items = [({"n": n}, CBRGraph() if n % 2 else None) for n in range(5)]
+        futures = [self.writer.submit(cbr, cbrgraph) for cbr, cbrgraph in items]
+
+        # -- Testing correct results ---------------------------------------------------
+        self.assertFalse(any(f.done() for f in futures))
+        self.assertFalse(self.writer.flush(timeout=0.01))
+        self.db_handler.gate.set()
+        self.assertTrue(self.writer.flush(timeout=5))
+        self.assertEqual(sum(self.db_handler.batches), 5)
+        self.assertLessEqual(max(self.db_handler.batches), 2)
+
+        for n in (0, 2, 4):
+            self.assertEqual(
+                futures[n].result(), handler.InsertCBRResult(items[n][0]["_id"])
+            )
+
+        self.assertEqual(
+            futures[3].result(),
+            handler.InsertCBRResult(items[3][0]["_id"], items[3][0]["_id"]),
+        )
+
+        # -- Testing failures ----------------------------------------------------------
+        self.assertIsInstance(futures[1].exception(), exceptions.CBRInsertionError)
+        self.assertEqual(self.writer.failures, 1)
+
+        with open(self.dead_letter_path) as f:
+            records = [json_util.loads(line) for line in f]
+
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["cbr"], {"n": 1})
+        self.assertIsNotNone(records[0]["cbrgraph"])
+
+        self.db_handler.insert_cbrs = mock_failure = unittest.mock.Mock(
+            side_effect=pymongo.errors.AutoReconnect()
+        )
+        futures = [self.writer.submit({"n": n}) for n in range(3)]
+        self.assertTrue(self.writer.flush(timeout=5))
+        self.assertTrue(mock_failure.called)
+
+        for f in futures:
+            self.assertIsInstance(f.exception(), pymongo.errors.AutoReconnect)
+
+        self.assertEqual(self.writer.failures, 4)
+
+    def test_close(self):
+        """Tests the :meth:`cookbase.db.writer.StorageWriter.close` method."""
+        futures = [self.writer.submit({"n": n}) for n in (0, 2, 4)]
+
+        # -- Testing correct results ---------------------------------------------------
+        self.assertTrue(self.writer.close(timeout=5))
+        self.assertTrue(all(f.done() for f in futures))
+        self.assertTrue(self.writer.closed)
+        self.assertFalse(self.writer._thread.is_alive())
+
+        # -- Testing submissions after closing -----------------------------------------
+        self.assertRaises(RuntimeError, self.writer.submit, {"n": 6})
+
+
 if __name__ == "__main__":
     unittest.main()
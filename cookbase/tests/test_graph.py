@@ -0,0 +1,385 @@
+import copy
+import unittest
+
+from cookbase.graph.cbrgraph import CBRGraph
+from cookbase.graph.cbrindex import CBRIndex
+from cookbase.graph.compact import MAGIC, CompactCBRGraph
+from cookbase.parsers.utils import parse_cbr
+from cookbase.validation.rules import Graph
+
+
+class TestCBRIndex(unittest.TestCase):
+    """Test class for the :class:`cookbase.graph.cbrindex.CBRIndex` class.
+
+    """
+
+    def setUp(self):
+        self.cbr = parse_cbr("resources/pizza-mozzarella.cbr")
+
+    def test_build(self):
+        """Tests the :meth:`cookbase.graph.cbrindex.CBRIndex.build` method."""
+        # -- Testing correct results ---------------------------------------------------
+        index = CBRIndex.from_cbr(self.cbr)
+        self.assertEqual(list(index.ingredients), list(self.cbr["ingredients"]))
+        self.assertEqual(index.processes["proc3"], 2)
+        self.assertEqual(
+            index.foodstuff_edges[:5],
+            [
+                ("ing2", "proc1"),
+                ("ing3", "proc1"),
+                ("ing4", "proc1"),
+                ("proc1", "proc2"),
+                ("ing1", "proc3"),
+            ],
+        )
+        self.assertEqual(index.appliance_uses["app1"][:3], ["proc1", "proc2", "proc3"])
+        self.assertFalse(index.unresolved_foodstuffs)
+        self.assertFalse(index.unresolved_appliances)
+
+        # -- Testing unresolved and unused references ----------------------------------
+        preparation = self.cbr["preparation"]
+        preparation["proc1"]["foodstuffsList"] = ["ing3", "ghost", "proc4"]
+        preparation["proc2"]["appliances"][0]["appliance"] = "app0"
+        index = CBRIndex.from_cbr(self.cbr)
+        self.assertEqual(index.unresolved_foodstuffs, [("ghost", "proc1")])
+        self.assertEqual(index.unresolved_appliances, [("app0", "proc2")])
+        self.assertEqual(index.unused_ingredients(), ["ing2", "ing4"])
+        self.assertNotIn("app1", index.unused_appliances())
+        # Edges from processes defined later come last
+        self.assertEqual(index.foodstuff_edges[-1], ("proc4", "proc1"))
+
+
+class TestCBRGraph(unittest.TestCase):
+    """Test class for the :class:`cookbase.graph.cbrgraph.CBRGraph` class.
+
+    """
+
+    def setUp(self):
+        self.cbr = parse_cbr("resources/pizza-mozzarella.cbr")
+
+    def test_build_graph(self):
+        """Tests the :meth:`cookbase.graph.cbrgraph.CBRGraph.build_graph` method."""
+        self.cbr["preparation"]["proc1"]["foodstuffsList"] = ["ing2", "ghost", "proc4"]
+        graph = CBRGraph()
+
+        # -- Testing correct results ---------------------------------------------------
+        graph.build_graph(self.cbr)
+        self.assertEqual(len(graph.get_ingredients()), len(self.cbr["ingredients"]))
+        self.assertEqual(len(graph.get_processes()), len(self.cbr["preparation"]))
+        self.assertEqual(graph.g.nodes["ghost"]["type"], "unref_foodstuff")
+        self.assertEqual(
+            list(graph.g.predecessors("proc1")), ["ing2", "proc4", "ghost"]
+        )
+        self.assertEqual(graph.g.nodes["proc2"]["appliances"]["app1"]["type"], "cba")
+
+        # Processes added one by one result in the same graph
+        other = CBRGraph()
+
+        for k, v in self.cbr["ingredients"].items():
+            other.add_ingredient(k, v)
+
+        for k, v in self.cbr["appliances"].items():
+            other.add_appliance(k, v)
+
+        for k, v in self.cbr["preparation"].items():
+            other.add_process(k, v)
+
+        other.resolve_pending_processes_edges()
+        self.assertEqual(other._pending_processes_edges, [("ghost", "proc1")])
+        other.g.add_node("ghost", type="unref_foodstuff")
+        other.g.add_edge("ghost", "proc1")
+        self.assertEqual(list(graph.g.nodes(data=True)), list(other.g.nodes(data=True)))
+        self.assertEqual(list(graph.g.edges), list(other.g.edges))
+
+        # -- Testing a given index -----------------------------------------------------
+        other.build_graph(self.cbr, CBRIndex.from_cbr(self.cbr))
+        self.assertEqual(list(graph.g.edges), list(other.g.edges))
+
+    def test_update_graph(self):
+        """Tests the :meth:`cookbase.graph.cbrgraph.CBRGraph.update_graph` method."""
+        graph = CBRGraph()
+        graph.build_graph(self.cbr)
+        new_cbr = copy.deepcopy(self.cbr)
+        new_cbr["ingredients"]["ing1"]["cbiId"] = 0
+        del new_cbr["preparation"]["proc2"]
+        new_cbr["appliances"]["app4"].pop("cbaId")
+        new_cbr["appliances"]["app4"]["functions"] = ["contains"]
+        changes = {
+            "ingredients": ["ing1"],
+            "appliances": ["app4"],
+            "preparation": ["proc2"],
+        }
+
+        # -- Testing correct results ---------------------------------------------------
+        self.assertTrue(graph.update_graph(new_cbr, changes))
+        expected = CBRGraph()
+        expected.build_graph(new_cbr)
+        self.assertEqual(
+            dict(graph.g.nodes(data=True)), dict(expected.g.nodes(data=True))
+        )
+        self.assertEqual(set(graph.g.edges), set(expected.g.edges))
+        # The process referring to the removed one now refers to a foodstuff not found
+        self.assertEqual(graph.g.nodes["proc2"]["type"], "unref_foodstuff")
+        self.assertEqual(
+            graph.g.nodes["proc3"]["appliances"]["app4"]["type"], "cba-virtual"
+        )
+
+        self.assertFalse(graph.update_graph(new_cbr, changes))
+
+    def test_from_serializable_graph(self):
+        """Tests the
+        :meth:`cookbase.graph.cbrgraph.CBRGraph.from_serializable_graph` method.
+        """
+        graph = CBRGraph()
+        graph.build_graph(self.cbr)
+
+        # -- Testing correct results ---------------------------------------------------
+        other = CBRGraph.from_serializable_graph(graph.get_serializable_graph())
+        self.assertEqual(other.g.graph, graph.g.graph)
+        self.assertEqual(list(other.g.nodes(data=True)), list(graph.g.nodes(data=True)))
+        self.assertEqual(set(other.g.edges), set(graph.g.edges))
+        self.assertEqual(list(other.get_processes()), list(graph.get_processes()))
+        self.assertEqual(
+            other.processes_summary().roots, graph.processes_summary().roots
+        )
+        self.assertEqual(other.appliance_conflicts(), graph.appliance_conflicts())
+
+        # The rebuilt graph can be updated in place
+        new_cbr = copy.deepcopy(self.cbr)
+        new_cbr["appliances"]["app4"].pop("cbaId")
+        self.assertTrue(other.update_graph(new_cbr, {"appliances": ["app4"]}))
+        self.assertEqual(
+            other.g.nodes["proc3"]["appliances"]["app4"]["type"], "cba-virtual"
+        )
+
+    def test_to_bytes(self):
+        """Tests the :meth:`cookbase.graph.cbrgraph.CBRGraph.to_bytes` and
+        :meth:`cookbase.graph.cbrgraph.CBRGraph.from_bytes` methods.
+        """
+        graph = CBRGraph()
+        graph.build_graph(self.cbr)
+
+        # -- Testing correct results ---------------------------------------------------
+        for compress in (True, False):
+            data = graph.to_bytes(compress)
+            self.assertTrue(data.startswith(MAGIC))
+
+            other = CBRGraph.from_bytes(data)
+            self.assertEqual(other.g.graph, graph.g.graph)
+            self.assertEqual(
+                list(other.g.nodes(data=True)), list(graph.g.nodes(data=True))
+            )
+            self.assertEqual(list(other.g.edges), list(graph.g.edges))
+            self.assertEqual(
+                other.processes_summary().roots, graph.processes_summary().roots
+            )
+            self.assertEqual(other.appliance_conflicts(), graph.appliance_conflicts())
+
+        self.assertLess(len(graph.to_bytes()), len(graph.to_bytes(compress=False)))
+
+        # -- Testing incorrect input ---------------------------------------------------
+        data = graph.to_bytes()
+        self.assertRaises(ValueError, CBRGraph.from_bytes, b"JSON" + data[4:])
+        self.assertRaises(
+            ValueError, CBRGraph.from_bytes, data[:4] + b"\xff" + data[5:]
+        )
+        self.assertRaises(ValueError, CBRGraph.from_bytes, data[:2])
+        self.assertRaises(
+            ValueError, CBRGraph.from_bytes, graph.to_bytes(compress=False)[:-1]
+        )
+
+    def test_get_nodes_by_type(self):
+        """Tests the :meth:`cookbase.graph.cbrgraph.CBRGraph.get_ingredients` and
+        :meth:`cookbase.graph.cbrgraph.CBRGraph.get_processes` methods.
+        """
+        graph = CBRGraph()
+        ingredients = graph.get_ingredients()
+        processes = graph.get_processes()
+
+        # -- Testing correct results ---------------------------------------------------
+        graph.build_graph(self.cbr)
+        self.assertEqual(list(ingredients), list(self.cbr["ingredients"]))
+        self.assertEqual(list(processes), list(self.cbr["preparation"]))
+
+        # The views follow the changes of the graph
+        new_cbr = copy.deepcopy(self.cbr)
+        del new_cbr["ingredients"]["ing1"]
+        del new_cbr["preparation"]["proc2"]
+        new_cbr["ingredients"]["ing2"]["cbiId"] = 0
+        graph.update_graph(
+            new_cbr, {"ingredients": ["ing1", "ing2"], "preparation": ["proc2"]}
+        )
+        self.assertNotIn("ing1", ingredients)
+        self.assertNotIn("proc2", processes)
+        self.assertEqual(list(ingredients), list(new_cbr["ingredients"]))
+        self.assertEqual(
+            {n for n, t in graph.g.nodes(data="type") if t == "cbp"}, set(processes)
+        )
+
+        graph.clear()
+        self.assertFalse(ingredients or processes)
+
+    def test_processes_summary(self):
+        """Tests the :meth:`cookbase.graph.cbrgraph.CBRGraph.processes_summary`
+        method.
+        """
+        graph = CBRGraph()
+        graph.build_graph(self.cbr)
+
+        # -- Testing correct results ---------------------------------------------------
+        summary = graph.processes_summary()
+        self.assertEqual(summary.roots, ("proc1", "proc16", "proc22"))
+        self.assertEqual(summary.leaves, ("proc27",))
+        self.assertEqual(graph.path_joining_processes(), ["proc20", "proc24"])
+        self.assertIn("proc24", summary.path_joining_set)
+        self.assertIs(graph.processes_summary(), summary)
+
+        # -- Testing invalidation ------------------------------------------------------
+        version = graph.version
+        new_cbr = copy.deepcopy(self.cbr)
+        del new_cbr["preparation"]["proc1"]
+        graph.update_graph(new_cbr, {"preparation": ["proc1"]})
+        self.assertGreater(graph.version, version)
+        self.assertIsNot(graph.processes_summary(), summary)
+        self.assertIn("proc2", graph.get_root_processes())
+
+        graph.g.add_edge("proc27", "proc2")
+        graph.mark_changed()
+        self.assertNotIn("proc2", graph.get_root_processes())
+
+    def test_aggregated_appliances_graph(self):
+        """Tests the
+        :meth:`cookbase.graph.cbrgraph.CBRGraph.aggregated_appliances_graph` method.
+        """
+        graph = CBRGraph()
+        graph.build_graph(self.cbr)
+
+        # -- Testing correct results ---------------------------------------------------
+        ag = graph.aggregated_appliances_graph()
+        self.assertEqual(
+            [ag.nodes[n]["processes"] for n in range(4)],
+            [
+                [f"proc{i}" for i in range(1, 16)],
+                ["proc16", "proc17", "proc18", "proc19"],
+                ["proc22", "proc23"],
+                ["proc20"],
+            ],
+        )
+        self.assertEqual(ag.nodes[2]["appliances"]["app6"], ["proc22"])
+        self.assertEqual(
+            sorted(ag.edges), [(0, 3), (1, 3), (2, 5), (3, 4), (4, 5), (5, 6)]
+        )
+
+        # -- Testing processes in a cycle ----------------------------------------------
+        self.cbr["preparation"]["proc17"]["foodstuffsList"].append("proc19")
+        graph.build_graph(self.cbr)
+        ag = graph.aggregated_appliances_graph()
+        paths = [p for _, d in ag.nodes(data=True) for p in d["processes"]]
+        self.assertEqual(sorted(paths), sorted(graph.get_processes()))
+        self.assertEqual(len(paths), len(set(paths)))
+
+    def test_appliance_conflicts(self):
+        """Tests the :meth:`cookbase.graph.cbrgraph.CBRGraph.appliance_conflicts` and
+        :meth:`cookbase.graph.cbrgraph.CBRGraph.paths_reachability` methods.
+        """
+        graph = CBRGraph()
+        graph.build_graph(self.cbr)
+
+        # -- Testing correct results ---------------------------------------------------
+        related = graph.paths_reachability(graph.aggregated_appliances_graph())
+        self.assertEqual(related[0], 0b1111001)
+        self.assertFalse(related[2] & 0b11)
+        self.assertEqual(
+            [
+                (c.appliance, c.processes, c.other_processes)
+                for c in graph.appliance_conflicts()
+            ],
+            [
+                ("app6", ("proc16", "proc17"), ("proc22",)),
+                ("app7", ("proc16",), ("proc22",)),
+            ],
+        )
+
+        # -- Testing processes in a cycle ----------------------------------------------
+        self.cbr["preparation"]["proc17"]["foodstuffsList"].append("proc19")
+        graph.build_graph(self.cbr)
+        self.assertEqual(
+            {c.appliance for c in graph.appliance_conflicts()}, {"app6", "app7"}
+        )
+
+
+class TestCompactCBRGraph(unittest.TestCase):
+    """Test class for the :class:`cookbase.graph.compact.CompactCBRGraph` class.
+
+    """
+
+    def setUp(self):
+        self.cbr = parse_cbr("resources/pizza-mozzarella.cbr")
+        self.cbr["preparation"]["proc1"]["foodstuffsList"] = ["ing2", "ghost", "proc4"]
+
+    def test_from_cbr(self):
+        """Tests the :meth:`cookbase.graph.compact.CompactCBRGraph.from_cbr` and
+        :meth:`cookbase.graph.compact.CompactCBRGraph.to_networkx` methods.
+        """
+        graph = CBRGraph()
+        graph.build_graph(self.cbr)
+        compact = CompactCBRGraph.from_cbr(self.cbr)
+
+        # -- Testing correct results ---------------------------------------------------
+        self.assertEqual(compact.nodes, list(graph.g))
+        self.assertEqual(compact.get_ingredients(), tuple(graph.get_ingredients()))
+        self.assertEqual(compact.get_processes(), tuple(graph.get_processes()))
+        self.assertEqual(compact.out_degree("ing2"), graph.out_degree("ing2"))
+        g = compact.to_networkx()
+        self.assertEqual(g.graph, graph.g.graph)
+        self.assertEqual(list(g.nodes(data=True)), list(graph.g.nodes(data=True)))
+        self.assertEqual(set(g.edges), set(graph.g.edges))
+        self.assertEqual(list(g.predecessors("proc1")), ["ing2", "proc4", "ghost"])
+        self.assertEqual(
+            compact.get_serializable_graph()["nodes"],
+            graph.get_serializable_graph()["nodes"],
+        )
+
+        # -- Testing a given index -----------------------------------------------------
+        self.assertEqual(
+            CompactCBRGraph.from_cbr(self.cbr, CBRIndex.from_cbr(self.cbr)), compact
+        )
+
+    def test_analysis(self):
+        """Tests the analysis methods of
+        :class:`cookbase.graph.compact.CompactCBRGraph` and the Graph rules applied to
+        it.
+        """
+        for cycle in False, True:
+            if cycle:
+                self.cbr["preparation"]["proc17"]["foodstuffsList"].append("proc19")
+
+            graph = CBRGraph()
+            graph.build_graph(self.cbr)
+            compact = CompactCBRGraph.from_cbr(self.cbr)
+
+            # -- Testing correct results -----------------------------------------------
+            summary = compact.processes_summary()
+            expected = graph.processes_summary()
+            self.assertEqual(
+                (summary.roots, summary.leaves, summary.path_joining),
+                (expected.roots, expected.leaves, expected.path_joining),
+            )
+            ag = compact.aggregated_appliances_graph()
+            expected = graph.aggregated_appliances_graph()
+            self.assertEqual(
+                list(ag.nodes(data=True)), list(expected.nodes(data=True))
+            )
+            self.assertEqual(list(ag.edges), list(expected.edges))
+            self.assertEqual(compact.appliance_conflicts(), graph.appliance_conflicts())
+
+            for rule in (
+                Graph.ingredients_used_exactly_once,
+                Graph.single_final_process,
+                Graph.appliances_not_in_conflict,
+            ):
+                self.assertEqual(rule(compact), rule(graph))
+
+
+if __name__ == "__main__":
+    unittest.main()
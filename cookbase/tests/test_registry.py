@@ -0,0 +1,52 @@
+import os
+import unittest
+
+import jsonschema
+from cookbase.schema import registry
+from cookbase.validation.globals import Definitions
+
+
+class TestSchemaRegistry(unittest.TestCase):
+    """Test class for the :mod:`cookbase.schema.registry` module.
+
+    """
+
+    def setUp(self):
+        self.registry = registry.SchemaRegistry()
+
+    def test_get(self):
+        """Tests the :meth:`cookbase.schema.registry.SchemaRegistry.get` method."""
+        # -- Testing correct result ----------------------------------------------------
+        schema = self.registry.get(Definitions.cbr_schema_url)
+        self.assertEqual(schema["$id"], Definitions.cbr_schema_url)
+        self.assertIs(self.registry.get(Definitions.cbr_schema_url + "#/x"), schema)
+
+        # -- Testing schemas bundled within the package --------------------------------
+        package_dir = os.path.dirname(os.path.abspath(registry.__file__))
+        self.assertEqual(
+            os.path.commonpath(
+                [package_dir, os.path.abspath(self.registry.schemas_dir)]
+            ),
+            package_dir,
+        )
+
+        # -- Testing jsonschema.exceptions.RefResolutionError (remote disabled) --------
+        with self.assertRaises(jsonschema.exceptions.RefResolutionError):
+            self.registry.get("http://example.com/not-registered.json")
+
+    def test_resolver_for(self):
+        """Tests the :meth:`cookbase.schema.registry.SchemaRegistry.resolver_for`
+        method.
+        """
+        schema = self.registry.get(Definitions.cbr_schema_url)
+        resolver = self.registry.resolver_for(schema)
+
+        # -- Testing correct result ----------------------------------------------------
+        _, resolved = resolver.resolve("../cb-common-definitions.json#/$defs/material")
+        self.assertIn("enum", resolved)
+        _, resolved = resolver.resolve("processes/baking.json")
+        self.assertEqual(resolved["properties"]["cbpId"]["const"], 3542442864)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,43 @@
+import copy
+import os
+import tempfile
+import threading
 import unittest
 from unittest import mock
 
 import jsonschema
 from bson.objectid import ObjectId
+from cookbase import metrics
 from cookbase.db import exceptions, handler
 from cookbase.parsers.utils import parse_cbr
-from cookbase.validation import cbr
+from cookbase.validation import cache, cba, cbr, diff, engine, rules
+
+
+def catalogue(cbrs):
+    """Builds a catalogue of :ref:`CBIs <cbi>`, :ref:`CBAs <cba>` and :ref:`CBPs <cbp>`
+    that covers the given :ref:`CBRs <cbr>`, by identifier."""
+    cbis, cbas, cbps = {}, {}, {}
+
+    for c in cbrs:
+        for i in c["ingredients"].values():
+            cbis[i["cbiId"]] = {"id": i["cbiId"], "name": {"en": i["name"]["text"]}}
+
+        for a in c["appliances"].values():
+            if "cbaId" in a:
+                cbas[a["cbaId"]] = {
+                    "id": a["cbaId"],
+                    "name": {"en": a["name"]["text"]},
+                    "info": {"familyLevel": 1, "functions": ["contains"]},
+                }
+
+        for p in c["preparation"].values():
+            cbps[p["cbpId"]] = {
+                "id": p["cbpId"],
+                "name": {"en": p["name"]["text"]},
+                "info": {"validation": {"conditions": {"requiredAppliances": [[]]}}},
+            }
+
+    return cbis, cbas, cbps
 
 
 class TestCbrValidation(unittest.TestCase):
@@ -41,11 +73,40 @@ class TestCbrValidation(unittest.TestCase):
         results = self.validator.apply_validation_rules(self.bad_cbr)
         self.assertEqual(results.is_valid(strict=False), False)
 
+    def test_validate_schema(self):
+        """Tests the :meth:`cookbase.validation.cbr.Validator.validate_schema`
+        method.
+        """
+        oneof_validator = cbr.Validator(process_dispatch=False)
+
+        # -- Testing correct results ---------------------------------------------------
+        self.validator.validate_schema(self.good_cbr)
+        oneof_validator.validate_schema(self.good_cbr)
+
+        # -- Testing ValidationError on a process --------------------------------------
+        process_ref = next(iter(self.good_cbr["preparation"]))
+        self.good_cbr["preparation"][process_ref]["unexpected"] = True
+
+        with self.assertRaises(jsonschema.exceptions.ValidationError) as cm:
+            self.validator.validate_schema(self.good_cbr)
+
+        self.assertEqual(list(cm.exception.path), ["preparation", process_ref])
+        self.assertIn("unexpected", cm.exception.message)
+
+        with self.assertRaises(jsonschema.exceptions.ValidationError):
+            oneof_validator.validate_schema(self.good_cbr)
+
+        # -- Testing ValidationError on an unknown cbpId -------------------------------
+        self.good_cbr["preparation"][process_ref] = {"cbpId": -1}
+
+        with self.assertRaises(jsonschema.exceptions.ValidationError):
+            self.validator.validate_schema(self.good_cbr)
+
     @mock.patch.object(cbr.Validator, "_store", autospec=True)
     @mock.patch.object(cbr.Validator, "apply_validation_rules", autospec=True)
-    @mock.patch.object(jsonschema, "validate", autospec=True)
+    @mock.patch.object(cbr.Validator, "validate_schema", autospec=True)
     def test_validate(
-        self, mock_jsonschema_validate, mock_apply_validation_rules, mock__store
+        self, mock_validate_schema, mock_apply_validation_rules, mock__store
     ):
         """Tests the :class:`cookbase.validation.cbr.Validator.validate` method."""
         # -- Testing correct results ---------------------------------------------------
@@ -75,6 +136,657 @@ class TestCbrValidation(unittest.TestCase):
         result = self.validator.validate(self.good_cbr, store=True, strict=False)
         self.assertEqual(result.storing_result, mock__store.side_effect.partial_result)
 
+    @mock.patch.object(cbr.Validator, "validate", autospec=True)
+    def test_validate_many(self, mock_validate):
+        """Tests the :meth:`cookbase.validation.cbr.Validator.validate_many` method."""
+        # -- Testing correct results in the current process ----------------------------
+        mock_validate.side_effect = lambda self, recipe, store, strict: (
+            cbr.ValidationResult(schema_validated=recipe["valid"])
+        )
+        cbrs = [{"valid": True}, {"valid": False}]
+        results = list(self.validator.validate_many(cbrs, workers=0, strict=False))
+        self.assertEqual([i for i, _ in results], [0, 1])
+        self.assertEqual([r.schema_validated for _, r in results], [True, False])
+        mock_validate.assert_called_with(self.validator, cbrs[1], False, False)
+
+    def test_validate_many_workers(self):
+        """Tests the :meth:`cookbase.validation.cbr.Validator.validate_many` method
+        over worker processes.
+        """
+        # -- Testing correct results ---------------------------------------------------
+        cbrs = ({"info": i} for i in range(20))
+        results = list(self.validator.validate_many(cbrs, workers=2, max_pending=3))
+        self.assertEqual([i for i, _ in results], list(range(20)))
+        self.assertFalse(any(r.schema_validated for _, r in results))
+
+        cbrs = ({"info": i} for i in range(20))
+        results = self.validator.validate_many(cbrs, workers=2, ordered=False)
+        self.assertEqual(sorted(i for i, _ in results), list(range(20)))
+
+        # -- Testing the database handler of the workers -------------------------------
+        handler_args = {"mongodb_url": "mongodb://localhost", "binary_graphs": True}
+
+        with mock.patch.object(handler, "DBHandler", autospec=True) as mock_db_handler:
+            with mock.patch.object(handler, "_db_handler", None):
+                cbr._init_worker(self.validator._worker_args, handler_args)
+                self.assertIs(handler._db_handler, mock_db_handler.return_value)
+
+        mock_db_handler.assert_called_once_with(**handler_args)
+
+    @mock.patch.object(cbr.Validator, "_store", autospec=True)
+    @mock.patch.object(cbr.Validator, "apply_validation_rules", autospec=True)
+    @mock.patch.object(cbr.Validator, "validate_schema", autospec=True)
+    def test_validate_timings(
+        self, mock_validate_schema, mock_apply_validation_rules, mock__store
+    ):
+        """Tests the timings collection of the
+        :class:`cookbase.validation.cbr.Validator.validate` method.
+        """
+        mock_apply_validation_rules.return_value = cbr.ValidationResult()
+        mock__store.return_value = handler.InsertCBRResult()
+
+        # -- Testing disabled collection -----------------------------------------------
+        result = self.validator.validate(self.good_cbr, store=True, strict=False)
+        self.assertIsNone(result.timings)
+
+        # -- Testing correct results ---------------------------------------------------
+        hook = mock.Mock()
+        validator = cbr.Validator(metrics_hooks=[hook])
+        result = validator.validate(self.good_cbr, store=True, strict=False)
+        self.assertIsNotNone(result.timings.schema_validation)
+        self.assertIsNotNone(result.timings.storage)
+        self.assertGreaterEqual(result.timings.total, result.timings.schema_validation)
+        hook.assert_called_once_with(result.timings)
+
+        # -- Testing failing hooks -----------------------------------------------------
+        hook.side_effect = RuntimeError
+        result = validator.validate(self.good_cbr, strict=False)
+        self.assertIsNone(result.timings.storage)
+
+    @mock.patch.object(cbr.Validator, "_store", autospec=True)
+    @mock.patch.object(cbr.Validator, "apply_validation_rules", autospec=True)
+    @mock.patch.object(cbr.Validator, "validate_schema", autospec=True)
+    def test_validate_cached(
+        self, mock_validate_schema, mock_apply_validation_rules, mock__store
+    ):
+        """Tests the :class:`cookbase.validation.cbr.Validator.validate` method with a
+        results cache.
+        """
+        mock_apply_validation_rules.return_value = cbr.ValidationResult()
+        mock__store.return_value = handler.InsertCBRResult()
+        validator = cbr.Validator(result_cache=cache.ValidationResultCache())
+
+        # -- Testing correct results ---------------------------------------------------
+        result = validator.validate(self.good_cbr, strict=False)
+        self.assertFalse(result.from_cache)
+
+        reordered = dict(reversed(list(self.good_cbr.items())))
+        result = validator.validate(reordered, store=True, strict=False)
+        self.assertTrue(result.from_cache)
+        self.assertIs(result.storing_result, mock__store.return_value)
+        mock_validate_schema.assert_called_once()
+        mock_apply_validation_rules.assert_called_once()
+
+        # -- Testing invalidation ------------------------------------------------------
+        db_handler = mock.Mock(catalogue_version=0)
+
+        with mock.patch.object(handler, "_db_handler", db_handler):
+            self.assertFalse(validator.validate(self.good_cbr).from_cache)
+            self.assertTrue(validator.validate(self.good_cbr).from_cache)
+            db_handler.catalogue_version += 1
+            self.assertFalse(validator.validate(self.good_cbr).from_cache)
+
+        self.assertEqual(mock_apply_validation_rules.call_count, 3)
+
+        validator.result_cache.catalogue_version = 2
+        result = validator.validate(self.good_cbr, strict=False)
+        self.assertFalse(result.from_cache)
+        self.assertEqual(mock_apply_validation_rules.call_count, 4)
+
+        # -- Testing schema validation failures ----------------------------------------
+        mock_validate_schema.side_effect = jsonschema.exceptions.ValidationError("")
+        self.assertFalse(validator.validate(self.bad_cbr).schema_validated)
+        result = validator.validate(self.bad_cbr, store=True)
+        self.assertTrue(result.from_cache)
+        self.assertFalse(result.schema_validated)
+        self.assertEqual(mock_validate_schema.call_count, 5)
+
+    @mock.patch.object(engine, "get_unrolled_cba_table", autospec=True)
+    @mock.patch.object(handler, "get_handler", autospec=True)
+    def test_revalidate(self, mock_get_handler, mock_get_unrolled_cba_table):
+        """Tests the :meth:`cookbase.validation.cbr.Validator.revalidate` method."""
+        cbis, cbas, cbps = catalogue([self.good_cbr])
+        db_handler = mock_get_handler.return_value
+        db_handler.get_cbis.side_effect = lambda ids, fields: {
+            i: cbis[i] for i in ids if i in cbis
+        }
+        db_handler.get_cbas.side_effect = lambda ids, fields: {
+            i: cbas[i] for i in ids if i in cbas
+        }
+        db_handler.get_cbps.side_effect = lambda ids, fields: {
+            i: cbps[i] for i in ids if i in cbps
+        }
+        mock_get_unrolled_cba_table.return_value = cba.UnrolledCBATable(cbas.values())
+        validator = cbr.Validator(engine=engine.standard_rule_engine())
+
+        def outcome(result):
+            return {k: (v.errors, v.warnings) for k, v in result.rules_results.items()}
+
+        old_cbr = copy.deepcopy(self.good_cbr)
+        result = validator.validate(old_cbr, strict=False)
+        self.assertTrue(result.is_valid(strict=False))
+        graph = result.cbrgraph
+
+        # -- Testing unaffected rules and resources ------------------------------------
+        new_cbr = copy.deepcopy(old_cbr)
+        ingredient = next(iter(new_cbr["ingredients"].values()))
+        ingredient["name"]["text"] += " (fresh)"
+        db_handler.reset_mock()
+        new_result = validator.revalidate(result, old_cbr, new_cbr, strict=False)
+        db_handler.get_cbis.assert_not_called()
+        self.assertIs(new_result.cbrgraph, graph)
+        self.assertIs(
+            new_result.rules_results["appliances_not_in_conflict"],
+            result.rules_results["appliances_not_in_conflict"],
+        )
+        self.assertEqual(
+            outcome(new_result), outcome(validator.validate(new_cbr, strict=False))
+        )
+
+        # -- Testing affected rules and resources --------------------------------------
+        old_cbr, result = new_cbr, new_result
+        new_cbr = copy.deepcopy(old_cbr)
+        ingredient = next(iter(new_cbr["ingredients"].values()))
+        ingredient["cbiId"] = 0
+        del new_cbr["preparation"][next(iter(new_cbr["preparation"]))]
+        db_handler.reset_mock()
+        new_result = validator.revalidate(result, old_cbr, new_cbr, strict=False)
+        self.assertFalse(new_result.is_valid(strict=False))
+        db_handler.get_cbis.assert_called_once_with({0}, ("name",))
+        db_handler.get_cbps.assert_not_called()
+        full_result = validator.validate(new_cbr, strict=False)
+        self.assertEqual(outcome(new_result), outcome(full_result))
+        self.assertEqual(
+            dict(new_result.cbrgraph.g.nodes(data=True)),
+            dict(full_result.cbrgraph.g.nodes(data=True)),
+        )
+        self.assertEqual(
+            set(new_result.cbrgraph.g.edges), set(full_result.cbrgraph.g.edges)
+        )
+
+        # -- Testing schema validation failures ----------------------------------------
+        old_cbr, result = new_cbr, new_result
+        new_cbr = copy.deepcopy(old_cbr)
+        ingredient = next(iter(new_cbr["ingredients"].values()))
+        ingredient["cbiId"] = "0"
+        new_result = validator.revalidate(result, old_cbr, new_cbr)
+        self.assertFalse(new_result.schema_validated)
+
+
+class TestValidationResultCache(unittest.TestCase):
+    """Test class for the :class:`cookbase.validation.cache.ValidationResultCache`
+    class.
+
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.version = 1
+        self.cache = cache.ValidationResultCache(
+            maxsize=2,
+            directory=self.directory.name,
+            catalogue_version=lambda: self.version,
+        )
+        self.result = cbr.ValidationResult(
+            rules_results={"rule": rules.AppliedRuleResult(errors=["error"])},
+            storing_result=handler.InsertCBRResult(),
+        )
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_key(self):
+        """Tests the :meth:`cookbase.validation.cache.ValidationResultCache.key`
+        method.
+        """
+        # -- Testing correct results ---------------------------------------------------
+        self.assertEqual(
+            self.cache.key({"a": 1, "b": [1, 2]}), self.cache.key({"b": [1, 2], "a": 1})
+        )
+        self.assertNotEqual(
+            self.cache.key({"a": 1, "b": [1, 2]}), self.cache.key({"a": 1, "b": [2, 1]})
+        )
+        self.assertNotEqual(self.cache.key({"a": 1}), self.cache.key({"a": 1}, "v2"))
+
+    def test_get(self):
+        """Tests the :meth:`cookbase.validation.cache.ValidationResultCache.get` and
+        :meth:`cookbase.validation.cache.ValidationResultCache.put` methods.
+        """
+        # -- Testing correct results ---------------------------------------------------
+        self.assertIsNone(self.cache.get("a"))
+        self.cache.put("a", self.result)
+        result = self.cache.get("a")
+        self.assertIsNot(result, self.result)
+        self.assertEqual(result.rules_results, self.result.rules_results)
+        self.assertIsNone(result.storing_result)
+        self.assertEqual(self.cache.cache_info().hits, 1)
+        self.assertEqual(self.cache.cache_info().misses, 1)
+
+        # -- Testing on-disk tier ------------------------------------------------------
+        self.cache.put("b", self.result)
+        self.cache.put("c", self.result)
+        self.assertEqual(self.cache.cache_info().size, 2)
+        self.assertIsNotNone(self.cache.get("a"))
+
+        other = cache.ValidationResultCache(
+            directory=self.directory.name, catalogue_version=self.version
+        )
+        self.assertIsNotNone(other.get("c"))
+
+        with self.assertRaises(ValueError):
+            cache.ValidationResultCache(directory=self.directory.name)
+
+        # -- Testing catalogue version changes -----------------------------------------
+        self.version = 2
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(self.cache.cache_info().size, 0)
+        self.version = 1
+        self.assertIsNone(self.cache.get("a"))
+
+    def test_invalidate(self):
+        """Tests the :meth:`cookbase.validation.cache.ValidationResultCache.invalidate`
+        method.
+        """
+        self.cache.put("a", self.result)
+        self.cache.put("b", self.result)
+
+        # -- Testing correct results ---------------------------------------------------
+        self.cache.invalidate("a")
+        self.assertIsNone(self.cache.get("a"))
+        self.assertIsNotNone(self.cache.get("b"))
+
+        self.cache.invalidate()
+        self.assertIsNone(self.cache.get("b"))
+
+        # -- Testing unrelated content of the cache directory --------------------------
+        unrelated = os.path.join(self.directory.name, "unrelated")
+        os.makedirs(unrelated)
+        self.cache.put("a", self.result)
+        self.version = 2
+        self.assertIsNone(self.cache.get("a"))
+        self.cache.invalidate()
+        self.assertTrue(os.path.isdir(unrelated))
+        self.assertEqual(os.listdir(self.directory.name), ["unrelated"])
+
+
+class TestRuleEngine(unittest.TestCase):
+    """Test class for the :class:`cookbase.validation.engine.RuleEngine` class.
+
+    """
+
+    def setUp(self):
+        self.engine = engine.RuleEngine(max_workers=4)
+        self.engine.add_provider("size", len)
+        self.engine.add_provider("double", lambda n: 2 * n, ("size",))
+
+    def tearDown(self):
+        self.engine.shutdown()
+
+    def test_run(self):
+        """Tests the :meth:`cookbase.validation.engine.RuleEngine.run` method."""
+        barrier = threading.Barrier(2, timeout=5)
+
+        def concurrent_rule(n):
+            # Fails with BrokenBarrierError unless both rules run at the same time
+            barrier.wait()
+            return rules.AppliedRuleResult(warnings=[n])
+
+        self.engine.add_rule("second", concurrent_rule, ("double",))
+        self.engine.add_rule("first", concurrent_rule, ("size",))
+
+        # -- Testing correct results ---------------------------------------------------
+        results, resources = self.engine.run({"a": 1, "b": 2}, outputs=("size",))
+        self.assertEqual(list(results), ["second", "first"])
+        self.assertEqual(results["second"].warnings, [4])
+        self.assertEqual(results["first"].warnings, [2])
+        self.assertEqual(resources["double"], 4)
+
+        # -- Testing rule removal ------------------------------------------------------
+        self.engine.remove_rule("second")
+        self.engine.add_rule("first", rules.AppliedRuleResult, ())
+        results, resources = self.engine.run({})
+        self.assertEqual(list(results), ["first"])
+        self.assertNotIn("double", resources)
+
+        # -- Testing exceptions raised by rules ----------------------------------------
+        self.engine.add_rule("failing", lambda n: 1 / n, ("size",))
+
+        with self.assertRaises(ZeroDivisionError):
+            self.engine.run({})
+
+    def test_rerun(self):
+        """Tests the :meth:`cookbase.validation.engine.RuleEngine.rerun` method."""
+        self.engine.add_provider(
+            "double", lambda n: 2 * n, ("size",), lambda previous, n: previous + 2
+        )
+        self.engine.add_provider("keys", sorted)
+        self.engine.add_rule("on_double", mock.Mock(return_value="d"), ("double",))
+        self.engine.add_rule("on_keys", mock.Mock(return_value="k"), ("keys",))
+        self.engine.add_rule("on_cbr", mock.Mock(return_value="c"), (engine.CBR,))
+        results, resources = self.engine.run({"a": 1})
+
+        # -- Testing correct results ---------------------------------------------------
+        previous_results = {k: f"previous {v}" for k, v in results.items()}
+        results, resources = self.engine.rerun(
+            {"a": 1, "b": 2},
+            ["size"],
+            previous_results,
+            resources,
+            resources={"size": 2},
+        )
+        self.assertEqual(
+            results, {"on_double": "d", "on_keys": "previous k", "on_cbr": "c"}
+        )
+        # The previous value of "double" is updated instead of provided again
+        self.assertEqual(resources["double"], 4)
+        self.assertEqual(resources["keys"], ["a"])
+
+        self.assertEqual(
+            self.engine.dependents(["size"]), {"size", "double", "on_double"}
+        )
+
+    def test_run_timings(self):
+        """Tests the timings collection of the
+        :meth:`cookbase.validation.engine.RuleEngine.run` method.
+        """
+
+        @metrics.timed_query("cbi")
+        def query(n):
+            return rules.AppliedRuleResult()
+
+        self.engine.add_rule("rule", query, ("double",))
+
+        # -- Testing disabled collection -----------------------------------------------
+        self.engine.run({})
+        self.assertIsNone(metrics.get_collector())
+
+        # -- Testing correct results ---------------------------------------------------
+        collector = metrics.TimingsCollector()
+
+        with collector.activate():
+            self.engine.run({})
+            self.engine.run({})
+
+        self.assertEqual(set(collector.timings.rules), {"rule"})
+        self.assertEqual(set(collector.timings.resources), {"size", "double"})
+        self.assertIsNone(collector.timings.graph_build)
+        self.assertEqual(collector.timings.db_queries["cbi"].count, 2)
+
+        # -- Testing query timers ------------------------------------------------------
+        with metrics.query_timer("cbr"):
+            pass
+
+        with collector.activate():
+            with metrics.query_timer("cbrgraphs"):
+                pass
+
+        self.assertNotIn("cbr", collector.timings.db_queries)
+        self.assertEqual(collector.timings.db_queries["cbrgraphs"].count, 1)
+
+    def test_fields(self):
+        """Tests the :meth:`cookbase.validation.engine.RuleEngine.fields` method."""
+        provided = []
+
+        def provide(cbr, fields=None):
+            provided.append(fields)
+            return {}
+
+        @rules.reads_fields(docs=["name", "info.parent"])
+        def first(size, docs):
+            return rules.AppliedRuleResult()
+
+        @rules.reads_fields(docs=["info"])
+        def second(docs):
+            return rules.AppliedRuleResult()
+
+        self.engine.add_provider("docs", provide, projected=True)
+        self.engine.add_rule("first", first, ("size", "docs"))
+        self.engine.add_rule("second", second, ("docs",))
+
+        # -- Testing correct results ---------------------------------------------------
+        self.assertEqual(self.engine.fields("docs"), ("info", "info.parent", "name"))
+        self.assertIsNone(self.engine.fields("size"))
+        self.engine.run({})
+        self.engine.run({}, outputs=("docs",))
+        self.assertEqual(provided, [("info", "info.parent", "name"), None])
+
+        # -- Testing undeclared fields -------------------------------------------------
+        self.engine.add_rule("third", lambda docs: rules.AppliedRuleResult(), ("docs",))
+        self.assertIsNone(self.engine.fields("docs"))
+
+    def test_run_invalid_dependencies(self):
+        """Tests the :meth:`cookbase.validation.engine.RuleEngine.run` method with
+        unsatisfiable dependencies.
+        """
+        # -- Testing ValueError on missing providers -----------------------------------
+        self.engine.add_rule("rule", rules.AppliedRuleResult, ("missing",))
+
+        with self.assertRaises(ValueError):
+            self.engine.run({})
+
+        # -- Testing ValueError on cyclic dependencies ---------------------------------
+        self.engine.add_provider("size", len, ("double",))
+        self.engine.add_rule("rule", rules.AppliedRuleResult, ("double",))
+
+        with self.assertRaises(ValueError):
+            self.engine.run({})
+
+    def test_standard_rule_engine(self):
+        """Tests the :func:`cookbase.validation.engine.standard_rule_engine`
+        function.
+        """
+        standard_engine = engine.standard_rule_engine()
+        self.assertEqual(
+            standard_engine.rules,
+            [
+                "ingredients_are_valid",
+                "foodstuff_and_appliance_references_are_consistent",
+                "processes_and_appliances_are_valid_and_processes_requirements_met",
+                "ingredients_used_exactly_once",
+                "single_final_process",
+                "appliances_not_in_conflict",
+            ],
+        )
+        self.assertIs(
+            engine.standard_rule_engine(compact_graph=True)._providers[
+                "cbrgraph"
+            ].function,
+            engine.build_compact_cbrgraph,
+        )
+        self.assertEqual(standard_engine.fields("cbis"), ("name",))
+        self.assertEqual(
+            standard_engine.fields("cbas"),
+            (
+                "info.familyLevel",
+                "info.functions",
+                "info.materials",
+                "info.parent",
+                "name",
+            ),
+        )
+        self.assertEqual(standard_engine.fields("cbps"), ("info.validation", "name"))
+
+
+class TestDiffCbrs(unittest.TestCase):
+    """Test class for the :func:`cookbase.validation.diff.diff_cbrs` function.
+
+    """
+
+    def test_diff_cbrs(self):
+        """Tests the :func:`cookbase.validation.diff.diff_cbrs` function."""
+        old = {
+            "info": {"name": "a"},
+            "ingredients": {"ing1": {"cbiId": 1}, "ing2": {"cbiId": 2}},
+            "appliances": {},
+            "preparation": {"pp1": {"cbpId": 1}},
+        }
+
+        # -- Testing correct results ---------------------------------------------------
+        self.assertFalse(diff.diff_cbrs(old, copy.deepcopy(old)))
+
+        new = copy.deepcopy(old)
+        new["info"]["name"] = "b"
+        new["ingredients"]["ing1"]["cbiId"] = 3
+        del new["ingredients"]["ing2"]
+        new["appliances"]["app1"] = {}
+        new["preparation"] = []
+        result = diff.diff_cbrs(old, new)
+        self.assertEqual(
+            result.items, {"ingredients": {"ing1", "ing2"}, "appliances": {"app1"}}
+        )
+        self.assertEqual(result.other, {"info", "preparation"})
+        self.assertEqual(result.changed_sections, {"ingredients", "appliances"})
+
+
+class TestUnrolledCBATable(unittest.TestCase):
+    """Test class for the :class:`cookbase.validation.cba.UnrolledCBATable` class.
+
+    """
+
+    def setUp(self):
+        self.table = cba.UnrolledCBATable(
+            [
+                {
+                    "id": 1,
+                    "info": {
+                        "familyLevel": 1,
+                        "functions": ["contains"],
+                        "materials": {"policy": "allow", "list": ["glass", "metal"]},
+                    },
+                },
+                {
+                    "id": 2,
+                    "info": {
+                        "familyLevel": 2,
+                        "parent": 1,
+                        "functions": ["heats"],
+                        "materials": {"policy": "disallow", "list": ["glass"]},
+                    },
+                },
+                {
+                    "id": 3,
+                    "info": {"familyLevel": 3, "parent": 2, "functions": ["bakes"]},
+                },
+            ]
+        )
+
+    def test_get(self):
+        """Tests the :meth:`cookbase.validation.cba.UnrolledCBATable.get` method."""
+        # -- Testing correct result ----------------------------------------------------
+        self.assertEqual(
+            self.table.get(3),
+            cba.UnrolledCBA(
+                3, (1, 2), frozenset({"contains", "heats", "bakes"}), "allow", {"metal"}
+            ),
+        )
+        self.assertIsNone(self.table.get(4))
+
+    def test_update(self):
+        """Tests the :meth:`cookbase.validation.cba.UnrolledCBATable.update` and
+        :meth:`cookbase.validation.cba.UnrolledCBATable.remove` methods.
+        """
+        # -- Testing descendants recomputation -----------------------------------------
+        version = self.table.version
+        self.table.update({"id": 2, "info": {"familyLevel": 2, "parent": 1}})
+        self.assertEqual(self.table.get(3).functions, {"contains", "bakes"})
+        self.assertEqual(self.table.get(3).materials, {"glass", "metal"})
+        self.assertGreater(self.table.version, version)
+
+        # -- Testing removal of descendants --------------------------------------------
+        version = self.table.version
+        self.table.remove(2)
+        self.assertIsNone(self.table.get(3))
+        self.assertEqual(len(self.table), 1)
+        self.assertGreater(self.table.version, version)
+
+    def test_follow(self):
+        """Tests the :meth:`cookbase.validation.cba.UnrolledCBATable.follow` and
+        :meth:`cookbase.validation.cba.UnrolledCBATable.refresh` methods.
+        """
+        db_handler = mock.create_autospec(handler.DBHandler, instance=True)
+        db_handler.cache = None
+        listeners = []
+        db_handler.add_invalidation_listener.side_effect = listeners.append
+        self.table.follow(db_handler)
+        cbp = {
+            "id": 1,
+            "info": {
+                "validation": {"conditions": {"requiredAppliances": [[{"cbaId": 4}]]}}
+            },
+        }
+        cbas = [{"id": 3, "info": {"familyLevel": 3, "parent": 2}}]
+        self.assertTrue(rules.Semantics.cbas_satisfy_cbp(cbas, cbp, self.table).errors)
+
+        # -- Testing refresh of an invalidated CBA -------------------------------------
+        db_handler.get_cbas.return_value = {
+            2: {"id": 2, "info": {"familyLevel": 2, "parent": 4}},
+            4: {"id": 4, "info": {"familyLevel": 1}},
+        }
+
+        for cba_id in (4, 2):
+            for listener in listeners:
+                listener("cba", cba_id)
+
+        db_handler.get_cbas.assert_called_with({2}, cba.UNROLLED_FIELDS)
+        self.assertEqual(self.table.get(3).ancestors, (4, 2))
+        self.assertFalse(rules.Semantics.cbas_satisfy_cbp(cbas, cbp, self.table).errors)
+
+        # -- Testing reload after invalidating every CBA -------------------------------
+        db_handler.iter_cbas.return_value = [{"id": 3, "info": {"familyLevel": 1}}]
+
+        for listener in listeners:
+            listener(None, None)
+
+        self.assertEqual(len(self.table), 1)
+        self.assertTrue(rules.Semantics.cbas_satisfy_cbp(cbas, cbp, self.table).errors)
+
+        # -- Testing unfollowing -------------------------------------------------------
+        self.table.unfollow()
+        db_handler.remove_invalidation_listener.assert_called_once_with(listeners[0])
+
+
+class TestSatisfiesClause(unittest.TestCase):
+    """Test class for the :func:`cookbase.validation.cba.satisfies_clause` function.
+
+    """
+
+    def test_satisfies_clause(self):
+        """Tests the :func:`cookbase.validation.cba.satisfies_clause` function."""
+        cbas = [
+            cba.UnrolledCBA(1, (10,), frozenset({"contains", "heats"})),
+            cba.UnrolledCBA(2, (), frozenset({"contains"})),
+        ]
+
+        # -- Testing correct results ---------------------------------------------------
+        self.assertTrue(cba.satisfies_clause([{"cbaId": 10}], cbas))
+        self.assertTrue(
+            cba.satisfies_clause([{"cbaId": 2}, {"function": "heats"}], cbas)
+        )
+        self.assertFalse(cba.satisfies_clause([{"cbaId": 3}], cbas))
+        self.assertFalse(
+            cba.satisfies_clause([{"function": "heats"}, {"function": "heats"}], cbas)
+        )
+
+        # -- Testing malformed literals ------------------------------------------------
+        self.assertFalse(cba.satisfies_clause([{"function": "contains"}, {}], cbas))
+
+        # -- Testing an assignment not found by taking the first matching CBA ----------
+        self.assertTrue(
+            cba.satisfies_clause(
+                [{"function": "contains"}, {"function": "heats"}], cbas
+            )
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,308 @@
+"""A content-addressed cache of :ref:`Cookbase Recipe (CBR) <cbr>` validation results.
+
+Results are keyed by a hash of the canonical JSON serialization of the :ref:`CBR <cbr>`
+(so resubmissions whose keys are merely reordered share their entry), of the
+:ref:`CBR <cbr>` Schema and validation rules they were obtained with, and of the version
+of the :doc:`Cookbase Data Model (CBDM) <cbdm>` catalogue they were checked against.
+"""
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, Optional, Union
+
+import attr
+from cookbase.db.cache import CacheInfo
+from cookbase.logging import logger
+
+if TYPE_CHECKING:
+    from cookbase.validation.cbr import ValidationResult
+
+
+def canonical_hash(cbr: Dict[str, Any]) -> str:
+    """Computes the hash of the canonical JSON serialization of a :ref:`CBR <cbr>`,
+    which does not depend on the order of its keys.
+
+    :param cbr: The :ref:`CBR <cbr>`
+    :type cbr: dict[str, Any]
+    :return: The hexadecimal SHA-256 digest
+    :rtype: str
+    """
+    data = json.dumps(
+        cbr, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str
+    )
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+class ValidationResultCache:
+    """A cache of :class:`cookbase.validation.cbr.ValidationResult` objects, with a
+    size-bounded, least-recently-used in-memory tier and an optional on-disk tier.
+
+    Entries are stored pickled, so every hit hands out a new copy of the result. The
+    storage results and timings of a validation are not cached, and neither is its
+    :doc:`CBRGraph <cbrg>` unless `include_graph` is set.
+
+    The catalogue version may be given as a value or as a callable returning it, which
+    is then called on every lookup. Whenever the version changes, the in-memory tier is
+    cleared and the on-disk entries of any other version are removed. The on-disk
+    entries of each version are kept in their own subdirectory of `directory`, and any
+    other content of `directory` is left untouched.
+
+    :param int maxsize: Maximum number of results held in memory, defaults to
+      :const:`1024`
+    :param directory: The directory of the on-disk tier, defaults to :const:`None` (no
+      on-disk tier)
+    :type directory: str, optional
+    :param catalogue_version: The version of the catalogue, or a callable returning it,
+      which must identify the catalogue contents across processes and runs if
+      `directory` is given, defaults to :const:`None` (replaced by a version local to
+      the process, derived from the database handler by the
+      :class:`cookbase.validation.cbr.Validator` using the cache)
+    :type catalogue_version: Hashable or Callable[[], Hashable], optional
+    :param include_graph: A flag indicating whether the :doc:`CBRGraph <cbrg>` is
+      cached along with the result, defaults to :const:`True`
+    :type include_graph: bool, optional
+
+    :ivar int hits: Number of lookups served from the cache
+    :ivar int misses: Number of lookups not found in the cache
+
+    :raises ValueError: `directory` is given without `catalogue_version`
+    """
+
+    #: Prefix of the names of the subdirectories of :attr:`directory` holding the
+    #: entries of each catalogue version, the only ones the cache ever removes
+    VERSION_DIRECTORY_PREFIX: str = "cookbase-results-"
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        directory: Optional[str] = None,
+        catalogue_version: Union[Hashable, Callable[[], Hashable]] = None,
+        include_graph: bool = True,
+    ):
+        """Constructor method."""
+        if directory is not None and catalogue_version is None:
+            raise ValueError("the on-disk tier requires a catalogue version")
+
+        self.maxsize = maxsize
+        self.directory = directory
+        self.include_graph = include_graph
+        self._catalogue_version = catalogue_version
+        self._current_version: Optional[str] = None
+        self._entries: Dict[str, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Worker processes start with an empty in-memory tier
+        state = self.__dict__.copy()
+        state["_entries"] = OrderedDict()
+        state["_current_version"] = None
+        state["hits"] = state["misses"] = 0
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @property
+    def catalogue_version(self) -> Hashable:
+        """The current version of the catalogue."""
+        if callable(self._catalogue_version):
+            return self._catalogue_version()
+
+        return self._catalogue_version
+
+    @catalogue_version.setter
+    def catalogue_version(
+        self, catalogue_version: Union[Hashable, Callable[[], Hashable]]
+    ) -> None:
+        if self.directory is not None and catalogue_version is None:
+            raise ValueError("the on-disk tier requires a catalogue version")
+
+        self._catalogue_version = catalogue_version
+        self._check_version()
+
+    def _check_version(self) -> str:
+        """Checks the catalogue version, invalidating the entries of any previous one.
+
+        :return: The digest of the current catalogue version
+        :rtype: str
+        """
+        version = hashlib.sha256(repr(self.catalogue_version).encode()).hexdigest()
+
+        with self._lock:
+            if version == self._current_version:
+                return version
+
+            self._entries.clear()
+            self._current_version = version
+
+        self._remove_versions(keep=version)
+        return version
+
+    def _remove_versions(self, keep: Optional[str] = None) -> None:
+        """Removes the on-disk entries of every catalogue version, leaving any other
+        content of :attr:`directory` untouched.
+
+        :param keep: The digest of the catalogue version whose entries are kept,
+          defaults to :const:`None` (none kept)
+        :type keep: str, optional
+        """
+        if self.directory is None or not os.path.isdir(self.directory):
+            return
+
+        for name in os.listdir(self.directory):
+            if (
+                name.startswith(self.VERSION_DIRECTORY_PREFIX)
+                and name != self.VERSION_DIRECTORY_PREFIX + str(keep)
+                and os.path.isdir(os.path.join(self.directory, name))
+            ):
+                shutil.rmtree(os.path.join(self.directory, name), True)
+
+    def key(self, cbr: Dict[str, Any], context: str = "") -> str:
+        """Computes the key of the validation result of a :ref:`CBR <cbr>`.
+
+        :param cbr: The :ref:`CBR <cbr>`
+        :type cbr: dict[str, Any]
+        :param context: A string identifying how the :ref:`CBR <cbr>` is validated
+          (e.g. the :ref:`CBR <cbr>` Schema version and the validation rules applied),
+          defaults to an empty string
+        :type context: str, optional
+        :return: The key
+        :rtype: str
+        """
+        digest = hashlib.sha256(canonical_hash(cbr).encode())
+        digest.update(context.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _path(self, version: str, key: str) -> str:
+        return os.path.join(
+            self.directory, self.VERSION_DIRECTORY_PREFIX + version, key + ".pickle"
+        )
+
+    def get(self, key: str) -> Optional["ValidationResult"]:
+        """Retrieves a copy of a cached validation result.
+
+        :param str key: The key, as computed by :meth:`key`
+        :return: A copy of the result, or :const:`None` if it is not cached
+        :rtype: cookbase.validation.cbr.ValidationResult or None
+        """
+        version = self._check_version()
+
+        with self._lock:
+            data = self._entries.get(key)
+
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+
+        if data is None and self.directory is not None:
+            try:
+                with open(self._path(version, key), "rb") as f:
+                    data = f.read()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Cannot read cached validation result: {e}")
+
+            with self._lock:
+                if data is not None:
+                    self._put_in_memory(key, data)
+                    self.hits += 1
+
+        if data is None:
+            with self._lock:
+                self.misses += 1
+
+            return None
+
+        try:
+            return pickle.loads(data)
+        except Exception as e:
+            logger.warning(f"Cannot load cached validation result: {e}")
+            self.invalidate(key)
+            return None
+
+    def put(self, key: str, result: "ValidationResult") -> None:
+        """Stores a copy of a validation result, without its storage results and
+        timings.
+
+        :param str key: The key, as computed by :meth:`key`
+        :param result: The result
+        :type result: cookbase.validation.cbr.ValidationResult
+        """
+        version = self._check_version()
+        changes = {"storing_result": None, "timings": None}
+
+        if not self.include_graph:
+            changes["cbrgraph"] = None
+
+        data = pickle.dumps(attr.evolve(result, **changes), pickle.HIGHEST_PROTOCOL)
+
+        with self._lock:
+            self._put_in_memory(key, data)
+
+        if self.directory is not None:
+            try:
+                self._write(self._path(version, key), data)
+            except OSError as e:
+                logger.warning(f"Cannot write cached validation result: {e}")
+
+    def _put_in_memory(self, key: str, data: bytes) -> None:
+        self._entries[key] = data
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    @staticmethod
+    def _write(path: str, data: bytes) -> None:
+        """Writes a file atomically, so concurrent readers never find it incomplete."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """Removes cached results from both tiers.
+
+        :param key: The key of the result to be removed, defaults to :const:`None`
+          (every result is removed)
+        :type key: str, optional
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+        if key is None:
+            self._remove_versions()
+        elif self.directory is not None and self._current_version is not None:
+            try:
+                os.unlink(self._path(self._current_version, key))
+            except FileNotFoundError:
+                pass
+
+    def cache_info(self) -> CacheInfo:
+        """Provides the statistics of the in-memory tier.
+
+        :return: The cache statistics
+        :rtype: cookbase.db.cache.CacheInfo
+        """
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, len(self._entries), self.maxsize)
@@ -1,9 +1,181 @@
-from typing import Any, Dict
+import threading
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
+from attr import attrib, attrs
 from cookbase.db import handler
+from cookbase.logging import logger
+from cookbase.validation.globals import Definitions
 
+#: The fields of the :ref:`CBAs <cba>` read when unrolling them, as requested from
+#: database when building and refreshing an :class:`UnrolledCBATable`
+UNROLLED_FIELDS = (
+    "info.familyLevel",
+    "info.parent",
+    "info.functions",
+    "info.materials",
+)
 
-def unroll(cba: Dict[str, Any]) -> Dict[str, Any]:
+_bits_lock = threading.Lock()
+_function_bits: Dict[str, int] = {}
+_material_bits: Dict[str, int] = {}
+
+
+def _mask(values: Iterable[str], bits: Dict[str, int], known: List[str]) -> int:
+    """Encodes a set of values as a bitmask, where each value is given the bit matching
+    its position in a list of known values. Unknown values are assigned the next free
+    bits the first time they appear.
+
+    :param values: The values to encode
+    :type values: Iterable[str]
+    :param bits: The assignment of bits, updated with any new value
+    :type bits: dict[str, int]
+    :param known: The known values, in their bit order
+    :type known: list[str]
+    :return: The bitmask
+    :rtype: int
+    """
+    mask = 0
+
+    for v in values:
+        try:
+            mask |= bits[v]
+        except KeyError:
+            with _bits_lock:
+                if not bits:
+                    bits.update((k, 1 << i) for i, k in enumerate(known))
+
+                if v not in bits:
+                    bits[v] = 1 << len(bits)
+
+            mask |= bits[v]
+
+    return mask
+
+
+def functions_mask(functions: Iterable[str]) -> int:
+    """Encodes a set of appliance functions as a bitmask over
+    :attr:`cookbase.validation.globals.Definitions.appliance_functions`.
+
+    :param functions: The appliance functions
+    :type functions: Iterable[str]
+    :return: The bitmask
+    :rtype: int
+    """
+    return _mask(functions, _function_bits, Definitions.appliance_functions)
+
+
+def materials_mask(materials: Iterable[str]) -> int:
+    """Encodes a set of materials as a bitmask over
+    :attr:`cookbase.validation.globals.Definitions.materials`.
+
+    :param materials: The materials
+    :type materials: Iterable[str]
+    :return: The bitmask
+    :rtype: int
+    """
+    return _mask(materials, _material_bits, Definitions.materials)
+
+
+def _merge_materials(
+    materials: Optional[Dict[str, Any]], parent_materials: Optional[Dict[str, Any]]
+) -> Optional[Dict[str, Any]]:
+    """Resolves the :code:`materials` property of a :ref:`Cookbase Appliance (CBA)
+    <cba>` given the one inherited from its parent.
+
+    Lists under the same policy are joined; a :const:`'disallow'` list applied over an
+    inherited :const:`'allow'` list results in the allowed materials that are not
+    disallowed; an :const:`'allow'` list prevails over an inherited :const:`'disallow'`
+    list.
+
+    :param materials: The :code:`materials` property of the CBA, if any
+    :type materials: dict[str, Any] or None
+    :param parent_materials: The resolved :code:`materials` property of the parent CBA,
+      if any
+    :type parent_materials: dict[str, Any] or None
+    :return: The resolved :code:`materials` property, if any
+    :rtype: dict[str, Any] or None
+    """
+    if not parent_materials:
+        return materials
+    elif not materials:
+        return parent_materials
+    elif materials["policy"] == parent_materials["policy"]:
+        return {
+            "policy": materials["policy"],
+            "list": materials["list"]
+            + [m for m in parent_materials["list"] if m not in materials["list"]],
+        }
+    elif materials["policy"] == "disallow":
+        return {
+            "policy": parent_materials["policy"],
+            "list": [m for m in parent_materials["list"] if m not in materials["list"]],
+        }
+    else:
+        return materials
+
+
+def get_ancestors(
+    cbas: Iterable[Dict[str, Any]],
+    known_cbas: Optional[Dict[int, Dict[str, Any]]] = None,
+    db_handler: Optional[handler.DBHandler] = None,
+) -> Dict[int, Dict[str, Any]]:
+    """Retrieves all the ancestor :ref:`Cookbase Appliances (CBAs) <cba>` of a set of
+    CBAs, issuing a single database query per family level.
+
+    :param cbas: The :ref:`CBAs <cba>` whose ancestors are to be retrieved
+    :type cbas: Iterable[dict[str, Any]]
+    :param known_cbas: A dictionary of already available :ref:`CBAs <cba>` by their
+      identifier, which are not requested again, defaults to :const:`None`
+    :type known_cbas: dict[int, dict[str, Any]], optional
+    :param db_handler: The database handler to use, defaults to the one provided by
+      :func:`cookbase.db.handler.get_handler`
+    :type db_handler: cookbase.db.handler.DBHandler, optional
+    :return: A dictionary mapping the identifier of each ancestor :ref:`CBA <cba>` into
+      the :ref:`CBA <cba>` itself
+    :rtype: dict[int, dict[str, Any]]
+    """
+    ancestors = {}
+    known_cbas = known_cbas or {}
+    level = list(cbas)
+
+    while level:
+        pending = set()
+
+        for cba in level:
+            if cba["info"]["familyLevel"] > 1:
+                parent_id = cba["info"]["parent"]
+
+                if parent_id in known_cbas:
+                    ancestors[parent_id] = known_cbas[parent_id]
+                elif parent_id not in ancestors:
+                    pending.add(parent_id)
+
+        if not pending:
+            break
+
+        if db_handler is None:
+            db_handler = handler.get_handler()
+
+        level = list(db_handler.get_cbas(pending, UNROLLED_FIELDS).values())
+        ancestors.update((cba["id"], cba) for cba in level)
+
+    return ancestors
+
+
+def unroll(
+    cba: Dict[str, Any], ancestors: Optional[Dict[int, Dict[str, Any]]] = None
+) -> Dict[str, Any]:
     """Returns an augmented :ref:`Cookbase Appliance (CBA) <cba>` by retrieving its
     parent CBAs recursively.
 
@@ -12,8 +184,15 @@ def unroll(cba: Dict[str, Any]) -> Dict[str, Any]:
     and the :code:`id` field updated to a list that include all the parent
     :code:`id`\ s; if the CBA has no parents, it is returned with no modifications.
 
+    The given :ref:`CBA <cba>` is never modified: the augmented structure is returned
+    as a new dictionary.
+
     :param cba: A :ref:`CBA <cba>` to be unrolled
     :type cba: dict[str, Any]
+    :param ancestors: A dictionary of ancestor :ref:`CBAs <cba>` by their identifier
+      (as returned by :func:`get_ancestors`) from where parents are taken before
+      requesting them from database, defaults to :const:`None`
+    :type ancestors: dict[int, dict[str, Any]], optional
     :return: An augmented :ref:`CBA <cba>`
     :rtype: dict[str, Any]
 
@@ -24,47 +203,501 @@ def unroll(cba: Dict[str, Any]) -> Dict[str, Any]:
         if cba["info"]["familyLevel"] <= 1:
             return cba
 
-        parent_cba = handler.get_handler().get_cba(cba["info"]["parent"])
+        parent_id = cba["info"]["parent"]
+
+        if ancestors is not None and parent_id in ancestors:
+            parent_cba = ancestors[parent_id]
+        else:
+            parent_cba = handler.get_handler().get_cba(parent_id, UNROLLED_FIELDS)
 
         if parent_cba["info"]["familyLevel"] > 1:
-            parent_cba = unroll(parent_cba)
+            parent_cba = unroll(parent_cba, ancestors)
+
+        unrolled_cba = dict(cba)
+        unrolled_cba["info"] = info = dict(cba["info"])
 
         if isinstance(parent_cba["id"], list):
-            aggregated_id = parent_cba["id"] + [cba["id"]]
+            unrolled_cba["id"] = parent_cba["id"] + [cba["id"]]
         else:
-            aggregated_id = [parent_cba["id"], cba["id"]]
-
-        cba["id"] = aggregated_id
+            unrolled_cba["id"] = [parent_cba["id"], cba["id"]]
 
         if "functions" in parent_cba["info"]:
-            if "functions" not in cba["info"]:
-                cba["info"]["functions"] = []
-
-            cba["info"]["functions"].extend(parent_cba["info"]["functions"])
+            info["functions"] = (
+                info.get("functions", []) + parent_cba["info"]["functions"]
+            )
 
         if "materials" in parent_cba["info"]:
-            if "materials" not in cba["info"]:
-                cba["info"]["materials"] = parent_cba["info"]["materials"]
-            else:
-                if (
-                    cba["info"]["materials"]["policy"]
-                    == parent_cba["info"]["materials"]["policy"]
-                ):
-                    cba["info"]["materials"]["list"].extend(
-                        parent_cba["info"]["materials"]["list"]
-                    )
-                elif cba["info"]["materials"]["policy"] == "disallow":
-                    m = parent_cba["info"]["materials"]["list"]
-
-                    for i in cba["info"]["materials"]["list"]:
-                        for j in m:
-                            if i == j:
-                                m.remove(j)
-                                break
-
-                    cba["info"]["materials"]["list"] = m
+            info["materials"] = _merge_materials(
+                info.get("materials"), parent_cba["info"]["materials"]
+            )
 
     except KeyError as ke:
         raise ke
 
-    return cba
+    return unrolled_cba
+
+
+@attrs(frozen=True)
+class UnrolledCBA:
+    """A class holding the data of a :ref:`Cookbase Appliance (CBA) <cba>` resolved
+    together with its whole ancestry.
+
+    :param cba_id: The :ref:`CBA <cba>` identifier, or :const:`None` for virtual
+      appliances
+    :type cba_id: int or None
+    :param ancestors: The identifiers of the ancestor :ref:`CBAs <cba>`, from the root
+      of the family to the parent, defaults to an empty tuple
+    :type ancestors: tuple[int, ...], optional
+    :param functions: The functions of the :ref:`CBA <cba>`, including the inherited
+      ones, defaults to an empty set
+    :type functions: frozenset[str], optional
+    :param materials_policy: The resolved materials policy (:const:`'allow'` or
+      :const:`'disallow'`), or :const:`None` if no policy applies, defaults to
+      :const:`None`
+    :type materials_policy: str, optional
+    :param materials: The materials the resolved policy applies to, defaults to an
+      empty set
+    :type materials: frozenset[str], optional
+
+    :ivar int functions_mask: The bitmask encoding :attr:`functions` (see
+      :func:`functions_mask`)
+    :ivar int materials_mask: The bitmask encoding :attr:`materials` (see
+      :func:`materials_mask`)
+
+    """
+
+    cba_id: Optional[int] = attrib()
+    ancestors: Tuple[int, ...] = attrib(default=())
+    functions: FrozenSet[str] = attrib(default=frozenset())
+    materials_policy: Optional[str] = attrib(default=None)
+    materials: FrozenSet[str] = attrib(default=frozenset())
+    functions_mask: int = attrib(init=False, eq=False, repr=False)
+    materials_mask: int = attrib(init=False, eq=False, repr=False)
+
+    def __attrs_post_init__(self):
+        object.__setattr__(self, "functions_mask", functions_mask(self.functions))
+        object.__setattr__(self, "materials_mask", materials_mask(self.materials))
+
+    @property
+    def ids(self) -> Tuple[int, ...]:
+        """The identifiers of the ancestor :ref:`CBAs <cba>` followed by the own
+        identifier.
+
+        :rtype: tuple[int, ...]
+        """
+        return self.ancestors + (self.cba_id,)
+
+    @staticmethod
+    def from_cba(cba: Dict[str, Any]) -> "UnrolledCBA":
+        """Builds an :class:`UnrolledCBA` from an already unrolled :ref:`CBA <cba>` (as
+        returned by :func:`unroll`), or from a virtual appliance definition.
+
+        :param cba: The unrolled :ref:`CBA <cba>`
+        :type cba: dict[str, Any]
+        :return: The equivalent :class:`UnrolledCBA`
+        :rtype: UnrolledCBA
+        """
+        ids = cba["id"] if isinstance(cba["id"], list) else [cba["id"]]
+        materials = cba["info"].get("materials") or {}
+        return UnrolledCBA(
+            ids[-1],
+            tuple(ids[:-1]),
+            frozenset(cba["info"].get("functions", ())),
+            materials.get("policy"),
+            frozenset(materials.get("list", ())),
+        )
+
+
+def satisfies_clause(
+    clause: Sequence[Dict[str, Any]], unrolled_cbas: Sequence[UnrolledCBA]
+) -> bool:
+    """Checks whether a set of unrolled :ref:`Cookbase Appliances (CBAs) <cba>` satisfy
+    a :ref:`Cookbase Process (CBP) <cbp>` required appliances clause, that is, whether
+    every literal of the clause can be assigned a different CBA meeting it.
+
+    A literal with a :code:`cbaId` is met by the :ref:`CBAs <cba>` having that
+    identifier or descending from it; otherwise, a literal with a :code:`function` is
+    met by the :ref:`CBAs <cba>` supporting that function. A literal with neither is
+    malformed, so it is reported and never met. The assignment is searched as a maximum
+    bipartite matching between literals and :ref:`CBAs <cba>` through augmenting paths,
+    taking time proportional to the number of literals times the number of compatible
+    literal-CBA pairs, so a complete assignment is found whenever one exists.
+
+    :param clause: The literals of the clause
+    :type clause: Sequence[dict[str, Any]]
+    :param unrolled_cbas: The unrolled :ref:`CBAs <cba>`
+    :type unrolled_cbas: Sequence[UnrolledCBA]
+    :return: A value indicating whether the clause is satisfied
+    :rtype: bool
+    """
+    # Bitmask over unrolled_cbas of the CBAs meeting each literal
+    adjacency = []
+
+    for literal in clause:
+        candidates = 0
+
+        if "cbaId" in literal:
+            for j, u in enumerate(unrolled_cbas):
+                if literal["cbaId"] in u.ids:
+                    candidates |= 1 << j
+        elif "function" in literal:
+            f = functions_mask((literal["function"],))
+
+            for j, u in enumerate(unrolled_cbas):
+                if u.functions_mask & f:
+                    candidates |= 1 << j
+        else:
+            logger.error(
+                f"Required appliances literal {literal} has neither a 'cbaId' nor a "
+                f"'function'"
+            )
+            return False
+
+        if not candidates:
+            return False
+
+        adjacency.append(candidates)
+
+    if len(adjacency) > len(unrolled_cbas):
+        return False
+
+    # Literal assigned to each CBA index
+    assigned: Dict[int, int] = {}
+
+    def augment(literal: int, visited: List[int]) -> bool:
+        candidates = adjacency[literal] & ~visited[0]
+
+        while candidates:
+            low = candidates & -candidates
+            visited[0] |= low
+            j = low.bit_length() - 1
+
+            if j not in assigned or augment(assigned[j], visited):
+                assigned[j] = literal
+                return True
+
+            candidates &= ~visited[0]
+
+        return False
+
+    # Most constrained literals first, so that augmenting paths are mostly short
+    for i in sorted(range(len(adjacency)), key=lambda i: bin(adjacency[i]).count("1")):
+        if not augment(i, [0]):
+            return False
+
+    return True
+
+
+class UnrolledCBATable:
+    """A class that materializes the unrolled data of every :ref:`Cookbase Appliance
+    (CBA) <cba>` in the catalogue, indexed by :code:`cbaId`.
+
+    The table is built once from the whole set of :ref:`CBAs <cba>`, and is refreshed
+    incrementally when any of them changes, recomputing only the changed CBAs and their
+    descendants.
+
+    :param cbas: The :ref:`CBAs <cba>` the table is built from, defaults to
+      :const:`None` (empty table)
+    :type cbas: Iterable[dict[str, Any]], optional
+
+    :ivar _cbas: The source :ref:`CBAs <cba>` by their identifier
+    :vartype _cbas: dict[int, dict[str, Any]]
+    :ivar _children: The identifiers of the children of each :ref:`CBA <cba>`
+    :vartype _children: dict[int, set[int]]
+    :ivar _table: The unrolled :ref:`CBAs <cba>` by their identifier
+    :vartype _table: dict[int, UnrolledCBA]
+    :ivar _followed: The database handler whose invalidations are followed and the
+      listener registered on it, if any
+    :vartype _followed: tuple[cookbase.db.handler.DBHandler,
+      cookbase.db.handler.InvalidationListener] or None
+    :ivar int version: A counter increased whenever the table contents change
+    """
+
+    def __init__(self, cbas: Optional[Iterable[Dict[str, Any]]] = None):
+        """Constructor method."""
+        self._cbas: Dict[int, Dict[str, Any]] = {}
+        self._children: Dict[int, Set[int]] = {}
+        self._table: Dict[int, UnrolledCBA] = {}
+        self._followed: Optional[
+            Tuple[handler.DBHandler, handler.InvalidationListener]
+        ] = None
+        self.version: int = 0
+
+        if cbas is not None:
+            self.load(cbas)
+
+    @staticmethod
+    def from_database(
+        db_handler: Optional[handler.DBHandler] = None,
+    ) -> "UnrolledCBATable":
+        """Builds the table from the :code:`cba` collection, retrieving only the
+        :data:`UNROLLED_FIELDS` of each :ref:`CBA <cba>`.
+
+        :param db_handler: The database handler to use, defaults to the one provided by
+          :func:`cookbase.db.handler.get_handler`
+        :type db_handler: cookbase.db.handler.DBHandler, optional
+        :return: The table holding every :ref:`CBA <cba>` in database
+        :rtype: UnrolledCBATable
+        """
+        if db_handler is None:
+            db_handler = handler.get_handler()
+
+        return UnrolledCBATable(db_handler.iter_cbas(UNROLLED_FIELDS))
+
+    def load(self, cbas: Iterable[Dict[str, Any]]) -> None:
+        """Replaces the table contents by the unrolled data of the given :ref:`CBAs
+        <cba>`.
+
+        :param cbas: The :ref:`CBAs <cba>` the table is built from
+        :type cbas: Iterable[dict[str, Any]]
+        """
+        self.version += 1
+        self._cbas.clear()
+        self._children.clear()
+        self._table.clear()
+
+        for cba in cbas:
+            self._add(cba)
+
+        for cba_id in self._cbas:
+            self._unroll(cba_id)
+
+    def update(self, cba: Dict[str, Any]) -> None:
+        """Inserts or replaces a :ref:`CBA <cba>`, recomputing it and its descendants.
+
+        :param cba: The new or changed :ref:`CBA <cba>`
+        :type cba: dict[str, Any]
+        """
+        self.version += 1
+        self.remove(cba["id"], keep_descendants=True)
+        self._add(cba)
+        self._recompute(cba["id"])
+
+    def remove(self, cba_id: int, keep_descendants: bool = False) -> None:
+        """Removes a :ref:`CBA <cba>` from the table.
+
+        :param int cba_id: The :ref:`CBA <cba>` identifier
+        :param bool keep_descendants: A flag indicating whether the unrolled data of the
+          descendants is kept, instead of being discarded, defaults to :const:`False`
+        """
+        self.version += 1
+        cba = self._cbas.pop(cba_id, None)
+
+        if cba is not None and cba["info"]["familyLevel"] > 1:
+            self._children.get(cba["info"]["parent"], set()).discard(cba_id)
+
+        if keep_descendants:
+            self._table.pop(cba_id, None)
+        else:
+            for i in self._subtree(cba_id):
+                self._table.pop(i, None)
+
+    def refresh(
+        self, cba_ids: Iterable[int], db_handler: Optional[handler.DBHandler] = None
+    ) -> None:
+        """Reloads a set of changed :ref:`CBAs <cba>` from database, discarding any
+        cached copy, and recomputes them and their descendants. :ref:`CBAs <cba>` no
+        longer found in database are removed.
+
+        :param cba_ids: The identifiers of the changed :ref:`CBAs <cba>`
+        :type cba_ids: Iterable[int]
+        :param db_handler: The database handler to use, defaults to the one provided by
+          :func:`cookbase.db.handler.get_handler`
+        :type db_handler: cookbase.db.handler.DBHandler, optional
+        """
+        if db_handler is None:
+            db_handler = handler.get_handler()
+
+        cba_ids = set(cba_ids)
+
+        if db_handler.cache is not None:
+            for cba_id in cba_ids:
+                db_handler.cache.invalidate("cba", cba_id)
+
+        self.replace(cba_ids, db_handler.get_cbas(cba_ids, UNROLLED_FIELDS))
+
+    def replace(self, cba_ids: Iterable[int], cbas: Dict[int, Dict[str, Any]]) -> None:
+        """Replaces a set of changed :ref:`CBAs <cba>` by their current version,
+        recomputing them and their descendants. :ref:`CBAs <cba>` not found in `cbas`
+        are removed.
+
+        :param cba_ids: The identifiers of the changed :ref:`CBAs <cba>`
+        :type cba_ids: Iterable[int]
+        :param cbas: The current version of the changed :ref:`CBAs <cba>` still in the
+          catalogue, by their identifier
+        :type cbas: dict[int, dict[str, Any]]
+        """
+        for cba_id in cba_ids:
+            if cba_id in cbas:
+                self.update(cbas[cba_id])
+            else:
+                self.remove(cba_id)
+
+    def follow(self, db_handler: handler.DBHandler) -> None:
+        """Keeps the table up to date with the :ref:`CBAs <cba>` invalidated through
+        :meth:`cookbase.db.handler.DBHandler.invalidate_cache`: a single changed
+        :ref:`CBA <cba>` is refreshed, while the whole table is reloaded if every
+        :ref:`CBA <cba>` is invalidated.
+
+        :param db_handler: The database handler whose invalidations are followed
+        :type db_handler: cookbase.db.handler.DBHandler
+        """
+        self.unfollow()
+        self._followed = (db_handler, self._on_invalidation)
+        db_handler.add_invalidation_listener(self._on_invalidation)
+
+    def unfollow(self) -> None:
+        """Stops following the invalidations of the database handler given to
+        :meth:`follow`, if any.
+        """
+        if self._followed is not None:
+            db_handler, listener = self._followed
+            db_handler.remove_invalidation_listener(listener)
+            self._followed = None
+
+    def _on_invalidation(
+        self, collection: Optional[str], doc_id: Optional[Hashable]
+    ) -> None:
+        """Refreshes the table after an invalidation of the followed database handler.
+
+        :param collection: The collection whose documents are invalidated, or
+          :const:`None` if all of them
+        :type collection: str or None
+        :param doc_id: The identifier of the invalidated document, or :const:`None` if
+          all of them
+        :type doc_id: Hashable or None
+        """
+        db_handler = self._followed[0]
+
+        if collection == "cba" and doc_id is not None:
+            self.refresh((doc_id,), db_handler)
+        elif collection in (None, "cba"):
+            self.load(db_handler.iter_cbas(UNROLLED_FIELDS))
+
+    def get(self, cba_id: int) -> Optional[UnrolledCBA]:
+        """Retrieves the unrolled data of a :ref:`CBA <cba>`.
+
+        :param int cba_id: The :ref:`CBA <cba>` identifier
+        :return: The unrolled :ref:`CBA <cba>`, or :const:`None` if it is not in the
+          table (or any of its ancestors is missing)
+        :rtype: UnrolledCBA or None
+        """
+        return self._table.get(cba_id)
+
+    def __contains__(self, cba_id: int) -> bool:
+        return cba_id in self._table
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def _add(self, cba: Dict[str, Any]) -> None:
+        """Registers a source :ref:`CBA <cba>`, without unrolling it."""
+        self._cbas[cba["id"]] = cba
+
+        if cba["info"]["familyLevel"] > 1:
+            self._children.setdefault(cba["info"]["parent"], set()).add(cba["id"])
+
+    def _subtree(self, cba_id: int) -> Iterable[int]:
+        """Yields a :ref:`CBA <cba>` identifier followed by those of its descendants."""
+        pending = [cba_id]
+
+        while pending:
+            i = pending.pop()
+            yield i
+            pending.extend(self._children.get(i, ()))
+
+    def _recompute(self, cba_id: int) -> None:
+        """Recomputes the unrolled data of a :ref:`CBA <cba>` and its descendants."""
+        subtree = list(self._subtree(cba_id))
+
+        for i in subtree:
+            self._table.pop(i, None)
+
+        for i in subtree:
+            self._unroll(i)
+
+    def _unroll(self, cba_id: int) -> Optional[UnrolledCBA]:
+        """Computes (and stores) the unrolled data of a :ref:`CBA <cba>`, reusing the
+        already computed data of its parent."""
+        if cba_id in self._table:
+            return self._table[cba_id]
+
+        cba = self._cbas.get(cba_id)
+
+        if cba is None:
+            return None
+
+        info = cba["info"]
+        materials = info.get("materials")
+
+        if info["familyLevel"] > 1:
+            parent = self._unroll(info["parent"])
+
+            if parent is None:
+                return None
+
+            parent_materials = (
+                {"policy": parent.materials_policy, "list": list(parent.materials)}
+                if parent.materials_policy
+                else None
+            )
+            materials = _merge_materials(materials, parent_materials)
+            unrolled = UnrolledCBA(
+                cba_id,
+                parent.ids,
+                parent.functions.union(info.get("functions", ())),
+                materials["policy"] if materials else None,
+                frozenset(materials["list"]) if materials else frozenset(),
+            )
+        else:
+            unrolled = UnrolledCBA(
+                cba_id,
+                (),
+                frozenset(info.get("functions", ())),
+                materials["policy"] if materials else None,
+                frozenset(materials["list"]) if materials else frozenset(),
+            )
+
+        self._table[cba_id] = unrolled
+        return unrolled
+
+
+def get_unrolled_cba_table(
+    db_handler: Optional[handler.DBHandler] = None, force_new_instance: bool = False
+) -> UnrolledCBATable:
+    """Provides the unrolled :ref:`Cookbase Appliances (CBAs) <cba>` table instance.
+
+    The first time this function is called (or if the `force_new_instance` flag is set
+    to :const:`True`) the table is built from the :code:`cba` collection; afterwards,
+    the already available instance is returned. The table follows the invalidations of
+    the database handler (see :meth:`UnrolledCBATable.follow`), so it is refreshed
+    whenever a :ref:`CBA <cba>` is invalidated through
+    :meth:`cookbase.db.handler.DBHandler.invalidate_cache`.
+
+    :param db_handler: The database handler to build the table from, defaults to the one
+      provided by :func:`cookbase.db.handler.get_handler`
+    :type db_handler: cookbase.db.handler.DBHandler, optional
+    :param force_new_instance: A flag indicating whether the table must be built again,
+      defaults to :const:`False`
+    :type force_new_instance: bool, optional
+    :return: The unrolled :ref:`CBAs <cba>` table
+    :rtype: UnrolledCBATable
+    """
+    global _unrolled_cba_table
+
+    with _unrolled_cba_table_lock:
+        if _unrolled_cba_table is None or force_new_instance:
+            if db_handler is None:
+                db_handler = handler.get_handler()
+
+            if _unrolled_cba_table is not None:
+                _unrolled_cba_table.unfollow()
+
+            _unrolled_cba_table = UnrolledCBATable.from_database(db_handler)
+            _unrolled_cba_table.follow(db_handler)
+
+        return _unrolled_cba_table
+
+
+_unrolled_cba_table = None
+_unrolled_cba_table_lock = threading.Lock()
@@ -1,13 +1,51 @@
-from typing import Any, Dict, Optional, Union
+import asyncio
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+import weakref
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+from urllib.parse import urldefrag, urljoin
 
 import jsonschema
-import requests
 from attr import attrib, attrs
-from cookbase.db import handler
+from cookbase.db import aiohandler, handler
+from cookbase.db.aiohandler import AsyncDBHandler, get_async_handler
 from cookbase.db.exceptions import CBRGraphInsertionError, CBRInsertionError
+from cookbase.db.writer import StorageWriter
 from cookbase.graph.cbrgraph import CBRGraph
 from cookbase.logging import logger
-from cookbase.validation import rules
+from cookbase.metrics import (
+    MetricsHook,
+    TimingsCollector,
+    ValidationTimings,
+    get_collector,
+)
+from cookbase.schema.registry import SchemaRegistry, get_registry
+from cookbase.validation import cba, rules
+from cookbase.validation.cache import ValidationResultCache
+from cookbase.validation.cba import UNROLLED_FIELDS, UnrolledCBATable
+from cookbase.validation.diff import SECTIONS, CBRDiff, diff_cbrs
+from cookbase.validation.engine import CBR, RuleEngine, get_rule_engine
 from cookbase.validation.globals import Definitions
 
 
@@ -26,8 +64,23 @@ class ValidationResult:
     :param cbrgraph: An object containing the :doc:`Cookbase Recipe Graph (CBRGraph)
       <cbrg>` data generated during validation
     :type cbrgraph: CBRGraph, optional
-    :param storing_result:
+    :param storing_result: The results of storing the :ref:`CBR <cbr>` and its
+      :doc:`CBRGraph <cbrg>`, set once stored if a
+      :class:`cookbase.db.writer.StorageWriter` stores them
     :type storing_result: handler.InsertCBRResult, optional
+    :param storing: The future resolved into :attr:`storing_result` if a
+      :class:`cookbase.db.writer.StorageWriter` stores the :ref:`CBR <cbr>` and its
+      :doc:`CBRGraph <cbrg>` in the background; it is not pickled
+    :type storing: concurrent.futures.Future[handler.InsertCBRResult], optional
+    :param timings: The time breakdown of the validation, if it was collected
+    :type timings: cookbase.metrics.ValidationTimings, optional
+    :param bool from_cache: A flag indicating whether the result was retrieved from a
+      :class:`cookbase.validation.cache.ValidationResultCache`, defaults to
+      :const:`False`
+    :param resources: The resources the rules were applied to (such as the catalogue
+      documents referred by the :ref:`CBR <cbr>`), kept to revalidate the :ref:`CBR
+      <cbr>` after it is edited; they are not pickled
+    :type resources: dict[str, Any]
 
     """
 
@@ -35,6 +88,27 @@ class ValidationResult:
     rules_results: Dict[str, rules.AppliedRuleResult] = attrib(factory=dict)
     cbrgraph: Optional[CBRGraph] = attrib(default=None)
     storing_result: Optional[handler.InsertCBRResult] = attrib(default=None)
+    storing: Optional[Future] = attrib(default=None, repr=False, eq=False)
+    timings: Optional[ValidationTimings] = attrib(default=None)
+    from_cache: bool = attrib(default=False)
+    resources: Dict[str, Any] = attrib(factory=dict, repr=False, eq=False)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        state["resources"] = {}
+        state["storing"] = None
+        return state
+
+    def _storing_done(self, future: Future) -> None:
+        """Sets :attr:`storing_result` from the resolved :attr:`storing` future, as
+        :meth:`Validator.validate` does when storing in the foreground."""
+        try:
+            self.storing_result = future.result()
+        except (CBRInsertionError, CBRGraphInsertionError) as e:
+            self.storing_result = e.partial_result
+        except Exception:
+            # Already reported by the storage writer
+            pass
 
     def is_valid(self, strict: bool = True) -> bool:
         """Indicates whether the validation process is evaluated as valid or not.
@@ -63,31 +137,467 @@ class ValidationResult:
         return True
 
 
+def _populate_resolver_store(
+    resolver: jsonschema.RefResolver, schema: Dict[str, Any]
+) -> None:
+    """Resolves in advance every document referenced, directly or transitively, by a
+    JSON Schema, so that they are held by the store of the given resolver.
+
+    :param resolver: The resolver whose store is to be populated
+    :type resolver: jsonschema.RefResolver
+    :param schema: The root JSON Schema
+    :type schema: dict[str, Any]
+    """
+    visited = {urldefrag(resolver.resolution_scope)[0]}
+    pending = [(resolver.resolution_scope, schema)]
+
+    while pending:
+        base_uri, node = pending.pop()
+
+        if isinstance(node, dict):
+            if isinstance(node.get("$id"), str):
+                base_uri = urljoin(base_uri, node["$id"])
+
+            if isinstance(node.get("$ref"), str):
+                url = urldefrag(urljoin(base_uri, node["$ref"]))[0]
+
+                if url and url not in visited:
+                    visited.add(url)
+                    pending.append((url, resolver.resolve_from_url(url)))
+
+            pending.extend((base_uri, v) for v in node.values())
+        elif isinstance(node, list):
+            pending.extend((base_uri, v) for v in node)
+
+
+def _catalogue_version() -> Tuple[int, int, int, int]:
+    """Provides the version of the catalogue seen by the default database handler and
+    unrolled :ref:`CBAs <cba>` table of this process, as computed by
+    :func:`_catalogue_version_of`.
+
+    :return: The catalogue version
+    :rtype: tuple[int, int, int, int]
+    """
+    return _catalogue_version_of(handler._db_handler, cba._unrolled_cba_table)
+
+
+def _catalogue_version_of(
+    db_handler: Union[handler.DBHandler, AsyncDBHandler, None],
+    table: Optional[UnrolledCBATable],
+) -> Tuple[int, int, int, int]:
+    """Computes the version of the catalogue seen by a database handler and an unrolled
+    :ref:`CBAs <cba>` table, which changes whenever any of them is replaced or its
+    contents are invalidated or updated. As it is built from the identities of both
+    objects, it is only meaningful within the current process.
+
+    :param db_handler: The database handler, if any
+    :type db_handler: cookbase.db.handler.DBHandler or
+      cookbase.db.aiohandler.AsyncDBHandler or None
+    :param table: The unrolled :ref:`CBAs <cba>` table, if any
+    :type table: cookbase.validation.cba.UnrolledCBATable or None
+    :return: The identifiers and the versions of both objects
+    :rtype: tuple[int, int, int, int]
+    """
+    return (
+        id(db_handler),
+        db_handler.catalogue_version if db_handler is not None else 0,
+        id(table),
+        table.version if table is not None else 0,
+    )
+
+
 class Validator:
     """A class that performs validation and :doc:`Cookbase Recipe Graph (CBRGraph)
     <cbrg>` construction of recipes in :ref:`Cookbase Recipe (CBR) <cbr>` format.
 
-    :param schema_url: A URL to where the :ref:`CBR <cbr>` Schema is to be retrieved,
-      defaults to :attr:`cookbase.validation.globals.Definitions.cbr_schema_url`
+    :param schema_url: The URI identifying the :ref:`CBR <cbr>` Schema, defaults to
+      :attr:`cookbase.validation.globals.Definitions.cbr_schema_url`
     :type schema_url: str, optional
+    :param registry: The schema registry from where the :ref:`CBR <cbr>` Schema and its
+      references are resolved, defaults to the one provided by
+      :func:`cookbase.schema.registry.get_registry`
+    :type registry: cookbase.schema.registry.SchemaRegistry, optional
+    :param process_dispatch: A flag indicating whether each :ref:`CBR Process
+      <cbr-preparation>` is validated only against the process schema matching its
+      :code:`cbpId`, instead of against the :code:`oneOf` composition of every process
+      schema, defaults to :const:`True`
+    :type process_dispatch: bool, optional
+    :param engine: The engine applying the validation rules, defaults to the one
+      provided by :func:`cookbase.validation.engine.get_rule_engine`
+    :type engine: cookbase.validation.engine.RuleEngine, optional
+    :param collect_timings: A flag indicating whether every :class:`ValidationResult`
+      carries the time breakdown of its validation, defaults to :const:`False`
+    :type collect_timings: bool, optional
+    :param metrics_hooks: Callables receiving the
+      :class:`cookbase.metrics.ValidationTimings` of every validation (which implies
+      collecting them), defaults to none
+    :type metrics_hooks: Iterable[cookbase.metrics.MetricsHook], optional
+    :param result_cache: The cache where validation results are looked up before
+      validating a :ref:`CBR <cbr>`, defaults to :const:`None` (no caching). If the
+      cache has no catalogue version, it is set to one derived from the default
+      database handler and unrolled :ref:`CBAs <cba>` table, so cached results are
+      discarded after :meth:`cookbase.db.handler.DBHandler.invalidate_cache` or any
+      change of the table. Such a version only tracks the changes made through this
+      process, which is why a cache with an on-disk tier requires its own version
+    :type result_cache: cookbase.validation.cache.ValidationResultCache, optional
+    :param storage_writer: The writer storing the validated :ref:`CBRs <cbr>` in the
+      background, so that validating with :code:`store=True` returns without waiting
+      for the database and the result's :attr:`ValidationResult.storing` future
+      tracks the insertion, defaults to :const:`None` (stored before returning). The
+      worker processes of :meth:`validate_many` always store before returning
+    :type storage_writer: cookbase.db.writer.StorageWriter, optional
 
-    :raises Exception: The HTTP response from requesting the :ref:`CBR <cbr>` Schema is
-      empty
+    :raises jsonschema.exceptions.RefResolutionError: The :ref:`CBR <cbr>` Schema or
+      any of its references is not available in the registry
+    :raises jsonschema.exceptions.SchemaError: The retrieved :ref:`CBR <cbr>` Schema is
+      not a valid Draft 7 JSON Schema
 
     :ivar schema: The :ref:`CBR <cbr>` schema
     :vartype schema: dict[str, Any]
+    :ivar engine: The engine applying the validation rules
+    :vartype engine: cookbase.validation.engine.RuleEngine
+    :ivar bool collect_timings: The timings collection flag
+    :ivar metrics_hooks: The callables receiving the timings of every validation
+    :vartype metrics_hooks: list[cookbase.metrics.MetricsHook]
+    :ivar result_cache: The validation results cache
+    :vartype result_cache: cookbase.validation.cache.ValidationResultCache or None
+    :ivar storage_writer: The background storage writer
+    :vartype storage_writer: cookbase.db.writer.StorageWriter or None
+    :ivar _schema_validator: The Draft 7 validator compiled from :attr:`schema`, whose
+      resolver store is pre-populated with every document referenced by the schema
+    :vartype _schema_validator: jsonschema.Draft7Validator
+    :ivar _process_validators: The validators of each process schema by the
+      :code:`cbpId` it requires, or :const:`None` if :code:`cbpId` dispatch is disabled
+    :vartype _process_validators: dict[int, jsonschema.Draft7Validator] or None
+    :ivar _item_validators: The validators of the ingredient and appliance schemas by
+      section name, or :const:`None` if :code:`cbpId` dispatch is disabled, used
+      together with :attr:`_process_validators` to validate edited items only
+    :vartype _item_validators: dict[str, jsonschema.Draft7Validator] or None
+    :ivar _thread_validators: The copies of the validators above used by each thread,
+      as a :class:`jsonschema.RefResolver` keeps track of its resolution scope and
+      cannot be shared by concurrent validations
+    :vartype _thread_validators: threading.local
 
     """
 
-    def __init__(self, schema_url: str = Definitions.cbr_schema_url):
+    def __init__(
+        self,
+        schema_url: str = Definitions.cbr_schema_url,
+        registry: Optional[SchemaRegistry] = None,
+        process_dispatch: bool = True,
+        engine: Optional[RuleEngine] = None,
+        collect_timings: bool = False,
+        metrics_hooks: Iterable[MetricsHook] = (),
+        result_cache: Optional[ValidationResultCache] = None,
+        storage_writer: Optional[StorageWriter] = None,
+    ):
         """Constructor method."""
-        r = requests.get(schema_url)
-        r.raise_for_status()
+        if registry is None:
+            registry = get_registry()
+
+        self.engine: RuleEngine = engine if engine is not None else get_rule_engine()
+        self.metrics_hooks: List[MetricsHook] = list(metrics_hooks)
+        self.collect_timings: bool = collect_timings or bool(self.metrics_hooks)
+        self.result_cache: Optional[ValidationResultCache] = result_cache
+
+        if result_cache is not None and result_cache.catalogue_version is None:
+            result_cache.catalogue_version = self._catalogue_version_function()
+
+        self.storage_writer: Optional[StorageWriter] = storage_writer
+        # Arguments to build an equivalent validator in a worker process
+        self._worker_args: Dict[str, Any] = {
+            "schema_url": schema_url,
+            "registry": registry if registry is not get_registry() else None,
+            "process_dispatch": process_dispatch,
+            "engine": engine,
+            "collect_timings": self.collect_timings,
+            "result_cache": result_cache,
+        }
+
+        self.schema: Dict[str, Any] = registry.get(schema_url)
+        jsonschema.Draft7Validator.check_schema(self.schema)
+        resolver = registry.resolver_for(self.schema)
+        _populate_resolver_store(resolver, self.schema)
+        self._schema_validator = jsonschema.Draft7Validator(
+            self.schema, resolver=resolver
+        )
+        self._process_validators: Optional[Dict[int, jsonschema.Draft7Validator]] = None
+        self._item_validators: Optional[Dict[str, jsonschema.Draft7Validator]] = None
+        self._thread_validators = threading.local()
+
+        if process_dispatch:
+            self._setup_process_dispatch(registry, resolver)
+
+    def _catalogue_version_function(self) -> Callable[[], Hashable]:
+        """Provides the function deriving the catalogue version of :attr:`result_cache`
+        when none is given.
+
+        :return: The catalogue version function, which can be pickled
+        :rtype: Callable[[], Hashable]
+        """
+        return _catalogue_version
+
+    def _setup_process_dispatch(
+        self, registry: SchemaRegistry, resolver: jsonschema.RefResolver
+    ) -> None:
+        """Prepares the validation of :ref:`CBR Processes <cbr-preparation>` by their
+        :code:`cbpId`.
+
+        The :code:`preparation` items of the :ref:`CBR <cbr>` Schema are expected to be
+        a :code:`oneOf` over process schemas, each of them pinning :code:`cbpId` with a
+        :code:`const`. A validator is compiled for every process schema, together with
+        a validator of the :ref:`CBR <cbr>` Schema that leaves the :code:`preparation`
+        items unchecked. If the schema does not follow that structure, a warning is
+        logged and the whole schema is used instead.
+
+        :param registry: The schema registry
+        :type registry: cookbase.schema.registry.SchemaRegistry
+        :param resolver: The resolver of the :ref:`CBR <cbr>` Schema
+        :type resolver: jsonschema.RefResolver
+        """
+        try:
+            preparation = self.schema["properties"]["preparation"]
+            process_url, process_schema = resolver.resolve(
+                preparation["additionalProperties"]["$ref"]
+            )
+            process_validators = {}
+
+            with resolver.in_scope(process_url):
+                for option in process_schema["oneOf"]:
+                    _, schema = resolver.resolve(option["$ref"])
+                    process_validators[
+                        schema["properties"]["cbpId"]["const"]
+                    ] = jsonschema.Draft7Validator(
+                        schema, resolver=registry.resolver_for(schema)
+                    )
+        except (KeyError, TypeError):
+            logger.warning(
+                "CBR Schema processes cannot be dispatched by cbpId, validating them "
+                "against the whole CBR Schema"
+            )
+            return
+
+        shell_schema = self._without_items(self.schema, ("preparation",))
+        self._shell_validator = jsonschema.Draft7Validator(
+            shell_schema, resolver=registry.resolver_for(shell_schema)
+        )
+        self._process_validator = jsonschema.Draft7Validator(
+            process_schema, resolver=registry.resolver_for(process_schema)
+        )
+        self._process_validators = process_validators
+
+        try:
+            item_validators = {}
+
+            for section in SECTIONS[:-1]:
+                _, schema = resolver.resolve(
+                    self.schema["properties"][section]["additionalProperties"]["$ref"]
+                )
+                item_validators[section] = jsonschema.Draft7Validator(
+                    schema, resolver=registry.resolver_for(schema)
+                )
+        except (KeyError, TypeError):
+            return
+
+        frame_schema = self._without_items(self.schema, SECTIONS)
+        self._frame_validator = jsonschema.Draft7Validator(
+            frame_schema, resolver=registry.resolver_for(frame_schema)
+        )
+        self._item_validators = item_validators
+
+    @staticmethod
+    def _without_items(
+        schema: Dict[str, Any], sections: Iterable[str]
+    ) -> Dict[str, Any]:
+        """Derives a :ref:`CBR <cbr>` Schema that leaves the items of some sections
+        unchecked, other than requiring them to be objects.
+
+        :param schema: The :ref:`CBR <cbr>` Schema
+        :type schema: dict[str, Any]
+        :param sections: The names of the sections
+        :type sections: Iterable[str]
+        :return: The derived schema
+        :rtype: dict[str, Any]
+        """
+        derived = dict(schema)
+        derived["properties"] = dict(schema["properties"])
 
-        if len(r.content) == 0:
-            raise Exception("the HTTP response from requesting JSON Schema is empty")
+        for section in sections:
+            derived["properties"][section] = dict(
+                schema["properties"][section], additionalProperties={"type": "object"}
+            )
 
-        self.schema: Dict[str, Any] = r.json()
+        return derived
+
+    def _local(
+        self, validator: jsonschema.Draft7Validator
+    ) -> jsonschema.Draft7Validator:
+        """Provides the copy of a validator to be used by the current thread, whose
+        resolver shares the store of the original one."""
+        copies = self._thread_validators.__dict__.setdefault("copies", {})
+        local = copies.get(id(validator))
+
+        if local is None:
+            resolver = validator.resolver
+            local = copies[id(validator)] = jsonschema.Draft7Validator(
+                validator.schema,
+                resolver=jsonschema.RefResolver(
+                    resolver.base_uri,
+                    resolver.referrer,
+                    store=resolver.store,
+                    cache_remote=resolver.cache_remote,
+                    handlers=resolver.handlers,
+                ),
+            )
+
+        return local
+
+    def _iter_schema_errors(
+        self, cbr: Dict[str, Any]
+    ) -> Iterator[jsonschema.exceptions.ValidationError]:
+        """Yields the errors found when validating a :ref:`CBR <cbr>` against the
+        :ref:`CBR <cbr>` Schema.
+
+        If :code:`cbpId` dispatch is enabled, each :ref:`CBR Process <cbr-preparation>`
+        is only validated against the process schema matching its :code:`cbpId` (or
+        against all of them, if none matches).
+
+        :param cbr: The :ref:`CBR <cbr>` to be validated
+        :type cbr: dict[str, Any]
+        :return: An iterator over the validation errors
+        :rtype: Iterator[jsonschema.exceptions.ValidationError]
+        """
+        if self._process_validators is None:
+            yield from self._local(self._schema_validator).iter_errors(cbr)
+            return
+
+        yield from self._local(self._shell_validator).iter_errors(cbr)
+        preparation = cbr.get("preparation") if isinstance(cbr, dict) else None
+
+        if not isinstance(preparation, dict):
+            return
+
+        for process_ref, process in preparation.items():
+            yield from self._iter_item_errors("preparation", process_ref, process)
+
+    def _iter_item_errors(
+        self, section: str, item_ref: str, item: Any
+    ) -> Iterator[jsonschema.exceptions.ValidationError]:
+        """Yields the errors found when validating an item of a :ref:`CBR <cbr>`
+        section against its schema, which for :ref:`CBR Processes <cbr-preparation>` is
+        the process schema matching its :code:`cbpId` (or all of them, if none
+        matches).
+
+        :param str section: The name of the section
+        :param str item_ref: The reference of the item
+        :param item: The item
+        :type item: Any
+        :return: An iterator over the validation errors
+        :rtype: Iterator[jsonschema.exceptions.ValidationError]
+        """
+        validator = None
+
+        if section != "preparation":
+            validator = self._item_validators[section]
+        elif isinstance(item, dict) and isinstance(item.get("cbpId"), int):
+            validator = self._process_validators.get(item["cbpId"])
+
+        if validator is None:
+            validator = self._process_validator
+
+        for e in self._local(validator).iter_errors(item):
+            e.path.extendleft((item_ref, section))
+            yield e
+
+    def _iter_changed_items_errors(
+        self, cbr: Dict[str, Any], items: Dict[str, Iterable[str]]
+    ) -> Iterator[jsonschema.exceptions.ValidationError]:
+        """Yields the errors found when validating a :ref:`CBR <cbr>` against the
+        :ref:`CBR <cbr>` Schema, checking only the given section items.
+
+        :param cbr: The :ref:`CBR <cbr>` to be validated
+        :type cbr: dict[str, Any]
+        :param items: The references of the items to be checked, by section name
+        :type items: dict[str, Iterable[str]]
+        :return: An iterator over the validation errors
+        :rtype: Iterator[jsonschema.exceptions.ValidationError]
+        """
+        yield from self._local(self._frame_validator).iter_errors(cbr)
+
+        for section, refs in items.items():
+            section_items = cbr.get(section)
+
+            if not isinstance(section_items, dict):
+                continue
+
+            for ref in refs:
+                if ref in section_items:
+                    yield from self._iter_item_errors(section, ref, section_items[ref])
+
+    def validate_schema(
+        self, cbr: Dict[str, Any], items: Optional[Dict[str, Iterable[str]]] = None
+    ) -> None:
+        """Validates a :ref:`CBR <cbr>` against the :ref:`CBR <cbr>` Schema.
+
+        :param cbr: The :ref:`CBR <cbr>` to be validated
+        :type cbr: dict[str, Any]
+        :param items: The references of the only :code:`ingredients`,
+          :code:`appliances` and :code:`preparation` items to be checked, by section
+          name, if the rest are known to satisfy their schemas, defaults to
+          :const:`None` (every item is checked); disregarded if :code:`cbpId`
+          dispatch is disabled
+        :type items: dict[str, Iterable[str]], optional
+
+        :raises jsonschema.exceptions.ValidationError: The :ref:`CBR <cbr>` does not
+          satisfy the :ref:`CBR <cbr>` Schema (the most relevant error is raised)
+        """
+        if items is not None and self._item_validators is not None:
+            errors = self._iter_changed_items_errors(cbr, items)
+        else:
+            errors = self._iter_schema_errors(cbr)
+
+        error = jsonschema.exceptions.best_match(errors)
+
+        if error is not None:
+            raise error
+
+    def _lookup_result(
+        self, cbr: Dict[str, Any]
+    ) -> Tuple[Optional[str], Optional[ValidationResult]]:
+        """Looks up the validation result of a :ref:`CBR <cbr>` in
+        :attr:`result_cache`.
+
+        The result is keyed by the :ref:`CBR <cbr>` together with the :ref:`CBR <cbr>`
+        Schema identifier and the names of the rules registered in :attr:`engine`.
+
+        :param cbr: The :ref:`CBR <cbr>` to be validated
+        :type cbr: dict[str, Any]
+        :return: The cache key and the cached result, which are :const:`None` if there
+          is no cache, or the result alone if it is not cached
+        :rtype: tuple[str or None, ValidationResult or None]
+        """
+        if self.result_cache is None:
+            return None, None
+
+        context = json.dumps([self.schema.get("$id"), self.engine.rules])
+        key = self.result_cache.key(cbr, context)
+        result = self.result_cache.get(key)
+
+        if result is not None:
+            result.from_cache = True
+
+        return key, result
+
+    def _remember_result(self, key: Optional[str], result: ValidationResult) -> None:
+        """Stores a validation result in :attr:`result_cache`, if any.
+
+        :param key: The cache key, as returned by :meth:`_lookup_result`
+        :type key: str or None
+        :param result: The validation result
+        :type result: ValidationResult
+        """
+        if key is not None:
+            self.result_cache.put(key, result)
 
     def _store(
         self, cbr: Dict[str, Any], cbrgraph: CBRGraph = None
@@ -110,35 +620,100 @@ class Validator:
     def apply_validation_rules(self, cbr: Dict[str, Any]) -> ValidationResult:
         """Validates a :ref:`CBR <cbr>` against the set of definition rules.
 
-        Validation rules defined in :mod:`cookbase.validation.rules` are applied
-        sequentially to ensure that the recipe document satisfies the :ref:`CBR <cbr>`
-        definition.
+        The validation rules registered in :attr:`engine` (by default, those defined in
+        :mod:`cookbase.validation.rules`) are applied to ensure that the recipe document
+        satisfies the :ref:`CBR <cbr>` definition, running concurrently those that do
+        not depend on each other.
 
         :param cbr: The :ref:`CBR <cbr>` to be validated
         :type cbr: dict[str, Any]
         :return: The results from applying the set of validation rules
         :rtype: ValidationResult
         """
-        result = ValidationResult()
-        rule = "ingredients_are_valid"
-        result.rules_results[rule] = getattr(rules.Semantics, rule)(cbr["ingredients"])
-        rule = "foodstuff_and_appliance_references_are_consistent"
-        result.rules_results[rule] = getattr(rules.Semantics, rule)(
-            cbr["ingredients"], cbr["appliances"], cbr["preparation"]
+        rules_results, resources = self.engine.run(cbr, outputs=("cbrgraph",))
+        return self._rules_result(rules_results, resources)
+
+    @staticmethod
+    def _rules_result(
+        rules_results: Dict[str, rules.AppliedRuleResult], resources: Dict[str, Any]
+    ) -> ValidationResult:
+        """Builds the result of applying the validation rules from the outcome of a
+        :class:`cookbase.validation.engine.RuleEngine` run.
+
+        :param rules_results: The results of the rules by name
+        :type rules_results: dict[str, rules.AppliedRuleResult]
+        :param resources: The resources of the run by name
+        :type resources: dict[str, Any]
+        :return: The results from applying the set of validation rules
+        :rtype: ValidationResult
+        """
+        resources = {k: v for k, v in resources.items() if k != CBR}
+        return ValidationResult(
+            rules_results=rules_results,
+            cbrgraph=resources.pop("cbrgraph"),
+            resources=resources,
         )
-        rule = "processes_and_appliances_are_valid_and_processes_requirements_met"
-        result.rules_results[rule] = getattr(rules.Semantics, rule)(
-            cbr["appliances"], cbr["preparation"]
+
+    def _reapply_validation_rules(
+        self,
+        previous_result: ValidationResult,
+        cbr: Dict[str, Any],
+        diff: CBRDiff,
+        catalogue: Optional[Dict[str, Any]] = None,
+    ) -> ValidationResult:
+        """Validates an edited :ref:`CBR <cbr>` against the set of definition rules,
+        updating in place the :doc:`CBRGraph <cbrg>` of its previous validation and
+        applying again only the rules whose inputs changed.
+
+        :param previous_result: The result of the previous validation
+        :type previous_result: ValidationResult
+        :param cbr: The edited :ref:`CBR <cbr>`
+        :type cbr: dict[str, Any]
+        :param diff: The differences between the previous and the edited :ref:`CBR
+          <cbr>`
+        :type diff: cookbase.validation.diff.CBRDiff
+        :param catalogue: Up-to-date catalogue resources of the rule engine, defaults
+          to :const:`None` (provided by the rule engine)
+        :type catalogue: dict[str, Any], optional
+        :return: The results from applying the set of validation rules
+        :rtype: ValidationResult
+        """
+        changed = diff.changed_sections
+        start = time.perf_counter()
+
+        if previous_result.cbrgraph.update_graph(cbr, diff.items):
+            changed.add("cbrgraph")
+
+        collector = get_collector()
+
+        if collector is not None:
+            collector.add_resource("cbrgraph", time.perf_counter() - start)
+
+        if diff.other:
+            changed.add(CBR)
+
+        resources = {"cbrgraph": previous_result.cbrgraph}
+
+        if catalogue is not None:
+            changed.update(
+                k for k, v in catalogue.items() if previous_result.resources.get(k) != v
+            )
+            resources.update(catalogue)
+
+        rules_results, resources = self.engine.rerun(
+            cbr,
+            changed,
+            previous_result.rules_results,
+            previous_result.resources,
+            outputs=("cbrgraph",),
+            resources=resources,
         )
-        result.cbrgraph = CBRGraph()
-        result.cbrgraph.build_graph(cbr)
-        rule = "ingredients_used_exactly_once"
-        result.rules_results[rule] = getattr(rules.Graph, rule)(result.cbrgraph)
-        rule = "single_final_process"
-        result.rules_results[rule] = getattr(rules.Graph, rule)(result.cbrgraph)
-        rule = "appliances_not_in_conflict"
-        result.rules_results[rule] = getattr(rules.Graph, rule)(result.cbrgraph)
-        return result
+        return self._rules_result(rules_results, resources)
+
+    def _schema_items(self, diff: CBRDiff) -> Optional[Dict[str, Set[str]]]:
+        """Selects the section items to be checked against the :ref:`CBR <cbr>`
+        Schema after an edit, or :const:`None` if every item must be checked."""
+        return None if diff.other.intersection(SECTIONS) else diff.items
 
     def validate(
         self, cbr: Dict[str, Any], store: bool = False, strict: bool = True
@@ -147,9 +722,607 @@ class Validator:
         and builds the :doc:`CBRGraph <cbrg>`.
 
         The validation process is implemented in two stages: firstly, a JSON Schema
-        validation is performed, and, secondly, validating rules are sequentially
-        applied to ensure that the recipe document satisfies the :ref:`CBR <cbr>`
-        definition.
+        validation is performed, and, secondly, validating rules are applied to ensure
+        that the recipe document satisfies the :ref:`CBR <cbr>` definition.
+
+        If :attr:`collect_timings` is set, the result carries the time breakdown of the
+        validation, which is also passed to every callable in :attr:`metrics_hooks`. If
+        :attr:`result_cache` is set, both stages are skipped when the result for an
+        equivalent :ref:`CBR <cbr>` is cached.
+
+        :param cbr: The :ref:`CBR <cbr>` to be validated
+        :type cbr: dict[str, Any]
+        :param store: A flag indicating whether the validated CBR and :doc:`CBRGraph
+          <cbrg>` should be stored in database, defaults to :const:`False`
+        :type store: bool, optional
+        :param strict: A flag indicating the validation policy, defaults to
+          :const:`True`
+        :type strict: bool, optional
+        :return: The results from applying the set of validation rules
+        :rtype: ValidationResult
+        """
+        return self._measure(self._validate, cbr, store, strict)
+
+    def revalidate(
+        self,
+        previous_result: ValidationResult,
+        old_cbr: Dict[str, Any],
+        new_cbr: Dict[str, Any],
+        store: bool = False,
+        strict: bool = True,
+    ) -> ValidationResult:
+        """Performs the validation of an edited :ref:`CBR <cbr>`, as :meth:`validate`
+        does, reusing the outcome of the validation of its previous version.
+
+        Only the added, removed or modified :code:`ingredients`, :code:`appliances` and
+        :code:`preparation` items are checked against their schemas, the
+        :doc:`CBRGraph <cbrg>` of `previous_result` is updated in place, only the
+        catalogue documents not referred before are retrieved, and only the rules
+        whose inputs changed are applied again. If `previous_result` has no
+        :doc:`CBRGraph <cbrg>` that can be updated in place (such as a
+        :class:`cookbase.graph.compact.CompactCBRGraph`) or did not satisfy the
+        :ref:`CBR <cbr>` Schema, the edited :ref:`CBR <cbr>` is validated from
+        scratch.
+
+        :param previous_result: The result of the validation of `old_cbr`, which must
+          not be used afterwards
+        :type previous_result: ValidationResult
+        :param old_cbr: The previous version of the :ref:`CBR <cbr>`
+        :type old_cbr: dict[str, Any]
+        :param new_cbr: The edited :ref:`CBR <cbr>` (a different object than
+          `old_cbr`)
+        :type new_cbr: dict[str, Any]
+        :param store: A flag indicating whether the validated CBR and :doc:`CBRGraph
+          <cbrg>` should be stored in database, defaults to :const:`False`
+        :type store: bool, optional
+        :param strict: A flag indicating the validation policy, defaults to
+          :const:`True`
+        :type strict: bool, optional
+        :return: The results from applying the set of validation rules
+        :rtype: ValidationResult
+        """
+        return self._measure(
+            self._revalidate, previous_result, old_cbr, new_cbr, store, strict
+        )
+
+    def _measure(
+        self, function: Callable[..., ValidationResult], *args
+    ) -> ValidationResult:
+        """Runs a validation function, which takes the timings to be filled as last
+        argument, collecting its timings if :attr:`collect_timings` is set.
+
+        :param function: The validation function
+        :type function: Callable[..., ValidationResult]
+        :return: The validation result
+        :rtype: ValidationResult
+        """
+        if not self.collect_timings:
+            return function(*args)
+
+        start = time.perf_counter()
+        collector = TimingsCollector()
+
+        with collector.activate():
+            result = function(*args, collector.timings)
+
+        collector.timings.total = time.perf_counter() - start
+        result.timings = collector.timings
+        self._run_metrics_hooks(result)
+        return result
+
+    def _run_metrics_hooks(self, result: ValidationResult) -> None:
+        """Passes the timings of a validation to every callable in
+        :attr:`metrics_hooks`, logging (and otherwise disregarding) their failures.
+
+        :param result: The validation result
+        :type result: ValidationResult
+        """
+        if result.timings is None:
+            return
+
+        for hook in self.metrics_hooks:
+            try:
+                hook(result.timings)
+            except Exception:
+                logger.exception("Metrics hook failed")
+
+    def validate_many(
+        self,
+        cbrs: Iterable[Dict[str, Any]],
+        workers: Optional[int] = None,
+        store: bool = False,
+        strict: bool = True,
+        ordered: bool = True,
+        max_pending: Optional[int] = None,
+    ) -> Iterator[Tuple[int, ValidationResult]]:
+        """Validates a stream of :ref:`CBRs <cbr>` over a pool of worker processes, as
+        performed by :meth:`validate`.
+
+        Every worker builds its own validator (with the same schema, rule engine and
+        timings configuration as this one) and its own database handler (built with the
+        same arguments as the one of :func:`cookbase.db.handler.get_handler`, if any),
+        which are kept for the whole stream. No more than `max_pending` :ref:`CBRs
+        <cbr>` are read from `cbrs` ahead of the results consumed, so memory usage does
+        not depend on the stream length.
+
+        :param cbrs: The :ref:`CBRs <cbr>` to be validated
+        :type cbrs: Iterable[dict[str, Any]]
+        :param workers: The number of worker processes, defaults to the number of CPUs;
+          if :const:`0`, the :ref:`CBRs <cbr>` are validated in the current process
+        :type workers: int, optional
+        :param store: A flag indicating whether the validated :ref:`CBRs <cbr>` and
+          their :doc:`CBRGraphs <cbrg>` should be stored in database, defaults to
+          :const:`False`
+        :type store: bool, optional
+        :param strict: A flag indicating the validation policy, defaults to
+          :const:`True`
+        :type strict: bool, optional
+        :param ordered: A flag indicating whether the results are yielded in the order
+          of `cbrs`, or as soon as they are available, defaults to :const:`True`
+        :type ordered: bool, optional
+        :param max_pending: Maximum number of :ref:`CBRs <cbr>` submitted and not yet
+          yielded, defaults to four times the number of workers
+        :type max_pending: int, optional
+        :return: An iterator over pairs formed by the position of each :ref:`CBR <cbr>`
+          in `cbrs` and its validation result
+        :rtype: Iterator[tuple[int, ValidationResult]]
+        """
+        if workers == 0:
+            for i, cbr in enumerate(cbrs):
+                yield i, self.validate(cbr, store, strict)
+
+            return
+
+        workers = workers or os.cpu_count() or 1
+        max_pending = max(max_pending or 4 * workers, 1)
+        db_handler = handler._db_handler
+        handler_args = db_handler.init_args if db_handler is not None else None
+        executor = ProcessPoolExecutor(
+            workers,
+            initializer=_init_worker,
+            initargs=(self._worker_args, handler_args),
+        )
+        pending: "deque[Tuple[int, Future]]" = deque()
+
+        def completed(block_until_all: bool) -> Iterator[Tuple[int, Future]]:
+            if ordered:
+                while pending and (block_until_all or len(pending) >= max_pending):
+                    yield pending.popleft()
+            else:
+                while pending and (block_until_all or len(pending) >= max_pending):
+                    done, _ = wait([f for _, f in pending], return_when=FIRST_COMPLETED)
+
+                    for i, f in [p for p in pending if p[1] in done]:
+                        pending.remove((i, f))
+                        yield i, f
+
+        try:
+            for i, cbr in enumerate(cbrs):
+                future = executor.submit(_validate_in_worker, cbr, store, strict)
+                pending.append((i, future))
+
+                for j, f in completed(False):
+                    result = f.result()
+                    self._run_metrics_hooks(result)
+                    yield j, result
+
+            for j, f in completed(True):
+                result = f.result()
+                self._run_metrics_hooks(result)
+                yield j, result
+        finally:
+            for _, f in pending:
+                f.cancel()
+
+            executor.shutdown()
+
+    def _validate(
+        self,
+        cbr: Dict[str, Any],
+        store: bool,
+        strict: bool,
+        timings: Optional[ValidationTimings] = None,
+    ) -> ValidationResult:
+        """Performs the validation stages of :meth:`validate`.
+
+        :param cbr: The :ref:`CBR <cbr>` to be validated
+        :type cbr: dict[str, Any]
+        :param bool store: The storage flag
+        :param bool strict: The validation policy flag
+        :param timings: The timings where the schema validation and storage durations
+          are recorded, defaults to :const:`None` (not recorded)
+        :type timings: cookbase.metrics.ValidationTimings, optional
+        :return: The results from applying the set of validation rules
+        :rtype: ValidationResult
+        """
+        key, result = self._lookup_result(cbr)
+
+        if result is None:
+            start = time.perf_counter()
+
+            try:
+                self.validate_schema(cbr)
+            except jsonschema.exceptions.ValidationError as e:
+                logger.error("CBR does not satisfy CBR Schema: " + e.message)
+                result = ValidationResult(schema_validated=False)
+                self._remember_result(key, result)
+                return result
+            finally:
+                if timings is not None:
+                    timings.schema_validation = time.perf_counter() - start
+
+            result = self.apply_validation_rules(cbr)
+            self._remember_result(key, result)
+        elif not result.schema_validated:
+            return result
+
+        return self._finish(cbr, result, store, strict, timings)
+
+    def _revalidate(
+        self,
+        previous_result: ValidationResult,
+        old_cbr: Dict[str, Any],
+        new_cbr: Dict[str, Any],
+        store: bool,
+        strict: bool,
+        timings: Optional[ValidationTimings] = None,
+    ) -> ValidationResult:
+        """Performs the validation stages of :meth:`revalidate`.
+
+        :param previous_result: The result of the validation of `old_cbr`
+        :type previous_result: ValidationResult
+        :param old_cbr: The previous version of the :ref:`CBR <cbr>`
+        :type old_cbr: dict[str, Any]
+        :param new_cbr: The edited :ref:`CBR <cbr>`
+        :type new_cbr: dict[str, Any]
+        :param bool store: The storage flag
+        :param bool strict: The validation policy flag
+        :param timings: The timings where the schema validation and storage durations
+          are recorded, defaults to :const:`None` (not recorded)
+        :type timings: cookbase.metrics.ValidationTimings, optional
+        :return: The results from applying the set of validation rules
+        :rtype: ValidationResult
+        """
+        if (
+            not isinstance(previous_result.cbrgraph, CBRGraph)
+            or not previous_result.schema_validated
+        ):
+            return self._validate(new_cbr, store, strict, timings)
+
+        key, result = self._lookup_result(new_cbr)
+
+        if result is None:
+            diff = diff_cbrs(old_cbr, new_cbr)
+            start = time.perf_counter()
+
+            try:
+                self.validate_schema(new_cbr, self._schema_items(diff))
+            except jsonschema.exceptions.ValidationError as e:
+                logger.error("CBR does not satisfy CBR Schema: " + e.message)
+                result = ValidationResult(schema_validated=False)
+                self._remember_result(key, result)
+                return result
+            finally:
+                if timings is not None:
+                    timings.schema_validation = time.perf_counter() - start
+
+            result = self._reapply_validation_rules(previous_result, new_cbr, diff)
+            self._remember_result(key, result)
+        elif not result.schema_validated:
+            return result
+
+        return self._finish(new_cbr, result, store, strict, timings)
+
+    def _finish(
+        self,
+        cbr: Dict[str, Any],
+        result: ValidationResult,
+        store: bool,
+        strict: bool,
+        timings: Optional[ValidationTimings] = None,
+    ) -> ValidationResult:
+        """Stores a :ref:`CBR <cbr>` and its :doc:`CBRGraph <cbrg>` after its rules
+        have been applied, if requested and valid, or queues them in
+        :attr:`storage_writer`, if any.
+
+        :param cbr: The validated :ref:`CBR <cbr>`
+        :type cbr: dict[str, Any]
+        :param result: The results from applying the set of validation rules
+        :type result: ValidationResult
+        :param bool store: The storage flag
+        :param bool strict: The validation policy flag
+        :param timings: The timings where the storage duration is recorded, defaults to
+          :const:`None` (not recorded)
+        :type timings: cookbase.metrics.ValidationTimings, optional
+        :return: The validation result
+        :rtype: ValidationResult
+        """
+        if not result.is_valid(strict):
+            logger.error("CBR does not satisfy CBR validation rules")
+        elif store:
+            start = time.perf_counter()
+
+            if result.cbrgraph is None:
+                result.cbrgraph = CBRGraph()
+                result.cbrgraph.build_graph(cbr)
+
+            try:
+                if self.storage_writer is not None:
+                    result.storing = self.storage_writer.submit(cbr, result.cbrgraph)
+                    result.storing.add_done_callback(result._storing_done)
+                else:
+                    result.storing_result = self._store(cbr, result.cbrgraph)
+            except (CBRInsertionError, CBRGraphInsertionError) as e:
+                logger.error(e)
+                result.storing_result = e.partial_result
+            finally:
+                if timings is not None:
+                    timings.storage = time.perf_counter() - start
+
+        return result
+
+
+class AsyncValidator(Validator):
+    """A :class:`Validator` whose validation methods are coroutines, so that many
+    :ref:`CBRs <cbr>` can be validated concurrently on one :mod:`asyncio` event loop.
+
+    The catalogue documents referred by a :ref:`CBR <cbr>` are requested concurrently
+    through an :class:`cookbase.db.aiohandler.AsyncDBHandler`, and the CPU-bound stages
+    (the schema validation and the application of the rules) run in the default
+    executor of the event loop, so none of them blocks the loop.
+
+    Its :meth:`validate` and :meth:`revalidate` methods are coroutine counterparts of
+    those of :class:`Validator`, and :meth:`validate_many` is an asynchronous generator,
+    so an :class:`AsyncValidator` cannot be used where a :class:`Validator` is expected.
+    The rules are applied asynchronously by :meth:`apply_validation_rules_async`, while
+    the inherited :meth:`Validator.apply_validation_rules` remains synchronous.
+
+    Besides `db_handler`, it takes the same parameters as :class:`Validator`.
+
+    :param db_handler: The asynchronous database handler, defaults to the one provided
+      by :func:`cookbase.db.aiohandler.get_async_handler`
+    :type db_handler: cookbase.db.aiohandler.AsyncDBHandler, optional
+
+    :ivar db_handler: The asynchronous database handler, or :const:`None` to use the
+      default one
+    :vartype db_handler: cookbase.db.aiohandler.AsyncDBHandler or None
+    :ivar _cba_table: The unrolled :ref:`CBAs <cba>` table, built from the database on
+      first use
+    :vartype _cba_table: cookbase.validation.cba.UnrolledCBATable or None
+    :ivar _stale_cba_ids: The identifiers of the :ref:`CBAs <cba>` invalidated through
+      the database handler since :attr:`_cba_table` was last refreshed
+    :vartype _stale_cba_ids: set[int]
+    :ivar _followed_handler: The database handler whose invalidations are followed to
+      refresh :attr:`_cba_table`, if any
+    :vartype _followed_handler: cookbase.db.aiohandler.AsyncDBHandler or None
+    """
+
+    def __init__(self, *args, db_handler: Optional[AsyncDBHandler] = None, **kwargs):
+        """Constructor method."""
+        self.db_handler: Optional[AsyncDBHandler] = db_handler
+        self._cba_table: Optional[UnrolledCBATable] = None
+        self._cba_table_lock: Optional[asyncio.Lock] = None
+        self._stale_cba_ids: Set[int] = set()
+        self._followed_handler: Optional[AsyncDBHandler] = None
+        super().__init__(*args, **kwargs)
+
+    def _catalogue_version_function(self) -> Callable[[], Hashable]:
+        """Provides the function deriving the catalogue version of :attr:`result_cache`
+        when none is given, from :attr:`db_handler` and the unrolled :ref:`CBAs <cba>`
+        table of this validator.
+
+        :return: The catalogue version function
+        :rtype: Callable[[], Hashable]
+        """
+
+        def catalogue_version() -> Tuple[int, int, int, int]:
+            db_handler = (
+                self.db_handler
+                if self.db_handler is not None
+                else aiohandler._async_db_handler
+            )
+            return _catalogue_version_of(db_handler, self._cba_table)
+
+        return catalogue_version
+
+    def _get_db_handler(self) -> AsyncDBHandler:
+        return self.db_handler if self.db_handler is not None else get_async_handler()
+
+    async def get_cba_table(self) -> UnrolledCBATable:
+        """Provides the unrolled :ref:`CBAs <cba>` table used by the rules, building it
+        from the :code:`cba` collection on first use, and refreshing the :ref:`CBAs
+        <cba>` invalidated through the database handler since.
+
+        :return: The unrolled :ref:`CBAs <cba>` table
+        :rtype: cookbase.validation.cba.UnrolledCBATable
+        """
+        if self._cba_table is None or self._stale_cba_ids:
+            if self._cba_table_lock is None:
+                self._cba_table_lock = asyncio.Lock()
+
+            async with self._cba_table_lock:
+                db_handler = self._get_db_handler()
+
+                if self._followed_handler is not db_handler:
+                    self._follow(db_handler)
+
+                if self._cba_table is None:
+                    self._stale_cba_ids.clear()
+                    cbas = [c async for c in db_handler.iter_cbas(UNROLLED_FIELDS)]
+                    self._cba_table = UnrolledCBATable(cbas)
+                elif self._stale_cba_ids:
+                    cba_ids, self._stale_cba_ids = self._stale_cba_ids, set()
+                    cbas = await db_handler.get_cbas(cba_ids, UNROLLED_FIELDS)
+                    self._cba_table.replace(cba_ids, cbas)
+
+        return self._cba_table
+
+    def _follow(self, db_handler: AsyncDBHandler) -> None:
+        """Registers a listener on a database handler marking the :ref:`CBAs <cba>` it
+        invalidates as stale, or the whole table if every :ref:`CBA <cba>` is
+        invalidated. The listener does not keep the validator alive.
+
+        :param db_handler: The database handler whose invalidations are followed
+        :type db_handler: cookbase.db.aiohandler.AsyncDBHandler
+        """
+        validator_ref = weakref.ref(self)
+
+        def listener(collection: Optional[str], doc_id: Optional[Hashable]) -> None:
+            validator = validator_ref()
+
+            if validator is None:
+                db_handler.remove_invalidation_listener(listener)
+            elif collection == "cba" and doc_id is not None:
+                validator._stale_cba_ids.add(doc_id)
+            elif collection in (None, "cba"):
+                validator._cba_table = None
+
+        db_handler.add_invalidation_listener(listener)
+        self._followed_handler = db_handler
+
+    async def _fetch_catalogue(self, cbr: Dict[str, Any]) -> Dict[str, Any]:
+        """Retrieves concurrently the catalogue documents referred by a :ref:`CBR
+        <cbr>`, with only the fields read by the rules of the engine.
+
+        :param cbr: The :ref:`CBR <cbr>`
+        :type cbr: dict[str, Any]
+        :return: The :code:`cbis`, :code:`cbas`, :code:`cbps` and :code:`cba_table`
+          resources of the rule engine
+        :rtype: dict[str, Any]
+        """
+        db_handler = self._get_db_handler()
+        cbis, cbas, cbps, cba_table = await asyncio.gather(
+            db_handler.get_cbis(
+                (i["cbiId"] for i in cbr["ingredients"].values()),
+                self.engine.fields("cbis"),
+            ),
+            db_handler.get_cbas(
+                (a["cbaId"] for a in cbr["appliances"].values() if "cbaId" in a),
+                self.engine.fields("cbas"),
+            ),
+            db_handler.get_cbps(
+                (p["cbpId"] for p in cbr["preparation"].values()),
+                self.engine.fields("cbps"),
+            ),
+            self.get_cba_table(),
+        )
+        return {"cbis": cbis, "cbas": cbas, "cbps": cbps, "cba_table": cba_table}
+
+    @staticmethod
+    async def _run_in_executor(function: Callable[..., Any], *args) -> Any:
+        """Runs a function in the default executor of the running event loop, within
+        a copy of the current context."""
+        loop = asyncio.get_event_loop()
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(
+            None, functools.partial(context.run, function, *args)
+        )
+
+    async def _lookup_result(
+        self, cbr: Dict[str, Any]
+    ) -> Tuple[Optional[str], Optional[ValidationResult]]:
+        """Looks up the validation result of a :ref:`CBR <cbr>` in :attr:`result_cache`,
+        as :meth:`Validator._lookup_result` does, in the default executor, since the
+        cache hashes and unpickles the result and may read it from disk.
+
+        :param cbr: The :ref:`CBR <cbr>` to be validated
+        :type cbr: dict[str, Any]
+        :return: The cache key and the cached result, which are :const:`None` if there
+          is no cache, or the result alone if it is not cached
+        :rtype: tuple[str or None, ValidationResult or None]
+        """
+        if self.result_cache is None:
+            return None, None
+
+        return await self._run_in_executor(super()._lookup_result, cbr)
+
+    async def _remember_result(
+        self, key: Optional[str], result: ValidationResult
+    ) -> None:
+        """Stores a validation result in :attr:`result_cache`, if any, as
+        :meth:`Validator._remember_result` does, in the default executor.
+
+        :param key: The cache key, as returned by :meth:`_lookup_result`
+        :type key: str or None
+        :param result: The validation result
+        :type result: ValidationResult
+        """
+        if key is not None:
+            await self._run_in_executor(super()._remember_result, key, result)
+
+    async def _update_catalogue(
+        self, previous_resources: Dict[str, Any], cbr: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Retrieves concurrently the catalogue documents referred by an edited
+        :ref:`CBR <cbr>` that were not referred by its previous version.
+
+        :param previous_resources: The resources of the previous validation
+        :type previous_resources: dict[str, Any]
+        :param cbr: The edited :ref:`CBR <cbr>`
+        :type cbr: dict[str, Any]
+        :return: The :code:`cbis`, :code:`cbas`, :code:`cbps` and :code:`cba_table`
+          resources of the rule engine
+        :rtype: dict[str, Any]
+        """
+        db_handler = self._get_db_handler()
+        referred = {
+            "cbis": (
+                {i["cbiId"] for i in cbr["ingredients"].values()},
+                db_handler.get_cbis,
+            ),
+            "cbas": (
+                {a["cbaId"] for a in cbr["appliances"].values() if "cbaId" in a},
+                db_handler.get_cbas,
+            ),
+            "cbps": (
+                {p["cbpId"] for p in cbr["preparation"].values()},
+                db_handler.get_cbps,
+            ),
+        }
+        catalogue = {}
+        lookups = {}
+
+        for name, (ids, get_many) in referred.items():
+            previous = previous_resources.get(name, {})
+            catalogue[name] = {k: v for k, v in previous.items() if k in ids}
+            missing = ids - catalogue[name].keys()
+
+            if missing:
+                lookups[name] = get_many(missing, self.engine.fields(name))
+
+        found, cba_table = await asyncio.gather(
+            asyncio.gather(*lookups.values()), self.get_cba_table()
+        )
+
+        for name, docs in zip(lookups, found):
+            catalogue[name].update(docs)
+
+        catalogue["cba_table"] = cba_table
+        return catalogue
+
+    async def apply_validation_rules_async(
+        self, cbr: Dict[str, Any]
+    ) -> ValidationResult:
+        """Validates a :ref:`CBR <cbr>` against the set of definition rules, as
+        performed by :meth:`Validator.apply_validation_rules`, requesting the catalogue
+        documents through :attr:`db_handler`.
+
+        :param cbr: The :ref:`CBR <cbr>` to be validated
+        :type cbr: dict[str, Any]
+        :return: The results from applying the set of validation rules
+        :rtype: ValidationResult
+        """
+        catalogue = await self._fetch_catalogue(cbr)
+        rules_results, resources = await self._run_in_executor(
+            self.engine.run, cbr, ("cbrgraph",), catalogue
+        )
+        return self._rules_result(rules_results, resources)
+
+    async def validate(
+        self, cbr: Dict[str, Any], store: bool = False, strict: bool = True
+    ) -> ValidationResult:
+        """Performs the validation of a :ref:`CBR <cbr>` and builds the :doc:`CBRGraph
+        <cbrg>`, as :meth:`Validator.validate` does.
 
         :param cbr: The :ref:`CBR <cbr>` to be validated
         :type cbr: dict[str, Any]
@@ -162,31 +1335,340 @@ class Validator:
         :return: The results from applying the set of validation rules
         :rtype: ValidationResult
         """
+        return await self._measure(self._validate, cbr, store, strict)
+
+    async def revalidate(
+        self,
+        previous_result: ValidationResult,
+        old_cbr: Dict[str, Any],
+        new_cbr: Dict[str, Any],
+        store: bool = False,
+        strict: bool = True,
+    ) -> ValidationResult:
+        """Performs the validation of an edited :ref:`CBR <cbr>`, reusing the outcome
+        of the validation of its previous version, as :meth:`Validator.revalidate`
+        does.
+
+        :param previous_result: The result of the validation of `old_cbr`, which must
+          not be used afterwards
+        :type previous_result: ValidationResult
+        :param old_cbr: The previous version of the :ref:`CBR <cbr>`
+        :type old_cbr: dict[str, Any]
+        :param new_cbr: The edited :ref:`CBR <cbr>` (a different object than
+          `old_cbr`)
+        :type new_cbr: dict[str, Any]
+        :param store: A flag indicating whether the validated CBR and :doc:`CBRGraph
+          <cbrg>` should be stored in database, defaults to :const:`False`
+        :type store: bool, optional
+        :param strict: A flag indicating the validation policy, defaults to
+          :const:`True`
+        :type strict: bool, optional
+        :return: The results from applying the set of validation rules
+        :rtype: ValidationResult
+        """
+        return await self._measure(
+            self._revalidate, previous_result, old_cbr, new_cbr, store, strict
+        )
+
+    async def validate_many(
+        self,
+        cbrs: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]],
+        store: bool = False,
+        strict: bool = True,
+        ordered: bool = True,
+        max_pending: Optional[int] = None,
+    ) -> AsyncIterator[Tuple[int, ValidationResult]]:
+        """Validates a stream of :ref:`CBRs <cbr>` concurrently on the running event
+        loop, as performed by :meth:`validate`.
+
+        No more than `max_pending` :ref:`CBRs <cbr>` are read from `cbrs` ahead of the
+        results consumed, which also bounds the number of validations in progress.
+
+        :param cbrs: The :ref:`CBRs <cbr>` to be validated
+        :type cbrs: Iterable[dict[str, Any]] or AsyncIterable[dict[str, Any]]
+        :param store: A flag indicating whether the validated :ref:`CBRs <cbr>` and
+          their :doc:`CBRGraphs <cbrg>` should be stored in database, defaults to
+          :const:`False`
+        :type store: bool, optional
+        :param strict: A flag indicating the validation policy, defaults to
+          :const:`True`
+        :type strict: bool, optional
+        :param ordered: A flag indicating whether the results are yielded in the order
+          of `cbrs`, or as soon as they are available, defaults to :const:`True`
+        :type ordered: bool, optional
+        :param max_pending: Maximum number of :ref:`CBRs <cbr>` submitted and not yet
+          yielded, defaults to four times the number of CPUs
+        :type max_pending: int, optional
+        :return: An asynchronous iterator over pairs formed by the position of each
+          :ref:`CBR <cbr>` in `cbrs` and its validation result
+        :rtype: AsyncIterator[tuple[int, ValidationResult]]
+        """
+        max_pending = max(max_pending or 4 * (os.cpu_count() or 1), 1)
+        pending: "deque[Tuple[int, asyncio.Future]]" = deque()
+
+        async def completed(
+            block_until_all: bool,
+        ) -> AsyncIterator[Tuple[int, asyncio.Future]]:
+            if ordered:
+                while pending and (block_until_all or len(pending) >= max_pending):
+                    yield pending.popleft()
+            else:
+                while pending and (block_until_all or len(pending) >= max_pending):
+                    done, _ = await asyncio.wait(
+                        [f for _, f in pending], return_when=asyncio.FIRST_COMPLETED
+                    )
+
+                    for i, f in [p for p in pending if p[1] in done]:
+                        pending.remove((i, f))
+                        yield i, f
+
         try:
-            jsonschema.validate(cbr, self.schema)
-        except jsonschema.exceptions.SchemaError as e:
-            logger.error("Invalid CBR Schema: " + e.message)
-            return ValidationResult(schema_validated=False)
-        except jsonschema.exceptions.ValidationError as e:
-            logger.error("CBR does not satisfy CBR Schema: " + e.message)
-            return ValidationResult(schema_validated=False)
+            i = 0
+
+            async for cbr in _aiter(cbrs):
+                future = asyncio.ensure_future(self.validate(cbr, store, strict))
+                pending.append((i, future))
+                i += 1
+
+                async for j, f in completed(False):
+                    yield j, await f
+
+            async for j, f in completed(True):
+                yield j, await f
+        finally:
+            for _, f in pending:
+                f.cancel()
+
+    async def _measure(
+        self, function: Callable[..., Awaitable[ValidationResult]], *args
+    ) -> ValidationResult:
+        """Awaits a validation coroutine function, which takes the timings to be filled
+        as last argument, collecting its timings if :attr:`collect_timings` is set.
+
+        :param function: The validation coroutine function
+        :type function: Callable[..., Awaitable[ValidationResult]]
+        :return: The validation result
+        :rtype: ValidationResult
+        """
+        if not self.collect_timings:
+            return await function(*args)
+
+        start = time.perf_counter()
+        collector = TimingsCollector()
+
+        with collector.activate():
+            result = await function(*args, collector.timings)
+
+        collector.timings.total = time.perf_counter() - start
+        result.timings = collector.timings
+        self._run_metrics_hooks(result)
+        return result
+
+    async def _validate(
+        self,
+        cbr: Dict[str, Any],
+        store: bool,
+        strict: bool,
+        timings: Optional[ValidationTimings] = None,
+    ) -> ValidationResult:
+        """Performs the validation stages of :meth:`validate`.
+
+        :param cbr: The :ref:`CBR <cbr>` to be validated
+        :type cbr: dict[str, Any]
+        :param bool store: The storage flag
+        :param bool strict: The validation policy flag
+        :param timings: The timings where the schema validation and storage durations
+          are recorded, defaults to :const:`None` (not recorded)
+        :type timings: cookbase.metrics.ValidationTimings, optional
+        :return: The results from applying the set of validation rules
+        :rtype: ValidationResult
+        """
+        key, result = await self._lookup_result(cbr)
+
+        if result is None:
+            start = time.perf_counter()
+
+            try:
+                await self._run_in_executor(self.validate_schema, cbr)
+            except jsonschema.exceptions.ValidationError as e:
+                logger.error("CBR does not satisfy CBR Schema: " + e.message)
+                result = ValidationResult(schema_validated=False)
+                await self._remember_result(key, result)
+                return result
+            finally:
+                if timings is not None:
+                    timings.schema_validation = time.perf_counter() - start
 
-        result = self.apply_validation_rules(cbr)
+            result = await self.apply_validation_rules_async(cbr)
+            await self._remember_result(key, result)
+        elif not result.schema_validated:
+            return result
+
+        return await self._finish(cbr, result, store, strict, timings)
+
+    async def _revalidate(
+        self,
+        previous_result: ValidationResult,
+        old_cbr: Dict[str, Any],
+        new_cbr: Dict[str, Any],
+        store: bool,
+        strict: bool,
+        timings: Optional[ValidationTimings] = None,
+    ) -> ValidationResult:
+        """Performs the validation stages of :meth:`revalidate`.
+
+        :param previous_result: The result of the validation of `old_cbr`
+        :type previous_result: ValidationResult
+        :param old_cbr: The previous version of the :ref:`CBR <cbr>`
+        :type old_cbr: dict[str, Any]
+        :param new_cbr: The edited :ref:`CBR <cbr>`
+        :type new_cbr: dict[str, Any]
+        :param bool store: The storage flag
+        :param bool strict: The validation policy flag
+        :param timings: The timings where the schema validation and storage durations
+          are recorded, defaults to :const:`None` (not recorded)
+        :type timings: cookbase.metrics.ValidationTimings, optional
+        :return: The results from applying the set of validation rules
+        :rtype: ValidationResult
+        """
+        if (
+            not isinstance(previous_result.cbrgraph, CBRGraph)
+            or not previous_result.schema_validated
+        ):
+            return await self._validate(new_cbr, store, strict, timings)
+
+        key, result = await self._lookup_result(new_cbr)
+
+        if result is None:
+            diff = diff_cbrs(old_cbr, new_cbr)
+            start = time.perf_counter()
+
+            try:
+                await self._run_in_executor(
+                    self.validate_schema, new_cbr, self._schema_items(diff)
+                )
+            except jsonschema.exceptions.ValidationError as e:
+                logger.error("CBR does not satisfy CBR Schema: " + e.message)
+                result = ValidationResult(schema_validated=False)
+                await self._remember_result(key, result)
+                return result
+            finally:
+                if timings is not None:
+                    timings.schema_validation = time.perf_counter() - start
 
+            catalogue = await self._update_catalogue(previous_result.resources, new_cbr)
+            result = await self._run_in_executor(
+                self._reapply_validation_rules,
+                previous_result,
+                new_cbr,
+                diff,
+                catalogue,
+            )
+            await self._remember_result(key, result)
+        elif not result.schema_validated:
+            return result
+
+        return await self._finish(new_cbr, result, store, strict, timings)
+
+    async def _finish(
+        self,
+        cbr: Dict[str, Any],
+        result: ValidationResult,
+        store: bool,
+        strict: bool,
+        timings: Optional[ValidationTimings] = None,
+    ) -> ValidationResult:
+        """Stores a :ref:`CBR <cbr>` and its :doc:`CBRGraph <cbrg>` after its rules
+        have been applied, if requested and valid, as :meth:`Validator._finish` does.
+
+        :param cbr: The validated :ref:`CBR <cbr>`
+        :type cbr: dict[str, Any]
+        :param result: The results from applying the set of validation rules
+        :type result: ValidationResult
+        :param bool store: The storage flag
+        :param bool strict: The validation policy flag
+        :param timings: The timings where the storage duration is recorded, defaults to
+          :const:`None` (not recorded)
+        :type timings: cookbase.metrics.ValidationTimings, optional
+        :return: The validation result
+        :rtype: ValidationResult
+        """
         if not result.is_valid(strict):
             logger.error("CBR does not satisfy CBR validation rules")
         elif store:
+            start = time.perf_counter()
+
+            if result.cbrgraph is None:
+                result.cbrgraph = CBRGraph()
+                result.cbrgraph.build_graph(cbr)
+
             try:
-                result.storing_result = self._store(cbr, result.cbrgraph)
+                if self.storage_writer is not None:
+                    result.storing = await self._run_in_executor(
+                        self.storage_writer.submit, cbr, result.cbrgraph
+                    )
+                    result.storing.add_done_callback(result._storing_done)
+                else:
+                    result.storing_result = await self._get_db_handler().insert_cbr(
+                        cbr, result.cbrgraph
+                    )
             except (CBRInsertionError, CBRGraphInsertionError) as e:
                 logger.error(e)
                 result.storing_result = e.partial_result
+            finally:
+                if timings is not None:
+                    timings.storage = time.perf_counter() - start
 
         return result
 
 
+async def _aiter(
+    iterable: Union[Iterable[Any], AsyncIterable[Any]],
+) -> AsyncIterator[Any]:
+    """Iterates asynchronously over an iterable, be it synchronous or asynchronous."""
+    if isinstance(iterable, AsyncIterable):
+        async for item in iterable:
+            yield item
+    else:
+        for item in iterable:
+            yield item
+
+
+def _init_worker(
+    validator_args: Dict[str, Any], handler_args: Optional[Dict[str, Any]]
+) -> None:
+    """Initializes a worker process of :meth:`Validator.validate_many`.
+
+    :param validator_args: The arguments to build the validator of the worker
+    :type validator_args: dict[str, Any]
+    :param handler_args: The arguments to build the database handler of the worker,
+      as given by :attr:`cookbase.db.handler.DBHandler.init_args`, or :const:`None` if
+      it is created on first use with the default arguments
+    :type handler_args: dict[str, Any] or None
+    """
+    global _worker_validator
+
+    # Database connections must not be shared with the parent process
+    handler._db_handler = None
+
+    if handler_args is not None:
+        handler._db_handler = handler.DBHandler(**handler_args)
+
+    _worker_validator = Validator(**validator_args)
+
+
+def _validate_in_worker(
+    cbr: Dict[str, Any], store: bool, strict: bool
+) -> ValidationResult:
+    """Validates a :ref:`CBR <cbr>` with the validator of a worker process of
+    :meth:`Validator.validate_many`."""
+    return _worker_validator.validate(cbr, store, strict)
+
+
+_worker_validator: Optional[Validator] = None
+
+
 if __name__ == "__main__":
-    import time
     from cookbase.parsers import utils
 
     logger.info("Start logging")
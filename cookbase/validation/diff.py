@@ -0,0 +1,63 @@
+"""Comparison of two versions of a :ref:`Cookbase Recipe (CBR) <cbr>`, used to
+revalidate edited recipes incrementally."""
+from typing import Any, Dict, Set
+
+from attr import attrib, attrs
+
+#: The :ref:`CBR <cbr>` sections whose items are compared one by one
+SECTIONS = ("ingredients", "appliances", "preparation")
+
+
+@attrs
+class CBRDiff:
+    """A class containing the differences between two versions of a :ref:`CBR <cbr>`.
+
+    :param items: The references of the items added, removed or modified in each of
+      the :data:`SECTIONS`, by section name
+    :type items: dict[str, set[str]]
+    :param other: The other top-level properties added, removed or modified, including
+      any section that is not an object in either version
+    :type other: set[str]
+
+    """
+
+    items: Dict[str, Set[str]] = attrib(factory=dict)
+    other: Set[str] = attrib(factory=set)
+
+    @property
+    def changed_sections(self) -> Set[str]:
+        """The names of the :data:`SECTIONS` having any item changed."""
+        return {s for s, refs in self.items.items() if refs}
+
+    def __bool__(self) -> bool:
+        return bool(self.other or self.changed_sections)
+
+
+def diff_cbrs(old: Dict[str, Any], new: Dict[str, Any]) -> CBRDiff:
+    """Computes the differences between two versions of a :ref:`CBR <cbr>`.
+
+    :param old: The previous version of the :ref:`CBR <cbr>`
+    :type old: dict[str, Any]
+    :param new: The new version of the :ref:`CBR <cbr>`
+    :type new: dict[str, Any]
+    :return: The differences found
+    :rtype: CBRDiff
+    """
+    diff = CBRDiff()
+
+    for k in old.keys() | new.keys():
+        if k in SECTIONS:
+            old_items, new_items = old.get(k), new.get(k)
+
+            if isinstance(old_items, dict) and isinstance(new_items, dict):
+                diff.items[k] = {
+                    ref
+                    for ref in old_items.keys() | new_items.keys()
+                    if old_items.get(ref) != new_items.get(ref)
+                }
+                continue
+
+        if old.get(k) != new.get(k):
+            diff.other.add(k)
+
+    return diff
@@ -0,0 +1,853 @@
+"""A module implementing the engine that applies the validation rules of
+:mod:`cookbase.validation.rules` to a :ref:`Cookbase Recipe (CBR) <cbr>`.
+
+Every rule registered in a :class:`RuleEngine` declares the inputs it is applied to,
+which are named resources derived from the :ref:`CBR <cbr>` under validation: its raw
+sections, its :doc:`Cookbase Recipe Graph (CBRGraph) <cbrg>` or the catalogue documents
+it refers to. Resources are in turn produced by registered providers, which may depend
+on other resources. The engine arranges rules and providers as a dependency graph and
+runs them on a thread pool as soon as their inputs are available, so that the database
+lookups of some rules overlap with the graph construction and the application of other
+rules. When a :ref:`CBR <cbr>` is edited, :meth:`RuleEngine.rerun` applies again only
+the rules depending on the resources that changed.
+
+The standard set of rules is registered in the engine provided by
+:func:`get_rule_engine`:
+
+- :code:`ingredients_are_valid`, on :code:`ingredients` and :code:`cbis`.
+- :code:`foodstuff_and_appliance_references_are_consistent`, on :code:`ingredients`,
+  :code:`appliances`, :code:`preparation` and :code:`cbrindex`.
+- :code:`processes_and_appliances_are_valid_and_processes_requirements_met`, on
+  :code:`appliances`, :code:`preparation`, :code:`cbas`, :code:`cbps` and
+  :code:`cba_table`.
+- :code:`ingredients_used_exactly_once`, :code:`single_final_process` and
+  :code:`appliances_not_in_conflict`, on :code:`cbrgraph`.
+
+The :code:`cbis`, :code:`cbas` and :code:`cbps` resources are retrieved with only the
+fields read by the rules taking them, as declared through
+:func:`cookbase.validation.rules.reads_fields` (see :meth:`RuleEngine.fields`).
+
+The :code:`cbrindex` resource, a :class:`cookbase.graph.cbrindex.CBRIndex` built in a
+single traversal of the :ref:`CBR <cbr>`, is shared by the rules above and the
+construction of the :code:`cbrgraph` resource. An engine created with
+:code:`compact_graph=True` provides the latter as a
+:class:`cookbase.graph.compact.CompactCBRGraph`.
+"""
+import contextvars
+import functools
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from attr import attrib, attrs
+from cookbase import metrics
+from cookbase.db import handler
+from cookbase.graph.cbrgraph import CBRGraph
+from cookbase.graph.cbrindex import CBRIndex
+from cookbase.graph.compact import CompactCBRGraph
+from cookbase.validation.cba import get_unrolled_cba_table
+from cookbase.validation.rules import AppliedRuleResult, Graph, Semantics, fields_read
+
+#: The name of the resource holding the :ref:`CBR <cbr>` under validation
+CBR = "cbr"
+
+
+@attrs(frozen=True)
+class Task:
+    """A class describing a rule or a resource provider registered in a
+    :class:`RuleEngine`.
+
+    :param str name: The name of the rule or resource
+    :param function: The function implementing the rule or providing the resource,
+      which is called with the values of `inputs` as positional arguments
+    :type function: Callable[..., Any]
+    :param inputs: The names of the resources required by `function`
+    :type inputs: tuple[str, ...]
+    :param update: A function providing the resource from its previous value, passed
+      as first argument, and the values of `inputs`, defaults to :const:`None`
+    :type update: Callable[..., Any], optional
+    :param projected: A flag indicating whether `function` and `update` take the
+      fields to be retrieved as :code:`fields` keyword argument, defaults to
+      :const:`False`
+    :type projected: bool, optional
+
+    """
+
+    name: str = attrib()
+    function: Callable[..., Any] = attrib()
+    inputs: Tuple[str, ...] = attrib(converter=tuple)
+    update: Optional[Callable[..., Any]] = attrib(default=None)
+    projected: bool = attrib(default=False)
+
+
+class RuleEngine:
+    """A class that holds a registry of validation rules and resource providers, and
+    applies the rules to :ref:`CBRs <cbr>` resolving their dependencies concurrently.
+
+    The :data:`CBR` resource, holding the :ref:`CBR <cbr>` under validation, is always
+    available.
+
+    :param max_workers: Maximum number of threads applying rules and providing
+      resources, defaults to the :class:`concurrent.futures.ThreadPoolExecutor`
+      default
+    :type max_workers: int, optional
+
+    :ivar _rules: The registered rules by name, in registration order
+    :vartype _rules: OrderedDict[str, Task]
+    :ivar _providers: The registered resource providers by resource name
+    :vartype _providers: dict[str, Task]
+
+    Engines can be pickled (as long as their rules and providers can) and used after a
+    fork, in which case their thread pool is created again.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """Constructor method."""
+        self.max_workers = max_workers
+        self._rules: Dict[str, Task] = OrderedDict()
+        self._providers: Dict[str, Task] = {}
+        self._reset_executor()
+
+    def _reset_executor(self) -> None:
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._executor_pid = os.getpid()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+
+        for k in ("_executor", "_executor_lock", "_executor_pid"):
+            del state[k]
+
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._reset_executor()
+
+    @property
+    def rules(self) -> List[str]:
+        """The names of the registered rules, in registration order."""
+        return list(self._rules)
+
+    def add_rule(
+        self,
+        name: str,
+        function: Callable[..., AppliedRuleResult],
+        inputs: Iterable[str],
+    ) -> None:
+        """Registers a validation rule, replacing any rule registered under the same
+        name.
+
+        :param str name: The name of the rule, used as key in
+          :attr:`cookbase.validation.cbr.ValidationResult.rules_results`
+        :param function: The function implementing the rule
+        :type function: Callable[..., cookbase.validation.rules.AppliedRuleResult]
+        :param inputs: The names of the resources passed to `function`, in order
+        :type inputs: Iterable[str]
+        """
+        self._rules[name] = Task(name, function, inputs)
+
+    def remove_rule(self, name: str) -> None:
+        """Unregisters a validation rule.
+
+        :param str name: The name of the rule
+
+        :raises KeyError: No rule is registered under `name`
+        """
+        del self._rules[name]
+
+    def add_provider(
+        self,
+        name: str,
+        function: Callable[..., Any],
+        inputs: Iterable[str] = (CBR,),
+        update: Optional[Callable[..., Any]] = None,
+        projected: bool = False,
+    ) -> None:
+        """Registers a resource provider, replacing any provider registered for the
+        same resource.
+
+        :param str name: The name of the provided resource
+        :param function: The function providing the resource
+        :type function: Callable[..., Any]
+        :param inputs: The names of the resources passed to `function`, in order,
+          defaults to the :data:`CBR` resource
+        :type inputs: Iterable[str], optional
+        :param update: A function providing the resource from its previous value and
+          the values of `inputs`, used by :meth:`rerun` instead of `function` when the
+          previous value is available, defaults to :const:`None`
+        :type update: Callable[..., Any], optional
+        :param projected: A flag indicating whether `function` and `update` provide
+          documents retrieving only the fields given as :code:`fields` keyword argument,
+          which are the ones found by :meth:`fields`, defaults to :const:`False`
+        :type projected: bool, optional
+
+        :raises ValueError: `name` is the reserved :data:`CBR` resource
+        """
+        if name == CBR:
+            raise ValueError(f"'{CBR}' resource cannot be provided")
+
+        self._providers[name] = Task(name, function, inputs, update, projected)
+
+    def fields(self, resource: str) -> Optional[Tuple[str, ...]]:
+        """Finds the fields of the documents of a resource read by the rules taking it,
+        as declared through :func:`cookbase.validation.rules.reads_fields`.
+
+        :param str resource: The name of the resource
+        :return: The dot-separated paths of the fields, or :const:`None` (all fields)
+          if no rule takes the resource, or any rule or provider taking it does not
+          declare the fields it reads
+        :rtype: tuple[str, ...] or None
+        """
+        if any(resource in p.inputs for p in self._providers.values()):
+            return None
+
+        fields = set()
+        found = False
+
+        for rule in self._rules.values():
+            for position, i in enumerate(rule.inputs):
+                if i == resource:
+                    read = fields_read(rule.function, position)
+
+                    if read is None:
+                        return None
+
+                    fields.update(read)
+                    found = True
+
+        return tuple(sorted(fields)) if found else None
+
+    def dependents(
+        self, resources: Iterable[str], up_to_date: Iterable[str] = ()
+    ) -> Set[str]:
+        """Finds the resources and rules that depend, directly or transitively, on
+        any of the given resources.
+
+        :param resources: The names of the resources
+        :type resources: Iterable[str]
+        :param up_to_date: The names of resources known to be up to date, which are not
+          considered dependents, defaults to none
+        :type up_to_date: Iterable[str], optional
+        :return: The names of the given resources and of the provided resources and
+          rules depending on them
+        :rtype: set[str]
+        """
+        found = set(resources)
+        excluded = set(up_to_date) - found
+        changed = True
+
+        while changed:
+            changed = False
+
+            for provider in self._providers.values():
+                if (
+                    provider.name not in found
+                    and provider.name not in excluded
+                    and found.intersection(provider.inputs)
+                ):
+                    found.add(provider.name)
+                    changed = True
+
+        found.update(r.name for r in self._rules.values() if found & set(r.inputs))
+        return found
+
+    def _plan(
+        self, rules: Iterable[Task], outputs: Sequence[str], available: Iterable[str]
+    ) -> List[Task]:
+        """Selects the providers needed to apply `rules` and obtain `outputs`, and
+        checks that they form an acyclic dependency graph.
+
+        :param rules: The rules to be applied
+        :type rules: Iterable[Task]
+        :param outputs: Names of resources required besides the rule inputs
+        :type outputs: Sequence[str]
+        :param available: Names of the resources already available
+        :type available: Iterable[str]
+        :return: The providers, in dependency order
+        :rtype: list[Task]
+
+        :raises ValueError: A required resource has no provider, or there is a cyclic
+          dependency among providers
+        """
+        planned: Dict[str, Task] = OrderedDict()
+        available = set(available)
+        visiting = set()
+
+        def visit(resource: str) -> None:
+            if resource in available or resource in planned:
+                return
+
+            if resource in visiting:
+                raise ValueError(f"cyclic dependency on resource '{resource}'")
+
+            try:
+                provider = self._providers[resource]
+            except KeyError:
+                raise ValueError(f"no provider registered for resource '{resource}'")
+
+            visiting.add(resource)
+
+            for i in provider.inputs:
+                visit(i)
+
+            visiting.discard(resource)
+            planned[resource] = provider
+
+        for rule in rules:
+            for i in rule.inputs:
+                visit(i)
+
+        for o in outputs:
+            visit(o)
+
+        return list(planned.values())
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor_pid != os.getpid():
+            # The threads of the pool do not survive a fork
+            self._reset_executor()
+
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    self.max_workers, thread_name_prefix="cookbase-rules"
+                )
+
+            return self._executor
+
+    def run(
+        self,
+        cbr: Dict[str, Any],
+        outputs: Sequence[str] = (),
+        resources: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[Dict[str, AppliedRuleResult], Dict[str, Any]]:
+        """Applies every registered rule to a :ref:`CBR <cbr>`.
+
+        Rules and providers are submitted to the thread pool as soon as all their inputs
+        are available. If any of them raises an exception, the pending ones are
+        cancelled and the exception is raised.
+
+        If a :class:`cookbase.metrics.TimingsCollector` is active, the duration of every
+        rule and provider is recorded in it, and it is kept active in the threads of the
+        pool while they run.
+
+        :param cbr: The :ref:`CBR <cbr>` to be validated
+        :type cbr: dict[str, Any]
+        :param outputs: Names of resources to be provided even if no rule requires
+          them, defaults to none
+        :type outputs: Sequence[str], optional
+        :param resources: Resources already available by name, whose providers are not
+          run, defaults to none
+        :type resources: dict[str, Any], optional
+        :return: A tuple containing the results of the rules by name, in registration
+          order, and the resources provided during the run by name
+        :rtype: tuple[dict[str, cookbase.validation.rules.AppliedRuleResult],
+          dict[str, Any]]
+
+        :raises ValueError: A required resource has no provider, or there is a cyclic
+          dependency among providers
+        """
+        results, resources = self._execute(
+            cbr, self._rules.values(), outputs, resources or {}, {}
+        )
+        return {r: results[r] for r in self._rules}, resources
+
+    def rerun(
+        self,
+        cbr: Dict[str, Any],
+        changed: Iterable[str],
+        previous_results: Dict[str, AppliedRuleResult],
+        previous_resources: Dict[str, Any],
+        outputs: Sequence[str] = (),
+        resources: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[Dict[str, AppliedRuleResult], Dict[str, Any]]:
+        """Applies the registered rules to a new version of a :ref:`CBR <cbr>`, reusing
+        the results and resources of a previous run that do not depend on the changed
+        resources.
+
+        Stale resources are provided again through the `update` function of their
+        provider, if any, when their previous value is available. Rules taking the
+        :data:`CBR` resource itself are always applied again, but resources provided
+        directly from it are only provided again if listed in `changed`.
+
+        :param cbr: The new version of the :ref:`CBR <cbr>`
+        :type cbr: dict[str, Any]
+        :param changed: Names of the resources whose value changed
+        :type changed: Iterable[str]
+        :param previous_results: The results of the previous run, by rule name
+        :type previous_results: dict[str, cookbase.validation.rules.AppliedRuleResult]
+        :param previous_resources: The resources of the previous run, by name
+        :type previous_resources: dict[str, Any]
+        :param outputs: Names of resources to be provided even if no rule requires
+          them, defaults to none
+        :type outputs: Sequence[str], optional
+        :param resources: Up-to-date resources, whose providers are not run, defaults
+          to none
+        :type resources: dict[str, Any], optional
+        :return: A tuple containing the results of the rules by name, in registration
+          order, and the resources of the run by name
+        :rtype: tuple[dict[str, cookbase.validation.rules.AppliedRuleResult],
+          dict[str, Any]]
+
+        :raises ValueError: A required resource has no provider, or there is a cyclic
+          dependency among providers
+        """
+        stale = self.dependents(changed, resources or ())
+        available = {
+            k: v for k, v in previous_resources.items() if k not in stale and k != CBR
+        }
+        available.update(resources or {})
+        rules = [
+            r
+            for r in self._rules.values()
+            if r.name in stale or r.name not in previous_results or CBR in r.inputs
+        ]
+        updates = {
+            k: previous_resources[k]
+            for k in stale
+            if k in previous_resources
+            and k in self._providers
+            and self._providers[k].update is not None
+        }
+        results, resources = self._execute(cbr, rules, outputs, available, updates)
+        return (
+            {r: results.get(r, previous_results.get(r)) for r in self._rules},
+            resources,
+        )
+
+    def _execute(
+        self,
+        cbr: Dict[str, Any],
+        rules: Iterable[Task],
+        outputs: Sequence[str],
+        resources: Dict[str, Any],
+        updates: Dict[str, Any],
+    ) -> Tuple[Dict[str, AppliedRuleResult], Dict[str, Any]]:
+        """Applies a set of rules to a :ref:`CBR <cbr>`, as described in :meth:`run`.
+
+        :param cbr: The :ref:`CBR <cbr>` to be validated
+        :type cbr: dict[str, Any]
+        :param rules: The rules to be applied
+        :type rules: Iterable[Task]
+        :param outputs: Names of resources to be provided even if no rule requires them
+        :type outputs: Sequence[str]
+        :param resources: Resources already available by name
+        :type resources: dict[str, Any]
+        :param updates: Previous values of the resources to be provided through the
+          `update` function of their provider, by name
+        :type updates: dict[str, Any]
+        :return: A tuple containing the results of `rules` by name and the resources by
+          name
+        :rtype: tuple[dict[str, cookbase.validation.rules.AppliedRuleResult],
+          dict[str, Any]]
+        """
+        rules = list(rules)
+        resources = dict(resources, **{CBR: cbr})
+        pending = [(t, False) for t in self._plan(rules, outputs, resources)] + [
+            (t, True) for t in rules
+        ]
+        projections = {
+            t.name: None if t.name in outputs else self.fields(t.name)
+            for t, is_rule in pending
+            if not is_rule and t.projected
+        }
+        results = {}
+        executor = self._get_executor()
+        collector = metrics.get_collector()
+        futures = {}
+
+        def submit_ready():
+            for task, is_rule in list(pending):
+                if all(i in resources for i in task.inputs):
+                    pending.remove((task, is_rule))
+                    function = task.function
+                    args = [resources[i] for i in task.inputs]
+
+                    if task.name in updates and not is_rule:
+                        function = task.update
+                        args.insert(0, updates[task.name])
+
+                    if task.name in projections and not is_rule:
+                        function = functools.partial(
+                            function, fields=projections[task.name]
+                        )
+
+                    if collector is None:
+                        f = executor.submit(function, *args)
+                    else:
+                        f = executor.submit(
+                            contextvars.copy_context().run,
+                            _timed_task,
+                            collector,
+                            task,
+                            is_rule,
+                            function,
+                            args,
+                        )
+
+                    futures[f] = (task, is_rule)
+
+        submit_ready()
+
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+
+            for f in done:
+                task, is_rule = futures.pop(f)
+
+                try:
+                    value = f.result()
+                except BaseException:
+                    for g in futures:
+                        g.cancel()
+
+                    raise
+
+                if is_rule:
+                    results[task.name] = value
+                else:
+                    resources[task.name] = value
+
+            submit_ready()
+
+        return results, resources
+
+    def shutdown(self) -> None:
+        """Releases the threads of the engine, which are created again if the engine
+        is run afterwards."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+
+def _timed_task(
+    collector: metrics.TimingsCollector,
+    task: Task,
+    is_rule: bool,
+    function: Callable[..., Any],
+    args: List[Any],
+) -> Any:
+    start = time.perf_counter()
+
+    try:
+        return function(*args)
+    finally:
+        elapsed = time.perf_counter() - start
+
+        if is_rule:
+            collector.add_rule(task.name, elapsed)
+        else:
+            collector.add_resource(task.name, elapsed)
+
+
+def build_cbrgraph(cbr: Dict[str, Any], index: Optional[CBRIndex] = None) -> CBRGraph:
+    """Provides the :doc:`CBRGraph <cbrg>` of a :ref:`CBR <cbr>`.
+
+    :param cbr: The :ref:`CBR <cbr>`
+    :type cbr: dict[str, Any]
+    :param index: The index of the references between the items of `cbr`, defaults to
+      building it from `cbr`
+    :type index: cookbase.graph.cbrindex.CBRIndex, optional
+    :return: The :doc:`CBRGraph <cbrg>` built from `cbr`
+    :rtype: cookbase.graph.cbrgraph.CBRGraph
+    """
+    graph = CBRGraph()
+    graph.build_graph(cbr, index)
+    return graph
+
+
+def build_compact_cbrgraph(
+    cbr: Dict[str, Any], index: Optional[CBRIndex] = None
+) -> CompactCBRGraph:
+    """Provides the :doc:`CBRGraph <cbrg>` of a :ref:`CBR <cbr>` in its compact,
+    array-backed form.
+
+    :param cbr: The :ref:`CBR <cbr>`
+    :type cbr: dict[str, Any]
+    :param index: The index of the references between the items of `cbr`, defaults to
+      building it from `cbr`
+    :type index: cookbase.graph.cbrindex.CBRIndex, optional
+    :return: The :doc:`CBRGraph <cbrg>` built from `cbr`
+    :rtype: cookbase.graph.compact.CompactCBRGraph
+    """
+    return CompactCBRGraph.from_cbr(cbr, index)
+
+
+def get_referred_cbis(
+    ingredients: Dict[str, Any], fields: Optional[Iterable[str]] = None
+) -> Dict[int, Dict[str, Any]]:
+    """Retrieves the :ref:`CBIs <cbi>` referred by a set of :ref:`CBR Ingredients
+    <cbr-ingredients>`.
+
+    :param ingredients: The :code:`ingredients` property of a :ref:`CBR <cbr>`
+    :type ingredients: dict[str, Any]
+    :param fields: The dot-separated paths of the only fields to be retrieved besides
+      the identifier, defaults to :const:`None` (all fields)
+    :type fields: Iterable[str], optional
+    :return: A dictionary mapping the identifiers of the :ref:`CBIs <cbi>` found into
+      their documents
+    :rtype: dict[int, dict[str, Any]]
+    """
+    return handler.get_handler().get_cbis(
+        (i["cbiId"] for i in ingredients.values()), fields
+    )
+
+
+def get_referred_cbas(
+    appliances: Dict[str, Any], fields: Optional[Iterable[str]] = None
+) -> Dict[int, Dict[str, Any]]:
+    """Retrieves the :ref:`CBAs <cba>` referred by a set of :ref:`CBR Appliances
+    <cbr-appliances>`.
+
+    :param appliances: The :code:`appliances` property of a :ref:`CBR <cbr>`
+    :type appliances: dict[str, Any]
+    :param fields: The dot-separated paths of the only fields to be retrieved besides
+      the identifier, defaults to :const:`None` (all fields)
+    :type fields: Iterable[str], optional
+    :return: A dictionary mapping the identifiers of the :ref:`CBAs <cba>` found into
+      their documents
+    :rtype: dict[int, dict[str, Any]]
+    """
+    return handler.get_handler().get_cbas(
+        (a["cbaId"] for a in appliances.values() if "cbaId" in a), fields
+    )
+
+
+def get_referred_cbps(
+    processes: Dict[str, Any], fields: Optional[Iterable[str]] = None
+) -> Dict[int, Dict[str, Any]]:
+    """Retrieves the :ref:`CBPs <cbp>` referred by a set of :ref:`CBR Processes
+    <cbr-preparation>`.
+
+    :param processes: The :code:`preparation` property of a :ref:`CBR <cbr>`
+    :type processes: dict[str, Any]
+    :param fields: The dot-separated paths of the only fields to be retrieved besides
+      the identifier, defaults to :const:`None` (all fields)
+    :type fields: Iterable[str], optional
+    :return: A dictionary mapping the identifiers of the :ref:`CBPs <cbp>` found into
+      their documents
+    :rtype: dict[int, dict[str, Any]]
+    """
+    return handler.get_handler().get_cbps(
+        (p["cbpId"] for p in processes.values()), fields
+    )
+
+
+def _update_referred(
+    previous: Dict[int, Dict[str, Any]],
+    ids: Set[int],
+    get_many: Callable[..., Dict[int, Dict[str, Any]]],
+    fields: Optional[Iterable[str]],
+) -> Dict[int, Dict[str, Any]]:
+    result = {k: v for k, v in previous.items() if k in ids}
+    missing = ids - result.keys()
+
+    if missing:
+        result.update(get_many(missing, fields))
+
+    return result
+
+
+def update_referred_cbis(
+    cbis: Dict[int, Dict[str, Any]],
+    ingredients: Dict[str, Any],
+    fields: Optional[Iterable[str]] = None,
+) -> Dict[int, Dict[str, Any]]:
+    """Updates the :ref:`CBIs <cbi>` referred by a set of :ref:`CBR Ingredients
+    <cbr-ingredients>`, only retrieving those not referred before.
+
+    :param cbis: The :ref:`CBIs <cbi>` previously referred, as provided by
+      :func:`get_referred_cbis`
+    :type cbis: dict[int, dict[str, Any]]
+    :param ingredients: The new :code:`ingredients` property of a :ref:`CBR <cbr>`
+    :type ingredients: dict[str, Any]
+    :param fields: The dot-separated paths of the only fields to be retrieved besides
+      the identifier, defaults to :const:`None` (all fields)
+    :type fields: Iterable[str], optional
+    :return: A dictionary mapping the identifiers of the :ref:`CBIs <cbi>` found into
+      their documents
+    :rtype: dict[int, dict[str, Any]]
+    """
+    return _update_referred(
+        cbis,
+        {i["cbiId"] for i in ingredients.values()},
+        handler.get_handler().get_cbis,
+        fields,
+    )
+
+
+def update_referred_cbas(
+    cbas: Dict[int, Dict[str, Any]],
+    appliances: Dict[str, Any],
+    fields: Optional[Iterable[str]] = None,
+) -> Dict[int, Dict[str, Any]]:
+    """Updates the :ref:`CBAs <cba>` referred by a set of :ref:`CBR Appliances
+    <cbr-appliances>`, only retrieving those not referred before.
+
+    :param cbas: The :ref:`CBAs <cba>` previously referred, as provided by
+      :func:`get_referred_cbas`
+    :type cbas: dict[int, dict[str, Any]]
+    :param appliances: The new :code:`appliances` property of a :ref:`CBR <cbr>`
+    :type appliances: dict[str, Any]
+    :param fields: The dot-separated paths of the only fields to be retrieved besides
+      the identifier, defaults to :const:`None` (all fields)
+    :type fields: Iterable[str], optional
+    :return: A dictionary mapping the identifiers of the :ref:`CBAs <cba>` found into
+      their documents
+    :rtype: dict[int, dict[str, Any]]
+    """
+    return _update_referred(
+        cbas,
+        {a["cbaId"] for a in appliances.values() if "cbaId" in a},
+        handler.get_handler().get_cbas,
+        fields,
+    )
+
+
+def update_referred_cbps(
+    cbps: Dict[int, Dict[str, Any]],
+    processes: Dict[str, Any],
+    fields: Optional[Iterable[str]] = None,
+) -> Dict[int, Dict[str, Any]]:
+    """Updates the :ref:`CBPs <cbp>` referred by a set of :ref:`CBR Processes
+    <cbr-preparation>`, only retrieving those not referred before.
+
+    :param cbps: The :ref:`CBPs <cbp>` previously referred, as provided by
+      :func:`get_referred_cbps`
+    :type cbps: dict[int, dict[str, Any]]
+    :param processes: The new :code:`preparation` property of a :ref:`CBR <cbr>`
+    :type processes: dict[str, Any]
+    :param fields: The dot-separated paths of the only fields to be retrieved besides
+      the identifier, defaults to :const:`None` (all fields)
+    :type fields: Iterable[str], optional
+    :return: A dictionary mapping the identifiers of the :ref:`CBPs <cbp>` found into
+      their documents
+    :rtype: dict[int, dict[str, Any]]
+    """
+    return _update_referred(
+        cbps,
+        {p["cbpId"] for p in processes.values()},
+        handler.get_handler().get_cbps,
+        fields,
+    )
+
+
+def _section(name: str) -> Callable[[Dict[str, Any]], Any]:
+    def provide(cbr: Dict[str, Any]) -> Any:
+        return cbr[name]
+
+    return provide
+
+
+def standard_rule_engine(
+    max_workers: Optional[int] = None, compact_graph: bool = False
+) -> RuleEngine:
+    """Creates a :class:`RuleEngine` with the standard resource providers and
+    validation rules registered.
+
+    :param max_workers: Maximum number of threads of the engine, defaults to the
+      :class:`concurrent.futures.ThreadPoolExecutor` default
+    :type max_workers: int, optional
+    :param compact_graph: A flag indicating whether the :code:`cbrgraph` resource is a
+      :class:`cookbase.graph.compact.CompactCBRGraph` instead of a
+      :class:`cookbase.graph.cbrgraph.CBRGraph`, defaults to :const:`False`. Compact
+      graphs take less memory and time to build and analyze, but they cannot be
+      updated in place when revalidating an edited :ref:`CBR <cbr>`
+    :type compact_graph: bool, optional
+    :return: The rule engine
+    :rtype: RuleEngine
+    """
+    engine = RuleEngine(max_workers)
+
+    for section in ("ingredients", "appliances", "preparation"):
+        engine.add_provider(section, _section(section))
+
+    engine.add_provider(
+        "cbrindex", CBRIndex.build, ("ingredients", "appliances", "preparation")
+    )
+    engine.add_provider(
+        "cbrgraph",
+        build_compact_cbrgraph if compact_graph else build_cbrgraph,
+        (CBR, "cbrindex"),
+    )
+    engine.add_provider(
+        "cbis",
+        get_referred_cbis,
+        ("ingredients",),
+        update_referred_cbis,
+        projected=True,
+    )
+    engine.add_provider(
+        "cbas", get_referred_cbas, ("appliances",), update_referred_cbas, projected=True
+    )
+    engine.add_provider(
+        "cbps",
+        get_referred_cbps,
+        ("preparation",),
+        update_referred_cbps,
+        projected=True,
+    )
+    engine.add_provider("cba_table", get_unrolled_cba_table, ())
+
+    engine.add_rule(
+        "ingredients_are_valid",
+        Semantics.ingredients_are_valid,
+        ("ingredients", "cbis"),
+    )
+    engine.add_rule(
+        "foodstuff_and_appliance_references_are_consistent",
+        Semantics.foodstuff_and_appliance_references_are_consistent,
+        ("ingredients", "appliances", "preparation", "cbrindex"),
+    )
+    engine.add_rule(
+        "processes_and_appliances_are_valid_and_processes_requirements_met",
+        Semantics.processes_and_appliances_are_valid_and_processes_requirements_met,
+        ("appliances", "preparation", "cbas", "cbps", "cba_table"),
+    )
+
+    for rule in (
+        "ingredients_used_exactly_once",
+        "single_final_process",
+        "appliances_not_in_conflict",
+    ):
+        engine.add_rule(rule, getattr(Graph, rule), ("cbrgraph",))
+
+    return engine
+
+
+def get_rule_engine(
+    max_workers: Optional[int] = None, force_new_instance: bool = False
+) -> RuleEngine:
+    """Provides the standard rule engine instance.
+
+    The first time this function is called (or if the `force_new_instance` flag is set
+    to :const:`True`) a :class:`RuleEngine` is created by
+    :func:`standard_rule_engine`; afterwards, the already available instance is
+    returned, disregarding the `max_workers` argument.
+
+    :param max_workers: Maximum number of threads of the engine, defaults to the
+      :class:`concurrent.futures.ThreadPoolExecutor` default
+    :type max_workers: int, optional
+    :param force_new_instance: A flag indicating whether a new engine must be created,
+      defaults to :const:`False`
+    :type force_new_instance: bool, optional
+    :return: The standard rule engine
+    :rtype: RuleEngine
+    """
+    global _rule_engine
+
+    with _rule_engine_lock:
+        if _rule_engine is None or force_new_instance:
+            _rule_engine = standard_rule_engine(max_workers)
+
+        return _rule_engine
+
+
+_rule_engine = None
+_rule_engine_lock = threading.Lock()
@@ -1,9 +1,23 @@
-import requests
+class _LazyDefinitions(type):
+    """Metaclass that sets up the :class:`Definitions` variables read from the
+    :doc:`Cookbase Data Model (CBDM) <cbdm>` common definitions document on first
+    access.
+    """
+
+    def __getattr__(cls, name):
+        if name in cls._lazy_attributes:
+            cls._setup()
+            return type.__getattribute__(cls, name)
+
+        raise AttributeError(f"type object {cls.__name__!r} has no attribute {name!r}")
 
 
-class Definitions:
+class Definitions(metaclass=_LazyDefinitions):
     """Class that provides global definitions for the Cookbase platform.
 
+    The :attr:`materials`, :attr:`appliance_functions` and :attr:`foodstuff_keywords`
+    variables are loaded the first time any of them is accessed.
+
     :ivar str schema_base_url: The base URL to the :doc:`Cookbase Data Model (CBDM)
       <cbdm>` Schemas
     :ivar str definitions_url: The URL to the :doc:`CBDM <cbdm>` common definitions
@@ -18,22 +32,20 @@ class Definitions:
     :vartype foodstuff_keywords: list[str]
     """
 
-    schema_base_url = "http://landarltracker.com/schemas"
+    schema_base_url = "http://landarltracker.com/cookbase/schemas/0.1.0"
     definitions_url = f"{schema_base_url}/cb-common-definitions.json"
     cbr_schema_url = f"{schema_base_url}/cbr/cbr.json"
-    materials = None
-    appliance_functions = None
-    foodstuff_keywords = None
+    _lazy_attributes = ("materials", "appliance_functions", "foodstuff_keywords")
 
     @staticmethod
     def _setup() -> None:
         """Sets the variables by reading the :doc:`Cookbase Data Model (CBDM) <cbdm>`
-        common definitions document.
+        common definitions document, as provided by the schema registry.
         """
-        d = requests.get(Definitions.definitions_url).json()
+        from cookbase.schema.registry import get_registry
+
+        d = get_registry().get(Definitions.definitions_url)
         Definitions.materials = d["$defs"]["material"]["enum"]
         Definitions.appliance_functions = d["$defs"]["applianceFunction"]["enum"]
         Definitions.foodstuff_keywords = d["$defs"]["foodstuffKeywords"]["enum"]
 
-
-Definitions._setup()
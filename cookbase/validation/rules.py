@@ -8,14 +8,33 @@ the application of the validation rules, they are implemented from a problem
 optimization perspective, and attending to this priority in some cases several tests are
 collapsed into a single function.
 
+The rules taking catalogue documents declare the fields they read from them through
+:func:`reads_fields`, so that only those fields are retrieved from database.
+
 """
-from typing import Any, Dict, List
+import inspect
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from attr import attrib, attrs
 from cookbase.db import handler
 from cookbase.graph.cbrgraph import CBRGraph
+from cookbase.graph.cbrindex import CBRIndex
+from cookbase.graph.compact import CompactCBRGraph
 from cookbase.logging import logger
-from cookbase.validation.globals import Definitions
+from cookbase.validation.cba import UNROLLED_FIELDS
+
+if TYPE_CHECKING:
+    from cookbase.validation.cba import UnrolledCBATable
 
 
 @attrs
@@ -69,6 +88,55 @@ class AppliedRuleResult:
         self.warnings.extend(result.warnings)
 
 
+def reads_fields(**fields: Iterable[str]) -> Callable:
+    """Decorator function that declares the fields of the catalogue documents read by a
+    validation rule, by name of the parameter taking them. The identifier of the
+    documents is always available.
+
+    :param fields: The dot-separated paths of the fields read from the documents passed
+      to each parameter
+    :type fields: Iterable[str]
+    """
+
+    def decorator(f: Callable):
+        f.read_fields = {k: tuple(v) for k, v in fields.items()}
+        return f
+
+    return decorator
+
+
+def fields_read(function: Callable, position: int) -> Optional[Tuple[str, ...]]:
+    """Retrieves the fields of the catalogue documents read by a validation rule from
+    one of its parameters, as declared through :func:`reads_fields`.
+
+    :param function: The function implementing the rule
+    :type function: Callable
+    :param int position: The position of the parameter
+    :return: The dot-separated paths of the fields, or :const:`None` if they are not
+      declared
+    :rtype: tuple[str, ...] or None
+    """
+    read_fields = getattr(function, "read_fields", None)
+
+    if read_fields is None:
+        return None
+
+    try:
+        parameters = list(inspect.signature(function).parameters)
+    except (TypeError, ValueError):
+        return None
+
+    if position >= len(parameters):
+        return None
+
+    return read_fields.get(parameters[position])
+
+
+# Fields read by the composite process and appliance rule, which also unrolls CBAs
+_CBA_FIELDS = ("name",) + UNROLLED_FIELDS
+_CBP_FIELDS = ("name", "info.validation")
+
+
 class Semantics:
     """A class that holds the set of methods that impose semantic conditions in order to
     validate a :ref:`Cookbase Recipe (CBR) <cbr>`.
@@ -79,7 +147,10 @@ class Semantics:
     """
 
     @staticmethod
-    def ingredients_are_valid(ingredients: Dict[str, Any]) -> AppliedRuleResult:
+    @reads_fields(cbis=("name",))
+    def ingredients_are_valid(
+        ingredients: Dict[str, Any], cbis: Optional[Dict[int, Dict[str, Any]]] = None
+    ) -> AppliedRuleResult:
         """Checks whether the :ref:`CBR Ingredients <cbr-ingredients>` present in a
         :ref:`CBR <cbr>` are correct and their respective :ref:`CBIs <cbi>` exist in the
         database.
@@ -95,15 +166,24 @@ class Semantics:
           from the :ref:`CBR <cbr>` to be validated, which holds a set of :ref:`CBR
           Ingredients <cbr-ingredients>`
         :type ingredients: dict[str, Any]
+        :param cbis: A dictionary mapping the identifiers of the referred :ref:`CBIs
+          <cbi>` into their documents, as returned by
+          :meth:`cookbase.db.handler.DBHandler.get_cbis`, defaults to retrieving them
+          from the database
+        :type cbis: dict[int, dict[str, Any]], optional
         :return: An :class:`AppliedRuleResult` object containing the errors and warnings
           registered during rule application
         :rtype: AppliedRuleResult
         """
         result = AppliedRuleResult()
-        db_handler = handler.get_handler()
+
+        if cbis is None:
+            cbis = handler.get_handler().get_cbis(
+                (i["cbiId"] for i in ingredients.values()), ("name",)
+            )
 
         for i in ingredients.values():
-            cbi = db_handler.get_cbi(i["cbiId"])
+            cbi = cbis.get(i["cbiId"])
             if cbi is None:
                 e = f'CBI with id {i["cbiId"]} does not exist in database'
                 result.errors.append(e)
@@ -124,6 +204,7 @@ class Semantics:
         return result
 
     @staticmethod
+    @reads_fields(cba=("name",))
     def appliance_is_valid(
         appliance: Dict[str, Any], cba: Dict[str, Any]
     ) -> AppliedRuleResult:
@@ -176,6 +257,7 @@ class Semantics:
         return result
 
     @staticmethod
+    @reads_fields(cbp=("name",))
     def process_is_valid(
         process: Dict[str, Any], cbp: Dict[str, Any]
     ) -> AppliedRuleResult:
@@ -225,7 +307,10 @@ class Semantics:
         return result
 
     @staticmethod
-    def processes_are_valid(processes: Dict[str, Any]) -> AppliedRuleResult:
+    @reads_fields(cbps=("name",))
+    def processes_are_valid(
+        processes: Dict[str, Any], cbps: Optional[Dict[int, Dict[str, Any]]] = None
+    ) -> AppliedRuleResult:
         """Checks whether the :ref:`CBR Processes <cbr-preparation>` present in a
         :ref:`CBR <cbr>` are correct and their respective :ref:`CBPs <cbp>` exist in the
         database.
@@ -245,15 +330,24 @@ class Semantics:
           from the :ref:`CBR <cbr>` to be validated, which holds a set of :ref:`CBR
           Processes <cbr-preparation>`
         :type processes: dict[str, Any]
+        :param cbps: A dictionary mapping the identifiers of the referred :ref:`CBPs
+          <cbp>` into their documents, as returned by
+          :meth:`cookbase.db.handler.DBHandler.get_cbps`, defaults to retrieving them
+          from the database
+        :type cbps: dict[int, dict[str, Any]], optional
         :return: An :class:`AppliedRuleResult` object containing the errors and warnings
           registered during rule application
         :rtype: AppliedRuleResult
         """
-        result = AppliedRuleResult
-        db_handler = handler.get_handler()
+        result = AppliedRuleResult()
+
+        if cbps is None:
+            cbps = handler.get_handler().get_cbps(
+                (p["cbpId"] for p in processes.values()), ("name",)
+            )
 
         for i in processes.values():
-            cbp = db_handler.get_cbp(i["cbpId"])
+            cbp = cbps.get(i["cbpId"])
 
             if cbp is None:
                 e = f'CBP with id {i["cbpId"]} does not exist in database'
@@ -270,6 +364,7 @@ class Semantics:
         ingredients: Dict[str, Any],
         appliances: Dict[str, Any],
         processes: Dict[str, Any],
+        index: Optional[CBRIndex] = None,
     ) -> AppliedRuleResult:
         """Checks for the consistency of a :ref:`CBR <cbr>` on the scope of its
         :ref:`CBR Ingredient <cbr-ingredients>`, :ref:`CBR Appliance <cbr-appliances>`
@@ -312,65 +407,41 @@ class Semantics:
           from the :ref:`CBR <cbr>` to be validated, which holds a set of :ref:`CBR
           Processes <cbr-preparation>`
         :type processes: dict[str, Any]
+        :param index: The index of the references between the items of the :ref:`CBR
+          <cbr>`, defaults to building it from the given sections
+        :type index: cookbase.graph.cbrindex.CBRIndex, optional
         :return: An :class:`AppliedRuleResult` object containing the errors and warnings
           registered during rule application
         :rtype: AppliedRuleResult
         """
         result = AppliedRuleResult()
-        used_ingredients = set()
-        used_appliances = set()
 
-        for i in processes.values():
-            # Checking foodstuffs references
-            for j in [v for v in Definitions.foodstuff_keywords if v in i.keys()]:
-                r = i[j]
-
-                if isinstance(r, str):
-                    if r not in ingredients.keys():
-                        if r not in processes.keys():
-                            e = (
-                                f"Foodstuff reference '{r}' appears neither in "
-                                f"'ingredients' nor in 'preparation' section"
-                            )
-                            result.errors.append(e)
-                            logger.error(e)
-                    else:
-                        used_ingredients.add(r)
-                else:
-                    for q in r:
-                        if q not in ingredients.keys():
-                            if q not in processes.keys():
-                                e = (
-                                    f"Foodstuff reference '{q}' appears neither in "
-                                    f"'ingredients' nor in 'preparation' section"
-                                )
-                        else:
-                            used_ingredients.add(q)
-
-            # Checking appliances references
-            for a in i["appliances"]:
-                if a["appliance"] not in appliances.keys():
-                    e = (
-                        f'Appliance reference \'{a["appliance"]}\' does not appear in '
-                        f"'appliances' section"
-                    )
-                    result.errors.append(e)
-                    logger.error(e)
-                else:
-                    used_appliances.add(a["appliance"])
+        if index is None:
+            index = CBRIndex.build(ingredients, appliances, processes)
 
-        # Checking unused ingredients
-        diff = ingredients.keys() - used_ingredients
+        # Checking foodstuffs references
+        for r, _ in index.unresolved_foodstuffs:
+            e = (
+                f"Foodstuff reference '{r}' appears neither in "
+                f"'ingredients' nor in 'preparation' section"
+            )
+            result.errors.append(e)
+            logger.error(e)
+
+        # Checking appliances references
+        for r, _ in index.unresolved_appliances:
+            e = f"Appliance reference '{r}' does not appear in 'appliances' section"
+            result.errors.append(e)
+            logger.error(e)
 
-        for d in diff:
+        # Checking unused ingredients
+        for d in index.unused_ingredients():
             w = f"Ingredient '{d}' is not used in 'preparation' section"
             result.warnings.append(w)
             logger.warning(w)
 
         # Checking unused appliances
-        diff = appliances.keys() - used_appliances
-
-        for d in diff:
+        for d in index.unused_appliances():
             w = f"Appliance '{d}' is not used in 'preparation' section"
             result.warnings.append(w)
             logger.warning(w)
@@ -378,13 +449,20 @@ class Semantics:
         return result
 
     @staticmethod
+    @reads_fields(cbas=UNROLLED_FIELDS, cbp=("info.validation",))
     def cbas_satisfy_cbp(
-        cbas: List[Dict[str, Any]], cbp: Dict[str, Any]
+        cbas: List[Dict[str, Any]],
+        cbp: Dict[str, Any],
+        table: Optional["UnrolledCBATable"] = None,
     ) -> AppliedRuleResult:
         """Checks if a set of :ref:`CBAs <cba>` satisfy at least one of the condition
         clauses provided by the :code:`data.validation.conditions.requiredAppliances`
         property of a given :ref:`CBP <cbp>`.
 
+        Each clause is checked by :func:`cookbase.validation.cba.satisfies_clause`,
+        which finds an assignment of different :ref:`CBAs <cba>` to the clause literals
+        whenever one exists.
+
         The provided :ref:`CBAs <cba>` are assumed to exist in the database.
 
         :param cbas: A list containing the :ref:`CBAs <cba>` to be verified
@@ -392,75 +470,37 @@ class Semantics:
         :param cbp: The dictionary containing the :ref:`CBP <cbp>` whose conditions
           clauses are to be checked for satisfaction
         :type cbp: dict[str, Any]
+        :param table: The table from where the unrolled :ref:`CBAs <cba>` are taken,
+          defaults to the one provided by
+          :func:`cookbase.validation.cba.get_unrolled_cba_table`
+        :type table: cookbase.validation.cba.UnrolledCBATable, optional
         :return: An :class:`AppliedRuleResult` object containing the errors and warnings
           registered during rule application
         :rtype: AppliedRuleResult
         """
-        from cookbase.validation.cba import unroll
+        from cookbase.validation.cba import (
+            UnrolledCBA,
+            get_unrolled_cba_table,
+            satisfies_clause,
+            unroll,
+        )
+
+        if table is None:
+            table = get_unrolled_cba_table()
 
-        unrolled_cbas = [unroll(cba) for cba in cbas]
+        unrolled_cbas = []
+
+        for cba in cbas:
+            unrolled_cba = table.get(cba["id"]) if cba["id"] is not None else None
+
+            if unrolled_cba is None:
+                # Virtual appliance or CBA not yet materialized in the table
+                unrolled_cba = UnrolledCBA.from_cba(unroll(cba))
+
+            unrolled_cbas.append(unrolled_cba)
 
         for clause in cbp["info"]["validation"]["conditions"]["requiredAppliances"]:
-            unsatisfied_clause = False
-            satisfied_literals = [False] * len(clause)
-            satisfying_cbas = [False] * len(unrolled_cbas)
-
-            # First iteration searching for exact cbaIds
-            # in order to minimize the search space
-            for i in range(len(clause)):
-                literal = clause[i]
-                if "cbaId" in literal:
-                    for j in range(len(unrolled_cbas)):
-                        if satisfying_cbas[j]:
-                            continue
-
-                        if (
-                            isinstance(unrolled_cbas[j]["id"], int)
-                            and unrolled_cbas[j]["id"] == literal["cbaId"]
-                        ) or (
-                            isinstance(unrolled_cbas[j]["id"], list)
-                            and literal["cbaId"] in unrolled_cbas[j]["id"]
-                        ):
-                            satisfied_literals[i] = True
-                            satisfying_cbas[j] = True
-                            break
-
-                    if not satisfied_literals[i]:
-                        unsatisfied_clause = True
-                        break
-
-            if unsatisfied_clause:
-                continue
-
-            # Second iteration searching for functions
-
-            # TODO: search combinatorial space exhaustively
-            ###############################################
-            # This implementation may throw false negatives
-            # as it associates a CBA to a CBP literal function
-            # sequentially, not considering any rearrangement
-            # that may lead us to a solution.
-            ############################
-            for i in range(len(clause)):
-                if satisfied_literals[i]:
-                    continue
-
-                literal = clause[i]
-                if "function" in literal:
-                    for j in range(len(unrolled_cbas)):
-                        if satisfying_cbas[j]:
-                            continue
-
-                        if literal["function"] in unrolled_cbas[j]["info"]["functions"]:
-                            satisfied_literals[i] = True
-                            satisfying_cbas[j] = True
-                            break
-
-                    if not satisfied_literals[i]:
-                        unsatisfied_clause = True
-                        break
-
-            if not unsatisfied_clause:
+            if satisfies_clause(clause, unrolled_cbas):
                 return AppliedRuleResult()
 
         e = f'Appliance requirements of CBP {cbp["id"]} are not satisfied'
@@ -468,8 +508,13 @@ class Semantics:
         return AppliedRuleResult(errors=[e])
 
     @staticmethod
+    @reads_fields(cbas=_CBA_FIELDS, cbps=_CBP_FIELDS)
     def processes_and_appliances_are_valid_and_processes_requirements_met(
-        appliances: Dict[str, Any], processes: Dict[str, Any]
+        appliances: Dict[str, Any],
+        processes: Dict[str, Any],
+        cbas: Optional[Dict[int, Dict[str, Any]]] = None,
+        cbps: Optional[Dict[int, Dict[str, Any]]] = None,
+        table: Optional["UnrolledCBATable"] = None,
     ) -> AppliedRuleResult:
         """Checks correctness and consistency on the :ref:`CBR Appliances
         <cbr-appliances>` and :ref:`CBR Processes <cbr-preparation>` present in a
@@ -502,16 +547,39 @@ class Semantics:
           from the :ref:`CBR <cbr>` to be validated, which holds a set of :ref:`CBR
           Processes <cbr-preparation>`
         :type processes: dict[str, Any]
+        :param cbas: A dictionary mapping the identifiers of the referred :ref:`CBAs
+          <cba>` into their documents, as returned by
+          :meth:`cookbase.db.handler.DBHandler.get_cbas`, defaults to retrieving them
+          from the database
+        :type cbas: dict[int, dict[str, Any]], optional
+        :param cbps: A dictionary mapping the identifiers of the referred :ref:`CBPs
+          <cbp>` into their documents, as returned by
+          :meth:`cookbase.db.handler.DBHandler.get_cbps`, defaults to retrieving them
+          from the database
+        :type cbps: dict[int, dict[str, Any]], optional
+        :param table: The table from where the unrolled :ref:`CBAs <cba>` are taken,
+          as in :meth:`cbas_satisfy_cbp`
+        :type table: cookbase.validation.cba.UnrolledCBATable, optional
         :return: An :class:`AppliedRuleResult` object containing the errors and warnings
           registered during rule application
         :rtype: AppliedRuleResult
         """
         result = AppliedRuleResult()
-        db_handler = handler.get_handler()
+
+        # Retrieving all the referred catalogue documents in advance
+        if cbps is None:
+            cbps = handler.get_handler().get_cbps(
+                (p["cbpId"] for p in processes.values()), _CBP_FIELDS
+            )
+
+        if cbas is None:
+            cbas = handler.get_handler().get_cbas(
+                (a["cbaId"] for a in appliances.values() if "cbaId" in a), _CBA_FIELDS
+            )
 
         for process_reference, p in processes.items():
             # Checking CBP validity
-            cbp = db_handler.get_cbp(p["cbpId"])
+            cbp = cbps.get(p["cbpId"])
 
             if cbp is None:
                 e = f'CBP with id {p["cbpId"]} does not exist in database'
@@ -522,11 +590,11 @@ class Semantics:
                 result.include_result(partial_result)
 
             # Checking CBAs validity
-            cbas = []
+            process_cbas = []
 
             for a in p["appliances"]:
                 if "cbaId" in appliances[a["appliance"]]:
-                    cba = db_handler.get_cba(appliances[a["appliance"]]["cbaId"])
+                    cba = cbas.get(appliances[a["appliance"]]["cbaId"])
 
                     if cba is None:
                         e = (
@@ -550,11 +618,12 @@ class Semantics:
                         },
                     }
 
-                cbas.append(cba)
+                process_cbas.append(cba)
 
             # Checking whether process requirements are met
-            partial_result = Semantics.cbas_satisfy_cbp(cbas, cbp)
-            result.include_result(partial_result)
+            if cbp is not None:
+                partial_result = Semantics.cbas_satisfy_cbp(process_cbas, cbp, table)
+                result.include_result(partial_result)
 
         return result
 
@@ -562,7 +631,9 @@ class Semantics:
 class Graph:
     """A class that holds the set of methods that impose graph consistency conditions in
     order to validate a :ref:`Cookbase Recipe (CBR) <cbr>` analyzing its corresponding
-    :doc:`Cookbase Recipe Graph (CBRGraph) <cbrg>`.
+    :doc:`Cookbase Recipe Graph (CBRGraph) <cbrg>`, held either by a
+    :class:`cookbase.graph.cbrgraph.CBRGraph` or by a
+    :class:`cookbase.graph.compact.CompactCBRGraph`.
 
     All messages notifying validation errors or warnings are passed to the
     :data:`cookbase.logging.logger` instance.
@@ -570,7 +641,9 @@ class Graph:
     """
 
     @staticmethod
-    def ingredients_used_exactly_once(graph: CBRGraph) -> AppliedRuleResult:
+    def ingredients_used_exactly_once(
+        graph: Union[CBRGraph, CompactCBRGraph]
+    ) -> AppliedRuleResult:
         """Checks that every :ref:`CBR Ingredient <cbr-ingredients>` in a given
         :doc:`CBRGraph <cbrg>` is directly used by a :ref:`CBR Process
         <cbr-preparation>` exactly once.
@@ -584,7 +657,8 @@ class Graph:
 
         :param graph: The :doc:`CBRGraph <cbrg>` generated from the :ref:`CBR <cbr>` to
           be validated
-        :type graph: cookbase.graph.cbrgraph.CBRGraph
+        :type graph: cookbase.graph.cbrgraph.CBRGraph or
+          cookbase.graph.compact.CompactCBRGraph
         :return: An :class:`AppliedRuleResult` object containing the errors and warnings
           registered during rule application
         :rtype: AppliedRuleResult
@@ -592,7 +666,7 @@ class Graph:
         result = AppliedRuleResult()
 
         for i in graph.get_ingredients():
-            r = graph.g.out_degree(i)
+            r = graph.out_degree(i)
 
             if r == 0:
                 w = f"Ingredient '{i}' is not used during preparation"
@@ -606,7 +680,9 @@ class Graph:
         return result
 
     @staticmethod
-    def single_final_process(graph: CBRGraph) -> AppliedRuleResult:
+    def single_final_process(
+        graph: Union[CBRGraph, CompactCBRGraph]
+    ) -> AppliedRuleResult:
         """Checks if there is only one :ref:`CBR Process <cbr-preparation>` in a given
         :doc:`CBRGraph <cbrg>` acting as the end process.
 
@@ -617,14 +693,15 @@ class Graph:
 
         :param graph: The :doc:`CBRGraph <cbrg>` generated from the :ref:`CBR <cbr>` to
           be validated
-        :type graph: cookbase.graph.cbrgraph.CBRGraph
+        :type graph: cookbase.graph.cbrgraph.CBRGraph or
+          cookbase.graph.compact.CompactCBRGraph
         :return: An :class:`AppliedRuleResult` object containing the errors and warnings
           registered during rule application
         :rtype: AppliedRuleResult
         """
         result = AppliedRuleResult()
 
-        if len(graph.get_leaf_processes()) > 1:
+        if len(graph.processes_summary().leaves) > 1:
             e = f"There are more than one ending processes in the recipe"
             result.errors.append(e)
             logger.error(e)
@@ -632,7 +709,9 @@ class Graph:
         return result
 
     @staticmethod
-    def appliances_not_in_conflict(graph: CBRGraph) -> AppliedRuleResult:
+    def appliances_not_in_conflict(
+        graph: Union[CBRGraph, CompactCBRGraph]
+    ) -> AppliedRuleResult:
         """Checks whether there are not any :ref:`CBR Appliance <cbr-appliances>` in a
         given :doc:`CBRGraph <cbrg>` that may be in conflict, that is, potentially used
         by two or more concurrent :ref:`CBR Processes <cbr-preparation>` at the same
@@ -644,71 +723,34 @@ class Graph:
           one concurrent :ref:`CBR Process <cbr-preparation>` in the analyzed :ref:`CBR
           <cbr>`.
 
+        Two processes are concurrent if neither of them precedes the other in the
+        preparation. The conflicts are found by
+        :meth:`cookbase.graph.cbrgraph.CBRGraph.appliance_conflicts`, and one warning
+        is logged for each pair of concurrent preparation paths sharing an appliance.
+
         :param graph: The :doc:`CBRGraph <cbrg>` generated from the :ref:`CBR <cbr>` to
           be validated
-        :type graph: cookbase.graph.cbrgraph.CBRGraph
+        :type graph: cookbase.graph.cbrgraph.CBRGraph or
+          cookbase.graph.compact.CompactCBRGraph
         :return: An :class:`AppliedRuleResult` object containing the errors and warnings
           registered during rule application
         :rtype: AppliedRuleResult
         """
         result = AppliedRuleResult()
-        ag = graph.aggregated_appliances_graph()
-        concurrent_paths = [i for i, _ in ag.in_degree() if _ == 0]
-
-        while concurrent_paths:
-            # Checks all combinations of two concurrent paths
-            for i in range(len(concurrent_paths) - 1):
-                for j in range(i + 1, len(concurrent_paths)):
-                    appls_1 = ag.nodes[concurrent_paths[i]]["appliances"].keys()
-                    appls_2 = ag.nodes[concurrent_paths[j]]["appliances"].keys()
-                    conflicting_appliances = appls_1 & appls_2
-
-                    if conflicting_appliances:
-                        for k in conflicting_appliances:
-                            s = "("
-
-                            for p in ag.nodes[concurrent_paths[i]]["appliances"][k]:
-                                s += f"'{p}', "
-
-                            s = s.rpartition(", ")[0] + ") and ("
-
-                            for p in ag.nodes[concurrent_paths[j]]["appliances"][k]:
-                                s += f"'{p}', "
-
-                            s = s.rpartition(", ")[0] + ")"
-
-                            w = (
-                                f"Appliance '{k}' is used in potentially concurrent "
-                                f"processes {s}"
-                            )
-                            result.warnings.append(w)
-                            logger.warning(w)
-
-            # Updates concurrent paths
-            candidates_next = set()
+        # The formatted processes of each path, as paths are usually in many conflicts
+        formatted = {}
 
-            for i in concurrent_paths:
-                for s in ag.successors(i):
-                    candidates_next.add(s)
+        for c in graph.appliance_conflicts():
+            for processes in c.processes, c.other_processes:
+                if processes not in formatted:
+                    formatted[processes] = ", ".join(f"'{p}'" for p in processes)
 
-            next_cp = set()
-            cp_helper_set = set(concurrent_paths)
-
-            for i in candidates_next:
-                advances = True
-
-                for j in ag.predecessors(i):
-                    if j not in cp_helper_set:
-                        advances = False
-                        break
-
-                if advances:
-                    next_cp.add(i)
-                else:
-                    for j in ag.predecessors(i):
-                        if j in cp_helper_set:
-                            next_cp.add(j)
-
-            concurrent_paths = list(next_cp)
+            w = (
+                f"Appliance '{c.appliance}' is used in potentially concurrent "
+                f"processes ({formatted[c.processes]}) and "
+                f"({formatted[c.other_processes]})"
+            )
+            result.warnings.append(w)
+            logger.warning(w)
 
         return result
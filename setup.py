@@ -16,6 +16,13 @@ setuptools.setup(
     long_description_content_type="text/markdown",
     url="https://github.com/hblanko/cookbase",
     packages=setuptools.find_packages(),
+    package_data={
+        "cookbase.schema": [
+            "schemas/*.json",
+            "schemas/*/*.json",
+            "schemas/*/*/*.json",
+        ]
+    },
     install_requires=[
         "attrs == 19.3.0",
         "jsonschema == 3.2.0",
@@ -26,6 +33,7 @@ setuptools.setup(
         "ruamel.yaml == 0.16.10",
         "uritools == 3.0.0",
     ],
+    extras_require={"async": ["motor == 2.1.0"]},
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: GNU General Public License v3 (GPLv3)",